@@ -1,11 +1,22 @@
-# 
-
-
-
-# asgi.py (no Channels / WebSockets)
+# asgi.py - HTTP through Django, WebSockets through Channels
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SampleDB.settings')
 
-application = get_asgi_application()
+# Initialise Django before importing consumers (they import models/settings)
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+from channels.sessions import SessionMiddlewareStack
+
+from core.WebSocketConnection.routing import websocket_urlpatterns
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    # The session (User_Id set at login) identifies socket users
+    "websocket": AllowedHostsOriginValidator(
+        SessionMiddlewareStack(URLRouter(websocket_urlpatterns))
+    ),
+})
@@ -1,5 +1,7 @@
+import logging
 import os
 from celery import Celery
+from celery.signals import worker_ready
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SampleDB.settings')
@@ -13,6 +15,17 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+@worker_ready.connect
+def rebuild_scheduler_indexes(**kwargs):
+    """Rebuild the Redis reminder index and advancement queue on startup; they miss writes made while Redis was down"""
+    from core.scheduler.recurring_scheduler import seed_advancement_queue
+    from core.scheduler.reminder_index import rebuild_reminder_index
+    for rebuild in (rebuild_reminder_index, seed_advancement_queue):
+        try:
+            rebuild()
+        except Exception as e:
+            logging.warning(f"⚠️ {rebuild.__name__} failed on worker start: {e}")
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
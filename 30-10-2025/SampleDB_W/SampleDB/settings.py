@@ -125,6 +125,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'corsheaders',
     'rest_framework',  # Added if you're using DRF
+    'channels',
     'core',  # Add your app here
     'core.scheduler',  # Scheduler app for recurring meetings
     'core.UserDashBoard',
@@ -318,11 +319,31 @@ REST_FRAMEWORK = {
 }
 
 # Channels configuration
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+# Redis layer so events published by any worker reach sockets on every worker.
+# CHANNEL_LAYER_BACKEND=memory keeps the single-process layer (local dev, tests).
+CHANNEL_LAYER_REDIS_URL = os.getenv(
+    "CHANNEL_LAYER_REDIS_URL",
+    f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/{os.getenv('CHANNEL_LAYER_REDIS_DB', '1')}"
+)
+
+if os.getenv("CHANNEL_LAYER_BACKEND", "redis") == "memory":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer"
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [CHANNEL_LAYER_REDIS_URL],
+                "capacity": 500,        # messages buffered per socket channel
+                "expiry": 10,           # seconds an undelivered message is kept
+                "group_expiry": 86400,  # drop group membership of dead sockets after a day
+            },
+        }
     }
-}
 
 # ======== CELERY CONFIGURATION FOR RECURRING MEETINGS ========
 # Set the default Django settings module for the 'celery' program
@@ -347,7 +368,11 @@ CELERY_TASK_ACKS_LATE = True
 CELERY_BEAT_SCHEDULE = {
     'update-recurring-meetings': {
         'task': 'core.scheduler.tasks.update_recurring_meetings_task',
-        'schedule': 60.0,  # Run every minute to check for new meetings
+        'schedule': 60.0,  # Run every minute; advances only the series queued as due
+    },
+    'sweep-recurring-meetings': {
+        'task': 'core.scheduler.tasks.sweep_recurring_meetings_task',
+        'schedule': 60.0 * 10,  # Run every 10 minutes to catch series missing from the queue
     },
     'send-daily-invitations': {
         'task': 'core.scheduler.tasks.send_daily_invitations_task',
@@ -355,12 +380,40 @@ CELERY_BEAT_SCHEDULE = {
     },
     'send-meeting-reminders': {
         'task': 'core.scheduler.tasks.send_meeting_reminders_task',
-        'schedule': 60.0,  # Run every minute to check for reminders
+        'schedule': 60.0,  # Run every minute; claims only the reminders that are due
+    },
+    'rebuild-reminder-index': {
+        'task': 'core.scheduler.tasks.rebuild_reminder_index_task',
+        'schedule': 60.0 * 60,  # Run hourly to repair the reminder index after Redis outages
     },
     'cleanup-old-meetings': {
         'task': 'core.scheduler.tasks.cleanup_old_meetings_task',
         'schedule': 60.0 * 60 * 24,  # Run daily to cleanup old meetings
     },
+    'refresh-meeting-occurrences': {
+        'task': 'core.scheduler.tasks.refresh_meeting_occurrences_task',
+        'schedule': 60.0 * 60 * 24,  # Run daily to extend the conflict-check horizon
+    },
+    'apply-participant-events': {
+        'task': 'core.scheduler.tasks.apply_participant_events_task',
+        'schedule': 5.0,  # Drain write-behind join/leave events (PARTICIPANT_WRITE_BEHIND)
+    },
+    'purge-participant-event-log': {
+        'task': 'core.scheduler.tasks.purge_participant_event_log_task',
+        'schedule': 60.0 * 60 * 24,  # Run daily to drop old idempotency keys
+    },
+    'process-scheduled-reminders': {
+        'task': 'core.scheduler.tasks.process_scheduled_reminders_task',
+        'schedule': 60.0,  # Run every minute; workers claim disjoint reminders (SKIP LOCKED)
+    },
+    'reconcile-notification-counters': {
+        'task': 'core.scheduler.tasks.reconcile_notification_counters_task',
+        'schedule': 60.0 * 10,  # Run every 10 minutes to repair unread counter drift
+    },
+    'cleanup-chat-files': {
+        'task': 'core.scheduler.tasks.cleanup_chat_files_task',
+        'schedule': 60.0 * 60 * 6,  # Run every 6 hours to drop chat attachments past FILE_CACHE_TTL
+    },
 }
 
 # Internationalization
@@ -383,7 +436,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # DATA_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024 * 1024  # 1GB
 # FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024 * 1024  # 1GB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024 * 1024  # 10GB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024 * 1024  # 10GB
+# Uploaded files (and ASGI request bodies) larger than this are spooled to a
+# temporary file instead of being held in memory. This is not a size limit.
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("FILE_UPLOAD_MAX_MEMORY_SIZE", 5 * 1024 * 1024))  # 5MB
 
 # Email configuration
 EMAIL_HOST = os.getenv("EMAIL_HOST")
@@ -1,12 +1,10 @@
 import json
 import time
 import threading
-import cv2
 import numpy as np
 import base64
 import io
 from PIL import Image
-import mediapipe as mp
 from scipy.spatial.distance import euclidean
 from datetime import datetime, timedelta
 import uuid
@@ -25,6 +23,8 @@ from django.core.cache import cache
 from django.db.models import Avg, Count, Q, Max, Min
 import logging
 
+from core.utils.lazy_imports import lazy_module, lazy_object
+
 logger = logging.getLogger(__name__)
 
 # ==================== CONFIGURATION ====================
@@ -61,6 +61,8 @@ class AttendanceConfig:
     FACE_TRACKING_CONFIDENCE = 0.5
     HAND_DETECTION_CONFIDENCE = 0.5
     POSE_DETECTION_CONFIDENCE = 0.5
+    
+    BULK_WRITE_BATCH_SIZE = 200         # rows per statement when flushing a whole meeting
 
 class ViolationSeverity:
     """Violation severity levels"""
@@ -140,11 +142,15 @@ class AttendanceSession(models.Model):
             return []
 
 # ==================== MEDIAPIPE INITIALIZATION ====================
+# OpenCV, mediapipe and its solution graphs are loaded on the first detection
+# frame, not when the URLconf is imported.
 
-mp_face = mp.solutions.face_detection.FaceDetection(min_detection_confidence=AttendanceConfig.FACE_DETECTION_CONFIDENCE)
-mp_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True, min_detection_confidence=0.5, min_tracking_confidence=0.5)
-mp_pose = mp.solutions.pose.Pose(min_detection_confidence=0.5)
-mp_hands = mp.solutions.hands.Hands(min_detection_confidence=0.5)
+cv2 = lazy_module("cv2")
+mp = lazy_module("mediapipe")
+mp_face = lazy_object(lambda: mp.solutions.face_detection.FaceDetection(min_detection_confidence=AttendanceConfig.FACE_DETECTION_CONFIDENCE))
+mp_mesh = lazy_object(lambda: mp.solutions.face_mesh.FaceMesh(refine_landmarks=True, min_detection_confidence=0.5, min_tracking_confidence=0.5))
+mp_pose = lazy_object(lambda: mp.solutions.pose.Pose(min_detection_confidence=0.5))
+mp_hands = lazy_object(lambda: mp.solutions.hands.Hands(min_detection_confidence=0.5))
 
 attendance_sessions = {}
 
@@ -501,6 +507,51 @@ def stop_attendance_tracking(meeting_id: str, user_id) -> bool:
     logger.warning(f"MULTI-USER: No session found for {meeting_id}_{user_id}")
     return False
 
+def _attendance_row_values(state, current_time) -> Dict[str, Any]:
+    """tbl_Attendance_Sessions column values for an in-memory session state"""
+    session_duration = (current_time - state["start_time"]).total_seconds()
+    
+    extended_data = {
+        'detection_counts': state.get("detection_counts", 0),
+        'warning_count': state.get("warning_count", 0),
+        'is_removed_from_meeting': state.get("is_removed_from_meeting", False),
+        'removal_timestamp': state.get("removal_timestamp").isoformat() if state.get("removal_timestamp") else None,
+        'removal_reason': state.get("removal_reason", ""),
+        'continuous_violation_start_time': state.get("continuous_violation_start_time"),
+        'last_detection_time': state.get("last_detection_time", 0.0),
+        'detection_penalty_applied': state.get("detection_penalty_applied", False),
+        'warning_phase_complete': state.get("warning_phase_complete", False),
+        'camera_resume_expected': state.get("camera_resume_expected", False),
+        'camera_resume_deadline': state.get("camera_resume_deadline"),
+        'camera_confirmation_token': state.get("camera_confirmation_token"),
+        'camera_verified_at': state.get("camera_verified_at"),
+        'grace_period_active': state.get("grace_period_active", False),
+        'grace_period_until': state.get("grace_period_until"),
+    }
+    
+    return {
+        'popup_count': state["popup_count"],
+        'detection_counts': json.dumps(extended_data),
+        'violation_start_times': json.dumps(state["violation_start_times"]),
+        'total_detections': state["total_detections"],
+        'attendance_penalty': state["attendance_penalty"],
+        'session_active': state["session_active"],
+        'break_used': state["break_used"],
+        'violations': json.dumps(state["violations"]),
+        'session_start_time': state["start_time"],
+        'last_activity': current_time,
+        'total_session_time': int(session_duration),
+        'active_participation_time': state.get("active_participation_time", int(session_duration)),
+        'violation_severity_score': state.get("violation_severity_score", 0.0),
+        'frame_processing_count': state.get("frame_processing_count", 0),
+        'engagement_score': max(0, 100 - state["attendance_penalty"]),
+        'attendance_percentage': max(0, 100 - state["attendance_penalty"]),
+        'total_break_time_used': state.get("total_break_time_used", 0),
+        'break_sessions': json.dumps(state.get("break_sessions", [])),
+        'break_count': state.get("break_count", 0),
+        'is_currently_on_break': state.get("is_currently_on_break", False),
+    }
+
 def store_attendance_to_db(meeting_id: str, user_id: str) -> bool:
     """Store attendance data"""
     session_key = get_session_key(meeting_id, user_id)
@@ -513,52 +564,10 @@ def store_attendance_to_db(meeting_id: str, user_id: str) -> bool:
     
     try:
         with transaction.atomic():
-            current_time = timezone.now()
-            session_duration = (current_time - state["start_time"]).total_seconds()
-            
-            extended_data = {
-                'detection_counts': state.get("detection_counts", 0),
-                'warning_count': state.get("warning_count", 0),
-                'is_removed_from_meeting': state.get("is_removed_from_meeting", False),
-                'removal_timestamp': state.get("removal_timestamp").isoformat() if state.get("removal_timestamp") else None,
-                'removal_reason': state.get("removal_reason", ""),
-                'continuous_violation_start_time': state.get("continuous_violation_start_time"),
-                'last_detection_time': state.get("last_detection_time", 0.0),
-                'detection_penalty_applied': state.get("detection_penalty_applied", False),
-                'warning_phase_complete': state.get("warning_phase_complete", False),
-                'camera_resume_expected': state.get("camera_resume_expected", False),
-                'camera_resume_deadline': state.get("camera_resume_deadline"),
-                'camera_confirmation_token': state.get("camera_confirmation_token"),
-                'camera_verified_at': state.get("camera_verified_at"),
-                'grace_period_active': state.get("grace_period_active", False),
-                'grace_period_until': state.get("grace_period_until"),
-            }
-            
             AttendanceSession.objects.update_or_create(
                 meeting_id=meeting_id,
                 user_id=user_id,
-                defaults={
-                    'popup_count': state["popup_count"],
-                    'detection_counts': json.dumps(extended_data),
-                    'violation_start_times': json.dumps(state["violation_start_times"]),
-                    'total_detections': state["total_detections"],
-                    'attendance_penalty': state["attendance_penalty"],
-                    'session_active': state["session_active"],
-                    'break_used': state["break_used"],
-                    'violations': json.dumps(state["violations"]),
-                    'session_start_time': state["start_time"],
-                    'last_activity': current_time,
-                    'total_session_time': int(session_duration),
-                    'active_participation_time': state.get("active_participation_time", int(session_duration)),
-                    'violation_severity_score': state.get("violation_severity_score", 0.0),
-                    'frame_processing_count': state.get("frame_processing_count", 0),
-                    'engagement_score': max(0, 100 - state["attendance_penalty"]),
-                    'attendance_percentage': max(0, 100 - state["attendance_penalty"]),
-                    'total_break_time_used': state.get("total_break_time_used", 0),
-                    'break_sessions': json.dumps(state.get("break_sessions", [])),
-                    'break_count': state.get("break_count", 0),
-                    'is_currently_on_break': state.get("is_currently_on_break", False),
-                }
+                defaults=_attendance_row_values(state, timezone.now())
             )
             
             return True
@@ -567,6 +576,69 @@ def store_attendance_to_db(meeting_id: str, user_id: str) -> bool:
         logger.error(f"MULTI-USER: Failed to store attendance for {meeting_id}_{user_id}: {e}")
         return False
 
+def stop_meeting_attendance_tracking(meeting_id: str) -> int:
+    """
+    Stop tracking for every user of a meeting (meeting end). Open breaks are
+    closed and all rows are written with one SELECT, one bulk_update and one
+    bulk_create instead of a transaction per user. Returns users flushed.
+    """
+    prefix = f"{meeting_id}_"
+    states = {
+        key[len(prefix):]: attendance_sessions[key]
+        for key in list(attendance_sessions.keys())
+        if key.startswith(prefix) and key in attendance_sessions
+    }
+    if not states:
+        return 0
+    
+    current_time = time.time()
+    now = timezone.now()
+    
+    try:
+        with transaction.atomic():
+            existing = {
+                obj.user_id: obj
+                for obj in AttendanceSession.objects.select_for_update().filter(
+                    meeting_id=meeting_id, user_id__in=list(states)
+                )
+            }
+            to_update, to_create = [], []
+            
+            for user_id, state in states.items():
+                attendance_obj = existing.get(user_id) or AttendanceSession(meeting_id=meeting_id, user_id=user_id)
+                
+                if state.get('is_currently_on_break'):
+                    update_break_time_used(state, attendance_obj, current_time)
+                    state['is_currently_on_break'] = False
+                    state['current_break_start_time'] = None
+                
+                values = _attendance_row_values(state, now)
+                for field, value in values.items():
+                    setattr(attendance_obj, field, value)
+                attendance_obj.current_break_start_time = None
+                attendance_obj.updated_at = now
+                
+                (to_update if attendance_obj.pk else to_create).append(attendance_obj)
+            
+            if to_update:
+                AttendanceSession.objects.bulk_update(
+                    to_update,
+                    list(values) + ['current_break_start_time', 'updated_at'],
+                    batch_size=AttendanceConfig.BULK_WRITE_BATCH_SIZE
+                )
+            if to_create:
+                AttendanceSession.objects.bulk_create(to_create, batch_size=AttendanceConfig.BULK_WRITE_BATCH_SIZE)
+    
+    except Exception as e:
+        logger.error(f"MULTI-USER: Failed to flush attendance for meeting {meeting_id}: {e}")
+        return 0
+    
+    for user_id in states:
+        attendance_sessions.pop(get_session_key(meeting_id, user_id), None)
+    
+    logger.info(f"MULTI-USER: Flushed attendance for {len(states)} users of meeting {meeting_id}")
+    return len(states)
+
 # ==================== CAMERA VERIFICATION ====================
 
 @csrf_exempt
@@ -51,7 +51,7 @@ from channels.routing import ProtocolTypeRouter
 from pymongo import MongoClient
 from bson import ObjectId
 from PIL import Image
-from insightface.app import FaceAnalysis
+from django.utils.functional import SimpleLazyObject
 import logging
 from datetime import datetime, timedelta
 import base64
@@ -200,6 +200,8 @@ class FaceModel:
         if not self._initialized:
             logger.info(f"🔹 Initializing InsightFace model: {FACE_MODEL_NAME}...")
             try:
+                from insightface.app import FaceAnalysis
+
                 self.app = FaceAnalysis(
                     name=FACE_MODEL_NAME,
                     providers=['CPUExecutionProvider']
@@ -251,7 +253,8 @@ class FaceModel:
             logger.error(f"❌ Error extracting embedding: {e}")
             raise ValueError(f"Failed to process image: {str(e)}")
 
-face_model = FaceModel()
+# Built on the first verification request instead of at import
+face_model = SimpleLazyObject(FaceModel)
 
 # ---------------------------------------------------------------------
 # Utility Functions
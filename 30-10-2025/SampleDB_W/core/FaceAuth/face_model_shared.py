@@ -26,8 +26,6 @@ import os
 import numpy as np
 from io import BytesIO
 from PIL import Image
-import cv2
-from insightface.app import FaceAnalysis
 import logging
 
 # ============================================================================
@@ -75,6 +73,9 @@ class SharedFaceModel:
             logger.info(f"🔹 Initializing Shared InsightFace Model: {FACE_MODEL_NAME}")
             logger.info(f"   Detection Size: {FACE_DETECTION_SIZE}")
             
+            # Imported here so loading this module does not pull in insightface/onnxruntime
+            from insightface.app import FaceAnalysis
+
             self._app = FaceAnalysis(
                 name=FACE_MODEL_NAME,
                 providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
@@ -214,6 +215,9 @@ class SharedFaceModel:
         Returns:
             numpy.ndarray: Image in BGR format (OpenCV)
         """
+        # OpenCV is only needed once an image is processed, not at import
+        import cv2
+
         try:
             # Handle file-like objects (Django UploadedFile)
             if hasattr(image_data, 'read'):
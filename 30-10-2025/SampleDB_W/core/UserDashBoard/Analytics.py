@@ -3,12 +3,28 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
+import functools
 import json
 import logging
 from datetime import datetime, timedelta
 import pytz
 from django.utils import timezone
 
+from core.utils.keyset import InvalidCursor, decode_cursor
+from core.utils.streaming_export import get_export_format, streaming_export_response
+
+from .analytics_exports import (
+    ATTENDANCE_COLUMNS,
+    MEETING_REPORT_COLUMNS,
+    fetch_attendance_page,
+    fetch_meeting_report_page,
+)
+from .analytics_rollups import (
+    TBL_HOST_DAILY,
+    TBL_MEETING_ROLLUP,
+    TBL_USER_DAILY,
+)
+
 # Configure logging
 logging.basicConfig(filename='analytics_debug.log', level=logging.DEBUG, format='%(asctime)s %(levelname)s %(message)s')
 
@@ -50,63 +66,34 @@ def get_host_dashboard_overview(request):
         else:
             return JsonResponse({"error": "Invalid timeframe"}, status=BAD_REQUEST_STATUS)
 
+        # Pre-aggregated per host and day (analytics_rollups.py)
+        type_filter = ""
+        params = [user_id, start_date.date(), end_date.date()]
+        if meeting_type != 'all':
+            type_filter = " AND Meeting_Type = %s"
+            params.append(meeting_type)
+
         with connection.cursor() as cursor:
-            # Total meetings hosted
-            query = """
-                SELECT COUNT(*) 
-                FROM tbl_Meetings m
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            cursor.execute(query, params)
-            total_meetings = cursor.fetchone()[0] or 0
+            # Meetings hosted, average participant duration and engagement
+            cursor.execute(f"""
+                SELECT COALESCE(SUM(Meeting_Count), 0),
+                       SUM(Duration_Minutes_Sum) / NULLIF(SUM(Participant_Rows), 0),
+                       SUM(Engagement_Sum) / NULLIF(SUM(Engagement_Count), 0)
+                FROM {TBL_HOST_DAILY}
+                WHERE Host_ID = %s AND Rollup_Date BETWEEN %s AND %s{type_filter}
+            """, params)
+            total_meetings, avg_duration, avg_engagement = cursor.fetchone()
+            avg_duration = avg_duration or 0
+            avg_engagement = avg_engagement or 0
 
             # Total participants
-            query = """
-                SELECT COUNT(DISTINCT p.User_ID)
-                FROM tbl_Participants p
-                JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            cursor.execute(query, params)
+            cursor.execute(f"""
+                SELECT COUNT(DISTINCT User_ID)
+                FROM {TBL_USER_DAILY}
+                WHERE Host_ID = %s AND Rollup_Date BETWEEN %s AND %s{type_filter}
+            """, params)
             total_participants = cursor.fetchone()[0] or 0
 
-            # Average meeting duration
-            query = """
-                SELECT AVG(p.Duration) / 60
-                FROM tbl_Participants p
-                JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            cursor.execute(query, params)
-            avg_duration = cursor.fetchone()[0] or 0
-
-            # Average engagement score
-            query = """
-                SELECT AVG(p.Engagement_Score)
-                FROM tbl_Participants p
-                JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-                AND p.Engagement_Score IS NOT NULL
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            cursor.execute(query, params)
-            avg_engagement = cursor.fetchone()[0] or 0
-
         data = {
             "total_meetings": int(total_meetings),
             "total_participants": int(total_participants),
@@ -119,6 +106,27 @@ def get_host_dashboard_overview(request):
         logging.error(f"Error fetching host overview: {e}")
         return JsonResponse({"error": f"Database error: {str(e)}"}, status=SERVER_ERROR_STATUS)
 
+def _report_date_range(date_range_start, date_range_end, timeframe):
+    """Start/end of a meeting report; missing dates default from the timeframe"""
+    ist_timezone = pytz.timezone('Asia/Kolkata')
+    if not date_range_end:
+        end_date = timezone.now().astimezone(ist_timezone)
+    else:
+        end_date = datetime.strptime(date_range_end, '%Y-%m-%d').replace(tzinfo=ist_timezone)
+        
+    if not date_range_start:
+        if timeframe == '7days':
+            start_date = end_date - timedelta(days=7)
+        elif timeframe == '30days':
+            start_date = end_date - timedelta(days=30)
+        elif timeframe == '90days':
+            start_date = end_date - timedelta(days=90)
+        else:
+            start_date = end_date - timedelta(days=30)
+    else:
+        start_date = datetime.strptime(date_range_start, '%Y-%m-%d').replace(tzinfo=ist_timezone)
+    return start_date, end_date
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def get_host_meeting_reports(request):
@@ -147,58 +155,37 @@ def get_host_meeting_reports(request):
             logging.error("Missing user_id in meeting reports request")
             return JsonResponse({"error": "user_id is required"}, status=BAD_REQUEST_STATUS)
 
-        # Calculate date range if not provided
-        ist_timezone = pytz.timezone('Asia/Kolkata')
-        if not date_range_end:
-            end_date = timezone.now().astimezone(ist_timezone)
-        else:
-            end_date = datetime.strptime(date_range_end, '%Y-%m-%d').replace(tzinfo=ist_timezone)
-            
-        if not date_range_start:
-            if timeframe == '7days':
-                start_date = end_date - timedelta(days=7)
-            elif timeframe == '30days':
-                start_date = end_date - timedelta(days=30)
-            elif timeframe == '90days':
-                start_date = end_date - timedelta(days=90)
-            else:
-                start_date = end_date - timedelta(days=30)
-        else:
-            start_date = datetime.strptime(date_range_start, '%Y-%m-%d').replace(tzinfo=ist_timezone)
+        start_date, end_date = _report_date_range(date_range_start, date_range_end, timeframe)
 
         offset = (page - 1) * limit
 
+        # One pre-aggregated row per ended meeting (analytics_rollups.py)
+        type_filter = ""
+        params = [user_id, start_date, end_date]
+        if meeting_type != 'all':
+            type_filter = " AND Meeting_Type = %s"
+            params.append(meeting_type)
+
         with connection.cursor() as cursor:
             # Count total meetings for pagination
-            count_query = """
+            cursor.execute(f"""
                 SELECT COUNT(*)
-                FROM tbl_Meetings m
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                count_query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            cursor.execute(count_query, params)
+                FROM {TBL_MEETING_ROLLUP}
+                WHERE Host_ID = %s AND Created_At BETWEEN %s AND %s{type_filter}
+            """, params)
             total_meetings = cursor.fetchone()[0] or 0
 
             # Fetch meeting reports
-            query = """
-                SELECT m.ID, m.Meeting_Name, m.Meeting_Type, m.Created_At, 
-                       COUNT(DISTINCT p.ID) as participant_count, 
-                       AVG(p.Duration) / 60 as avg_duration,
-                       AVG(p.Engagement_Score) as avg_engagement
-                FROM tbl_Meetings m
-                LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            query += " GROUP BY m.ID, m.Meeting_Name, m.Meeting_Type, m.Created_At ORDER BY m.Created_At DESC LIMIT %s OFFSET %s"
-            params.extend([limit, offset])
-            cursor.execute(query, params)
+            cursor.execute(f"""
+                SELECT Meeting_ID, Meeting_Name, Meeting_Type, Created_At,
+                       Participant_Count,
+                       Duration_Minutes_Sum / NULLIF(Participant_Count, 0) as avg_duration,
+                       Engagement_Sum / NULLIF(Engagement_Count, 0) as avg_engagement
+                FROM {TBL_MEETING_ROLLUP}
+                WHERE Host_ID = %s AND Created_At BETWEEN %s AND %s{type_filter}
+                ORDER BY Created_At DESC
+                LIMIT %s OFFSET %s
+            """, params + [limit, offset])
             rows = cursor.fetchall()
 
             meetings = []
@@ -228,6 +215,44 @@ def get_host_meeting_reports(request):
         logging.error(f"Error fetching host meeting reports: {e}")
         return JsonResponse({"error": f"Database error: {str(e)}"}, status=SERVER_ERROR_STATUS)
 
+@require_http_methods(["GET"])
+@csrf_exempt
+def export_host_meeting_reports(request):
+    """
+    Stream a host's meeting reports as CSV or JSONL (?format=csv|jsonl).
+    Each row carries a cursor; ?cursor=<last received> resumes the export.
+    """
+    try:
+        user_id = request.GET.get('user_id') or request.GET.get('userId') or request.GET.get('host_id')
+        meeting_type = request.GET.get('meetingType') or request.GET.get('meeting_type', 'all')
+        after = request.GET.get('cursor')
+
+        if not user_id:
+            return JsonResponse({"error": "user_id is required"}, status=BAD_REQUEST_STATUS)
+
+        fmt = get_export_format(request)
+        if not fmt:
+            return JsonResponse({"error": "format must be csv or jsonl"}, status=BAD_REQUEST_STATUS)
+
+        try:
+            decode_cursor(after, 2)
+            start_date, end_date = _report_date_range(
+                request.GET.get('start_date') or request.GET.get('startDate'),
+                request.GET.get('end_date') or request.GET.get('endDate'),
+                request.GET.get('timeframe', '30days')
+            )
+        except (InvalidCursor, ValueError) as e:
+            return JsonResponse({"error": str(e)}, status=BAD_REQUEST_STATUS)
+
+        logging.debug(f"Host meeting report export - user_id: {user_id}, format: {fmt}, resume: {bool(after)}")
+        return streaming_export_response(
+            functools.partial(fetch_meeting_report_page, user_id, start_date, end_date, meeting_type),
+            MEETING_REPORT_COLUMNS, fmt, f"meeting_reports_{user_id}", after
+        )
+    except Exception as e:
+        logging.error(f"Error exporting host meeting reports: {e}")
+        return JsonResponse({"error": f"Database error: {str(e)}"}, status=SERVER_ERROR_STATUS)
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def get_host_engagement_distribution(request):
@@ -259,40 +284,30 @@ def get_host_engagement_distribution(request):
         else:
             return JsonResponse({"error": "Invalid timeframe"}, status=BAD_REQUEST_STATUS)
 
-        with connection.cursor() as cursor:
-            query = """
-                SELECT 
-                    CASE 
-                        WHEN p.Engagement_Score >= 80 THEN 'High'
-                        WHEN p.Engagement_Score >= 50 THEN 'Medium'
-                        ELSE 'Low'
-                    END as engagement_level,
-                    COUNT(*) as count,
-                    CASE 
-                        WHEN p.Engagement_Score >= 80 THEN '#4CAF50'
-                        WHEN p.Engagement_Score >= 50 THEN '#FFC107'
-                        ELSE '#F44336'
-                    END as color
-                FROM tbl_Participants p
-                JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s 
-                AND p.Engagement_Score IS NOT NULL
-            """
-            params = [user_id, start_date, end_date]
-            if meeting_type != 'all':
-                query += " AND m.Meeting_Type = %s"
-                params.append(meeting_type)
-            query += " GROUP BY engagement_level ORDER BY engagement_level"
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+        # Engagement level counts are pre-aggregated per host and day (analytics_rollups.py)
+        type_filter = ""
+        params = [user_id, start_date.date(), end_date.date()]
+        if meeting_type != 'all':
+            type_filter = " AND Meeting_Type = %s"
+            params.append(meeting_type)
 
-            distribution = []
-            for row in rows:
-                distribution.append({
-                    "name": row[0],
-                    "value": int(row[1]),
-                    "color": row[2]
-                })
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT SUM(Engagement_High), SUM(Engagement_Medium), SUM(Engagement_Low)
+                FROM {TBL_HOST_DAILY}
+                WHERE Host_ID = %s AND Rollup_Date BETWEEN %s AND %s{type_filter}
+            """, params)
+            high, medium, low = cursor.fetchone()
+
+            distribution = [
+                {"name": name, "value": int(value), "color": color}
+                for name, value, color in (
+                    ("High", high, "#4CAF50"),
+                    ("Medium", medium, "#FFC107"),
+                    ("Low", low, "#F44336"),
+                )
+                if value
+            ]
 
             # Ensure we have all three categories even if some are empty
             existing_levels = {item['name'] for item in distribution}
@@ -352,35 +367,32 @@ def get_host_meeting_trends(request):
         else:
             return JsonResponse({"error": "Invalid timeframe"}, status=BAD_REQUEST_STATUS)
 
+        # Periods are built from the daily rollups (analytics_rollups.py)
         with connection.cursor() as cursor:
             if metric == 'meetings':
-                query = """
-                    SELECT DATE_FORMAT(m.Created_At, %s) as date, 
-                           COUNT(*) as count,
-                           AVG(COALESCE(p.Engagement_Score, 0)) as avg_engagement
-                    FROM tbl_Meetings m
-                    LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                    WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-                    GROUP BY DATE_FORMAT(m.Created_At, %s)
+                query = f"""
+                    SELECT DATE_FORMAT(Rollup_Date, %s) as date,
+                           SUM(Meeting_Count) as count,
+                           SUM(Engagement_Sum) / NULLIF(SUM(Engagement_Count), 0) as avg_engagement
+                    FROM {TBL_HOST_DAILY}
+                    WHERE Host_ID = %s AND Rollup_Date BETWEEN %s AND %s
+                    GROUP BY DATE_FORMAT(Rollup_Date, %s)
                     ORDER BY date
                 """
-                params = [date_format, user_id, start_date, end_date, date_format]
             elif metric == 'participants':
-                query = """
-                    SELECT DATE_FORMAT(m.Created_At, %s) as date, 
-                           COUNT(DISTINCT p.User_ID) as count,
-                           AVG(COALESCE(p.Engagement_Score, 0)) as avg_engagement
-                    FROM tbl_Meetings m
-                    LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID
-                    WHERE m.Host_ID = %s AND m.Created_At BETWEEN %s AND %s
-                    GROUP BY DATE_FORMAT(m.Created_At, %s)
+                query = f"""
+                    SELECT DATE_FORMAT(Rollup_Date, %s) as date,
+                           COUNT(DISTINCT User_ID) as count,
+                           SUM(Engagement_Sum) / NULLIF(SUM(Engagement_Count), 0) as avg_engagement
+                    FROM {TBL_USER_DAILY}
+                    WHERE Host_ID = %s AND Rollup_Date BETWEEN %s AND %s
+                    GROUP BY DATE_FORMAT(Rollup_Date, %s)
                     ORDER BY date
                 """
-                params = [date_format, user_id, start_date, end_date, date_format]
             else:
                 return JsonResponse({"error": "Invalid metric"}, status=BAD_REQUEST_STATUS)
 
-            cursor.execute(query, params)
+            cursor.execute(query, [date_format, user_id, start_date.date(), end_date.date(), date_format])
             rows = cursor.fetchall()
 
             trends = []
@@ -653,6 +665,44 @@ def get_participant_attendance(request):
         logging.error(f"Error fetching participant attendance: {e}")
         return JsonResponse({"error": f"Database error: {str(e)}"}, status=SERVER_ERROR_STATUS)
 
+@require_http_methods(["GET"])
+@csrf_exempt
+def export_participant_attendance(request):
+    """
+    Stream a participant's attendance records as CSV or JSONL (?format=csv|jsonl).
+    Each row carries a cursor; ?cursor=<last received> resumes the export.
+    """
+    try:
+        user_id = request.GET.get('userId') or request.GET.get('user_id')
+        meeting_type = request.GET.get('meetingType') or request.GET.get('meeting_type', 'all')
+        after = request.GET.get('cursor')
+
+        if not user_id:
+            return JsonResponse({"error": "userId is required"}, status=BAD_REQUEST_STATUS)
+
+        fmt = get_export_format(request)
+        if not fmt:
+            return JsonResponse({"error": "format must be csv or jsonl"}, status=BAD_REQUEST_STATUS)
+
+        start_date = request.GET.get('start_date') or request.GET.get('startDate')
+        end_date = request.GET.get('end_date') or request.GET.get('endDate')
+        try:
+            decode_cursor(after, 1)
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else datetime.now().date()
+            start_date = (datetime.strptime(start_date, '%Y-%m-%d').date() if start_date
+                          else end_date - timedelta(days=30))
+        except (InvalidCursor, ValueError) as e:
+            return JsonResponse({"error": str(e)}, status=BAD_REQUEST_STATUS)
+
+        logging.debug(f"Participant attendance export - user_id: {user_id}, format: {fmt}, resume: {bool(after)}")
+        return streaming_export_response(
+            functools.partial(fetch_attendance_page, user_id, start_date, end_date, meeting_type),
+            ATTENDANCE_COLUMNS, fmt, f"attendance_{user_id}", after
+        )
+    except Exception as e:
+        logging.error(f"Error exporting participant attendance: {e}")
+        return JsonResponse({"error": f"Database error: {str(e)}"}, status=SERVER_ERROR_STATUS)
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def get_participant_engagement(request):
@@ -869,10 +919,12 @@ def get_user_stats(request):
 urlpatterns = [
     path('api/analytics/host/overview', get_host_dashboard_overview, name='get_host_dashboard_overview'),
     path('api/analytics/host/meetings', get_host_meeting_reports, name='get_host_meeting_reports'),
+    path('api/analytics/host/meetings/export', export_host_meeting_reports, name='export_host_meeting_reports'),
     path('api/analytics/host/engagement-distribution', get_host_engagement_distribution, name='get_host_engagement_distribution'),
     path('api/analytics/host/trends', get_host_meeting_trends, name='get_host_meeting_trends'),
     path('api/analytics/participant/personal-report', get_participant_personal_report, name='get_participant_personal_report'),
     path('api/analytics/participant/attendance', get_participant_attendance, name='get_participant_attendance'),
+    path('api/analytics/participant/attendance/export', export_participant_attendance, name='export_participant_attendance'),
     path('api/analytics/participant/engagement', get_participant_engagement, name='get_participant_engagement'),
     path('api/analytics/user/stats', get_user_stats, name='get_user_stats'),
 ]
\ No newline at end of file
@@ -0,0 +1,116 @@
+# analytics_exports.py - Keyset page readers for the streaming report exports
+#
+# Each reader returns one page as [(row dict, cursor token of that row)].
+# Pages follow an index order (rollup (Host_ID, Created_At) / participant
+# (User_ID, ID)), so every page is a bounded range scan and an export can
+# resume after any row it already delivered.
+from datetime import timedelta
+
+from django.db import connection
+
+from core.utils.keyset import decode_cursor, encode_cursor
+
+from .analytics_rollups import TBL_MEETING_ROLLUP
+
+MEETING_REPORT_COLUMNS = (
+    'meeting_id', 'meeting_name', 'meeting_type', 'created_at',
+    'participants', 'duration', 'engagement',
+)
+
+ATTENDANCE_COLUMNS = (
+    'meeting_id', 'meeting_name', 'meeting_time', 'meeting_type',
+    'duration_minutes', 'sessions', 'attendance_percentage', 'engagement_score',
+)
+
+
+def _rounded(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def fetch_meeting_report_page(host_id, start_date, end_date, meeting_type, after, limit):
+    """Rollup rows of a host's meetings created in [start_date, end_date], newest first"""
+    key = decode_cursor(after, 2)
+    params = [host_id, start_date, end_date]
+    conditions = ""
+    if meeting_type != 'all':
+        conditions += " AND Meeting_Type = %s"
+        params.append(meeting_type)
+    if key is not None:
+        conditions += " AND (Created_At, Meeting_ID) < (%s, %s)"
+        params.extend(key)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT Meeting_ID, Meeting_Name, Meeting_Type, Created_At, Participant_Count,
+                   Duration_Minutes_Sum / NULLIF(Participant_Count, 0),
+                   Engagement_Sum / NULLIF(Engagement_Count, 0)
+            FROM {TBL_MEETING_ROLLUP}
+            WHERE Host_ID = %s AND Created_At BETWEEN %s AND %s{conditions}
+            ORDER BY Created_At DESC, Meeting_ID DESC
+            LIMIT %s
+        """, params + [limit])
+        rows = cursor.fetchall()
+
+    return [
+        (
+            {
+                'meeting_id': meeting_id,
+                'meeting_name': meeting_name or f"Meeting {meeting_id}",
+                'meeting_type': meeting_type_value,
+                'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else None,
+                'participants': int(participants or 0),
+                'duration': _rounded(duration) or 0.0,
+                'engagement': _rounded(engagement),
+            },
+            encode_cursor(created_at, meeting_id),
+        )
+        for meeting_id, meeting_name, meeting_type_value, created_at, participants, duration, engagement in rows
+    ]
+
+
+def fetch_attendance_page(user_id, start_date, end_date, meeting_type, after, limit):
+    """A participant's attendance rows for meetings held between the two dates, newest participation first"""
+    key = decode_cursor(after, 1)
+    params = [user_id, start_date, end_date + timedelta(days=1)]
+    conditions = ""
+    if meeting_type != 'all':
+        conditions += " AND p.Meeting_Type = %s"
+        params.append(meeting_type)
+    if key is not None:
+        conditions += " AND p.ID < %s"
+        params.extend(key)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT p.ID, p.Meeting_ID, m.Meeting_Name, COALESCE(m.Started_At, m.Created_At), p.Meeting_Type,
+                   p.Total_Duration_Minutes, p.Total_Sessions,
+                   p.Attendance_Percentagebasedon_host, a.engagement_score
+            FROM tbl_Participants p
+            JOIN tbl_Meetings m ON m.ID = p.Meeting_ID
+            LEFT JOIN tbl_Attendance_Sessions a
+                ON a.Meeting_ID = p.Meeting_ID AND a.User_ID = CAST(p.User_ID AS CHAR)
+            WHERE p.User_ID = %s AND p.Role = 'participant'
+              AND COALESCE(m.Started_At, m.Created_At) >= %s
+              AND COALESCE(m.Started_At, m.Created_At) < %s{conditions}
+            ORDER BY p.ID DESC
+            LIMIT %s
+        """, params + [limit])
+        rows = cursor.fetchall()
+
+    return [
+        (
+            {
+                'meeting_id': meeting_id,
+                'meeting_name': meeting_name or f"Meeting {meeting_id}",
+                'meeting_time': meeting_time.strftime('%Y-%m-%d %H:%M:%S') if meeting_time else None,
+                'meeting_type': meeting_type_value or "Unknown",
+                'duration_minutes': _rounded(duration) or 0.0,
+                'sessions': int(sessions or 0),
+                'attendance_percentage': _rounded(attendance) or 0.0,
+                'engagement_score': _rounded(engagement),
+            },
+            encode_cursor(participant_id),
+        )
+        for (participant_id, meeting_id, meeting_name, meeting_time, meeting_type_value,
+             duration, sessions, attendance, engagement) in rows
+    ]
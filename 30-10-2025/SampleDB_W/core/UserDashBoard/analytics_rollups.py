@@ -0,0 +1,226 @@
+# analytics_rollups.py - Pre-aggregated rows for the host analytics endpoints
+#
+# Three tables, all derived from tbl_Meetings, tbl_Participants and
+# tbl_Attendance_Sessions (engagement_score) for ended meetings:
+#   tbl_Analytics_Meeting_Rollup  one row per meeting (meeting reports)
+#   tbl_Analytics_Host_Daily      per host, day and meeting type (overview,
+#                                 engagement distribution, meeting trends)
+#   tbl_Analytics_User_Daily      per participant, host, day and meeting type
+#                                 (distinct participant counts)
+#
+# The unit of maintenance is one host-day: refresh_host_day rebuilds every
+# row of a host for one day from the source tables, so it is idempotent and
+# the same code serves the end-of-meeting update and the backfill command.
+# Days are DATE(tbl_Meetings.Created_At), matching the old Created_At filters.
+import logging
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+from core.WebSocketConnection.meeting_history import ENDED_STATUSES
+
+TBL_MEETING_ROLLUP = 'tbl_Analytics_Meeting_Rollup'
+TBL_HOST_DAILY = 'tbl_Analytics_Host_Daily'
+TBL_USER_DAILY = 'tbl_Analytics_User_Daily'
+
+BACKFILL_BATCH_SIZE = 200
+
+# Engagement levels, as the old per-request CASE expressions bucketed them
+ENGAGEMENT_HIGH = 80
+ENGAGEMENT_MEDIUM = 50
+
+_rollup_tables_ready = False
+
+_ENDED_FILTER = f"LOWER(m.Status) IN ({', '.join(['%s'] * len(ENDED_STATUSES))})"
+
+# Engagement of a participant: their AI attendance session, when there is one
+_ATTENDANCE_JOIN = """
+    LEFT JOIN tbl_Attendance_Sessions a
+        ON a.Meeting_ID = p.Meeting_ID AND a.User_ID = CAST(p.User_ID AS CHAR)
+"""
+
+
+def create_rollup_tables():
+    """Create the rollup tables once per process"""
+    global _rollup_tables_ready
+    if _rollup_tables_ready:
+        return True
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TBL_MEETING_ROLLUP} (
+                    Meeting_ID CHAR(36) PRIMARY KEY,
+                    Host_ID INT NOT NULL,
+                    Meeting_Day DATE NOT NULL,
+                    Meeting_Type VARCHAR(50) NOT NULL,
+                    Meeting_Name VARCHAR(255),
+                    Created_At DATETIME NOT NULL,
+                    Participant_Count INT NOT NULL DEFAULT 0,
+                    Duration_Minutes_Sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    Engagement_Sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    Engagement_Count INT NOT NULL DEFAULT 0,
+                    Engagement_High INT NOT NULL DEFAULT 0,
+                    Engagement_Medium INT NOT NULL DEFAULT 0,
+                    Engagement_Low INT NOT NULL DEFAULT 0,
+                    Updated_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    INDEX idx_meeting_rollup_host_created (Host_ID, Created_At),
+                    INDEX idx_meeting_rollup_host_day (Host_ID, Meeting_Day)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TBL_HOST_DAILY} (
+                    Host_ID INT NOT NULL,
+                    Rollup_Date DATE NOT NULL,
+                    Meeting_Type VARCHAR(50) NOT NULL,
+                    Meeting_Count INT NOT NULL DEFAULT 0,
+                    Participant_Rows INT NOT NULL DEFAULT 0,
+                    Duration_Minutes_Sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    Engagement_Sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    Engagement_Count INT NOT NULL DEFAULT 0,
+                    Engagement_High INT NOT NULL DEFAULT 0,
+                    Engagement_Medium INT NOT NULL DEFAULT 0,
+                    Engagement_Low INT NOT NULL DEFAULT 0,
+                    Updated_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (Host_ID, Rollup_Date, Meeting_Type)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TBL_USER_DAILY} (
+                    User_ID INT NOT NULL,
+                    Host_ID INT NOT NULL,
+                    Rollup_Date DATE NOT NULL,
+                    Meeting_Type VARCHAR(50) NOT NULL,
+                    Meeting_Count INT NOT NULL DEFAULT 0,
+                    Duration_Minutes_Sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    Engagement_Sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+                    Engagement_Count INT NOT NULL DEFAULT 0,
+                    Updated_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (User_ID, Host_ID, Rollup_Date, Meeting_Type),
+                    INDEX idx_user_daily_host_date (Host_ID, Rollup_Date, User_ID)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+        _rollup_tables_ready = True
+        logging.debug("Analytics rollup tables created or exist")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to create analytics rollup tables: {e}")
+        return False
+
+
+def refresh_host_day(cursor, host_id, day):
+    """Rebuild every rollup row of one host for one day (call inside a transaction)"""
+    day_filter = [host_id, day, day + timedelta(days=1), *ENDED_STATUSES]
+
+    cursor.execute(f"DELETE FROM {TBL_MEETING_ROLLUP} WHERE Host_ID = %s AND Meeting_Day = %s", [host_id, day])
+    cursor.execute(f"""
+        INSERT INTO {TBL_MEETING_ROLLUP}
+            (Meeting_ID, Host_ID, Meeting_Day, Meeting_Type, Meeting_Name, Created_At,
+             Participant_Count, Duration_Minutes_Sum, Engagement_Sum, Engagement_Count,
+             Engagement_High, Engagement_Medium, Engagement_Low)
+        SELECT m.ID, m.Host_ID, DATE(m.Created_At), COALESCE(m.Meeting_Type, 'InstantMeeting'),
+               m.Meeting_Name, m.Created_At,
+               COUNT(p.ID),
+               COALESCE(SUM(p.Total_Duration_Minutes), 0),
+               COALESCE(SUM(a.engagement_score), 0),
+               COUNT(a.engagement_score),
+               COALESCE(SUM(a.engagement_score >= {ENGAGEMENT_HIGH}), 0),
+               COALESCE(SUM(a.engagement_score >= {ENGAGEMENT_MEDIUM} AND a.engagement_score < {ENGAGEMENT_HIGH}), 0),
+               COALESCE(SUM(a.engagement_score < {ENGAGEMENT_MEDIUM}), 0)
+        FROM tbl_Meetings m
+        LEFT JOIN tbl_Participants p ON p.Meeting_ID = m.ID
+        {_ATTENDANCE_JOIN}
+        WHERE m.Host_ID = %s AND m.Created_At >= %s AND m.Created_At < %s AND {_ENDED_FILTER}
+        GROUP BY m.ID, m.Host_ID, m.Meeting_Type, m.Meeting_Name, m.Created_At
+    """, day_filter)
+
+    cursor.execute(f"DELETE FROM {TBL_HOST_DAILY} WHERE Host_ID = %s AND Rollup_Date = %s", [host_id, day])
+    cursor.execute(f"""
+        INSERT INTO {TBL_HOST_DAILY}
+            (Host_ID, Rollup_Date, Meeting_Type, Meeting_Count, Participant_Rows, Duration_Minutes_Sum,
+             Engagement_Sum, Engagement_Count, Engagement_High, Engagement_Medium, Engagement_Low)
+        SELECT Host_ID, Meeting_Day, Meeting_Type, COUNT(*), SUM(Participant_Count), SUM(Duration_Minutes_Sum),
+               SUM(Engagement_Sum), SUM(Engagement_Count),
+               SUM(Engagement_High), SUM(Engagement_Medium), SUM(Engagement_Low)
+        FROM {TBL_MEETING_ROLLUP}
+        WHERE Host_ID = %s AND Meeting_Day = %s
+        GROUP BY Host_ID, Meeting_Day, Meeting_Type
+    """, [host_id, day])
+
+    cursor.execute(f"DELETE FROM {TBL_USER_DAILY} WHERE Host_ID = %s AND Rollup_Date = %s", [host_id, day])
+    cursor.execute(f"""
+        INSERT INTO {TBL_USER_DAILY}
+            (User_ID, Host_ID, Rollup_Date, Meeting_Type, Meeting_Count, Duration_Minutes_Sum,
+             Engagement_Sum, Engagement_Count)
+        SELECT p.User_ID, m.Host_ID, DATE(m.Created_At), COALESCE(m.Meeting_Type, 'InstantMeeting'),
+               COUNT(DISTINCT m.ID),
+               COALESCE(SUM(p.Total_Duration_Minutes), 0),
+               COALESCE(SUM(a.engagement_score), 0),
+               COUNT(a.engagement_score)
+        FROM tbl_Meetings m
+        JOIN tbl_Participants p ON p.Meeting_ID = m.ID
+        {_ATTENDANCE_JOIN}
+        WHERE m.Host_ID = %s AND m.Created_At >= %s AND m.Created_At < %s AND {_ENDED_FILTER}
+        GROUP BY p.User_ID, m.Host_ID, DATE(m.Created_At), COALESCE(m.Meeting_Type, 'InstantMeeting')
+    """, day_filter)
+
+
+def refresh_meeting_rollups(meeting_id):
+    """Bring the rollups up to date for the host-day of a meeting that just ended"""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT Host_ID, DATE(Created_At) FROM tbl_Meetings WHERE ID = %s", [meeting_id])
+            row = cursor.fetchone()
+            if not row or row[0] is None or row[1] is None:
+                return False
+            refresh_host_day(cursor, row[0], row[1])
+
+    logging.info(f"📊 Analytics rollups refreshed for host {row[0]} on {row[1]} (meeting {meeting_id})")
+    return True
+
+
+def backfill_rollups(batch_size=BACKFILL_BATCH_SIZE, since=None):
+    """
+    Rebuild the rollups for every host-day with an ended meeting (from the
+    date since, if given), batch_size host-days per transaction. Returns counts.
+    """
+    if not create_rollup_tables():
+        raise RuntimeError("Analytics rollup tables could not be created")
+
+    counts = {'host_days': 0}
+    last_key = None
+
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                params = list(ENDED_STATUSES)
+                since_filter = ""
+                if since:
+                    since_filter = "AND m.Created_At >= %s"
+                    params.append(since)
+                key_filter = ""
+                if last_key:
+                    key_filter = "HAVING (Host_ID, Meeting_Day) > (%s, %s)"
+                    params.extend(last_key)
+                cursor.execute(f"""
+                    SELECT m.Host_ID, DATE(m.Created_At) AS Meeting_Day
+                    FROM tbl_Meetings m
+                    WHERE m.Host_ID IS NOT NULL AND m.Created_At IS NOT NULL
+                      AND {_ENDED_FILTER} {since_filter}
+                    GROUP BY m.Host_ID, DATE(m.Created_At)
+                    {key_filter}
+                    ORDER BY m.Host_ID, Meeting_Day
+                    LIMIT %s
+                """, params + [batch_size])
+                host_days = cursor.fetchall()
+                if not host_days:
+                    break
+
+                for host_id, day in host_days:
+                    refresh_host_day(cursor, host_id, day)
+                counts['host_days'] += len(host_days)
+                last_key = host_days[-1]
+
+        logging.info(f"Analytics rollup backfill progress: {counts}")
+
+    return counts
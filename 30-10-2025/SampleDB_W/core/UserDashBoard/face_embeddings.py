@@ -19,20 +19,21 @@ os.environ.update({
 
 import os
 import sys
+import importlib.util
 import logging
 import numpy as np
 import base64
 from io import BytesIO
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
-import cv2
 from PIL import Image
 
-# MongoDB and S3 imports
-from pymongo import MongoClient
+# MongoDB and S3 imports (pymongo, boto3 and cv2 load on first use)
 from bson import ObjectId
-import boto3
 from botocore.exceptions import ClientError
+from core.utils.lazy_imports import lazy_module, lazy_object
+
+cv2 = lazy_module("cv2")
 
 # ============================================================================
 # IMPORT SHARED FACE MODEL FROM FACEAUTH FOLDER
@@ -47,6 +48,9 @@ if faceauth_dir not in sys.path:
 
 try:
     from face_model_shared import get_face_model, compare_embeddings
+    # face_model_shared only imports insightface when the model is built
+    if importlib.util.find_spec("insightface") is None:
+        raise ImportError("No module named 'insightface'")
     FACE_RECOGNITION_ENABLED = True
     face_model = None
 except ImportError as e:
@@ -86,31 +90,30 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
 AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET", "connectly-storage")
 
-# Initialize MongoDB client
-try:
-    mongo_client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    db = mongo_client[MONGO_DB]
-    face_embeddings_collection = db["face_embeddings"]
-    profile_photos_collection = db["profile_photos"]
-    logger.info(f"✓ MongoDB connected successfully to {MONGO_DB}")
-except Exception as e:
-    logger.error(f"✗ MongoDB connection failed: {e}")
-    db = None
-    face_embeddings_collection = None
-    profile_photos_collection = None
+def _create_mongo_client():
+    from pymongo import MongoClient
+    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+    logger.info(f"✓ MongoDB client created for {MONGO_DB}")
+    return client
 
-# Initialize S3 client
-try:
-    s3_client = boto3.client(
+def _create_s3_client():
+    import boto3
+    client = boto3.client(
         "s3",
         aws_access_key_id=AWS_ACCESS_KEY_ID,
         aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
         region_name=AWS_REGION
     )
     logger.info(f"✓ S3 client initialized for bucket: {AWS_S3_BUCKET}")
-except Exception as e:
-    logger.error(f"✗ S3 client initialization failed: {e}")
-    s3_client = None
+    return client
+
+# MongoDB and S3 clients are built on first use, not when the URLconf is imported
+mongo_client = lazy_object(_create_mongo_client)
+db = lazy_object(lambda: mongo_client[MONGO_DB])
+face_embeddings_collection = lazy_object(lambda: db["face_embeddings"])
+profile_photos_collection = lazy_object(lambda: db["profile_photos"])
+
+s3_client = lazy_object(_create_s3_client)
 
 # ============================================================================
 # BACKWARD COMPATIBILITY - Keep old class for imports
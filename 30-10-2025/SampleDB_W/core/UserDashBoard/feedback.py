@@ -102,8 +102,6 @@ def create_feedback_table():
 @require_http_methods(["POST"])
 @csrf_exempt
 def Create_Feedback(request):
-    create_feedback_table()
-
     try:
         data = json.loads(request.body)
         if isinstance(data, list) and len(data) == 1:
@@ -189,8 +187,6 @@ def Create_Feedback(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def List_All_Feedback(request):
-    create_feedback_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = f"""
@@ -213,8 +209,6 @@ def List_All_Feedback(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_Feedback(request, id):
-    create_feedback_table()
-
     try:
         feedback_id = int(id)
     except ValueError:
@@ -242,8 +236,6 @@ def Get_Feedback(request, id):
 @require_http_methods(["PUT"])
 @csrf_exempt
 def Update_Feedback(request, id):
-    create_feedback_table()
-
     try:
         feedback_id = int(id)
     except ValueError:
@@ -335,8 +327,6 @@ def Update_Feedback(request, id):
 @require_http_methods(["DELETE"])
 @csrf_exempt
 def Delete_Feedback(request, id):
-    create_feedback_table()
-
     try:
         feedback_id = int(id)
     except ValueError:
@@ -361,8 +351,6 @@ def Delete_Feedback(request, id):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Validate_Feedback_Data(request):
-    create_feedback_table()
-
     try:
         data = json.loads(request.body)
         if isinstance(data, list) and len(data) == 1:
@@ -171,8 +171,6 @@ def create_meeting_invitations_table():
 @require_http_methods(["POST"])
 @csrf_exempt
 def Create_Meeting_Invitation(request):
-    create_meeting_invitations_table()
-
     try:
         data = json.loads(request.body)
         logging.debug(f"Received JSON: {json.dumps(data, indent=2)}")
@@ -315,8 +313,6 @@ def Create_Meeting_Invitation(request):
 @require_http_methods(["PUT"])
 @csrf_exempt
 def Update_Invitation_Status(request, invite_token):
-    create_meeting_invitations_table()
-
     try:
         invite_token = uuid.UUID(invite_token)
     except ValueError:
@@ -384,8 +380,6 @@ def Update_Invitation_Status(request, invite_token):
 @require_http_methods(["PUT"])
 @csrf_exempt
 def Update_RSVP_Status(request, invite_token):
-    create_meeting_invitations_table()
-
     try:
         invite_token = uuid.UUID(invite_token)
     except ValueError:
@@ -451,8 +445,6 @@ def Update_RSVP_Status(request, invite_token):
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_Meeting_Invitation(request, invite_token):
-    create_meeting_invitations_table()
-
     try:
         invite_token = uuid.UUID(invite_token)
     except ValueError:
@@ -492,8 +484,6 @@ def Get_Meeting_Invitation(request, invite_token):
 @require_http_methods(["GET"])
 @csrf_exempt
 def List_Meeting_Invitations(request):
-    create_meeting_invitations_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = f"""
@@ -527,8 +517,6 @@ def List_Meeting_Invitations(request):
 @require_http_methods(["PUT"])
 @csrf_exempt
 def Update_Meeting_Invitation(request, invite_token):
-    create_meeting_invitations_table()
-
     try:
         invite_token = uuid.UUID(invite_token)
     except ValueError:
@@ -674,8 +662,6 @@ def Update_Meeting_Invitation(request, invite_token):
 @require_http_methods(["DELETE"])
 @csrf_exempt
 def Delete_Meeting_Invitation(request, invite_token):
-    create_meeting_invitations_table()
-
     try:
         invite_token = uuid.UUID(invite_token)
     except ValueError:
@@ -712,8 +698,6 @@ def Delete_Meeting_Invitation(request, invite_token):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Validate_Meeting_Invitation_Data(request):
-    create_meeting_invitations_table()
-
     try:
         data = json.loads(request.body)
         logging.debug(f"Received JSON: {json.dumps(data, indent=2)}")
@@ -11,19 +11,14 @@ from datetime import datetime, timedelta
 from tempfile import TemporaryDirectory
 from typing import List
 from django.db import connection
-from pymongo import MongoClient
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
-from graphviz import Source
-import torch
-from transformers import MarianMTModel, MarianTokenizer
 import logging
 from urllib.parse import quote_plus
 from django.http import StreamingHttpResponse
-import openai
 import logging
 from django.urls import path
 from fpdf import FPDF
@@ -34,16 +29,11 @@ from io import BytesIO
 from wsgiref.util import FileWrapper
 import mimetypes
 from bson import ObjectId
-import boto3
 from botocore.exceptions import NoCredentialsError
-from pydub import AudioSegment
-from deep_translator import GoogleTranslator
-import torch
 from django.utils import timezone
-from core.WebSocketConnection.meetings import BAD_REQUEST_STATUS, NOT_FOUND_STATUS, SERVER_ERROR_STATUS, SUCCESS_STATUS, TBL_MEETINGS, create_meetings_table
-
-# === GPU CHECK ===
-print("Using GPU:", torch.cuda.is_available())
+from core.utils.lazy_imports import lazy_module, lazy_object
+from core.WebSocketConnection.meeting_invitees import is_meeting_invitee
+from core.WebSocketConnection.meetings import BAD_REQUEST_STATUS, NOT_FOUND_STATUS, SERVER_ERROR_STATUS, SUCCESS_STATUS, TBL_MEETINGS
 
 # === CONFIGURATION ===
 # AWS Configuration
@@ -52,13 +42,25 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
 AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET", "connectly-storage")
 
+# === LAZY HEAVY IMPORTS ===
+# ML/media libraries and remote clients are loaded on first use, not when
+# Django imports the URLconf (see `manage.py check_import_budget`).
+torch = lazy_module("torch")
+transformers = lazy_module("transformers")
+graphviz = lazy_module("graphviz")
+openai = lazy_module("openai", on_import=lambda module: setattr(module, "api_key", os.getenv("OPENAI_API_KEY")))
+
+def _create_s3_client():
+    import boto3
+    return boto3.client(
+        "s3",
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_REGION
+    )
+
 # S3 Client
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION
-)
+s3_client = lazy_object(_create_s3_client)
 
 S3_FOLDERS = {
     "videos": os.getenv("S3_FOLDER_VIDEOS", "videos"),
@@ -68,8 +70,6 @@ S3_FOLDERS = {
     "subtitles": os.getenv("S3_FOLDER_SUBTITLES", "subtitles")
 }
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
 # MongoDB Configuration - Updated to match FastAPI
 mongo_user = os.getenv("MONGO_USER", "connectly")
 mongo_password = os.getenv("MONGO_PASSWORD", "password")
@@ -78,9 +78,13 @@ mongo_port = os.getenv("MONGO_PORT", "27017")
 mongo_db = os.getenv("MONGO_DB", "connectlydb")
 
 MONGO_URI = os.getenv("MONGO_URI")
-mongo_client = MongoClient(MONGO_URI)
-db = mongo_client[mongo_db]
-collection = db["test"]
+def _create_mongo_client():
+    from pymongo import MongoClient
+    return MongoClient(MONGO_URI)
+
+mongo_client = lazy_object(_create_mongo_client)
+db = lazy_object(lambda: mongo_client[mongo_db])
+collection = lazy_object(lambda: db["test"])
 TRASH_RETENTION_DAYS = 15
 # === LOGGING SETUP ===
 logger = logging.getLogger("video_processor")
@@ -150,27 +154,10 @@ def is_user_allowed(meeting_id: str, email: str = "", user_id: str = "") -> bool
             return False
             
         with connection.cursor() as cursor:
-            # Check 1: ScheduledMeeting email
-            if email:
-                cursor.execute("SELECT email FROM tbl_ScheduledMeetings WHERE id = %s", [meeting_id])
-                row = cursor.fetchone()
-                if row and row[0]:
-                    scheduled_emails = [e.strip().lower() for e in row[0].split(',') if e.strip()]
-                    if email.strip().lower() in scheduled_emails:
-                        logger.info(f"✅ Access granted via ScheduledMeeting: {email}")
-                        return True  # ✅ RETURN IMMEDIATELY
-
-            # Check 2: CalendarMeeting email
-            if email:
-                cursor.execute("SELECT email, guestEmails, attendees FROM tbl_CalendarMeetings WHERE id = %s", [meeting_id])
-                row = cursor.fetchone()
-                if row:
-                    for field in row:
-                        if field:
-                            emails = [e.strip().lower() for e in re.split(r'[;,]', field) if e.strip()]
-                            if email.strip().lower() in emails:
-                                logger.info(f"✅ Access granted via CalendarMeeting: {email}")
-                                return True  # ✅ RETURN IMMEDIATELY
+            # Check 1+2: Scheduled/Calendar invitee via the indexed invitee table
+            if email and is_meeting_invitee(meeting_id, email):
+                logger.info(f"✅ Access granted via meeting invitation: {email}")
+                return True  # ✅ RETURN IMMEDIATELY
 
             # Check 3: InstantMeeting participant (only for instant meetings)
             if user_id:
@@ -214,20 +201,9 @@ def get_meeting_participants_emails(meeting_id: str) -> list:
     
     try:
         with connection.cursor() as cursor:
-            # Check Scheduled Meetings
-            cursor.execute("SELECT email FROM tbl_ScheduledMeetings WHERE id = %s", [meeting_id])
-            row = cursor.fetchone()
-            if row and row[0]:
-                visible_to_emails += [e.strip() for e in row[0].split(',') if e.strip()]
-
-            # Check Calendar Meetings
-            cursor.execute("SELECT email, guestEmails, attendees FROM tbl_CalendarMeetings WHERE id = %s", [meeting_id])
-            row = cursor.fetchone()
-            if row:
-                for field in row:
-                    if field:
-                        emails = [e.strip() for e in re.split(r'[;,]', field) if e.strip()]
-                        visible_to_emails += emails
+            # Scheduled and Calendar meeting invitees
+            cursor.execute("SELECT DISTINCT Email FROM tbl_MeetingInvitees WHERE Meeting_ID = %s", [meeting_id])
+            visible_to_emails += [r[0] for r in cursor.fetchall() if r[0]]
 
             # Check Instant Meeting Participants
             cursor.execute("SELECT User_ID FROM tbl_Participants WHERE Meeting_ID = %s", [meeting_id])
@@ -264,7 +240,7 @@ def create_srt_from_segments(segments: List[dict], output_path: str):
                 f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
 
 def generate_graph(dot_code: str, output_path: str):
-    s = Source(dot_code)
+    s = graphviz.Source(dot_code)
     return s.render(filename=output_path, format="png", cleanup=True)
 
 def save_pdf(content: str, path: str, image_path: str = None):
@@ -288,12 +264,10 @@ def send_recording_completion_notifications(meeting_id: str, video_url: str, tra
     """Send recording completion notifications ONLY to authorized users based on is_user_allowed() logic"""
     try:
         # Import notification functions
-        from core.WebSocketConnection.notifications import create_meeting_notifications, ensure_notification_tables
+        from core.WebSocketConnection.notifications import create_meeting_notifications
+        from core.WebSocketConnection.notification_counters import adjust_unread_count
         import pytz
         
-        # Ensure notification tables exist
-        ensure_notification_tables()
-        
         # Get ALL participant emails for this meeting
         all_participant_emails = get_meeting_participants_emails(meeting_id)
         
@@ -366,6 +340,7 @@ def send_recording_completion_notifications(meeting_id: str, video_url: str, tra
                     
                     if cursor.rowcount > 0:
                         sent_count += 1
+                        adjust_unread_count(email.strip(), 1)
                         logger.info(f"✅ Notification sent to authorized user: {email}")
                         
             except Exception as e:
@@ -549,11 +524,6 @@ Suggested next steps: No specific next steps mentioned in this segment.
         return "Summary generation failed."
 
 # === ENHANCED VIDEO PROCESSING WITH FASTAPI FEATURES ===
-# Add these imports at the very top of your file
-import torch
-from transformers import MarianMTModel, MarianTokenizer
-import logging
-
 class LocalIndianLanguageTranslator:
     """Fast local translation for Hindi and Telugu using Helsinki-NLP models"""
     
@@ -582,8 +552,8 @@ class LocalIndianLanguageTranslator:
             
             logging.info(f"📥 Loading {lang} translation model: {model_name}")
             
-            self.tokenizers[lang] = MarianTokenizer.from_pretrained(model_name)
-            self.models[lang] = MarianMTModel.from_pretrained(model_name)
+            self.tokenizers[lang] = transformers.MarianTokenizer.from_pretrained(model_name)
+            self.models[lang] = transformers.MarianMTModel.from_pretrained(model_name)
             
             # Move to GPU if available
             if self.device == "cuda":
@@ -692,7 +662,6 @@ def process_video_sync(video_path: str, meeting_id: str, user_id: str):
     import os
     import json
     from datetime import datetime
-    import openai
     
     logging.info(f"🎬 Starting video processing: {video_path}")
     
@@ -2405,8 +2374,6 @@ def process_meeting_recording(video_blob, meeting_id, user_id):
 @csrf_exempt
 def Start_Recording(request, id):
     """Start LiveKit stream recording - UPDATED with duplicate prevention"""
-    create_meetings_table()
-
     try:
         # Parse request body for additional settings
         recording_settings = {}
@@ -2548,8 +2515,6 @@ def Start_Recording(request, id):
 @csrf_exempt
 def Stop_Recording(request, id):
     """Stop LiveKit stream recording - UPDATED with processing integration"""
-    create_meetings_table()
-
     try:
         # Get meeting info BEFORE updating
         with connection.cursor() as cursor:
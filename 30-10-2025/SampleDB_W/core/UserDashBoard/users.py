@@ -13,19 +13,17 @@ import logging
 import re
 import os
 import random
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import timedelta
-from pymongo import MongoClient
 from bson import ObjectId
 import base64
 from urllib.parse import quote_plus  # ADD THIS IMPORT
 from datetime import datetime, timedelta
 
-import boto3
 from botocore.exceptions import NoCredentialsError, ClientError
 import uuid
+from core.scheduler.mail_dispatch import RATE_BUCKET_OTP, send_mail_now
+from core.WebSocketConnection.notification_counters import issue_notification_socket_token
+from core.utils.lazy_imports import lazy_object
 # Global Variables
 TBL_USER = 'tbl_Users'
 
@@ -69,19 +67,27 @@ else:
     S3_ENABLED = True
     logger.info("✅ AWS credentials loaded successfully")
 
-# S3 Client
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION
-)
+def _create_s3_client():
+    import boto3
+    return boto3.client(
+        "s3",
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_REGION
+    )
+
+def _create_mongo_client():
+    from pymongo import MongoClient
+    return MongoClient(MONGO_URI)
+
+# S3 and MongoDB clients are built on first use, not when the URLconf is imported
+s3_client = lazy_object(_create_s3_client)
 
 # MongoDB Configuration
 MONGO_URI = os.getenv("MONGO_URI")
-mongo_client = MongoClient(MONGO_URI)
-db = mongo_client[os.getenv("MONGO_DB", "connectlydb")]
-profile_photos_collection = db["profile_photos"]
+mongo_client = lazy_object(_create_mongo_client)
+db = lazy_object(lambda: mongo_client[os.getenv("MONGO_DB", "connectlydb")])
+profile_photos_collection = lazy_object(lambda: db["profile_photos"])
 
 # Email configuration
 SMTP_SERVER = os.getenv("SMTP_SERVER", os.getenv("EMAIL_HOST", "smtp.gmail.com"))
@@ -89,6 +95,14 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", os.getenv("EMAIL_PORT", 587)))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME", os.getenv("EMAIL_HOST_USER"))
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", os.getenv("EMAIL_HOST_PASSWORD"))
 FROM_EMAIL = os.getenv("FROM_EMAIL", os.getenv("DEFAULT_FROM_EMAIL", SMTP_USERNAME))
+# OTP mail goes through the pooled mail service with these SMTP settings
+OTP_SMTP_CONNECTION = {
+    'host': SMTP_SERVER,
+    'port': SMTP_PORT,
+    'username': SMTP_USERNAME,
+    'password': SMTP_PASSWORD,
+    'use_tls': True,
+}
 
 # (Face embeddings imports continue below...)
 
@@ -163,21 +177,16 @@ def generate_OTP():
     return ''.join([str(random.randint(0, 9)) for _ in range(6)])
 
 def send_OTP_email(email, OTP):
-    """Send OTP to the provided email address"""
+    """Send OTP to the provided email address (inline: the user is waiting for it)"""
     try:
-        msg = MIMEMultipart()
-        msg['From'] = FROM_EMAIL
-        msg['To'] = email
-        msg['Subject'] = 'Your Password Reset OTP'
-        
         body = f"Your OTP for password reset is: {OTP}\nThis OTP is valid for 10 minutes."
-        msg.attach(MIMEText(body, 'plain'))
-
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        server.sendmail(FROM_EMAIL, email, msg.as_string())
-        server.quit()
+        sent, failed, transient = send_mail_now(
+            'Your Password Reset OTP', body, [email], from_email=FROM_EMAIL,
+            connection_kwargs=OTP_SMTP_CONNECTION, rate_bucket=RATE_BUCKET_OTP,
+        )
+        if not sent:
+            logging.error(f"Failed to send OTP to {email}")
+            return False
         logging.debug(f"OTP {OTP} sent to {email}")
         return True
     except Exception as e:
@@ -234,6 +243,7 @@ def get_mongo_client():
     try:
         logging.info(f"Attempting MongoDB connection with URI: {MONGO_URI.split('@')[0]}@****")
         
+        from pymongo import MongoClient
         client = MongoClient(
             MONGO_URI, 
             serverSelectionTimeoutMS=5000,
@@ -857,8 +867,6 @@ def Register_User(request):
     """
     Register a new user with profile photo stored in AWS S3 and face embedding
     """
-    create_user_table()
-    
     try:
         data = json.loads(request.body)
         logging.debug(f"Received registration request")
@@ -1382,7 +1390,6 @@ def Cleanup_Deleted_Photos(request):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Login_User(request):
-    create_user_table()
     try:
         data = json.loads(request.body)
         logging.debug(f"Received JSON: {json.dumps(data, indent=2)}")
@@ -1423,7 +1430,8 @@ def Login_User(request):
                     "Entity_Type": "user",
                     "Id": user_id,
                     "Name": full_name,
-                    "Session_Timeout": 86400
+                    "Session_Timeout": 86400,
+                    "Notification_Ws_Token": issue_notification_socket_token(user_id)
                 }, status=SUCCESS_STATUS)
             logging.error(f"Login failed for credential: {credential}")
             return JsonResponse({"Error": "Invalid credential or password, or user inactive"}, status=UNAUTHORIZED_STATUS)
@@ -1444,9 +1452,6 @@ def Logout_User(request):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Forgot_Password(request):
-    create_user_table()
-    create_otp_table()
-    
     try:
         data = json.loads(request.body)
         email = data.get('email')
@@ -1485,9 +1490,6 @@ def Forgot_Password(request):
 @require_http_methods(["POST"])
 @csrf_exempt  
 def Reset_Password(request):
-    create_user_table()
-    create_otp_table()
-
     try:
         data = json.loads(request.body)
         received_OTP = data.get('OTP') or data.get('otp')
@@ -1552,8 +1554,6 @@ def Reset_Password(request):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Add_User(request):
-    create_user_table()
-
     try:
         data = json.loads(request.body)
         logging.debug(f"Received JSON: {json.dumps(data, indent=2)}")
@@ -1664,8 +1664,6 @@ def Add_User(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def List_All_Users(request):
-    create_user_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = """
@@ -1691,8 +1689,6 @@ def List_All_Users(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_User(request, id):
-    create_user_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = """
@@ -1719,8 +1715,6 @@ def Get_User(request, id):
 @require_http_methods(["PUT", "PATCH"])
 @csrf_exempt
 def Update_User(request, id):
-    create_user_table()
-
     # ---------- Parse & unwrap ----------
     try:
         data = json.loads(request.body or "{}")
@@ -1865,8 +1859,6 @@ def Update_User(request, id):
 @require_http_methods(["DELETE"])
 @csrf_exempt
 def Delete_User(request, id):
-    create_user_table()
-
     try:
         with transaction.atomic():
             with connection.cursor() as cursor:
@@ -1892,7 +1884,6 @@ def Delete_User(request, id):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Validate_User_Data(request):
-    create_user_table()
     try:
         data = json.loads(request.body)
         logging.debug(f"Received JSON: {json.dumps(data, indent=2)}")
@@ -2031,7 +2022,8 @@ def Face_Recognition_Login(request):
                 "Email": user_row[2],
                 "Similarity_Score": recognition_result['similarity'],
                 "Detection_Score": recognition_result['det_score'],
-                "Session_Timeout": 86400
+                "Session_Timeout": 86400,
+                "Notification_Ws_Token": issue_notification_socket_token(user_id)
             }, status=200)
     
     except json.JSONDecodeError:
@@ -1,6 +1,8 @@
 # cache_only_hand_raise.py - Ephemeral Hand Raise System (Cache Only, No Database)
 from core.WebSocketConnection import enhanced_logging_config
 import redis
+from core.utils.redis_registry import RedisStore
+from core.WebSocketConnection.meeting_events import EVENT_HAND_RAISE, broadcasts_meeting_event
 import json
 import os
 import time
@@ -16,25 +18,9 @@ from django.db import connection
 # Configure logging
 logger = logging.getLogger('cache_hand_raise')
 
-# Redis configuration for cache-only hand raise
-CACHE_HAND_RAISE_CONFIG = {
-    'host': os.getenv("CACHE_HAND_RAISE_HOST", "localhost"),
-    'port': int(os.getenv("CACHE_HAND_RAISE_PORT", 6379)),
-    'db': int(os.getenv("CACHE_HAND_RAISE_DB", 4)),
-    'decode_responses': os.getenv("CACHE_HAND_RAISE_DECODE_RESPONSES", "True") == "True",
-    'socket_timeout': int(os.getenv("CACHE_HAND_RAISE_SOCKET_TIMEOUT", 5)),
-    'socket_connect_timeout': int(os.getenv("CACHE_HAND_RAISE_CONNECT_TIMEOUT", 5)),
-    'retry_on_timeout': os.getenv("CACHE_HAND_RAISE_RETRY_ON_TIMEOUT", "True") == "True"
-}
-
-# Initialize cache-only hand raise Redis client
-try:
-    cache_hand_raise_redis = redis.Redis(**CACHE_HAND_RAISE_CONFIG)
-    cache_hand_raise_redis.ping()
-    logger.info("✅ Cache-only hand raise Redis connected successfully")
-except Exception as e:
-    logger.warning(f"⚠ Cache-only hand raise Redis not available: {e}")
-    cache_hand_raise_redis = None
+# Cache-only hand raise Redis client - pooled and connected on first use.
+# Host/DB still come from the CACHE_HAND_RAISE_* env variables (see core.utils.redis_registry).
+cache_hand_raise_redis = RedisStore('hand_raise')
 
 # Cache settings - hand raises exist ONLY during meeting
 CACHE_SETTINGS = {
@@ -58,8 +44,12 @@ class CacheOnlyHandRaiseManager:
     
     def __init__(self):
         self.redis_client = cache_hand_raise_redis
-        self.enabled = cache_hand_raise_redis is not None
-        logger.info(f"✋ Cache-only hand raise manager initialized: {'Enabled' if self.enabled else 'Disabled'}")
+        logger.info("✋ Cache-only hand raise manager initialized (Redis store 'hand_raise')")
+
+    @property
+    def enabled(self):
+        """True while the store is reachable (health-checked with backoff)"""
+        return bool(self.redis_client)
     
     def _get_hands_key(self, meeting_id):
         """Generate Redis key for raised hands"""
@@ -409,6 +399,7 @@ cache_hand_raise_manager = CacheOnlyHandRaiseManager()
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_HAND_RAISE, 'start')
 def start_meeting_hand_raise(request):
     """Start hand raise system for a meeting (initialize cache)"""
     try:
@@ -441,6 +432,7 @@ def start_meeting_hand_raise(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_HAND_RAISE, 'raise')
 def raise_hand(request):
     """Raise hand (cache only, no database)"""
     try:
@@ -515,6 +507,7 @@ def raise_hand(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_HAND_RAISE, 'acknowledge')
 def acknowledge_hand(request):
     """Host acknowledges or denies a raised hand"""
     try:
@@ -585,6 +578,7 @@ def acknowledge_hand(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_HAND_RAISE, 'clear_all')
 def clear_all_hands(request):
     """Host clears all raised hands"""
     try:
@@ -732,6 +726,7 @@ def sync_hand_raise_state(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_HAND_RAISE, 'end')
 def end_meeting_hand_raise(request):
     """End meeting and DELETE ALL hand raise data immediately"""
     try:
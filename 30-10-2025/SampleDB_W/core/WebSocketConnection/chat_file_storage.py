@@ -0,0 +1,228 @@
+# chat_file_storage.py - Blob storage for cache-chat attachments
+#
+# Attachments used to be base64-encoded into one Redis string each (up to
+# MAX_FILE_SIZE, a third larger than the file), read back whole to check the
+# write and decoded again on every download. Redis now keeps only the file
+# metadata; the raw bytes live in the backend chosen by CHAT_FILE_BACKEND
+# (s3 when AWS_S3_BUCKET is configured, local otherwise):
+#   local   one file per attachment under CHAT_FILE_ROOT (MEDIA_ROOT/chat_files)
+#   s3      one object per attachment under CHAT_FILE_S3_PREFIX in AWS_S3_BUCKET
+# Uploads are copied from the uploaded file in CHAT_FILE_CHUNK_SIZE pieces and
+# downloads read any byte range back the same way, so a request holds about
+# one chunk in memory whatever the size of the file.
+#
+# Blobs are deleted with their metadata (file delete, meeting end). Blobs that
+# outlive it are removed by cleanup_stale() once older than FILE_CACHE_TTL,
+# which is when Redis used to expire them.
+import logging
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+
+from core.utils.lazy_imports import lazy_object
+
+logger = logging.getLogger('cache_chat')
+
+# Servers sharing a bucket must not fall back to per-host local files
+CHAT_FILE_BACKEND = os.getenv("CHAT_FILE_BACKEND", "s3" if os.getenv("AWS_S3_BUCKET") else "local")
+CHAT_FILE_ROOT = os.getenv("CHAT_FILE_ROOT", os.path.join(settings.MEDIA_ROOT, "chat_files"))
+CHAT_FILE_S3_PREFIX = os.getenv("CHAT_FILE_S3_PREFIX", "chat_files")
+# Bytes read or written per step on upload and download
+CHAT_FILE_CHUNK_SIZE = int(os.getenv("CHAT_FILE_CHUNK_SIZE", 1024 * 1024))
+
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
+AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET", "connectly-storage")
+
+# file ids are md5 hex digests (see _generate_file_id); anything else never reaches a path
+_FILE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _check_file_id(file_id):
+    if not _FILE_ID_RE.match(str(file_id)):
+        raise ValueError(f"Invalid chat file id: {file_id}")
+    return str(file_id)
+
+
+def _read_chunks(fileobj, chunk_size=CHAT_FILE_CHUNK_SIZE):
+    """Chunks of an UploadedFile (spooled to disk by Django) or any file-like object"""
+    if hasattr(fileobj, 'chunks'):
+        yield from fileobj.chunks(chunk_size)
+        return
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class LocalChatFileStorage:
+    """Attachments as plain files under root/<first two id chars>/<file id>"""
+
+    name = 'local'
+
+    def __init__(self, root=CHAT_FILE_ROOT):
+        self.root = root
+
+    def _path(self, file_id):
+        file_id = _check_file_id(file_id)
+        return os.path.join(self.root, file_id[:2], file_id)
+
+    def save(self, file_id, fileobj):
+        """Write the blob chunk by chunk; returns its size in bytes"""
+        path = self._path(file_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.part-{uuid.uuid4().hex}"
+        size = 0
+        try:
+            with open(partial, 'wb') as out:
+                for chunk in _read_chunks(fileobj):
+                    out.write(chunk)
+                    size += len(chunk)
+            os.replace(partial, path)
+        except Exception:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return size
+
+    def size(self, file_id):
+        """Blob size in bytes, or None when it does not exist"""
+        try:
+            return os.path.getsize(self._path(file_id))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def iter_range(self, file_id, start, end, chunk_size=CHAT_FILE_CHUNK_SIZE):
+        """Yield bytes start..end (inclusive) of the blob"""
+        with open(self._path(file_id), 'rb') as blob:
+            blob.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = blob.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, file_id):
+        try:
+            os.remove(self._path(file_id))
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def cleanup_stale(self, max_age_seconds):
+        """Remove blobs (and abandoned partial uploads) older than max_age_seconds"""
+        if not os.path.isdir(self.root):
+            return 0
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+
+def _create_s3_client():
+    import boto3
+    return boto3.client(
+        "s3",
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_REGION
+    )
+
+
+s3_client = lazy_object(_create_s3_client)
+
+# head_object has no body, so a missing key comes back as a bare 404
+_S3_MISSING_CODES = {'404', 'NoSuchKey', 'NotFound'}
+
+
+class S3ChatFileStorage:
+    """Attachments as objects under <prefix>/<file id> in AWS_S3_BUCKET"""
+
+    name = 's3'
+
+    def __init__(self, bucket=AWS_S3_BUCKET, prefix=CHAT_FILE_S3_PREFIX):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+
+    def _key(self, file_id):
+        return f"{self.prefix}/{_check_file_id(file_id)}"
+
+    def save(self, file_id, fileobj):
+        """Multipart upload in CHAT_FILE_CHUNK_SIZE parts (min 5 MB); returns the size in bytes"""
+        from boto3.s3.transfer import TransferConfig
+
+        part_size = max(CHAT_FILE_CHUNK_SIZE, 5 * 1024 * 1024)
+        if hasattr(fileobj, 'seek'):
+            fileobj.seek(0)
+        s3_client.upload_fileobj(
+            fileobj, self.bucket, self._key(file_id),
+            Config=TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size, max_concurrency=2)
+        )
+        return self.size(file_id)
+
+    def size(self, file_id):
+        """Object size in bytes, or None when it does not exist; other S3 errors are raised"""
+        from botocore.exceptions import ClientError
+
+        try:
+            return s3_client.head_object(Bucket=self.bucket, Key=self._key(file_id))['ContentLength']
+        except ValueError:
+            return None
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in _S3_MISSING_CODES:
+                return None
+            raise
+
+    def iter_range(self, file_id, start, end, chunk_size=CHAT_FILE_CHUNK_SIZE):
+        response = s3_client.get_object(Bucket=self.bucket, Key=self._key(file_id), Range=f'bytes={start}-{end}')
+        yield from response['Body'].iter_chunks(chunk_size)
+
+    def delete(self, file_id):
+        try:
+            s3_client.delete_object(Bucket=self.bucket, Key=self._key(file_id))
+        except ValueError:
+            pass
+
+    def cleanup_stale(self, max_age_seconds):
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}/"):
+            stale = [
+                {'Key': item['Key']} for item in page.get('Contents', [])
+                if item['LastModified'].timestamp() < cutoff
+            ]
+            if stale:
+                s3_client.delete_objects(Bucket=self.bucket, Delete={'Objects': stale, 'Quiet': True})
+                removed += len(stale)
+        return removed
+
+
+CHAT_FILE_BACKENDS = {
+    'local': LocalChatFileStorage,
+    's3': S3ChatFileStorage,
+}
+
+
+def _create_storage():
+    if CHAT_FILE_BACKEND not in CHAT_FILE_BACKENDS:
+        raise ValueError(f"Unknown CHAT_FILE_BACKEND: {CHAT_FILE_BACKEND}")
+    return CHAT_FILE_BACKENDS[CHAT_FILE_BACKEND]()
+
+
+chat_file_storage = lazy_object(_create_storage)
@@ -1,16 +1,22 @@
 # cache_only_chat.py - Fixed Enhanced Ephemeral Chat System with Private File Upload
 from core.WebSocketConnection import enhanced_logging_config
 import redis
+from core.utils.redis_registry import RedisStore
+from core.WebSocketConnection.meeting_events import EVENT_CHAT, broadcasts_meeting_event
+from core.WebSocketConnection.chat_file_storage import chat_file_storage
 import json
 import time
 import logging
 import os
 import hashlib
 import base64
+import io
+import re
 import mimetypes
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 from django.utils import timezone
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
@@ -21,25 +27,9 @@ from django.conf import settings
 # Configure logging
 logger = logging.getLogger('cache_chat')
 
-# Redis configuration for cache-only chat
-CACHE_CHAT_CONFIG = {
-    'host': os.getenv("CACHE_CHAT_HOST", "localhost"),
-    'port': int(os.getenv("CACHE_CHAT_PORT", 6379)),
-    'db': int(os.getenv("CACHE_CHAT_DB", 3)),
-    'decode_responses': os.getenv("CACHE_CHAT_DECODE_RESPONSES", "True") == "True",
-    'socket_timeout': int(os.getenv("CACHE_CHAT_SOCKET_TIMEOUT", 5)),
-    'socket_connect_timeout': int(os.getenv("CACHE_CHAT_CONNECT_TIMEOUT", 5)),
-    'retry_on_timeout': os.getenv("CACHE_CHAT_RETRY_ON_TIMEOUT", "True") == "True"
-}
-
-# Initialize cache-only chat Redis client
-try:
-    cache_chat_redis = redis.Redis(**CACHE_CHAT_CONFIG)
-    cache_chat_redis.ping()
-    logger.info("✅ Enhanced cache-only chat Redis connected successfully")
-except Exception as e:
-    logger.warning(f"⚠ Enhanced cache-only chat Redis not available: {e}")
-    cache_chat_redis = None
+# Cache-only chat Redis client - pooled and connected on first use.
+# Host/DB still come from the CACHE_CHAT_* env variables (see core.utils.redis_registry).
+cache_chat_redis = RedisStore('chat')
 
 # Enhanced cache settings
 CACHE_SETTINGS = {
@@ -90,6 +80,7 @@ CACHE_SETTINGS = {
         'application/javascript': '.js',
     },
     'FILE_CACHE_TTL': 3600 * 24 * 7,
+    'SCAN_BATCH_SIZE': 500,
     'BROADCAST_DELAY': 0.1,
     'SYNC_INTERVAL': 2,
 }
@@ -99,8 +90,12 @@ class EnhancedCacheOnlyChatManager:
     
     def __init__(self):
         self.redis_client = cache_chat_redis
-        self.enabled = cache_chat_redis is not None
-        logger.info(f"🗨 Enhanced cache-only chat manager initialized: {'Enabled' if self.enabled else 'Disabled'}")
+        logger.info("🗨 Enhanced cache-only chat manager initialized (Redis store 'chat')")
+
+    @property
+    def enabled(self):
+        """True while the store is reachable (health-checked with backoff)"""
+        return bool(self.redis_client)
     
     def _get_chat_key(self, meeting_id):
         return f"cache_chat:{meeting_id}"
@@ -111,6 +106,9 @@ class EnhancedCacheOnlyChatManager:
     def _get_file_data_key(self, file_id):
         return f"cache_file_data:{file_id}"
     
+    def _get_file_meta_key(self, file_id):
+        return f"cache_file_meta:{file_id}"
+    
     def _get_typing_key(self, meeting_id):
         return f"cache_typing:{meeting_id}"
     
@@ -120,8 +118,8 @@ class EnhancedCacheOnlyChatManager:
     def _get_meeting_status_key(self, meeting_id):
         return f"cache_meeting_status:{meeting_id}"
     
-    def _validate_file(self, file_data, filename, content_type):
-        if len(file_data) > CACHE_SETTINGS['MAX_FILE_SIZE']:
+    def _validate_file(self, file_size, filename, content_type):
+        if file_size > CACHE_SETTINGS['MAX_FILE_SIZE']:
             return False, f"File too large (max {CACHE_SETTINGS['MAX_FILE_SIZE'] / 1024 / 1024:.1f}MB)"
         
         if content_type not in CACHE_SETTINGS['ALLOWED_FILE_TYPES']:
@@ -238,7 +236,11 @@ class EnhancedCacheOnlyChatManager:
             return False
 
     def upload_file(self, meeting_id, file_data, filename, content_type, user_id, user_name, is_private=False, recipients=None):
-        """Upload file with support for private recipients - FIXED"""
+        """
+        Upload file with support for private recipients. file_data is an
+        UploadedFile (or bytes); its content goes to chat_file_storage in
+        chunks and only the metadata is kept in Redis.
+        """
         if not self.enabled:
             return False, "Redis not available"
         
@@ -249,13 +251,18 @@ class EnhancedCacheOnlyChatManager:
         recipients = [str(r) for r in recipients if r] if recipients else []
         
         try:
-            if not isinstance(file_data, bytes):
-                logger.error(f"File data must be bytes, got {type(file_data)}")
+            if isinstance(file_data, bytes):
+                file_size = len(file_data)
+                file_data = io.BytesIO(file_data)
+            elif hasattr(file_data, 'read') and hasattr(file_data, 'size'):
+                file_size = file_data.size
+            else:
+                logger.error(f"File data must be an uploaded file or bytes, got {type(file_data)}")
                 return False, "Invalid file data type"
             
             filename = self._sanitize_filename(filename)
             
-            is_valid, validation_msg = self._validate_file(file_data, filename, content_type)
+            is_valid, validation_msg = self._validate_file(file_size, filename, content_type)
             if not is_valid:
                 return False, validation_msg
             
@@ -266,46 +273,47 @@ class EnhancedCacheOnlyChatManager:
             
             file_id = self._generate_file_id(meeting_id, filename, user_id)
             
-            file_data_key = self._get_file_data_key(file_id)
             try:
-                encoded_data = base64.b64encode(file_data).decode('ascii')
-                logger.info(f"📦 Storing file data: {len(encoded_data)} chars, original: {len(file_data)} bytes")
-            except Exception as encode_error:
-                logger.error(f"Failed to encode file data: {encode_error}")
-                return False, "Failed to encode file data"
-            
-            self.redis_client.set(file_data_key, encoded_data, ex=CACHE_SETTINGS['FILE_CACHE_TTL'])
+                stored_size = chat_file_storage.save(file_id, file_data)
+            except Exception as store_error:
+                logger.error(f"Failed to store file data for {file_id}: {store_error}")
+                return False, "Failed to store file data"
             
-            test_retrieve = self.redis_client.get(file_data_key)
-            if not test_retrieve or len(test_retrieve) != len(encoded_data):
-                logger.error(f"Failed to store file data in Redis for {file_id}")
+            if stored_size != file_size:
+                logger.error(f"Stored {stored_size} of {file_size} bytes for {file_id}")
+                chat_file_storage.delete(file_id)
                 return False, "Failed to store file data"
             
-            logger.info(f"✅ File data stored successfully in Redis: {file_id}")
+            logger.info(f"✅ File data stored in {chat_file_storage.name} storage: {file_id} ({file_size} bytes)")
             
             files_key = self._get_files_key(meeting_id)
             file_metadata = {
                 'file_id': file_id,
                 'filename': filename,
                 'content_type': content_type,
-                'size': len(file_data),
+                'size': file_size,
                 'uploaded_by': str(user_id),
                 'uploaded_by_name': user_name,
                 'uploaded_at': timezone.now().isoformat(),
                 'meeting_id': meeting_id,
-                'encoding': 'base64',
+                'encoding': 'raw',
+                'storage': chat_file_storage.name,
                 'is_private': is_private,
                 'recipients': recipients
             }
             
-            self.redis_client.hset(files_key, file_id, json.dumps(file_metadata))
+            pipe = self.redis_client.pipeline()
+            pipe.hset(files_key, file_id, json.dumps(file_metadata))
+            # Direct lookup for downloads, which only know the file_id
+            pipe.set(self._get_file_meta_key(file_id), json.dumps(file_metadata), ex=CACHE_SETTINGS['FILE_CACHE_TTL'])
+            pipe.execute()
             
             status_data = json.loads(meeting_status)
             status_data['file_count'] = status_data.get('file_count', 0) + 1
             status_data['last_activity'] = timezone.now().isoformat()
             self.redis_client.set(status_key, json.dumps(status_data))
             
-            human_size = self._format_file_size(len(file_data))
+            human_size = self._format_file_size(file_size)
             is_image = content_type.startswith('image/')
             
             file_message_text = (
@@ -323,7 +331,7 @@ class EnhancedCacheOnlyChatManager:
                 'file_metadata': file_metadata,
                 'file_data': json.dumps({
                     'name': filename,
-                    'size': len(file_data),
+                    'size': file_size,
                     'type': content_type,
                     'file_id': file_id,
                     'upload_id': file_id,
@@ -343,7 +351,7 @@ class EnhancedCacheOnlyChatManager:
             message_id = self.add_message(meeting_id, file_message_data)
             
             if message_id:
-                logger.info(f"📎 File uploaded successfully: {filename} ({len(file_data)} bytes)")
+                logger.info(f"📎 File uploaded successfully: {filename} ({file_size} bytes)")
                 logger.info(f"   - Private: {is_private}")
                 logger.info(f"   - Recipients: {recipients}")
                 
@@ -352,13 +360,14 @@ class EnhancedCacheOnlyChatManager:
                     'message_id': message_id,
                     'download_url': f'/api/cache-chat/files/{file_id}/',
                     'filename': filename,
-                    'size': len(file_data),
+                    'size': file_size,
                     'content_type': content_type,
                     'is_private': is_private,
                     'recipients': recipients
                 }
             else:
-                self.redis_client.delete(file_data_key)
+                chat_file_storage.delete(file_id)
+                self.redis_client.delete(self._get_file_meta_key(file_id))
                 self.redis_client.hdel(files_key, file_id)
                 return False, "Failed to create file message"
             
@@ -369,43 +378,20 @@ class EnhancedCacheOnlyChatManager:
             return False, f"Upload failed: {str(e)}"
 
 
-    def get_file(self, file_id):
+    def get_file_info(self, file_id):
+        """Metadata of a stored file with its current blob size, or None when it is gone"""
         if not self.enabled:
-            return None, None
+            return None
         
         try:
-            file_data_key = self._get_file_data_key(file_id)
-            encoded_data = self.redis_client.get(file_data_key)
+            metadata = self._get_file_metadata(file_id)
             
-            if not encoded_data:
+            size = chat_file_storage.size(file_id)
+            if size is None:
+                size = self._migrate_legacy_file_data(file_id)
+            if size is None:
                 logger.warning(f"File data not found for ID: {file_id}")
-                return None, None
-            
-            try:
-                file_data = base64.b64decode(encoded_data)
-                logger.info(f"📥 Successfully decoded file data: {len(file_data)} bytes for {file_id}")
-            except Exception as decode_error:
-                logger.error(f"Failed to decode file data for {file_id}: {decode_error}")
-                return None, None
-            
-            metadata = None
-            keys = self.redis_client.keys("cache_files:*")
-            for key in keys:
-                try:
-                    files_data = self.redis_client.hgetall(key)
-                    if file_id in files_data:
-                        metadata_str = files_data[file_id]
-                        metadata = json.loads(metadata_str)
-                        
-                        if isinstance(metadata, dict):
-                            logger.info(f"📄 Found metadata for file {file_id} in {key}")
-                            break
-                        else:
-                            logger.warning(f"Invalid metadata format for file {file_id}")
-                            
-                except (json.JSONDecodeError, Exception) as e:
-                    logger.warning(f"Error processing metadata for file {file_id}: {e}")
-                    continue
+                return None
             
             if not metadata:
                 logger.warning(f"No metadata found for file {file_id}, creating basic metadata")
@@ -413,15 +399,80 @@ class EnhancedCacheOnlyChatManager:
                     'file_id': file_id,
                     'filename': f'file_{file_id}',
                     'content_type': 'application/octet-stream',
-                    'size': len(file_data),
                     'uploaded_at': timezone.now().isoformat()
                 }
-            
-            return file_data, metadata
+            metadata['size'] = size
+            return metadata
             
         except Exception as e:
             logger.error(f"❌ Failed to get file {file_id}: {e}")
-            return None, None
+            return None
+    
+    def iter_file(self, file_id, start, end):
+        """Stream bytes start..end (inclusive) of a stored file"""
+        return chat_file_storage.iter_range(file_id, start, end)
+    
+    def _migrate_legacy_file_data(self, file_id):
+        """
+        Move a file uploaded before chat_file_storage (base64 in Redis) into
+        the blob storage. Returns its size, or None when there is none.
+        """
+        file_data_key = self._get_file_data_key(file_id)
+        encoded_data = self.redis_client.get(file_data_key)
+        if not encoded_data:
+            return None
+        
+        try:
+            size = chat_file_storage.save(file_id, io.BytesIO(base64.b64decode(encoded_data)))
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy file data for {file_id}: {e}")
+            return None
+        
+        self.redis_client.delete(file_data_key)
+        logger.info(f"📦 Moved legacy file {file_id} from Redis to {chat_file_storage.name} storage ({size} bytes)")
+        return size
+
+    def _get_file_metadata(self, file_id):
+        """Metadata for one file from its cache_file_meta key, falling back to the meeting hashes"""
+        metadata_str = self.redis_client.get(self._get_file_meta_key(file_id))
+        if metadata_str:
+            try:
+                metadata = json.loads(metadata_str)
+                if isinstance(metadata, dict):
+                    return metadata
+            except json.JSONDecodeError:
+                pass
+            logger.warning(f"Invalid metadata format for file {file_id}")
+            return None
+        return self._find_legacy_file_metadata(file_id)
+    
+    def _find_legacy_file_metadata(self, file_id):
+        """
+        Files uploaded before cache_file_meta existed are only listed in their
+        meeting's hash: SCAN for it once and store the direct key, so these
+        entries stop costing a scan (they expire with FILE_CACHE_TTL anyway).
+        """
+        for key in self.redis_client.scan_iter(match="cache_files:*", count=CACHE_SETTINGS['SCAN_BATCH_SIZE']):
+            try:
+                metadata_str = self.redis_client.hget(key, file_id)
+                if not metadata_str:
+                    continue
+                metadata = json.loads(metadata_str)
+                if not isinstance(metadata, dict):
+                    logger.warning(f"Invalid metadata format for file {file_id}")
+                    continue
+                
+                logger.info(f"📄 Found metadata for file {file_id} in {key}")
+                ttl = self.redis_client.ttl(self._get_file_data_key(file_id))
+                self.redis_client.set(
+                    self._get_file_meta_key(file_id), metadata_str,
+                    ex=ttl if ttl and ttl > 0 else CACHE_SETTINGS['FILE_CACHE_TTL']
+                )
+                return metadata
+            except Exception as e:
+                logger.warning(f"Error processing metadata for file {file_id}: {e}")
+                continue
+        return None
 
     def get_messages(self, meeting_id, limit=100, offset=0, user_id=None, is_host=False):
         """Get messages with corrected private message filtering"""
@@ -506,7 +557,6 @@ class EnhancedCacheOnlyChatManager:
         
         try:
             files_key = self._get_files_key(meeting_id)
-            file_data_key = self._get_file_data_key(file_id)
             
             file_metadata_str = self.redis_client.hget(files_key, file_id)
             if not file_metadata_str:
@@ -517,7 +567,8 @@ class EnhancedCacheOnlyChatManager:
             if file_metadata.get('uploaded_by') != str(user_id):
                 return False, "Not authorized to delete this file"
             
-            self.redis_client.delete(file_data_key)
+            chat_file_storage.delete(file_id)
+            self.redis_client.delete(self._get_file_data_key(file_id), self._get_file_meta_key(file_id))
             self.redis_client.hdel(files_key, file_id)
             
             status_key = self._get_meeting_status_key(meeting_id)
@@ -569,8 +620,11 @@ class EnhancedCacheOnlyChatManager:
             file_count = len(files)
             
             for file_metadata in files:
-                file_data_key = self._get_file_data_key(file_metadata['file_id'])
-                self.redis_client.delete(file_data_key)
+                chat_file_storage.delete(file_metadata['file_id'])
+                self.redis_client.delete(
+                    self._get_file_data_key(file_metadata['file_id']),
+                    self._get_file_meta_key(file_metadata['file_id'])
+                )
             
             deleted_keys = self.redis_client.delete(
                 chat_key, 
@@ -698,10 +752,10 @@ class EnhancedCacheOnlyChatManager:
             return
         
         try:
-            status_keys = self.redis_client.keys("cache_meeting_status:*")
             current_time = timezone.now()
             
-            for status_key in status_keys:
+            # SCAN walks the keyspace in batches instead of blocking Redis like KEYS
+            for status_key in self.redis_client.scan_iter(match="cache_meeting_status:*", count=CACHE_SETTINGS['SCAN_BATCH_SIZE']):
                 try:
                     status_data = self.redis_client.get(status_key)
                     if status_data:
@@ -731,6 +785,7 @@ enhanced_cache_chat_manager = EnhancedCacheOnlyChatManager()
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_CHAT, 'start')
 def start_meeting_chat(request):
     try:
         data = json.loads(request.body)
@@ -769,6 +824,7 @@ def start_meeting_chat(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_CHAT, 'message')
 def send_cache_chat_message(request):
     try:
         data = json.loads(request.body)
@@ -831,6 +887,7 @@ def send_cache_chat_message(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_CHAT, 'file')
 def upload_chat_file(request):
     """FIXED: Properly handle private file recipients"""
     try:
@@ -893,28 +950,16 @@ def upload_chat_file(request):
         logger.info(f"   - Is private: {is_private}")
         logger.info(f"   - Recipients: {recipients}")
         
-        # Read file data
-        try:
-            file_data = uploaded_file.read()
-            logger.info(f"   - Bytes read: {len(file_data)}")
-        except Exception as read_error:
-            logger.error(f"❌ Failed to read file: {read_error}")
-            return JsonResponse({'error': 'Failed to read uploaded file'}, status=500)
-        
+        # The upload stays a (disk-spooled) UploadedFile and is copied to storage in chunks
         filename = uploaded_file.name
         content_type = uploaded_file.content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
         
-        # Validate file data is bytes
-        if not isinstance(file_data, bytes):
-            logger.error(f"❌ File data is not bytes: {type(file_data)}")
-            return JsonResponse({'error': 'Invalid file data format'}, status=500)
-        
-        logger.info(f"📤 Starting upload: {filename} ({len(file_data)} bytes)")
+        logger.info(f"📤 Starting upload: {filename} ({uploaded_file.size} bytes)")
         
         # FIX: Pass is_private and recipients to backend manager
         success, result = enhanced_cache_chat_manager.upload_file(
             meeting_id, 
-            file_data, 
+            uploaded_file, 
             filename, 
             content_type, 
             user_id, 
@@ -943,7 +988,7 @@ def upload_chat_file(request):
                 'cache_ttl_days': CACHE_SETTINGS['FILE_CACHE_TTL'] // (24 * 3600),
                 'debug_info': {
                     'original_size': uploaded_file.size,
-                    'processed_size': len(file_data),
+                    'processed_size': result['size'],
                     'content_type_detected': content_type,
                     'is_private_received': is_private,
                     'recipients_received': recipients
@@ -959,43 +1004,99 @@ def upload_chat_file(request):
         logger.error(f"❌ Traceback: {traceback.format_exc()}")
         return JsonResponse({'error': 'Internal server error'}, status=500)
 
-@require_http_methods(["GET"])
+def parse_byte_range(range_header, file_size):
+    """
+    (start, end) for a single "bytes=" Range header, None when the whole file
+    should be sent (no header, or a form not supported here such as multiple
+    ranges). Raises ValueError when the range cannot be satisfied.
+    """
+    match = re.fullmatch(r'\s*bytes=(\d*)-(\d*)\s*', range_header or '')
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    
+    if not match.group(1):
+        # Suffix range: the last N bytes
+        length = int(match.group(2))
+        if length == 0 or file_size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, file_size - length), file_size - 1
+    
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else file_size - 1
+    if start >= file_size or start > end:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, file_size - 1)
+
+async def _stream_file_chunks(file_id, start, end):
+    """
+    Bytes start..end of a stored file as an async iterator. Under ASGI Django
+    drains a sync iterator into a list before sending it, so each chunk is
+    read from storage in a worker thread instead.
+    """
+    chunks = enhanced_cache_chat_manager.iter_file(file_id, start, end)
+    next_chunk = sync_to_async(next)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+@require_http_methods(["GET", "HEAD"])
 @csrf_exempt
 def download_chat_file(request, file_id):
+    """Stream a chat file from storage; supports single HTTP byte ranges"""
     try:
         logger.info(f"📥 File download request for: {file_id}")
         
-        file_data, metadata = enhanced_cache_chat_manager.get_file(file_id)
+        metadata = enhanced_cache_chat_manager.get_file_info(file_id)
         
-        if not file_data:
+        if not metadata:
             logger.warning(f"❌ File not found: {file_id}")
             return JsonResponse({'error': 'File not found or expired'}, status=404)
         
-        if not metadata:
-            content_type = 'application/octet-stream'
-            filename = f'file_{file_id}'
-            logger.warning(f"⚠️ Using default metadata for {file_id}")
-        else:
-            content_type = metadata.get('content_type', 'application/octet-stream')
-            filename = metadata.get('filename', f'file_{file_id}')
-            logger.info(f"✅ Using stored metadata for {file_id}: {filename}")
+        file_size = metadata['size']
+        content_type = metadata.get('content_type', 'application/octet-stream')
+        filename = metadata.get('filename', f'file_{file_id}')
         
-        response = HttpResponse(
-            file_data,
-            content_type=content_type
-        )
+        try:
+            byte_range = parse_byte_range(request.META.get('HTTP_RANGE'), file_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{file_size}'
+            response['Access-Control-Allow-Origin'] = '*'
+            return response
+        
+        start, end = byte_range or (0, file_size - 1)
+        length = end - start + 1 if file_size else 0
+        status = 206 if byte_range else 200
+        
+        if request.method == 'HEAD' or length == 0:
+            response = HttpResponse(status=status, content_type=content_type)
+        else:
+            response = StreamingHttpResponse(
+                _stream_file_chunks(file_id, start, end),
+                status=status,
+                content_type=content_type
+            )
         
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = len(file_data)
+        response['Content-Length'] = str(length)
+        response['Accept-Ranges'] = 'bytes'
         response['Cache-Control'] = 'private, max-age=3600'
         response['Access-Control-Allow-Origin'] = '*'
-        response['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+        response['Access-Control-Allow-Methods'] = 'GET, HEAD, POST, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Range, Content-Type, Authorization'
+        response['Access-Control-Expose-Headers'] = 'Content-Range, Accept-Ranges, Content-Length'
         
         if content_type.startswith('text/'):
             response['Content-Type'] = f'{content_type}; charset=utf-8'
         
-        logger.info(f"📥 File download served: {filename} ({len(file_data)} bytes)")
+        logger.info(f"📥 File download served: {filename} ({length} of {file_size} bytes)")
         return response
         
     except Exception as e:
@@ -1067,6 +1168,7 @@ def get_cache_chat_history(request, meeting_id):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_CHAT, 'typing')
 def update_typing_indicator(request):
     try:
         data = json.loads(request.body)
@@ -1135,6 +1237,7 @@ def get_typing_users(request, meeting_id):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_CHAT, 'end')
 def end_meeting_chat(request):
     try:
         data = json.loads(request.body)
@@ -1223,6 +1326,7 @@ def get_meeting_files(request, meeting_id):
 
 @require_http_methods(["DELETE"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_CHAT, 'delete_file')
 def delete_chat_file(request, meeting_id, file_id):
     try:
         user_id = request.GET.get('user_id')
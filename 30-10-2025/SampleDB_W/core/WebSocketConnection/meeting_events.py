@@ -0,0 +1,269 @@
+# meeting_events.py - Per-meeting event bus for chat, reactions, hand raise and whiteboard
+#
+# REST endpoints stay the write path (validation, Redis caches). After a
+# successful write they publish an event here; MeetingConsumer pushes it to
+# every WebSocket subscribed to that meeting and event type, so clients no
+# longer poll the GET endpoints.
+#
+# Every event gets a per-meeting sequence number and is kept in a short
+# Redis log, so a reconnecting client can resume from the last seq it saw.
+import functools
+import json
+import logging
+import os
+import re
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core import signing
+from django.db import connection
+
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('meeting_events')
+
+EVENT_CHAT = 'chat'
+EVENT_REACTION = 'reaction'
+EVENT_HAND_RAISE = 'hand_raise'
+EVENT_WHITEBOARD = 'whiteboard'
+EVENT_TYPES = (EVENT_CHAT, EVENT_REACTION, EVENT_HAND_RAISE, EVENT_WHITEBOARD)
+
+# Events that may be dropped under backpressure; clients lose nothing durable
+EPHEMERAL_ACTIONS = {
+    (EVENT_REACTION, 'add'),
+    (EVENT_CHAT, 'typing'),
+}
+
+EVENT_LOG_SIZE = 500                # events kept per meeting for resume
+EVENT_LOG_TTL = 24 * 3600           # seconds
+MAX_INLINE_PAYLOAD_BYTES = 64 * 1024  # larger request bodies are sent as "refetch"
+
+# Seconds a socket token from the join response stays valid for (re)connecting
+MEETING_SOCKET_TOKEN_MAX_AGE = int(os.getenv("MEETING_SOCKET_TOKEN_MAX_AGE", 12 * 3600))
+_SOCKET_TOKEN_SALT = 'core.meeting_socket'
+
+_GROUP_SAFE_RE = re.compile(r'[^0-9A-Za-z_.-]')
+
+
+def issue_meeting_socket_token(meeting_id, user_id):
+    """Signed token binding a user to one meeting's socket (returned by the join endpoint)"""
+    return signing.dumps({'m': str(meeting_id), 'u': str(user_id)}, salt=_SOCKET_TOKEN_SALT, compress=True)
+
+
+def verify_meeting_socket_token(token, meeting_id):
+    """User id from a socket token issued for meeting_id, or None if forged, expired or for another meeting"""
+    try:
+        payload = signing.loads(token, salt=_SOCKET_TOKEN_SALT, max_age=MEETING_SOCKET_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if payload.get('m') != str(meeting_id):
+        return None
+    return payload.get('u')
+
+
+def is_meeting_member(meeting_id, user_id):
+    """
+    True when the user hosts the meeting, is invited to it (tbl_MeetingInvitees)
+    or has joined it - including a join still waiting in the write-behind roster.
+    """
+    from .participant_events import get_pending_state
+
+    if get_pending_state(meeting_id, user_id) is not None:
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT 1 FROM tbl_Meetings m
+            WHERE m.ID = %s AND (
+                m.Host_ID = %s
+                OR EXISTS (SELECT 1 FROM tbl_Participants p WHERE p.Meeting_ID = m.ID AND p.User_ID = %s)
+                OR EXISTS (
+                    SELECT 1 FROM tbl_MeetingInvitees i
+                    INNER JOIN tbl_Users u ON u.ID = %s
+                    WHERE i.Meeting_ID = m.ID AND i.Email = LOWER(TRIM(u.Email))
+                )
+            )
+            LIMIT 1
+        """, [str(meeting_id), user_id, user_id, user_id])
+        return cursor.fetchone() is not None
+
+
+def meeting_group_name(meeting_id, event_type):
+    """Channels group for one meeting and event type (fan-out per event type)"""
+    return f"meeting.{_GROUP_SAFE_RE.sub('_', str(meeting_id))[:60]}.{event_type}"
+
+
+def _seq_key(meeting_id):
+    return f"meeting_events:{meeting_id}:seq"
+
+
+def _log_key(meeting_id):
+    return f"meeting_events:{meeting_id}:log"
+
+
+def _record_event(meeting_id, event):
+    """Assign the next sequence number and append the event to the resume log"""
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        seq = client.incr(_seq_key(meeting_id))
+        event['seq'] = seq
+        pipe = client.pipeline()
+        pipe.rpush(_log_key(meeting_id), json.dumps(event, default=str))
+        pipe.ltrim(_log_key(meeting_id), -EVENT_LOG_SIZE, -1)
+        pipe.expire(_log_key(meeting_id), EVENT_LOG_TTL)
+        pipe.expire(_seq_key(meeting_id), EVENT_LOG_TTL)
+        pipe.execute()
+        return seq
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record event for meeting {meeting_id}: {e}")
+        return None
+
+
+def get_current_seq(meeting_id):
+    client = get_redis_client()
+    if client is None:
+        return 0
+    try:
+        return int(client.get(_seq_key(meeting_id)) or 0)
+    except Exception:
+        return 0
+
+
+def get_events_since(meeting_id, since_seq, event_types=None):
+    """
+    Events with seq > since_seq, oldest first.
+    Returns (events, complete) - complete is False when the log no longer
+    reaches back to since_seq and the client must refetch state over REST.
+    """
+    client = get_redis_client()
+    if client is None:
+        return [], False
+
+    try:
+        raw_events = client.lrange(_log_key(meeting_id), 0, -1)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read event log for meeting {meeting_id}: {e}")
+        return [], False
+
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(json.loads(raw))
+        except (TypeError, ValueError):
+            continue
+    events.sort(key=lambda event: event.get('seq') or 0)
+
+    oldest_seq = events[0]['seq'] if events else get_current_seq(meeting_id) + 1
+    complete = oldest_seq <= since_seq + 1
+
+    events = [
+        event for event in events
+        if event.get('seq', 0) > since_seq and (not event_types or event.get('type') in event_types)
+    ]
+    return events, complete
+
+
+def publish_meeting_event(meeting_id, event_type, action, data=None, result=None,
+                          sender_id=None, recipients=None):
+    """
+    Record and fan out one event. Never raises - a failed publish only means
+    clients fall back to their next REST refresh.
+    """
+    if not meeting_id or event_type not in EVENT_TYPES:
+        return None
+
+    event = {
+        'type': event_type,
+        'action': action,
+        'meeting_id': str(meeting_id),
+        'sender_id': str(sender_id) if sender_id is not None else None,
+        # None = whole meeting; a list (possibly empty) = private to sender + recipients
+        'recipients': [str(r) for r in recipients] if recipients is not None else None,
+        'data': data,
+        'result': result,
+        'ts': time.time(),
+    }
+    _record_event(meeting_id, event)
+
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return event.get('seq')
+        async_to_sync(channel_layer.group_send)(
+            meeting_group_name(meeting_id, event_type),
+            {'type': 'meeting.event', 'event': event}
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Event fan-out failed for meeting {meeting_id} ({event_type}.{action}): {e}")
+
+    return event.get('seq')
+
+
+def _request_payload(request):
+    """Request fields to forward with the event (JSON body or form fields, never files)"""
+    content_type = request.META.get('CONTENT_TYPE', '')
+    if content_type.startswith('multipart/') or content_type.startswith('application/x-www-form-urlencoded'):
+        return request.POST.dict(), False
+    try:
+        body = request.body
+    except Exception:
+        return {}, False
+    if len(body) > MAX_INLINE_PAYLOAD_BYTES:
+        return {}, True
+    try:
+        data = json.loads(body) if body else {}
+        return (data if isinstance(data, dict) else {'items': data}), False
+    except (TypeError, ValueError):
+        return {}, False
+
+
+def broadcasts_meeting_event(event_type, action):
+    """
+    Decorator for mutating REST views: after a 2xx JSON response, publish the
+    request fields and response body as a meeting event. Private chat events
+    carry their recipients so the consumer only delivers them to those users.
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            if not (200 <= response.status_code < 300):
+                return response
+
+            try:
+                data, too_large = _request_payload(request)
+                try:
+                    result = json.loads(response.content) if response.get('Content-Type', '').startswith('application/json') else None
+                except (TypeError, ValueError):
+                    result = None
+
+                meeting_id = (
+                    kwargs.get('meeting_id')
+                    or data.get('meeting_id')
+                    or (result or {}).get('meeting_id')
+                )
+                is_private = str(data.get('is_private', '')).lower() in ('true', '1')
+                recipients = (data.get('recipients') or []) if is_private else None
+                if isinstance(recipients, str):
+                    try:
+                        recipients = json.loads(recipients)
+                    except (TypeError, ValueError):
+                        recipients = [r.strip() for r in recipients.split(',') if r.strip()]
+
+                publish_meeting_event(
+                    meeting_id,
+                    event_type,
+                    action,
+                    data=None if too_large else data,
+                    result=result if not too_large else {'refetch': True},
+                    sender_id=data.get('user_id') or kwargs.get('user_id'),
+                    recipients=recipients,
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Could not publish {event_type}.{action}: {e}")
+
+            return response
+        return wrapper
+    return decorator
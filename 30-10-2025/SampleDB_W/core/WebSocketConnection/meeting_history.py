@@ -0,0 +1,242 @@
+# meeting_history.py - Batched data access for the user meeting history views
+#
+# Get_User_Meeting_History, Get_User_Meetings_By_Date and
+# Get_User_Today_Meetings read one keyset page of meetings with a single
+# joined query, then load host durations, participant counts and session
+# totals for the whole page with one query each. The query count per request
+# is fixed, whatever the number of meetings.
+#
+# Pages are ordered by meeting time (COALESCE(Started_At, Created_At)) and
+# meeting ID; the cursor token is the sort key of the last row. Requests
+# without ?limit= or ?cursor= get every row in one response, as before paging.
+import json
+import logging
+import os
+
+from core.utils.keyset import decode_cursor, encode_cursor, parse_page_size
+from core.utils.redis_registry import get_redis_client
+
+from .participant_sessions import get_meetings_session_totals, session_time
+
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+HISTORY_SUMMARY_CACHE_TTL = int(os.getenv("HISTORY_SUMMARY_CACHE_TTL", 300))  # seconds
+
+ENDED_STATUSES = ('ended', 'completed')
+
+# Meetings a user hosted or joined; each branch uses its own index
+_USER_MEETINGS_SQL = """
+    SELECT ID FROM tbl_Meetings WHERE Host_ID = %s
+    UNION
+    SELECT Meeting_ID FROM tbl_Participants WHERE User_ID = %s
+"""
+
+_MEETING_COLUMNS = (
+    'id', 'meeting_name', 'meeting_type', 'meeting_link', 'status',
+    'created_at', 'started_at', 'ended_at', 'host_id',
+    'recording', 'waiting_room', 'livekit_room', 'livekit_room_sid',
+    'meeting_time', 'host_name', 'host_email',
+    'user_role', 'participant_name', 'user_duration', 'user_end_meeting_time',
+)
+
+_DETAIL_COLUMNS = ('scheduled_duration', 'description', 'location')
+
+
+def fetch_user_meeting_page(cursor, user_id, limit, after=None, descending=True,
+                            ended_only=False, time_from=None, time_to=None, with_details=False):
+    """
+    One page of a user's meetings as dicts, plus the cursor for the next
+    page (None on the last page); limit None returns every row. time_from/
+    time_to bound the meeting time as a half-open range; with_details adds
+    the scheduled/calendar duration, description and location (calendar
+    meetings have no description column).
+    """
+    key = decode_cursor(after, 2)
+
+    columns = """
+        m.ID, m.Meeting_Name, m.Meeting_Type, m.Meeting_Link, m.Status,
+        m.Created_At, m.Started_At, m.Ended_At, m.Host_ID,
+        m.Is_Recording_Enabled, m.Waiting_Room_Enabled, m.livekit_room_name, m.LiveKit_Room_SID,
+        COALESCE(m.Started_At, m.Created_At) AS Meeting_Time,
+        hu.full_name, hu.email,
+        up.Role, up.Full_Name, up.Total_Duration_Minutes, up.End_Meeting_Time
+    """
+    joins = ""
+    if with_details:
+        columns += """,
+        CASE
+            WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
+            WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
+            WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN
+                TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
+            ELSE 60
+        END,
+        CASE
+            WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.description
+            ELSE NULL
+        END,
+        CASE
+            WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.location
+            WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
+            ELSE NULL
+        END
+        """
+        joins = """
+        LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
+        LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
+        """
+
+    conditions = []
+    params = [user_id, user_id, user_id]
+    if ended_only:
+        conditions.append(f"LOWER(m.Status) IN ({', '.join(['%s'] * len(ENDED_STATUSES))})")
+        params.extend(ENDED_STATUSES)
+    if time_from is not None:
+        conditions.append("COALESCE(m.Started_At, m.Created_At) >= %s")
+        params.append(time_from)
+    if time_to is not None:
+        conditions.append("COALESCE(m.Started_At, m.Created_At) < %s")
+        params.append(time_to)
+    if key is not None:
+        conditions.append(f"(COALESCE(m.Started_At, m.Created_At), m.ID) {'<' if descending else '>'} (%s, %s)")
+        params.extend(key)
+
+    direction = 'DESC' if descending else 'ASC'
+    cursor.execute(f"""
+        SELECT {columns}
+        FROM tbl_Meetings m
+        JOIN ({_USER_MEETINGS_SQL}) um ON um.ID = m.ID
+        LEFT JOIN tbl_Users hu ON hu.ID = m.Host_ID
+        LEFT JOIN tbl_Participants up ON up.Meeting_ID = m.ID AND up.User_ID = %s
+        {joins}
+        {('WHERE ' + ' AND '.join(conditions)) if conditions else ''}
+        ORDER BY Meeting_Time {direction}, m.ID {direction}
+        {'LIMIT %s' if limit is not None else ''}
+    """, params + ([limit + 1] if limit is not None else []))
+
+    names = _MEETING_COLUMNS + (_DETAIL_COLUMNS if with_details else ())
+    rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+    for row in rows:
+        row['id'] = str(row['id'])
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['meeting_time'], rows[-1]['id'])
+    return rows, next_cursor
+
+
+def history_page_size(request, default=HISTORY_PAGE_SIZE):
+    """?limit= page size, or None (no paging) when the request has neither ?limit= nor ?cursor="""
+    if 'limit' not in request.GET and 'cursor' not in request.GET:
+        return None
+    return parse_page_size(request, default, HISTORY_MAX_PAGE_SIZE)
+
+
+def load_meeting_stats(cursor, meeting_ids, user_id):
+    """
+    For a page of meetings, in three queries:
+    host row (user_id, Total_Duration_Minutes) per meeting, distinct
+    participant counts, and session totals of the user and the hosts.
+    """
+    meeting_ids = list(meeting_ids)
+    if not meeting_ids:
+        return {}, {}, {}
+    placeholders = ', '.join(['%s'] * len(meeting_ids))
+
+    # First host row per meeting, as get_host_duration_for_meeting picks it
+    cursor.execute(f"""
+        SELECT Meeting_ID, User_ID, Total_Duration_Minutes
+        FROM tbl_Participants
+        WHERE Meeting_ID IN ({placeholders}) AND Role = 'host'
+        ORDER BY ID ASC
+    """, meeting_ids)
+    hosts = {}
+    for meeting_id, host_user_id, total in cursor.fetchall():
+        hosts.setdefault(str(meeting_id), (host_user_id, float(total or 0)))
+
+    cursor.execute(f"""
+        SELECT Meeting_ID, COUNT(DISTINCT User_ID)
+        FROM tbl_Participants
+        WHERE Meeting_ID IN ({placeholders})
+        GROUP BY Meeting_ID
+    """, meeting_ids)
+    counts = {str(meeting_id): count for meeting_id, count in cursor.fetchall()}
+
+    user_ids = {int(user_id)} | {host_user_id for host_user_id, _ in hosts.values()}
+    sessions = get_meetings_session_totals(cursor, meeting_ids, user_ids, session_time())
+
+    return hosts, counts, sessions
+
+
+def format_session_time(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+
+# ---- cached per-user summary ---------------------------------------------------
+
+def history_summary_key(user_id):
+    return f"meeting_history_summary:{user_id}"
+
+
+def _compute_history_summary(cursor, user_id):
+    cursor.execute(f"""
+        SELECT COUNT(*),
+               COALESCE(SUM(COALESCE(up.Role, 'host') = 'host'), 0),
+               COALESCE(SUM(CASE
+                   WHEN hp.Total_Duration_Minutes > 0 THEN hp.Total_Duration_Minutes
+                   WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL
+                       THEN TIMESTAMPDIFF(SECOND, m.Started_At, m.Ended_At) / 60
+                   ELSE 0
+               END), 0),
+               COALESCE(SUM(up.Total_Duration_Minutes), 0)
+        FROM tbl_Meetings m
+        JOIN ({_USER_MEETINGS_SQL}) um ON um.ID = m.ID
+        LEFT JOIN tbl_Participants up ON up.Meeting_ID = m.ID AND up.User_ID = %s
+        LEFT JOIN tbl_Participants hp ON hp.ID = (
+            SELECT MIN(h.ID) FROM tbl_Participants h
+            WHERE h.Meeting_ID = m.ID AND h.Role = 'host'
+        )
+        WHERE LOWER(m.Status) IN ({', '.join(['%s'] * len(ENDED_STATUSES))})
+    """, [user_id, user_id, user_id, *ENDED_STATUSES])
+    total, hosted, meeting_minutes, participation_minutes = cursor.fetchone()
+    return {
+        'total_meetings': int(total or 0),
+        'hosted_meetings': int(hosted or 0),
+        'participated_meetings': int(total or 0),
+        'total_meeting_time_minutes': round(float(meeting_minutes or 0), 2),
+        'total_participation_time_minutes': round(float(participation_minutes or 0), 2),
+    }
+
+
+def get_history_summary(cursor, user_id, refresh=False):
+    """Totals over all of a user's ended meetings, cached in Redis for HISTORY_SUMMARY_CACHE_TTL"""
+    client = get_redis_client()
+    key = history_summary_key(user_id)
+    if client is not None and not refresh:
+        try:
+            cached = client.get(key)
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logging.warning(f"History summary cache read failed for {user_id}: {e}")
+
+    summary = _compute_history_summary(cursor, user_id)
+
+    if client is not None:
+        try:
+            client.setex(key, HISTORY_SUMMARY_CACHE_TTL, json.dumps(summary))
+        except Exception as e:
+            logging.warning(f"History summary cache write failed for {user_id}: {e}")
+    return summary
+
+
+def invalidate_history_summaries(user_ids):
+    """Drop cached summaries, e.g. for everyone in a meeting that just ended"""
+    client = get_redis_client()
+    if client is None or not user_ids:
+        return
+    try:
+        client.delete(*[history_summary_key(user_id) for user_id in set(user_ids)])
+    except Exception as e:
+        logging.warning(f"History summary cache invalidation failed: {e}")
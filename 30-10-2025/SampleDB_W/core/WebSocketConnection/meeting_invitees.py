@@ -0,0 +1,190 @@
+# meeting_invitees.py - Normalized (meeting_id, email, role) invitee index
+#
+# tbl_ScheduledMeetings.email and tbl_CalendarMeetings.email/guestEmails/attendees
+# keep their comma/semicolon separated strings for backwards compatibility.
+# This table mirrors them one row per address so "meetings for this user"
+# lookups go through an index instead of LIKE scans.
+import json
+import logging
+import re
+
+from django.db import connection, transaction
+
+TBL_MEETING_INVITEES = 'tbl_MeetingInvitees'
+
+# Roles stored in tbl_MeetingInvitees.Role
+ROLE_ORGANIZER = 'organizer'    # tbl_CalendarMeetings.email
+ROLE_GUEST = 'guest'            # tbl_CalendarMeetings.guestEmails
+ROLE_ATTENDEE = 'attendee'      # tbl_CalendarMeetings.attendees
+ROLE_PARTICIPANT = 'participant'  # tbl_ScheduledMeetings.email
+
+BACKFILL_BATCH_SIZE = 500
+
+_EMAIL_SPLIT_RE = re.compile(r'[,;\n|]')
+
+_invitee_table_ready = False
+
+
+def create_meeting_invitees_table():
+    """Create tbl_MeetingInvitees once per process"""
+    global _invitee_table_ready
+    if _invitee_table_ready:
+        return True
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tbl_MeetingInvitees (
+                    Meeting_ID CHAR(36) NOT NULL,
+                    Email VARCHAR(255) NOT NULL,
+                    Role VARCHAR(20) NOT NULL,
+                    Created_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (Meeting_ID, Email, Role),
+                    INDEX idx_invitee_email_meeting (Email, Meeting_ID),
+                    CONSTRAINT FK_MeetingInvitees_Meetings FOREIGN KEY (Meeting_ID)
+                        REFERENCES tbl_Meetings(ID)
+                        ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+        _invitee_table_ready = True
+        logging.debug("tbl_MeetingInvitees table created or exists")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to create tbl_MeetingInvitees table: {e}")
+        return False
+
+
+def normalize_email(email):
+    """Lower-case and trim an address; returns '' for anything that is not an email"""
+    if not email or not isinstance(email, str):
+        return ''
+    email = email.strip().lower()
+    return email if '@' in email else ''
+
+
+def split_invitee_emails(raw):
+    """
+    Split a stored invitee value into normalized addresses.
+    Accepts lists, JSON arrays and comma/semicolon/newline/pipe separated strings.
+    """
+    if not raw:
+        return []
+
+    items = raw
+    if isinstance(raw, str):
+        raw = raw.strip()
+        items = None
+        if raw.startswith('['):
+            try:
+                items = json.loads(raw)
+            except (json.JSONDecodeError, ValueError):
+                items = None
+        if items is None:
+            items = _EMAIL_SPLIT_RE.split(raw)
+
+    emails = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get('email')
+        email = normalize_email(item)
+        if email:
+            emails.append(email)
+
+    return list(dict.fromkeys(emails))
+
+
+def sync_meeting_invitees(cursor, meeting_id, role_emails):
+    """
+    Replace the invitee rows of one meeting.
+
+    role_emails maps a role to the raw stored value (string or list). Runs on
+    the caller's cursor so it commits or rolls back with the meeting write.
+    """
+    rows = []
+    for role, raw in role_emails.items():
+        for email in split_invitee_emails(raw):
+            rows.append((str(meeting_id), email, role))
+
+    cursor.execute("DELETE FROM tbl_MeetingInvitees WHERE Meeting_ID = %s", [str(meeting_id)])
+    if rows:
+        cursor.executemany("""
+            INSERT IGNORE INTO tbl_MeetingInvitees (Meeting_ID, Email, Role)
+            VALUES (%s, %s, %s)
+        """, rows)
+
+    logging.debug(f"Synced {len(rows)} invitees for meeting {meeting_id}")
+    return len(rows)
+
+
+def sync_calendar_meeting_invitees(cursor, meeting_id, organizer_email, guest_emails, attendees):
+    """
+    Index the email/guestEmails/attendees columns of a calendar meeting.
+    Attendees already listed as guests are not indexed a second time
+    (older rows store the same list in both columns).
+    """
+    guests = split_invitee_emails(guest_emails)
+    return sync_meeting_invitees(cursor, meeting_id, {
+        ROLE_ORGANIZER: [organizer_email] if isinstance(organizer_email, str) else organizer_email,
+        ROLE_GUEST: guests,
+        ROLE_ATTENDEE: [email for email in split_invitee_emails(attendees) if email not in guests],
+    })
+
+
+def sync_scheduled_meeting_invitees(cursor, meeting_id, participant_emails):
+    """Index the email column of a scheduled meeting"""
+    return sync_meeting_invitees(cursor, meeting_id, {
+        ROLE_PARTICIPANT: participant_emails,
+    })
+
+
+def is_meeting_invitee(meeting_id, email, roles=None):
+    """Primary-key lookup: is this address invited to the meeting?"""
+    email = normalize_email(email)
+    if not email or not meeting_id:
+        return False
+
+    query = "SELECT 1 FROM tbl_MeetingInvitees WHERE Meeting_ID = %s AND Email = %s"
+    params = [str(meeting_id), email]
+    if roles:
+        query += " AND Role IN (" + ",".join(["%s"] * len(roles)) + ")"
+        params.extend(roles)
+
+    with connection.cursor() as cursor:
+        cursor.execute(query + " LIMIT 1", params)
+        return cursor.fetchone() is not None
+
+
+def backfill_meeting_invitees(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Rebuild tbl_MeetingInvitees from the legacy string columns.
+    Walks both meeting tables by primary key so each batch is a range scan.
+    """
+    create_meeting_invitees_table()
+    counts = {'calendar_meetings': 0, 'scheduled_meetings': 0, 'invitees': 0}
+
+    sources = [
+        ('calendar_meetings',
+         "SELECT ID, email, guestEmails, attendees FROM tbl_CalendarMeetings "
+         "WHERE ID > %s ORDER BY ID LIMIT %s",
+         lambda cursor, row: sync_calendar_meeting_invitees(cursor, row[0], row[1], row[2], row[3])),
+        ('scheduled_meetings',
+         "SELECT id, email FROM tbl_ScheduledMeetings "
+         "WHERE id > %s ORDER BY id LIMIT %s",
+         lambda cursor, row: sync_scheduled_meeting_invitees(cursor, row[0], row[1])),
+    ]
+
+    for name, query, sync_row in sources:
+        last_id = ''
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(query, [last_id, batch_size])
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    counts['invitees'] += sync_row(cursor, row)
+                counts[name] += len(rows)
+                last_id = rows[-1][0]
+        logging.info(f"Invitee backfill: processed {counts[name]} {name}")
+
+    return counts
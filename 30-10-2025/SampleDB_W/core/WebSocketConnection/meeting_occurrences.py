@@ -0,0 +1,472 @@
+# meeting_occurrences.py - Materialised per-host meeting occurrences for conflict checks
+#
+# Every scheduled and calendar meeting is expanded into tbl_MeetingOccurrences
+# for a rolling horizon, so "does this host already have something at this
+# time" is one range scan on (Host_ID, Occurrence_Start, Occurrence_End)
+# instead of COUNT(*) queries per meeting table that ignore recurrence.
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+
+from core.utils.date_utils import convert_to_ist, get_current_ist_datetime, format_datetime_for_db
+from core.utils.recurring_calculator import expand_occurrences, get_series_bounds
+from core.utils.redis_registry import get_redis_client
+
+TBL_MEETING_OCCURRENCES = 'tbl_MeetingOccurrences'
+
+# How far ahead recurring series are materialised (refreshed daily by Celery)
+OCCURRENCE_HORIZON_DAYS = 180
+OCCURRENCE_BATCH_SIZE = 200
+
+# Meetings in these states never block a time slot
+INACTIVE_MEETING_STATUSES = ('deleted', 'cancelled', 'recurrence_ended')
+
+_occurrence_table_ready = False
+
+
+def create_meeting_occurrences_table():
+    """Create tbl_MeetingOccurrences once per process"""
+    global _occurrence_table_ready
+    if _occurrence_table_ready:
+        return True
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tbl_MeetingOccurrences (
+                    ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    Meeting_ID CHAR(36) NOT NULL,
+                    Host_ID INT NOT NULL,
+                    Meeting_Type VARCHAR(50) NOT NULL,
+                    Occurrence_Start DATETIME NOT NULL,
+                    Occurrence_End DATETIME NOT NULL,
+                    INDEX idx_occurrence_host_interval (Host_ID, Occurrence_Start, Occurrence_End),
+                    INDEX idx_occurrence_meeting (Meeting_ID),
+                    CONSTRAINT FK_MeetingOccurrences_Meetings FOREIGN KEY (Meeting_ID)
+                        REFERENCES tbl_Meetings(ID)
+                        ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+        _occurrence_table_ready = True
+        logging.debug("tbl_MeetingOccurrences table created or exists")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to create tbl_MeetingOccurrences table: {e}")
+        return False
+
+
+def get_occurrence_window(now=None):
+    """The [start, end) window that is kept materialised"""
+    now = now or get_current_ist_datetime()
+    return now - timedelta(days=1), now + timedelta(days=OCCURRENCE_HORIZON_DAYS)
+
+
+def expand_series_for_horizon(meeting_data, now=None):
+    """Occurrences of a series (or one-off meeting) inside the materialised window"""
+    if not meeting_data.get('is_recurring'):
+        # One-off meetings are stored whatever their date, so the horizon
+        # never hides a conflict with them
+        bounds = get_series_bounds(meeting_data)
+        if not bounds:
+            return []
+        start_time, duration = bounds[0], bounds[1]
+        return [(start_time, start_time + duration)]
+
+    window_start, window_end = get_occurrence_window(now)
+    return expand_occurrences(meeting_data, window_start, window_end)
+
+
+def materialize_meeting_occurrences(cursor, meeting_id, host_id, meeting_type, meeting_data, now=None):
+    """
+    Replace the stored occurrences of one meeting. Runs on the caller's cursor
+    so it commits or rolls back with the meeting write.
+    """
+    occurrences = expand_series_for_horizon(meeting_data, now) if host_id else []
+    rows = [
+        (str(meeting_id), host_id, meeting_type,
+         format_datetime_for_db(start), format_datetime_for_db(end))
+        for start, end in occurrences
+    ]
+
+    cursor.execute("DELETE FROM tbl_MeetingOccurrences WHERE Meeting_ID = %s", [str(meeting_id)])
+    if rows:
+        cursor.executemany("""
+            INSERT INTO tbl_MeetingOccurrences
+                (Meeting_ID, Host_ID, Meeting_Type, Occurrence_Start, Occurrence_End)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows)
+
+    logging.debug(f"Materialised {len(rows)} occurrences for {meeting_type} {meeting_id}")
+    return len(rows)
+
+
+def find_host_conflicts(host_id, proposed, exclude_meeting_id=None):
+    """
+    Batch conflict check.
+
+    proposed is a list of (start, end) datetimes - typically every occurrence
+    of a proposed recurring series. One indexed range query fetches the host's
+    stored occurrences in the envelope of all proposals, then a sorted sweep
+    pairs them up. Returns a list of dicts, one per overlapping pair.
+    """
+    if not host_id or not proposed:
+        return []
+
+    proposed = sorted((convert_to_ist(start), convert_to_ist(end)) for start, end in proposed if start and end)
+    if not proposed:
+        return []
+
+    envelope_start = format_datetime_for_db(proposed[0][0])
+    envelope_end = format_datetime_for_db(max(end for _, end in proposed))
+
+    query = """
+        SELECT o.Meeting_ID, o.Meeting_Type, o.Occurrence_Start, o.Occurrence_End
+        FROM tbl_MeetingOccurrences o
+        INNER JOIN tbl_Meetings m ON m.ID = o.Meeting_ID
+        WHERE o.Host_ID = %s
+          AND o.Occurrence_Start < %s
+          AND o.Occurrence_End > %s
+          AND (m.Status IS NULL OR m.Status NOT IN ({statuses}))
+    """.format(statuses=",".join(["%s"] * len(INACTIVE_MEETING_STATUSES)))
+    params = [host_id, envelope_end, envelope_start, *INACTIVE_MEETING_STATUSES]
+
+    if exclude_meeting_id:
+        query += " AND o.Meeting_ID <> %s"
+        params.append(str(exclude_meeting_id))
+
+    query += " ORDER BY o.Occurrence_Start"
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        existing = [
+            (row[0], row[1], convert_to_ist(row[2]), convert_to_ist(row[3]))
+            for row in cursor.fetchall()
+        ]
+
+    # Sweep: both lists are sorted by start; keep the existing occurrences
+    # that could still overlap the current proposal.
+    conflicts = []
+    active = []
+    next_existing = 0
+    for proposed_start, proposed_end in proposed:
+        while next_existing < len(existing) and existing[next_existing][2] < proposed_end:
+            active.append(existing[next_existing])
+            next_existing += 1
+        active = [item for item in active if item[3] > proposed_start]
+        for meeting_id, meeting_type, existing_start, existing_end in active:
+            if existing_start < proposed_end:
+                conflicts.append({
+                    'meeting_id': str(meeting_id),
+                    'meeting_type': meeting_type,
+                    'existing_start': existing_start.isoformat(),
+                    'existing_end': existing_end.isoformat(),
+                    'proposed_start': proposed_start.isoformat(),
+                    'proposed_end': proposed_end.isoformat(),
+                })
+
+    return conflicts
+
+
+def check_series_conflicts(host_id, meeting_data, exclude_meeting_id=None):
+    """Expand a proposed meeting or series over the horizon and check it in one query"""
+    return find_host_conflicts(host_id, expand_series_for_horizon(meeting_data), exclude_meeting_id)
+
+
+SCHEDULED_SERIES_COLUMNS = """
+    id, host_id, start_time, end_time, duration_minutes,
+    is_recurring, recurrence_type, recurrence_interval,
+    recurrence_occurrences, recurrence_end_date,
+    selected_days, selected_month_dates, monthly_pattern, end_date, start_date
+"""
+
+CALENDAR_SERIES_COLUMNS = "ID, Host_ID, startTime, endTime, duration"
+
+
+def _calendar_meeting_data(row):
+    return {'start_time': row[2], 'end_time': row[3], 'duration_minutes': row[4]}
+
+
+def _series_anchor(start_time, is_recurring, start_date):
+    """
+    First occurrence of a series. start_time holds the current occurrence once
+    the scheduler has advanced a series, and recurrence_occurrences counts from
+    the first one, so recurring series are anchored back at start_date.
+    """
+    if not (start_time and is_recurring and start_date):
+        return start_time
+    series_date = start_date.date() if isinstance(start_date, datetime) else start_date
+    series_start = convert_to_ist(datetime.combine(series_date, start_time.time()))
+    return series_start if series_start < start_time else start_time
+
+
+def _scheduled_meeting_data(row):
+    """Series definition of a tbl_ScheduledMeetings row (SCHEDULED_SERIES_COLUMNS), anchored at start_date"""
+    start_time = convert_to_ist(row[2]) if row[2] else None
+    end_time = convert_to_ist(row[3]) if row[3] else None
+    anchor = _series_anchor(start_time, row[5], row[14])
+    if anchor != start_time and end_time:
+        end_time -= start_time - anchor
+    return {
+        'start_time': anchor,
+        'end_time': end_time,
+        'duration_minutes': row[4],
+        'is_recurring': bool(row[5]),
+        'recurrence_type': row[6],
+        'recurrence_interval': row[7],
+        'recurrence_occurrences': row[8],
+        'recurrence_end_date': row[9],
+        'selected_days': row[10],
+        'selected_month_dates': row[11],
+        'monthly_pattern': row[12],
+        'end_date': row[13] if row[5] else None,
+    }
+
+
+def load_meeting_series(cursor, meeting_id, meeting_type):
+    """(host_id, meeting_data) of one meeting as stored, or None (reads on the caller's cursor)"""
+    if meeting_type == 'ScheduleMeeting':
+        cursor.execute(f"SELECT {SCHEDULED_SERIES_COLUMNS} FROM tbl_ScheduledMeetings WHERE id = %s", [str(meeting_id)])
+        row = cursor.fetchone()
+        return (row[1], _scheduled_meeting_data(row)) if row else None
+
+    cursor.execute(f"SELECT {CALENDAR_SERIES_COLUMNS} FROM tbl_CalendarMeetings WHERE ID = %s", [str(meeting_id)])
+    row = cursor.fetchone()
+    return (row[1], _calendar_meeting_data(row)) if row else None
+
+
+def rematerialize_meeting_occurrences(cursor, meeting_id, meeting_type):
+    """Re-expand one meeting from its stored row (after an update, on the same cursor)"""
+    series = load_meeting_series(cursor, meeting_id, meeting_type)
+    if not series:
+        return 0
+    host_id, meeting_data = series
+    return materialize_meeting_occurrences(cursor, meeting_id, host_id, meeting_type, meeting_data)
+
+
+def refresh_meeting_occurrences(recurring_only=False, batch_size=OCCURRENCE_BATCH_SIZE):
+    """
+    Re-materialise occurrences from the meeting tables.
+
+    recurring_only=True rolls the horizon forward for recurring series (daily
+    Celery job); False rebuilds everything (backfill).
+    """
+    create_meeting_occurrences_table()
+    now = get_current_ist_datetime()
+    counts = {'scheduled_meetings': 0, 'calendar_meetings': 0, 'occurrences': 0}
+
+    sources = [
+        ('scheduled_meetings', 'ScheduleMeeting',
+         f"SELECT {SCHEDULED_SERIES_COLUMNS} FROM tbl_ScheduledMeetings "
+         f"WHERE id > %s {'AND is_recurring = 1' if recurring_only else ''} ORDER BY id LIMIT %s",
+         _scheduled_meeting_data),
+    ]
+    if not recurring_only:
+        sources.append(
+            ('calendar_meetings', 'CalendarMeeting',
+             f"SELECT {CALENDAR_SERIES_COLUMNS} FROM tbl_CalendarMeetings "
+             "WHERE ID > %s ORDER BY ID LIMIT %s",
+             _calendar_meeting_data)
+        )
+
+    for name, meeting_type, query, to_meeting_data in sources:
+        last_id = ''
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(query, [last_id, batch_size])
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    counts['occurrences'] += materialize_meeting_occurrences(
+                        cursor, row[0], row[1], meeting_type, to_meeting_data(row), now
+                    )
+                counts[name] += len(rows)
+                last_id = rows[-1][0]
+        logging.info(f"Occurrence refresh: processed {counts[name]} {name}")
+
+    return counts
+
+
+def get_recurring_series_ids(after_id, limit):
+    """One keyset page of recurring scheduled meeting ids (occurrence refresh fan-out)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM tbl_ScheduledMeetings WHERE is_recurring = 1 AND id > %s ORDER BY id LIMIT %s",
+            [after_id, limit]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def refresh_series_occurrences(meeting_ids):
+    """Re-materialise the given scheduled meetings in one transaction (one fan-out chunk)"""
+    if not meeting_ids:
+        return 0
+
+    now = get_current_ist_datetime()
+    placeholders = ', '.join(['%s'] * len(meeting_ids))
+    stored = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {SCHEDULED_SERIES_COLUMNS} FROM tbl_ScheduledMeetings WHERE id IN ({placeholders})",
+            list(meeting_ids)
+        )
+        for row in cursor.fetchall():
+            stored += materialize_meeting_occurrences(
+                cursor, row[0], row[1], 'ScheduleMeeting', _scheduled_meeting_data(row), now
+            )
+    return stored
+
+# ---------------------------------------------------------------------------
+# Calendar windows
+# ---------------------------------------------------------------------------
+
+# Expanded windows are cached per (series definition, window). The key holds
+# a fingerprint of the recurrence fields, so an edited series misses the old
+# entries and they simply expire.
+OCCURRENCE_CACHE_TTL = int(os.getenv("OCCURRENCE_CACHE_TTL", 3600))
+OCCURRENCE_CACHE_PREFIX = 'occurrences:'
+# Longest window one calendar request may expand
+CALENDAR_WINDOW_MAX_DAYS = 366
+
+SERIES_FINGERPRINT_FIELDS = (
+    'start_time', 'end_time', 'duration_minutes', 'is_recurring', 'recurrence_type',
+    'recurrence_interval', 'recurrence_occurrences', 'recurrence_end_date',
+    'selected_days', 'selected_month_dates', 'monthly_pattern', 'end_date',
+)
+
+
+def _series_fingerprint(meeting_data):
+    payload = json.dumps(
+        {field: meeting_data.get(field) for field in SERIES_FINGERPRINT_FIELDS},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def expand_occurrences_cached(series_id, meeting_data, window_start, window_end):
+    """expand_occurrences for one (series, window), cached in Redis"""
+    window_start = convert_to_ist(window_start)
+    window_end = convert_to_ist(window_end)
+    cache_key = (
+        f"{OCCURRENCE_CACHE_PREFIX}{series_id}:{_series_fingerprint(meeting_data)}:"
+        f"{int(window_start.timestamp())}:{int(window_end.timestamp())}"
+    )
+
+    client = get_redis_client()
+    if client is not None:
+        try:
+            cached = client.get(cache_key)
+            if cached is not None:
+                return [
+                    (convert_to_ist(datetime.fromisoformat(start)), convert_to_ist(datetime.fromisoformat(end)))
+                    for start, end in json.loads(cached)
+                ]
+        except Exception as e:
+            logging.warning(f"Occurrence cache unavailable for {series_id}: {e}")
+            client = None
+
+    occurrences = expand_occurrences(meeting_data, window_start, window_end)
+
+    if client is not None:
+        try:
+            client.setex(
+                cache_key, OCCURRENCE_CACHE_TTL,
+                json.dumps([[start.isoformat(), end.isoformat()] for start, end in occurrences])
+            )
+        except Exception as e:
+            logging.warning(f"Could not cache occurrences for {series_id}: {e}")
+
+    return occurrences
+
+
+def _calendar_series_data(row):
+    """
+    Series definition of a tbl_ScheduledMeetings row for calendar expansion,
+    anchored at start_date like _scheduled_meeting_data.
+    """
+    start_time = convert_to_ist(row[2]) if row[2] else None
+    end_time = convert_to_ist(row[3]) if row[3] else None
+    duration_minutes = row[4] or 60
+    if start_time and end_time and end_time > start_time:
+        duration_minutes = int((end_time - start_time).total_seconds() // 60)
+
+    return {
+        'start_time': _series_anchor(start_time, row[5], row[14]),
+        'end_time': None,
+        'duration_minutes': duration_minutes,
+        'is_recurring': bool(row[5]),
+        'recurrence_type': row[6],
+        'recurrence_interval': row[7],
+        'recurrence_occurrences': row[8],
+        'recurrence_end_date': row[9],
+        'selected_days': row[10],
+        'selected_month_dates': row[11],
+        'monthly_pattern': row[12],
+        'end_date': row[13] if row[5] else None,
+    }
+
+
+def list_user_series_occurrences(user_id, user_email, window_start, window_end):
+    """
+    Every occurrence of the scheduled meetings a user hosts or is invited to
+    inside [window_start, window_end), in one query plus cached expansion.
+    Returns a list of (series_info dict, occurrence_start, occurrence_end).
+    """
+    window_start = convert_to_ist(window_start)
+    window_end = convert_to_ist(window_end)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT sm.id, sm.host_id, sm.start_time, sm.end_time, sm.duration_minutes,
+                   sm.is_recurring, sm.recurrence_type, sm.recurrence_interval,
+                   sm.recurrence_occurrences, sm.recurrence_end_date,
+                   sm.selected_days, sm.selected_month_dates, sm.monthly_pattern, sm.end_date,
+                   sm.start_date, sm.title, sm.location, sm.email,
+                   m.Meeting_Link, m.Status, m.Meeting_Name
+            FROM (
+                SELECT id AS meeting_id FROM tbl_ScheduledMeetings WHERE host_id = %s
+                UNION
+                SELECT Meeting_ID FROM tbl_MeetingInvitees WHERE Email = %s
+            ) um
+            INNER JOIN tbl_ScheduledMeetings sm ON sm.id = um.meeting_id
+            INNER JOIN tbl_Meetings m ON sm.id = m.ID
+            WHERE (m.Status IS NULL OR m.Status NOT IN ({",".join(["%s"] * len(INACTIVE_MEETING_STATUSES))}))
+              AND COALESCE(sm.start_date, sm.start_time) < %s
+              AND (
+                  (sm.is_recurring = 0 AND sm.end_time > %s)
+                  OR (sm.is_recurring = 1 AND (sm.recurrence_end_date IS NULL OR sm.recurrence_end_date >= %s))
+              )
+        """, [
+            user_id or None, user_email, *INACTIVE_MEETING_STATUSES,
+            format_datetime_for_db(window_end), format_datetime_for_db(window_start),
+            window_start.strftime('%Y-%m-%d'),
+        ])
+        rows = cursor.fetchall()
+
+    results = []
+    for row in rows:
+        try:
+            occurrences = expand_occurrences_cached(row[0], _calendar_series_data(row), window_start, window_end)
+        except Exception as e:
+            logging.error(f"Could not expand series {row[0]}: {e}")
+            continue
+
+        series = {
+            'id': str(row[0]),
+            'host_id': row[1],
+            'is_recurring': bool(row[5]),
+            'recurrence_type': row[6],
+            'title': row[15] or row[20] or 'Untitled Meeting',
+            'location': row[16] or '',
+            'email': row[17] or '',
+            'meeting_link': row[18] or '',
+            'status': row[19],
+        }
+        for occurrence_start, occurrence_end in occurrences:
+            results.append((series, occurrence_start, occurrence_end))
+
+    return results
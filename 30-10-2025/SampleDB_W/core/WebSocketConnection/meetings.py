@@ -19,8 +19,9 @@ from datetime import datetime, timedelta
 import json
 import logging
 import uuid
-import aiopg
 import redis
+from asgiref.sync import sync_to_async
+from core.utils.redis_registry import RedisStore, get_async_redis_client
 from django.core.mail import send_mail
 from django.conf import settings
 import os
@@ -39,15 +40,40 @@ import ssl
 import json
 import logging
 import threading
-from django.core.mail import EmailMessage
+from core.scheduler.mail_dispatch import dispatch_mail
+from core.scheduler.reminder_index import index_meeting_reminders, unindex_meeting_reminders
+from core.scheduler.advancement_queue import schedule_series_advancement, unschedule_series_advancement
 from django.conf import settings
 from typing import Optional, Dict, List, Any
 import pytz
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 import logging
+from core.UserDashBoard.analytics_rollups import refresh_meeting_rollups
+from core.utils.api_response import (
+    SCHEMA_V1,
+    SCHEMA_V2,
+    conditional_json_response,
+    get_response_schema,
+    project_items,
+)
+from .meeting_events import issue_meeting_socket_token
+from .meeting_invitees import (
+    normalize_email,
+    sync_calendar_meeting_invitees,
+    sync_scheduled_meeting_invitees,
+)
+from .meeting_occurrences import (
+    CALENDAR_WINDOW_MAX_DAYS,
+    INACTIVE_MEETING_STATUSES,
+    check_series_conflicts,
+    find_host_conflicts,
+    list_user_series_occurrences,
+    load_meeting_series,
+    materialize_meeting_occurrences,
+    rematerialize_meeting_occurrences,
+)
 from .notifications import (
-    ensure_notification_tables,
     create_meeting_notifications,
     schedule_meeting_reminders,
     create_host_notification,
@@ -56,8 +82,6 @@ from .notifications import (
 logger = logging.getLogger('meetings') 
 
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-
 # Add to your existing imports in meetings.py
 try:
     from core.AI_Attendance.Attendance import start_attendance_tracking, stop_attendance_tracking
@@ -91,22 +115,8 @@ except ImportError as e:
     class VideoGrants:
         pass
 
-# Redis configuration for caching
-REDIS_CONFIG = {
-    'host': os.getenv("REDIS_HOST", "localhost"),
-    'port': int(os.getenv("REDIS_PORT", 6379)),
-    'db': int(os.getenv("REDIS_DB", 0)),
-    'decode_responses': os.getenv("REDIS_DECODE_RESPONSES", "True") == "True"
-}
-
-# Initialize Redis client
-try:
-    redis_client = redis.Redis(**REDIS_CONFIG)
-    redis_client.ping()  # Test connection
-    logging.info("✅ Redis connected successfully")
-except Exception as e:
-    logging.warning(f"⚠️ Redis not available: {e}")
-    redis_client = None
+# Redis client for caching - pooled and connected on first use (REDIS_* env variables)
+redis_client = RedisStore()
 
 # Global Variables (all your existing constants)
 TBL_MEETINGS = 'tbl_Meetings'
@@ -135,25 +145,26 @@ LIVEKIT_CONFIG = {
     'ttl': int(os.getenv("LIVEKIT_TTL", 3600))
 }
 
+# Async LiveKit client (used by the async join/leave/connection-info/sync views)
+LIVEKIT_ASYNC_TIMEOUT = float(os.getenv("LIVEKIT_ASYNC_TIMEOUT", 5))
+LIVEKIT_ASYNC_MAX_CONNECTIONS = int(os.getenv("LIVEKIT_ASYNC_MAX_CONNECTIONS", 100))
+
 class ProductionLiveKitService:
     """Production LiveKit service optimized for 50+ participants with fast joining"""
     
     def __init__(self):
         self.config = LIVEKIT_CONFIG
-        self.redis_client = None
         
         # Create SSL context that ignores certificate validation
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
         
-        # Optional Redis connection
-        try:
-            self.redis_client = redis.Redis(host='192.168.48.201', port=6379, db=0, decode_responses=True)
-            self.redis_client.ping()
-            logging.info("✅ Redis connected for caching")
-        except:
-            logging.info("ℹ Redis not available, proceeding without caching")
+        # Optional Redis caching - shares the default pool, falsy while Redis is down
+        self.redis_client = redis_client
+        
+        # aiohttp sessions for the async methods: id(loop) -> (loop, session)
+        self._async_sessions = {}
     
     def generate_admin_token(self) -> str:
         """Generate admin JWT token with correct structure for LiveKit API"""
@@ -549,22 +560,7 @@ class ProductionLiveKitService:
                 if response.status_code == 200:
                     result = response.json()
                     
-                    participants = []
-                    for p in result.get('participants', []):
-                        participants.append({
-                            'identity': p.get('identity', ''),
-                            'name': p.get('name', ''),  
-                            'state': p.get('state', 'ACTIVE'),
-                            'tracks': p.get('tracks', []),
-                            'metadata': p.get('metadata', ''),
-                            'joined_at': p.get('joined_at'),
-                            'is_publisher': len(p.get('tracks', [])) > 0,
-                            'connection_quality': p.get('connection_quality', 'unknown'),
-                            # ADDED: Additional info for large groups
-                            'track_count': len(p.get('tracks', [])),
-                            'has_video': any(track.get('type') == 'video' for track in p.get('tracks', [])),
-                            'has_audio': any(track.get('type') == 'audio' for track in p.get('tracks', []))
-                        })
+                    participants = [self._format_participant(p) for p in result.get('participants', [])]
                     
                     logging.info(f"✅ Found {len(participants)} LiveKit participants in {room_name}")
                     return participants
@@ -591,6 +587,24 @@ class ProductionLiveKitService:
         
         return []
 
+    @staticmethod
+    def _format_participant(p: Dict) -> Dict:
+        """Participant dict returned by list_participants / alist_participants"""
+        return {
+            'identity': p.get('identity', ''),
+            'name': p.get('name', ''),  
+            'state': p.get('state', 'ACTIVE'),
+            'tracks': p.get('tracks', []),
+            'metadata': p.get('metadata', ''),
+            'joined_at': p.get('joined_at'),
+            'is_publisher': len(p.get('tracks', [])) > 0,
+            'connection_quality': p.get('connection_quality', 'unknown'),
+            # ADDED: Additional info for large groups
+            'track_count': len(p.get('tracks', [])),
+            'has_video': any(track.get('type') == 'video' for track in p.get('tracks', [])),
+            'has_audio': any(track.get('type') == 'audio' for track in p.get('tracks', []))
+        }
+
     def remove_participant(self, room_name: str, participant_identity: str, reason: str = "MANUAL_DISCONNECT") -> bool:
         """Remove participant from LiveKit room and prevent reconnection"""
         max_retries = 3
@@ -753,6 +767,97 @@ class ProductionLiveKitService:
             logging.error(f"Mute tracks failed: {e}")
             return False
          
+    # ---- Async client ---------------------------------------------------
+    # Same Twirp endpoints as the blocking methods above, over a pooled
+    # aiohttp session, so async views wait on LiveKit without holding a
+    # worker thread. Retries are short; callers bound the total wait.
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Session bound to the running loop. async_to_sync callers from plain
+        threads each run on a new loop, so sessions of closed loops are dropped
+        whenever a new one is created; the entry holds its loop, so the loop's
+        id cannot be reused while the entry exists.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._async_sessions.get(id(loop))
+        if entry is None or entry[1].closed:
+            for loop_id, (other_loop, _) in list(self._async_sessions.items()):
+                if other_loop.is_closed():
+                    self._async_sessions.pop(loop_id, None)
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ssl=self.ssl_context,
+                    limit=LIVEKIT_ASYNC_MAX_CONNECTIONS
+                ),
+                timeout=aiohttp.ClientTimeout(total=LIVEKIT_ASYNC_TIMEOUT)
+            )
+            entry = (loop, session)
+            self._async_sessions[id(loop)] = entry
+        return entry[1]
+
+    async def _twirp_call_async(self, method: str, payload: Dict, token: str,
+                                max_retries: int = 2) -> Optional[Dict]:
+        """POST to RoomService/<method>; returns the JSON body, or None on 404/failure"""
+        url = f"{self.config['url']}/twirp/livekit.RoomService/{method}"
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+        session = self._get_async_session()
+        
+        for attempt in range(max_retries):
+            try:
+                async with session.post(url, headers=headers, json=payload) as response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    if response.status == 404:
+                        return None
+                    logging.warning(f"❌ LiveKit {method} failed: {response.status} - {await response.text()}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logging.warning(f"⏰ LiveKit {method} error (attempt {attempt + 1}): {e}")
+            
+            if attempt < max_retries - 1:
+                await asyncio.sleep(0.5 * (2 ** attempt))
+        
+        return None
+
+    async def alist_participants(self, room_name: str) -> List[Dict]:
+        """Async list_participants"""
+        result = await self._twirp_call_async(
+            'ListParticipants',
+            {'room': room_name},
+            self.generate_room_specific_token(room_name)
+        )
+        participants = [self._format_participant(p) for p in (result or {}).get('participants', [])]
+        logging.info(f"✅ Found {len(participants)} LiveKit participants in {room_name}")
+        return participants
+
+    async def aget_room(self, room_name: str) -> Optional[Dict]:
+        """Async get_room"""
+        result = await self._twirp_call_async(
+            'ListRooms',
+            {'names': [room_name]},
+            self.generate_admin_token()
+        )
+        for room in (result or {}).get('rooms', []):
+            if room.get('name') == room_name:
+                return room
+        return None
+
+    async def aremove_participant(self, room_name: str, participant_identity: str,
+                                  reason: str = "MANUAL_DISCONNECT") -> bool:
+        """Async remove_participant"""
+        result = await self._twirp_call_async(
+            'RemoveParticipant',
+            {'room': room_name, 'identity': participant_identity, 'reason': reason},
+            self.generate_admin_token()
+        )
+        if result is None:
+            return False
+        logging.info(f"Removed participant {participant_identity} from room {room_name}")
+        return True
+         
     def _fallback_room_response(self, room_name: str) -> Dict:
         """Fallback room response optimized for 50+ participants"""
         fallback_sid = f'fallback_{room_name}_{int(time.time())}'
@@ -1344,95 +1449,150 @@ def record_participant_leave_fast(meeting_id, user_id):
         return False
 
 
-async def get_meeting_info_cached(meeting_id: str) -> Dict:
-    """Get meeting info with Redis caching"""
-    cache_key = f"meeting:{meeting_id}"
+# Seconds a meeting row stays cached for joins; end/update drop it early
+MEETING_INFO_CACHE_TTL = int(os.getenv("MEETING_INFO_CACHE_TTL", 30))
+
+def meeting_info_cache_key(meeting_id) -> str:
+    return f"meeting:{meeting_id}"
+
+def invalidate_meeting_info_cache(meeting_id):
+    """Drop the cached meeting row after its status or room changes"""
+    try:
+        if redis_client:
+            redis_client.delete(meeting_info_cache_key(meeting_id))
+    except redis.RedisError as e:
+        logging.warning(f"Could not invalidate meeting cache for {meeting_id}: {e}")
+
+def _fetch_meeting_info(meeting_id: str) -> Optional[Dict]:
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT Host_ID, Meeting_Name, Status, LiveKit_Room_Name, 
+                   Is_Recording_Enabled, Waiting_Room_Enabled, Meeting_Type
+            FROM tbl_Meetings 
+            WHERE ID = %s
+        """, [meeting_id])
+        row = cursor.fetchone()
+    
+    if not row:
+        return None
+    
+    return {
+        'host_id': row[0],
+        'meeting_name': row[1],
+        'status': row[2],
+        'livekit_room_name': row[3],
+        'recording_enabled': row[4],
+        'waiting_room_enabled': row[5],
+        'meeting_type': row[6]
+    }
+
+def get_meeting_info(meeting_id: str) -> Optional[Dict]:
+    """Sync get_meeting_info_cached (same cache entry)"""
+    cache_key = meeting_info_cache_key(meeting_id)
     
-    # Try cache first
     try:
-        cached = redis_client.get(cache_key)
-        if cached:
-            return json.loads(cached)
-    except:
+        if redis_client:
+            cached = redis_client.get(cache_key)
+            if cached:
+                return json.loads(cached)
+    except redis.RedisError:
         pass
     
-    # Database lookup with connection pooling
-    async with aiopg.create_pool(DATABASE_URL) as pool:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute("""
-                    SELECT Host_ID, Meeting_Name, Status, LiveKit_Room_Name, 
-                           Is_Recording_Enabled, Waiting_Room_Enabled
-                    FROM tbl_Meetings 
-                    WHERE ID = %s
-                """, [meeting_id])
-                
-                row = await cursor.fetchone()
-                if not row:
-                    return None
-                
-                meeting_info = {
-                    'host_id': row[0],
-                    'meeting_name': row[1],
-                    'status': row[2],
-                    'livekit_room_name': row[3],
-                    'recording_enabled': row[4],
-                    'waiting_room_enabled': row[5]
-                }
-                
-                # Cache for 5 minutes
-                redis_client.setex(cache_key, 300, json.dumps(meeting_info))
-                
-                return meeting_info
+    meeting_info = _fetch_meeting_info(meeting_id)
+    
+    if meeting_info:
+        try:
+            if redis_client:
+                redis_client.setex(cache_key, MEETING_INFO_CACHE_TTL, json.dumps(meeting_info, default=str))
+        except redis.RedisError:
+            pass
+    
+    return meeting_info
 
-async def record_participant_join_async(meeting_id: str, user_id: str, user_name: str, is_host: bool):
-    """Async participant recording with batch operations"""
+async def get_meeting_info_cached(meeting_id: str) -> Optional[Dict]:
+    """Get meeting info with Redis caching; database errors propagate to the caller"""
+    cache_key = meeting_info_cache_key(meeting_id)
+    client = get_async_redis_client()
+    
+    # Try cache first
+    if client is not None:
+        try:
+            cached = await client.get(cache_key)
+            if cached:
+                return json.loads(cached)
+        except redis.RedisError:
+            pass
+    
+    meeting_info = await sync_to_async(_fetch_meeting_info)(meeting_id)
+    
+    if meeting_info and client is not None:
+        try:
+            await client.setex(cache_key, MEETING_INFO_CACHE_TTL, json.dumps(meeting_info, default=str))
+        except redis.RedisError:
+            pass
+    
+    return meeting_info
+
+def _record_participant_join(meeting_id: str, user_id: str, user_name: str, participant_role: str,
+                             meeting_type: Optional[str] = None):
+    """Same write as the record_participant_join endpoint (queued when write-behind is on)"""
+    from .participants import write_participant_join
+    from .participant_events import ACTION_JOIN, PARTICIPANT_WRITE_BEHIND, enqueue_participant_event
+
+    # tbl_Participants.User_ID is an INT column
+    user_id = int(user_id)
+
+    if PARTICIPANT_WRITE_BEHIND:
+        event_time = timezone.now().astimezone(pytz.timezone("Asia/Kolkata")).strftime('%Y-%m-%d %H:%M:%S')
+        if enqueue_participant_event(meeting_id, user_id, ACTION_JOIN, event_time,
+                                     full_name=user_name, role=participant_role) is not None:
+            return
+
+    _, action, _ = write_participant_join(
+        meeting_id, user_id, user_name, participant_role, meeting_type or 'InstantMeeting'
+    )
+    logging.info(f"✅ Participant join recorded for user {user_id} ({action})")
+
+async def record_participant_join_async(meeting_id: str, user_id: str, user_name: str, is_host: bool,
+                                        meeting_type: Optional[str] = None) -> bool:
+    """Record a join in a worker thread; failures are logged, never raised"""
     try:
-        # Use connection pool
-        async with aiopg.create_pool(DATABASE_URL) as pool:
-            async with pool.acquire() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        INSERT INTO tbl_Participants 
-                        (Meeting_ID, User_ID, Full_Name, Join_Time, Role, Status)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE Join_Time = VALUES(Join_Time)
-                    """, [
-                        meeting_id, user_id, user_name, 
-                        timezone.now(), 'host' if is_host else 'participant', 'active'
-                    ])
-                    
-                    # Update participant count in cache
-                    cache_key = f"participant_count:{meeting_id}"
-                    redis_client.incr(cache_key)
-                    redis_client.expire(cache_key, 3600)
-                    
+        await sync_to_async(_record_participant_join)(
+            meeting_id, user_id, user_name, 'host' if is_host else 'participant', meeting_type
+        )
+        return True
     except Exception as e:
-        logging.error(f"Failed to record participant: {e}")
+        logging.warning(f"Failed to record participant join (non-critical): {e}")
+        return False
 
 async def get_room_participant_count_cached(room_name: str) -> int:
-    """Get participant count with caching"""
-    cache_key = f"room_count:{room_name}"
+    """Async get_room_participant_count_with_cache (same cache key)"""
+    cache_key = f"participant_count:{room_name}"
+    client = get_async_redis_client()
     
-    try:
-        cached_count = redis_client.get(cache_key)
-        if cached_count:
-            return int(cached_count)
-    except:
-        pass
+    if client is not None:
+        try:
+            cached_count = await client.get(cache_key)
+            if cached_count is not None:
+                return int(cached_count)
+        except redis.RedisError:
+            pass
     
     # Fallback to LiveKit API
-    try:
-        api = LiveKitAPI(LIVEKIT_CONFIG['url'], LIVEKIT_CONFIG['api_key'], LIVEKIT_CONFIG['api_secret'])
-        participants = await api.room.list_participants(ListParticipantsRequest(room=room_name))
-        count = len(participants.participants)
-        
-        # Cache for 30 seconds
-        redis_client.setex(cache_key, 30, count)
-        return count
-        
-    except:
+    if not (LIVEKIT_ENABLED and livekit_service):
         return 0
+    
+    participants = await livekit_service.alist_participants(room_name)
+    count = len(participants)
+    
+    # Cache for 10 seconds
+    if client is not None:
+        try:
+            await client.setex(cache_key, 10, count)
+        except redis.RedisError:
+            pass
+    
+    return count
 
 
 # Disable slow room lookups in List_All_Meetings
@@ -1748,7 +1908,10 @@ def create_calendar_meeting_table():
 
 def send_meeting_invitations(data):
     """
-    Send meeting invitations - handles both Calendar and Schedule meetings
+    Send meeting invitations - handles both Calendar and Schedule meetings.
+    Returns (queued, invalid_emails): the mail is only queued here, so
+    invalid_emails lists the addresses dropped before queueing; addresses the
+    mail server rejects later are logged by send_mail_batch_task.
     """
     meeting_title = data.get('meeting_title', 'Meeting')
     guest_emails = data.get('guest_emails', [])
@@ -1878,54 +2041,19 @@ You are invited to join a meeting:
 Best regards,  
 Meet Pro Team"""
 
-            # Send emails
-            successful_sends = 0
-            failed_emails = []
-            
-            batch_size = 10
-            for i in range(0, len(guest_emails), batch_size):
-                batch = guest_emails[i:i + batch_size]
-                
-                try:
-                    email_message = EmailMessage(
-                        subject=subject,
-                        body=message,
-                        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@meetpro.com'),
-                        to=batch,
-                    )
-                    
-                    email_message.send(fail_silently=False)
-                    successful_sends += len(batch)
-                    logging.info(f"Successfully sent batch of {len(batch)} emails")
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logging.error(f"Failed to send email batch: {e}")
-                    failed_emails.extend(batch)
+            # Queue on the shared mail service: pooled SMTP, rate limited, retried (mail_dispatch.py)
+            queued = dispatch_mail(subject, message, guest_emails)
+            invalid_emails = [email for email in guest_emails if not email or '@' not in email]
             
-            logging.info(f"Email sending completed: {successful_sends}/{len(guest_emails)} emails sent")
-            return successful_sends, failed_emails
+            logging.info(f"Email sending queued: {queued}/{len(guest_emails)} emails")
+            return queued, invalid_emails
                 
         except Exception as e:
             logging.error(f"Critical error in email sending: {e}")
             return 0, guest_emails
     
-    # Calendar meetings send synchronously, Schedule meetings send asynchronously
-    if meeting_type == 'CalendarMeeting':
-        logging.info(f"Sending emails synchronously for {meeting_type}")
-        sent_count, failed_list = send_emails_core()
-        return sent_count, failed_list
-    else:
-        # For Schedule meetings - send asynchronously
-        def send_emails_async():
-            send_emails_core()
-        
-        email_thread = threading.Thread(target=send_emails_async)
-        email_thread.daemon = True
-        email_thread.start()
-        
-        logging.info(f"Started async email sending for {len(guest_emails)} invitations")
-        return len(guest_emails), []
+    # Delivery happens on the mail workers, so every meeting type only queues here
+    return send_emails_core()
 
 @csrf_exempt
 def get_all_meetings(request):
@@ -1963,59 +2091,72 @@ def get_all_meetings(request):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
-def check_meeting_conflicts(host_id, start_time, end_time, meeting_type="CalendarMeeting"):
+def check_meeting_conflicts(host_id, start_time, end_time, meeting_type="CalendarMeeting",
+                            meeting_data=None, exclude_meeting_id=None):
     """
     Check if the host already has a meeting (Calendar or Schedule) overlapping with the given time.
     Returns (True, message) if conflict exists.
+
+    Pass meeting_data (the recurrence fields of a proposed series) to check every
+    occurrence of the series in one query against tbl_MeetingOccurrences.
     """
-    from django.db import connection
     if not start_time or not end_time:
         return False, None
 
     try:
-        with connection.cursor() as cursor:
-            # Convert to string for SQL comparison
-            start_str = start_time.strftime('%Y-%m-%d %H:%M:%S')
-            end_str = end_time.strftime('%Y-%m-%d %H:%M:%S')
+        if meeting_data:
+            conflicts = check_series_conflicts(host_id, meeting_data, exclude_meeting_id)
+        else:
+            conflicts = find_host_conflicts(host_id, [(start_time, end_time)], exclude_meeting_id)
 
-            # Check Calendar Meeting overlap
-            cursor.execute("""
-                SELECT COUNT(*) FROM tbl_CalendarMeetings
-                WHERE Host_ID = %s AND (
-                    (startTime <= %s AND endTime >= %s) OR
-                    (startTime >= %s AND startTime < %s)
-                )
-            """, [host_id, end_str, start_str, start_str, end_str])
-            calendar_conflict = cursor.fetchone()[0] > 0
+        if not conflicts:
+            return False, None
 
-            # Check Scheduled Meeting overlap
-            cursor.execute("""
-                SELECT COUNT(*) FROM tbl_ScheduledMeetings
-                WHERE host_id = %s AND (
-                    (start_time <= %s AND end_time >= %s) OR
-                    (start_time >= %s AND start_time < %s)
-                )
-            """, [host_id, end_str, start_str, start_str, end_str])
-            scheduled_conflict = cursor.fetchone()[0] > 0
+        calendar_conflict = any(c['meeting_type'] == 'CalendarMeeting' for c in conflicts)
+        logging.info(f"⚠️ {len(conflicts)} conflicting occurrence(s) for host {host_id}, first at {conflicts[0]['existing_start']}")
 
         # Determine message based on meeting type
         if meeting_type == "CalendarMeeting":
             if calendar_conflict:
                 return True, "You already have a calendar meeting scheduled at this time. Please choose a different time slot."
-            elif scheduled_conflict:
-                return True, "You already have a scheduled meeting at this time. Please select another time slot to create your calendar meeting."
+            return True, "You already have a scheduled meeting at this time. Please select another time slot to create your calendar meeting."
         else:  # ScheduleMeeting
             if calendar_conflict:
                 return True, "You already have a calendar meeting at this time. Please select another slot to schedule your meeting."
-            elif scheduled_conflict:
-                return True, "You already have a scheduled meeting at this time. Please choose another time."
-
-        return False, None
+            return True, "You already have a scheduled meeting at this time. Please choose another time."
 
     except Exception as e:
         logging.error(f"Conflict check failed: {e}")
         return False, None
 
+# Update_Meeting fields that move a meeting in time; only these re-run the conflict check
+MEETING_TIMING_FIELDS = (
+    'Host_ID', 'Started_At', 'Ended_At', 'start_time', 'end_time', 'startTime', 'endTime',
+    'start_date', 'end_date', 'duration', 'duration_minutes', 'Duration_Minutes',
+    'recurrence', 'recurrence_end_date',
+)
+
+def check_updated_meeting_conflicts(cursor, meeting_id, meeting_type, status, data):
+    """
+    Conflict check for Update_Meeting, run on the row as just written (same cursor
+    and transaction) so the stored series is what gets expanded. The meeting's own
+    occurrences are excluded; ended/inactive meetings and edits that do not touch
+    the timing are not checked.
+    """
+    if status == 'ended' or status in INACTIVE_MEETING_STATUSES:
+        return False, None
+    if not any(data.get(field) is not None for field in MEETING_TIMING_FIELDS):
+        return False, None
+
+    series = load_meeting_series(cursor, meeting_id, meeting_type)
+    if not series:
+        return False, None
+    host_id, meeting_data = series
+    return check_meeting_conflicts(
+        host_id, meeting_data['start_time'], meeting_data['end_time'], meeting_type=meeting_type,
+        meeting_data=meeting_data, exclude_meeting_id=meeting_id
+    )
+
 def calculate_meeting_status(started_at, ended_at, duration_minutes=60):
     """
     Calculate real-time meeting status based on current time
@@ -2072,10 +2213,6 @@ def calculate_meeting_status(started_at, ended_at, duration_minutes=60):
 @csrf_exempt
 def Create_Calendar_Meeting(request):
     """FIXED: Create Calendar Meeting with fully working mail + notification system (aligned with ScheduleMeeting)"""
-    create_meetings_table()
-    create_calendar_meeting_table()
-    ensure_notification_tables()
-
     try:
         # --- Parse request data ---
         data = json.loads(request.body)
@@ -2190,6 +2327,15 @@ def Create_Calendar_Meeting(request):
                     json.dumps(data.get('reminderTimes', [15, 30])),
                     1, 1, 1, 1, 1, 1, created_at
                 ])
+
+                # attendees holds the same addresses as guestEmails: index them once
+                sync_calendar_meeting_invitees(
+                    cursor, meeting_uuid, data.get('email'), guest_emails, []
+                )
+                materialize_meeting_occurrences(
+                    cursor, meeting_uuid, host_id, 'CalendarMeeting',
+                    {'start_time': start_dt, 'end_time': end_dt, 'duration_minutes': duration}
+                )
         logging.info(f"✅ Calendar meeting created: {meeting_uuid}")
     except Exception as e:
         logging.error(f"DB insert failed: {e}")
@@ -2280,11 +2426,6 @@ def Create_Calendar_Meeting(request):
 def Create_Schedule_Meeting(request):
     """COMPLETE: Create scheduled meeting with FULL notification system and status fix"""
     try:
-        # Ensure tables exist - INCLUDING NOTIFICATION TABLES
-        create_meetings_table()
-        create_scheduled_meetings_table()
-        ensure_notification_tables()  # PRESERVED: Notification tables
-
         # Parse JSON data - UNCHANGED
         try:
             data = json.loads(request.body)
@@ -2391,11 +2532,6 @@ def Create_Schedule_Meeting(request):
         else:
             ended_at = safe_datetime_convert(data.get('Ended_At'), 'Ended_At')
 
-        # --- Check for time conflicts ---
-        conflict, message = check_meeting_conflicts(host_id, start_dt, end_dt, meeting_type="ScheduleMeeting")
-        if conflict:
-            return JsonResponse({"Error": message}, status=400)
-        
         # Handle start_date and end_date from frontend - UNCHANGED
         start_date = safe_datetime_convert(data.get('start_date'), 'start_date')
         end_date = safe_datetime_convert(data.get('end_date'), 'end_date')
@@ -2486,6 +2622,30 @@ def Create_Schedule_Meeting(request):
             selected_month_dates = None
             monthly_pattern = None
 
+        # Series definition used for conflict checks and occurrence materialisation
+        occurrence_data = {
+            'start_time': started_at,
+            'end_time': ended_at,
+            'duration_minutes': duration_minutes,
+            'is_recurring': is_recurring,
+            'recurrence_type': recurrence_type,
+            'recurrence_interval': recurrence_interval,
+            'recurrence_occurrences': recurrence_occurrences,
+            'recurrence_end_date': recurrence_end_date,
+            'selected_days': selected_days,
+            'selected_month_dates': selected_month_dates,
+            'monthly_pattern': monthly_pattern,
+            'end_date': end_date if is_recurring else None,
+        }
+
+        # --- Check for time conflicts (every occurrence of a recurring series) ---
+        if started_at and ended_at:
+            conflict, message = check_meeting_conflicts(
+                host_id, started_at, ended_at, meeting_type="ScheduleMeeting", meeting_data=occurrence_data
+            )
+            if conflict:
+                return JsonResponse({"Error": message}, status=400)
+
         # Process settings data - UNCHANGED (ALL ORIGINAL SETTINGS LOGIC)
         settings = data.get('settings', {})
         settings_waiting_room = 1 if settings.get('waitingRoom', data.get('settings_waiting_room', True)) else 0
@@ -2613,6 +2773,16 @@ def Create_Schedule_Meeting(request):
                     ]
                     
                     cursor.execute(scheduled_query, scheduled_params)
+                    sync_scheduled_meeting_invitees(cursor, meeting_data['id'], meeting_data['email'])
+                    materialize_meeting_occurrences(
+                        cursor, meeting_data['id'], meeting_data['host_id'], 'ScheduleMeeting', occurrence_data
+                    )
+                    index_meeting_reminders(
+                        meeting_data['id'], meeting_data['started_at'],
+                        meeting_data['reminders_times'] if meeting_data['reminders_email'] else []
+                    )
+                    if meeting_data['is_recurring']:
+                        schedule_series_advancement(meeting_data['id'], meeting_data['ended_at'])
                     logging.info("Database inserts completed successfully")
                     
         except Exception as e:
@@ -2736,7 +2906,6 @@ def Create_Schedule_Meeting(request):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Create_Instant_Meeting(request):
-    create_meetings_table()
     ist_timezone = pytz.timezone("Asia/Kolkata")
     try:
         data = json.loads(request.body)
@@ -2920,8 +3089,6 @@ def Create_Instant_Meeting(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def List_All_Meetings(request):
-    create_meetings_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = f"""
@@ -2985,8 +3152,6 @@ def List_All_Meetings(request):
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_Meeting(request, id):
-    create_meetings_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = f"""
@@ -3043,6 +3208,12 @@ def Get_Meeting(request, id):
 
     return JsonResponse({"Error": "Meeting not found"}, status=NOT_FOUND_STATUS)
 
+def _refresh_rollups_after_update(meeting_id):
+    try:
+        refresh_meeting_rollups(meeting_id)
+    except Exception as e:
+        logging.warning(f"UPDATE_MEETING: Analytics rollups not refreshed for {meeting_id}: {e}")
+
 # ALL YOUR REMAINING EXISTING FUNCTIONS (unchanged)
 @require_http_methods(["PUT"])
 @csrf_exempt
@@ -3051,10 +3222,6 @@ def Update_Meeting(request, id):
     Update existing meetings only - no new row creation.
     Returns error if meeting ID not found in any table.
     """
-    create_meetings_table()
-    create_scheduled_meetings_table()
-    create_calendar_meeting_table()
-
     try:
         data = json.loads(request.body)
         logging.debug(f"UPDATE_MEETING: Received JSON: {json.dumps(data, indent=2)}")
@@ -3236,6 +3403,10 @@ def Update_Meeting(request, id):
                 main_updated_rows = cursor.rowcount
                 logging.info(f"UPDATE_MEETING: Main table update affected {main_updated_rows} rows")
 
+                # Analytics rollups only count ended meetings; refresh the host-day when that changes
+                if status != existing['Status'] and 'ended' in (status, existing['Status']):
+                    transaction.on_commit(lambda: _refresh_rollups_after_update(id))
+
                 # Handle email field for ScheduleMeeting
                 email_field = data.get('email')
                 if isinstance(email_field, list):
@@ -3414,6 +3585,21 @@ def Update_Meeting(request, id):
                         logging.error(f"UPDATE_MEETING: Failed to update ScheduleMeeting {id}")
                         return JsonResponse({"Error": f"Failed to update ScheduleMeeting {id}"}, status=500)
 
+                    conflict, message = check_updated_meeting_conflicts(cursor, id, 'ScheduleMeeting', status, data)
+                    if conflict:
+                        transaction.set_rollback(True)
+                        return JsonResponse({"Error": message}, status=400)
+
+                    sync_scheduled_meeting_invitees(cursor, id, final_email)
+                    rematerialize_meeting_occurrences(cursor, id, 'ScheduleMeeting')
+                    index_meeting_reminders(
+                        id, data.get('start_time', started_at), reminders_times if reminders_email else []
+                    )
+                    if recurring_data.get('enabled'):
+                        schedule_series_advancement(id, data.get('end_time', ended_at))
+                    else:
+                        unschedule_series_advancement(id)
+
                 elif meeting_type == 'CalendarMeeting':
                     logging.info(f"UPDATE_MEETING: Processing CalendarMeeting update for {id}")
                     
@@ -3669,6 +3855,14 @@ def Update_Meeting(request, id):
                             }, status=500)
                         else:
                             logging.info(f"UPDATE_MEETING: Successfully updated exactly 1 CalendarMeeting record with ID {id}")
+
+                        conflict, message = check_updated_meeting_conflicts(cursor, id, 'CalendarMeeting', status, data)
+                        if conflict:
+                            transaction.set_rollback(True)
+                            return JsonResponse({"Error": message}, status=400)
+
+                        sync_calendar_meeting_invitees(cursor, id, calendar_email, guest_emails, attendees)
+                        rematerialize_meeting_occurrences(cursor, id, 'CalendarMeeting')
                             
                     except Exception as calendar_error:
                         logging.error(f"UPDATE_MEETING: Error in CalendarMeeting update section for {id}: {calendar_error}")
@@ -3693,6 +3887,9 @@ def Update_Meeting(request, id):
         logging.error(f"UPDATE_MEETING: Full traceback: {traceback.format_exc()}")
         return JsonResponse({"Error": f"Database error: {str(e)}"}, status=500)
 
+    # Joins read Status / room name from the cached row
+    invalidate_meeting_info_cache(id)
+
     # Return success response
     return JsonResponse({
         "Message": "Meeting updated successfully",
@@ -3705,8 +3902,6 @@ def Update_Meeting(request, id):
 @require_http_methods(["DELETE"])
 @csrf_exempt
 def Delete_Meeting(request, id):
-    create_meetings_table()
-
     try:
         with transaction.atomic():
             with connection.cursor() as cursor:
@@ -3722,6 +3917,8 @@ def Delete_Meeting(request, id):
                 # Delete from scheduled or calendar tables first if needed
                 if meeting_type == 'ScheduleMeeting':
                     cursor.execute(f"DELETE FROM {TBL_SCHEDULED_MEETINGS} WHERE id = %s", [id])
+                    unindex_meeting_reminders(id)
+                    unschedule_series_advancement(id)
                 elif meeting_type == 'CalendarMeeting':
                     cursor.execute(f"DELETE FROM {TBL_CALENDAR_MEETING} WHERE ID = %s", [id])
 
@@ -3749,8 +3946,6 @@ def Delete_Meeting(request, id):
 @require_http_methods(["POST"])
 @csrf_exempt
 def Allow_From_Waiting_Room(request, id):
-    create_meetings_table()
-
     try:
         with connection.cursor() as cursor:
             select_query = f"""
@@ -4417,6 +4612,196 @@ def format_meeting_for_frontend(row, user_id=None, user_email=None):
         logging.error(f"Error in format_meeting_for_frontend: {e}")
         return None
 
+# Compact (v2) schemas: {compact_key: legacy_key}. Each field is emitted once
+# instead of under every historical alias. The row formatters build v2 dicts
+# directly (without the v1 aliases); these maps document the correspondence.
+SCHEDULE_MEETING_V2_FIELDS = {
+    'id': 'ID',
+    'host_id': 'Host_ID',
+    'title': 'title',
+    'name': 'Meeting_Name',
+    'description': 'description',
+    'location': 'location',
+    'start': 'start_time',
+    'end': 'end_time',
+    'original_start': 'original_start_time',
+    'original_end': 'original_end_time',
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'timezone': 'timezone',
+    'duration': 'duration_minutes',
+    'is_recurring': 'is_recurring',
+    'recurrence_type': 'recurrence_type',
+    'selected_days': 'selected_days',
+    'selected_month_dates': 'selected_month_dates',
+    'is_today': 'is_today_meeting',
+    'waiting_room': 'settings_waiting_room',
+    'recording': 'settings_recording',
+    'participants': 'participants',
+    'status': 'Status',
+    'link': 'Meeting_Link',
+    'type': 'Meeting_Type',
+    'is_host': 'is_host',
+    'host_name': 'host_name',
+    'host_email': 'host_email',
+}
+
+CALENDAR_MEETING_V2_FIELDS = {
+    'id': 'ID',
+    'host_id': 'Host_ID',
+    'title': 'title',
+    'start': 'startTime',
+    'end': 'endTime',
+    'duration': 'duration',
+    'organizer': 'email',
+    'guests': 'guestEmails',
+    'provider': 'provider',
+    'link': 'Meeting_Link',
+    'location': 'location',
+    'reminders': 'reminderMinutes',
+    'settings': 'Settings',
+    'calendar_settings': 'CalendarSettings',
+    'status': 'Status',
+    'created_at': 'CreatedAt',
+    'recording': 'Is_Recording_Enabled',
+    'waiting_room': 'Waiting_Room_Enabled',
+    'livekit_room': 'LiveKit_Room_Name',
+    'livekit_sid': 'LiveKit_Room_SID',
+    'role': 'user_role',
+    'participant_count': 'participant_count',
+    'type': 'type',
+    'series_id': 'series_id',
+}
+
+def format_schedule_meeting_row(row, user_id, user_email, current_datetime, schema=SCHEMA_V1):
+    """Build the schedule meeting dict (v1 or compact v2) for one row, or None if the user is not invited"""
+    from core.utils.recurring_calculator import calculate_next_occurrence
+
+    # UNCHANGED: Original participant processing
+    participant_emails = []
+    if row[30] and isinstance(row[30], str):
+        participant_emails = [email.strip() for email in row[30].split(',') if email.strip()]
+
+    is_host = str(row[1]) == str(user_id)
+    is_participant = user_email in participant_emails if user_email else False
+
+    if not (is_host or is_participant):
+        return None
+
+    # UNCHANGED: Original recurring meeting logic
+    display_start_time = row[5].isoformat() if row[5] else None
+    display_end_time = row[6].isoformat() if row[6] else None
+    is_today_meeting = False
+    duration_minutes = row[10] or 60
+
+    if row[11]:  # is_recurring - UNCHANGED logic
+        try:
+            meeting_data = {
+                'start_time': display_start_time,
+                'end_time': display_end_time,
+                'is_recurring': True,
+                'recurrence_type': row[12],
+                'recurrence_interval': row[13] or 1,
+                'recurrence_end_date': row[15].isoformat() if row[15] else None,
+                'selected_days': row[16],
+                'selected_month_dates': row[17],
+                'monthly_pattern': row[18] or 'same-date'
+            }
+
+            next_occurrence = calculate_next_occurrence(meeting_data, current_datetime)
+            if next_occurrence:
+                display_start_time = next_occurrence['next_start_time']
+                display_end_time = next_occurrence['next_end_time']
+                is_today_meeting = next_occurrence.get('is_today', False)
+        except Exception as e:
+            logging.error(f"Error calculating next occurrence: {e}")
+
+    # ONLY CHANGE: Calculate status based on display times
+    start_dt = None
+    end_dt = None
+    if display_start_time:
+        start_dt = datetime.fromisoformat(display_start_time.replace('Z', '+00:00')) if isinstance(display_start_time, str) else display_start_time
+    if display_end_time:
+        end_dt = datetime.fromisoformat(display_end_time.replace('Z', '+00:00')) if isinstance(display_end_time, str) else display_end_time
+
+    calculated_status = calculate_meeting_status(start_dt, end_dt, duration_minutes)
+
+    if schema == SCHEMA_V2:
+        return {
+            'id': str(row[0]),
+            'host_id': row[1],
+            'title': row[2] or "Untitled Meeting",
+            'name': row[35] or row[2] or "Untitled Meeting",
+            'description': row[3] or "",
+            'location': row[4] or "",
+            'start': display_start_time,
+            'end': display_end_time,
+            'original_start': row[5].isoformat() if row[5] else None,
+            'original_end': row[6].isoformat() if row[6] else None,
+            'start_date': row[7].isoformat() if row[7] else None,
+            'end_date': row[8].isoformat() if row[8] else None,
+            'timezone': row[9] or "Asia/Kolkata",
+            'duration': duration_minutes,
+            'is_recurring': bool(row[11]),
+            'recurrence_type': row[12],
+            'selected_days': json.loads(row[16]) if row[16] else [],
+            'selected_month_dates': json.loads(row[17]) if row[17] else [],
+            'is_today': is_today_meeting,
+            'waiting_room': bool(row[19]),
+            'recording': bool(row[20]),
+            'participants': participant_emails,
+            'status': calculated_status,
+            'link': row[32] or "",
+            'type': row[36] or "ScheduleMeeting",
+            'is_host': is_host,
+            'host_name': row[39] or "",
+            'host_email': row[40] or "",
+        }
+
+    # UNCHANGED: All original meeting data structure
+    meeting = {
+        "ID": str(row[0]),
+        "Meeting_ID": str(row[0]),
+        "Host_ID": row[1],
+        "title": row[2] or "Untitled Meeting",
+        "Meeting_Name": row[35] or row[2] or "Untitled Meeting",
+        "description": row[3] or "",
+        "location": row[4] or "",
+        "start_time": display_start_time,
+        "Started_At": display_start_time,
+        "end_time": display_end_time,
+        "Ended_At": display_end_time,
+        "original_start_time": row[5].isoformat() if row[5] else None,
+        "original_end_time": row[6].isoformat() if row[6] else None,
+        "start_date": row[7].isoformat() if row[7] else None,
+        "end_date": row[8].isoformat() if row[8] else None,
+        "timezone": row[9] or "Asia/Kolkata",
+        "duration_minutes": duration_minutes,
+        "is_recurring": bool(row[11]),
+        "recurrence_type": row[12],
+        "selected_days": json.loads(row[16]) if row[16] else [],
+        "selected_month_dates": json.loads(row[17]) if row[17] else [],
+        "is_today_meeting": is_today_meeting,
+        "settings_waiting_room": bool(row[19]),
+        "settings_recording": bool(row[20]),
+        "email": row[30] or "",
+        "participants": participant_emails,
+
+        # ONLY CHANGE: Use calculated status
+        "Status": calculated_status,
+        "status": calculated_status,
+
+        # UNCHANGED: All remaining original fields
+        "Meeting_Link": row[32] or "",
+        "Meeting_Type": row[36] or "ScheduleMeeting",
+        "is_host": is_host,
+        "host_name": row[39] or "",
+        "host_email": row[40] or "",
+    }
+
+    return meeting
+
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_User_Schedule_Meetings(request):
@@ -4452,11 +4837,15 @@ def Get_User_Schedule_Meetings(request):
                 m.Status, m.Meeting_Link, m.Is_Recording_Enabled, m.Waiting_Room_Enabled,
                 m.Meeting_Name, m.Meeting_Type, m.LiveKit_Room_Name, m.LiveKit_Room_SID,
                 u.full_name as host_full_name, u.email as host_email
-            FROM tbl_ScheduledMeetings sm
+            FROM (
+                SELECT id AS meeting_id FROM tbl_ScheduledMeetings WHERE host_id = %s
+                UNION
+                SELECT Meeting_ID FROM tbl_MeetingInvitees WHERE Email = %s AND Role = 'participant'
+            ) um
+            INNER JOIN tbl_ScheduledMeetings sm ON sm.id = um.meeting_id
             INNER JOIN tbl_Meetings m ON sm.id = m.ID
             LEFT JOIN tbl_Users u ON sm.host_id = u.ID
-            WHERE (sm.host_id = %s OR (sm.email IS NOT NULL AND sm.email LIKE %s))
-              AND m.Status NOT IN ('deleted', 'cancelled', 'recurrence_ended')
+            WHERE m.Status NOT IN ('deleted', 'cancelled', 'recurrence_ended')
               AND (
                   (sm.is_recurring = 0 AND sm.end_time >= %s)
                   OR
@@ -4467,132 +4856,319 @@ def Get_User_Schedule_Meetings(request):
             ORDER BY sm.start_time ASC
             """
             
-            email_pattern = f'%{user_email}%' if user_email else ''
             one_week_ago = current_datetime - timedelta(days=7)
             
             cursor.execute(query, [
-                user_id, email_pattern, current_datetime, current_date, current_date, one_week_ago, current_datetime
+                user_id or None, normalize_email(user_email), current_datetime, current_date, current_date, one_week_ago, current_datetime
             ])
             rows = cursor.fetchall()
 
             logging.info(f"Query returned {len(rows)} meetings for user {user_id}")
 
+            schema = get_response_schema(request)
             meetings = []
             for row in rows:
                 try:
-                    # UNCHANGED: Original participant processing
-                    participant_emails = []
-                    if row[30] and isinstance(row[30], str):
-                        participant_emails = [email.strip() for email in row[30].split(',') if email.strip()]
-                    
-                    is_host = str(row[1]) == str(user_id)
-                    is_participant = user_email in participant_emails if user_email else False
-                    
-                    if is_host or is_participant:
-                        # UNCHANGED: Original recurring meeting logic
-                        display_start_time = row[5].isoformat() if row[5] else None
-                        display_end_time = row[6].isoformat() if row[6] else None
-                        is_today_meeting = False
-                        duration_minutes = row[10] or 60
-                        
-                        if row[11]:  # is_recurring - UNCHANGED logic
-                            try:
-                                meeting_data = {
-                                    'start_time': display_start_time,
-                                    'end_time': display_end_time,
-                                    'is_recurring': True,
-                                    'recurrence_type': row[12],
-                                    'recurrence_interval': row[13] or 1,
-                                    'recurrence_end_date': row[15].isoformat() if row[15] else None,
-                                    'selected_days': row[16],
-                                    'selected_month_dates': row[17],
-                                    'monthly_pattern': row[18] or 'same-date'
-                                }
-                                
-                                next_occurrence = calculate_next_occurrence(meeting_data, current_datetime)
-                                if next_occurrence:
-                                    display_start_time = next_occurrence['next_start_time']
-                                    display_end_time = next_occurrence['next_end_time']
-                                    is_today_meeting = next_occurrence.get('is_today', False)
-                            except Exception as e:
-                                logging.error(f"Error calculating next occurrence: {e}")
-
-                        # ONLY CHANGE: Calculate status based on display times
-                        start_dt = None
-                        end_dt = None
-                        if display_start_time:
-                            start_dt = datetime.fromisoformat(display_start_time.replace('Z', '+00:00')) if isinstance(display_start_time, str) else display_start_time
-                        if display_end_time:
-                            end_dt = datetime.fromisoformat(display_end_time.replace('Z', '+00:00')) if isinstance(display_end_time, str) else display_end_time
-                            
-                        calculated_status = calculate_meeting_status(start_dt, end_dt, duration_minutes)
-
-                        # UNCHANGED: All original meeting data structure
-                        meeting = {
-                            "ID": str(row[0]),
-                            "Meeting_ID": str(row[0]),
-                            "Host_ID": row[1],
-                            "title": row[2] or "Untitled Meeting",
-                            "Meeting_Name": row[35] or row[2] or "Untitled Meeting",
-                            "description": row[3] or "",
-                            "location": row[4] or "",
-                            "start_time": display_start_time,
-                            "Started_At": display_start_time,
-                            "end_time": display_end_time,
-                            "Ended_At": display_end_time,
-                            "original_start_time": row[5].isoformat() if row[5] else None,
-                            "original_end_time": row[6].isoformat() if row[6] else None,
-                            "start_date": row[7].isoformat() if row[7] else None,
-                            "end_date": row[8].isoformat() if row[8] else None,
-                            "timezone": row[9] or "Asia/Kolkata",
-                            "duration_minutes": duration_minutes,
-                            "is_recurring": bool(row[11]),
-                            "recurrence_type": row[12],
-                            "selected_days": json.loads(row[16]) if row[16] else [],
-                            "selected_month_dates": json.loads(row[17]) if row[17] else [],
-                            "is_today_meeting": is_today_meeting,
-                            "settings_waiting_room": bool(row[19]),
-                            "settings_recording": bool(row[20]),
-                            "email": row[30] or "",
-                            "participants": participant_emails,
-                            
-                            # ONLY CHANGE: Use calculated status
-                            "Status": calculated_status,
-                            "status": calculated_status,
-                            
-                            # UNCHANGED: All remaining original fields
-                            "Meeting_Link": row[32] or "",
-                            "Meeting_Type": row[36] or "ScheduleMeeting",
-                            "is_host": is_host,
-                            "host_name": row[39] or "",
-                            "host_email": row[40] or "",
-                        }
-                        
+                    meeting = format_schedule_meeting_row(row, user_id, user_email, current_datetime, schema)
+                    if meeting:
                         meetings.append(meeting)
-                        
+
                 except Exception as row_error:
                     logging.error(f"Error processing meeting row: {row_error}")
                     continue
 
             # UNCHANGED: Original sorting and response structure
-            meetings.sort(key=lambda m: m.get('start_time') or '9999-12-31')
+            start_key, today_key = ('start', 'is_today') if schema == SCHEMA_V2 else ('start_time', 'is_today_meeting')
+            meetings.sort(key=lambda m: m.get(start_key) or '9999-12-31')
             
             response_data = {
-                "meetings": meetings,
+                "meetings": project_items(request, meetings),
                 "summary": {
                     "total_meetings": len(meetings),
                     "recurring_meetings": len([m for m in meetings if m.get('is_recurring')]),
-                    "todays_meetings": len([m for m in meetings if m.get('is_today_meeting')]),
+                    "todays_meetings": len([m for m in meetings if m.get(today_key)]),
                 }
             }
+            if schema == SCHEMA_V2:
+                response_data["schema"] = SCHEMA_V2
             
             logging.info(f"Retrieved {len(meetings)} meetings with calculated statuses")
-            return JsonResponse(response_data, safe=False, status=200)
+            return conditional_json_response(request, response_data)
             
     except Exception as e:
         logging.error(f"Error in Get_User_Schedule_Meetings: {e}")
         return JsonResponse({"Error": f"Database error: {str(e)}"}, status=500)
 
+def format_calendar_meeting_row(row, user_id=None, user_email=None, schema=SCHEMA_V1):
+    """Build the calendar meeting dict (v1 or compact v2) for one tbl_CalendarMeetings row"""
+    # ONLY CHANGE: Calculate real-time status
+    started_at = row[3]  # startTime
+    ended_at = row[4]    # endTime
+    duration_minutes = row[5] or 60  # duration
+    stored_status = row[19]  # m.Status
+
+    calculated_status = calculate_meeting_status(started_at, ended_at, duration_minutes)
+
+    # UNCHANGED: All original email parsing logic
+    guest_emails_raw = row[7]
+    attendees_raw = row[11]
+
+    guest_emails_list = parse_enhanced_guest_emails(guest_emails_raw, "guestEmails")
+    attendees_list = parse_enhanced_guest_emails(attendees_raw, "attendees")
+
+    if len(guest_emails_list) >= len(attendees_list):
+        final_email_list = guest_emails_list
+        primary_source = "guestEmails"
+    else:
+        final_email_list = attendees_list  
+        primary_source = "attendees"
+
+    if len(guest_emails_list) > 0 and len(attendees_list) > 0:
+        all_emails = set(guest_emails_list + attendees_list)
+        if len(all_emails) > len(final_email_list):
+            final_email_list = list(all_emails)
+            primary_source = "merged"
+
+    reminder_minutes = parse_reminder_minutes(row[12])
+
+    is_host = str(row[1]) == str(user_id) if user_id else False
+    is_participant = False
+
+    if user_email:
+        is_participant = (
+            user_email.lower() in [email.lower() for email in final_email_list] or 
+            user_email.lower() == (row[6] or '').lower()
+        )
+
+    if schema == SCHEMA_V2:
+        return {
+            'id': str(row[0]),
+            'host_id': row[1],
+            'title': row[2] or row[25] or 'Untitled Meeting',
+            'start': row[3].isoformat() if row[3] else None,
+            'end': row[4].isoformat() if row[4] else None,
+            'duration': row[5] or 60,
+            'organizer': row[6],
+            'guests': final_email_list,
+            'provider': row[8] or 'internal',
+            'link': row[9],
+            'location': row[10] or '',
+            'reminders': reminder_minutes,
+            'settings': {
+                'createCalendarEvent': bool(row[13]),
+                'sendInvitations': bool(row[14]),
+                'setReminders': bool(row[15]),
+                'addMeetingLink': bool(row[16]),
+            },
+            'calendar_settings': {
+                'addToHostCalendar': bool(row[17]) if row[17] is not None else True,
+                'addToParticipantCalendars': bool(row[18]) if row[18] is not None else True,
+                'reminderTimes': reminder_minutes
+            },
+            'status': calculated_status,
+            'created_at': row[19].isoformat() if row[19] else None,
+            'recording': bool(row[20]),
+            'waiting_room': bool(row[21]),
+            'livekit_room': row[22] if len(row) > 22 else None,
+            'livekit_sid': row[23] if len(row) > 23 else None,
+            'role': 'host' if is_host else 'participant',
+            'participant_count': len(final_email_list),
+            'type': 'calendar',
+            'series_id': None,
+        }
+
+    # UNCHANGED: All original meeting data structure
+    meeting = {
+        'ID': str(row[0]),
+        'id': str(row[0]),
+        'meeting_id': str(row[0]),
+        'Meeting_ID': str(row[0]),
+
+        'Host_ID': row[1],
+        'host_id': row[1],
+        'title': row[2] or row[25] or 'Untitled Meeting',
+        'Meeting_Name': row[2] or row[25] or 'Untitled Meeting',
+        'meetingTitle': row[2] or row[25] or 'Untitled Meeting',
+
+        'startTime': row[3].isoformat() if row[3] else None,
+        'Started_At': row[3].isoformat() if row[3] else None,
+        'start_time': row[3].isoformat() if row[3] else None,
+        'meetingStartTime': row[3].isoformat() if row[3] else None,
+
+        'endTime': row[4].isoformat() if row[4] else None,
+        'Ended_At': row[4].isoformat() if row[4] else None,
+        'end_time': row[4].isoformat() if row[4] else None,
+        'meetingEndTime': row[4].isoformat() if row[4] else None,
+
+        'duration': row[5] or 60,
+        'Duration_Minutes': row[5] or 60,
+        'meetingDuration': row[5] or 60,
+
+        'email': row[6],
+        'organizer': row[6],
+
+        # UNCHANGED: All email fields
+        'guestEmails': final_email_list,
+        'guestEmailsRaw': guest_emails_raw or '',
+        'guest_emails': final_email_list,
+        'attendees': final_email_list,
+        'attendee_emails': final_email_list,
+        'participants': final_email_list,
+        'participantEmails': final_email_list,
+        'Participants': final_email_list,
+        'attendeesRaw': attendees_raw or '',
+
+        'provider': row[8] or 'internal',
+        'Provider': row[8] or 'internal',
+        'Meeting_Link': row[9],
+        'meetingUrl': row[9],
+        'meeting_url': row[9],
+        'location': row[10] or '',
+        'Location': row[10] or '',
+
+        'reminderMinutes': reminder_minutes,
+        'ReminderMinutes': reminder_minutes,
+
+        'Settings': {
+            'createCalendarEvent': bool(row[13]),
+            'sendInvitations': bool(row[14]),
+            'setReminders': bool(row[15]),
+            'addMeetingLink': bool(row[16]),
+        },
+
+        'Settings_CreateCalendarEvent': bool(row[13]),
+        'Settings_SendInvitations': bool(row[14]),
+        'Settings_SetReminders': bool(row[15]),
+        'Settings_AddMeetingLink': bool(row[16]),
+
+        'CalendarSettings': {
+            'addToHostCalendar': bool(row[17]) if row[17] is not None else True,
+            'addToParticipantCalendars': bool(row[18]) if row[18] is not None else True,
+            'reminderTimes': reminder_minutes
+        },
+        'Settings_AddToHostCalendar': bool(row[17]) if row[17] is not None else True,
+        'Settings_AddToParticipantCalendars': bool(row[18]) if row[18] is not None else True,
+
+        # ONLY CHANGE: Use calculated status
+        'Status': calculated_status,
+        'status': calculated_status,
+
+        # UNCHANGED: All remaining fields
+        'CreatedAt': row[19].isoformat() if row[19] else None,
+        'Is_Recording_Enabled': bool(row[20]),
+        'recordingEnabled': bool(row[20]),
+        'Waiting_Room_Enabled': bool(row[21]),
+        'waitingRoomEnabled': bool(row[21]),
+        'type': 'calendar',
+
+        'LiveKit_Room_Name': row[22] if len(row) > 22 else None,
+        'LiveKit_Room_SID': row[23] if len(row) > 23 else None,
+
+        'is_host': is_host,
+        'is_participant': is_participant,
+        'user_role': 'host' if is_host else 'participant',
+
+        'participant_count': len(final_email_list),
+        'has_participants': len(final_email_list) > 0
+    }
+
+    return meeting
+
+
+def format_series_occurrence(series, occurrence_start, occurrence_end, user_id=None, user_email=None, schema=SCHEMA_V1):
+    """Calendar-shaped dict (v1 or compact v2) for one expanded occurrence of a scheduled meeting"""
+    participant_emails = [email.strip() for email in series['email'].split(',') if email.strip()]
+    is_host = str(series['host_id']) == str(user_id) if user_id else False
+    duration_minutes = int((occurrence_end - occurrence_start).total_seconds() // 60)
+    calculated_status = calculate_meeting_status(occurrence_start, occurrence_end, duration_minutes)
+    occurrence_id = f"{series['id']}:{occurrence_start.strftime('%Y%m%dT%H%M')}"
+
+    if schema == SCHEMA_V2:
+        return {
+            'id': occurrence_id,
+            'host_id': series['host_id'],
+            'title': series['title'],
+            'start': occurrence_start.isoformat(),
+            'end': occurrence_end.isoformat(),
+            'duration': duration_minutes,
+            'organizer': participant_emails[0] if participant_emails else '',
+            'guests': participant_emails,
+            'provider': 'internal',
+            'link': series['meeting_link'],
+            'location': series['location'],
+            'reminders': None,
+            'settings': None,
+            'calendar_settings': None,
+            'status': calculated_status,
+            'created_at': None,
+            'recording': None,
+            'waiting_room': None,
+            'livekit_room': None,
+            'livekit_sid': None,
+            'role': 'host' if is_host else 'participant',
+            'participant_count': len(participant_emails),
+            'type': 'schedule_occurrence',
+            'series_id': series['id'],
+        }
+
+    return {
+        'ID': occurrence_id,
+        'id': occurrence_id,
+        'meeting_id': series['id'],
+        'Meeting_ID': series['id'],
+        'series_id': series['id'],
+
+        'Host_ID': series['host_id'],
+        'host_id': series['host_id'],
+        'title': series['title'],
+        'Meeting_Name': series['title'],
+        'meetingTitle': series['title'],
+
+        'startTime': occurrence_start.isoformat(),
+        'start_time': occurrence_start.isoformat(),
+        'endTime': occurrence_end.isoformat(),
+        'end_time': occurrence_end.isoformat(),
+        'duration': duration_minutes,
+        'Duration_Minutes': duration_minutes,
+
+        'email': participant_emails[0] if participant_emails else '',
+        'guestEmails': participant_emails,
+        'participants': participant_emails,
+        'provider': 'internal',
+        'Meeting_Link': series['meeting_link'],
+        'meetingUrl': series['meeting_link'],
+        'location': series['location'],
+
+        'Status': calculated_status,
+        'status': calculated_status,
+        'is_recurring': series['is_recurring'],
+        'recurrence_type': series['recurrence_type'],
+        'type': 'schedule_occurrence',
+
+        'is_host': is_host,
+        'is_participant': not is_host,
+        'user_role': 'host' if is_host else 'participant',
+        'participant_count': len(participant_emails),
+        'has_participants': len(participant_emails) > 0,
+    }
+
+
+def parse_calendar_window(start_date, end_date):
+    """(window_start, window_end) for expand_recurring, or None if the window is missing or too long"""
+    from core.utils.date_utils import parse_datetime_safely
+
+    window_start = parse_datetime_safely(start_date) if start_date else None
+    window_end = parse_datetime_safely(end_date) if end_date else None
+    if not window_start or not window_end:
+        return None
+    if len(end_date) == 10:
+        # A date-only end_date includes that whole day
+        window_end += timedelta(days=1)
+    if window_end <= window_start or window_end - window_start > timedelta(days=CALENDAR_WINDOW_MAX_DAYS):
+        return None
+    return window_start, window_end
+
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def Get_User_Calendar_Meetings(request):
@@ -4606,6 +5182,17 @@ def Get_User_Calendar_Meetings(request):
         if not user_id and not user_email:
             return JsonResponse({"Error": "User ID or email required"}, status=400)
         
+        # expand_recurring=1 adds every occurrence of the user's scheduled series
+        # inside [start_date, end_date], so a month view needs one request
+        expand_recurring = str(request.GET.get('expand_recurring', '')).lower() in ('1', 'true', 'yes')
+        calendar_window = None
+        if expand_recurring:
+            calendar_window = parse_calendar_window(start_date, end_date)
+            if not calendar_window:
+                return JsonResponse({
+                    "Error": f"expand_recurring needs start_date and end_date at most {CALENDAR_WINDOW_MAX_DAYS} days apart"
+                }, status=400)
+        
         with connection.cursor() as cursor:
             # UNCHANGED: Original comprehensive query
             base_query = """
@@ -4617,26 +5204,19 @@ def Get_User_Calendar_Meetings(request):
                 cm.Settings_AddToHostCalendar, cm.Settings_AddToParticipantCalendars,
                 cm.CreatedAt, m.Status, m.Is_Recording_Enabled, m.Waiting_Room_Enabled,
                 m.LiveKit_Room_Name, m.LiveKit_Room_SID, m.Meeting_Name as meeting_name
-            FROM tbl_CalendarMeetings cm
+            FROM (
+                SELECT ID AS meeting_id FROM tbl_CalendarMeetings WHERE Host_ID = %s
+                UNION
+                SELECT Meeting_ID FROM tbl_MeetingInvitees WHERE Email = %s
+            ) um
+            INNER JOIN tbl_CalendarMeetings cm ON cm.ID = um.meeting_id
             INNER JOIN tbl_Meetings m ON cm.ID = m.ID
-            WHERE (
-                cm.Host_ID = %s 
-                OR (cm.guestEmails IS NOT NULL AND cm.guestEmails LIKE %s)
-                OR (cm.attendees IS NOT NULL AND cm.attendees LIKE %s)
-                OR (cm.email = %s)
-            )
-            AND m.Status NOT IN ('deleted', 'cancelled')
+            WHERE m.Status NOT IN ('deleted', 'cancelled')
             """
             
-            # UNCHANGED: Original parameter building
-            params = []
-            if user_id:
-                params.append(user_id)
-            else:
-                params.append(None)
-                
-            email_pattern = f'%{user_email}%' if user_email else '%'
-            params.extend([email_pattern, email_pattern, user_email or ''])
+            # Host match plus an indexed invitee lookup (organizer, guest or attendee),
+            # joined as a derived table so MySQL does not run it as a dependent subquery
+            params = [user_id or None, normalize_email(user_email)]
             
             if start_date and end_date:
                 base_query += " AND cm.startTime BETWEEN %s AND %s"
@@ -4653,150 +5233,34 @@ def Get_User_Calendar_Meetings(request):
             cursor.execute(base_query, params)
             rows = cursor.fetchall()
             
+            schema = get_response_schema(request)
             meetings = []
             for row in rows:
                 try:
-                    # ONLY CHANGE: Calculate real-time status
-                    started_at = row[3]  # startTime
-                    ended_at = row[4]    # endTime
-                    duration_minutes = row[5] or 60  # duration
-                    stored_status = row[19]  # m.Status
-                    
-                    calculated_status = calculate_meeting_status(started_at, ended_at, duration_minutes)
-                    
-                    # UNCHANGED: All original email parsing logic
-                    guest_emails_raw = row[7]
-                    attendees_raw = row[11]
-                    
-                    guest_emails_list = parse_enhanced_guest_emails(guest_emails_raw, "guestEmails")
-                    attendees_list = parse_enhanced_guest_emails(attendees_raw, "attendees")
-                    
-                    if len(guest_emails_list) >= len(attendees_list):
-                        final_email_list = guest_emails_list
-                        primary_source = "guestEmails"
-                    else:
-                        final_email_list = attendees_list  
-                        primary_source = "attendees"
-                    
-                    if len(guest_emails_list) > 0 and len(attendees_list) > 0:
-                        all_emails = set(guest_emails_list + attendees_list)
-                        if len(all_emails) > len(final_email_list):
-                            final_email_list = list(all_emails)
-                            primary_source = "merged"
-                    
-                    reminder_minutes = parse_reminder_minutes(row[12])
-                    
-                    is_host = str(row[1]) == str(user_id) if user_id else False
-                    is_participant = False
-                    
-                    if user_email:
-                        is_participant = (
-                            user_email.lower() in [email.lower() for email in final_email_list] or 
-                            user_email.lower() == (row[6] or '').lower()
-                        )
-                    
-                    # UNCHANGED: All original meeting data structure
-                    meeting = {
-                        'ID': str(row[0]),
-                        'id': str(row[0]),
-                        'meeting_id': str(row[0]),
-                        'Meeting_ID': str(row[0]),
-                        
-                        'Host_ID': row[1],
-                        'host_id': row[1],
-                        'title': row[2] or row[25] or 'Untitled Meeting',
-                        'Meeting_Name': row[2] or row[25] or 'Untitled Meeting',
-                        'meetingTitle': row[2] or row[25] or 'Untitled Meeting',
-                        
-                        'startTime': row[3].isoformat() if row[3] else None,
-                        'Started_At': row[3].isoformat() if row[3] else None,
-                        'start_time': row[3].isoformat() if row[3] else None,
-                        'meetingStartTime': row[3].isoformat() if row[3] else None,
-                        
-                        'endTime': row[4].isoformat() if row[4] else None,
-                        'Ended_At': row[4].isoformat() if row[4] else None,
-                        'end_time': row[4].isoformat() if row[4] else None,
-                        'meetingEndTime': row[4].isoformat() if row[4] else None,
-                        
-                        'duration': row[5] or 60,
-                        'Duration_Minutes': row[5] or 60,
-                        'meetingDuration': row[5] or 60,
-                        
-                        'email': row[6],
-                        'organizer': row[6],
-                        
-                        # UNCHANGED: All email fields
-                        'guestEmails': final_email_list,
-                        'guestEmailsRaw': guest_emails_raw or '',
-                        'guest_emails': final_email_list,
-                        'attendees': final_email_list,
-                        'attendee_emails': final_email_list,
-                        'participants': final_email_list,
-                        'participantEmails': final_email_list,
-                        'Participants': final_email_list,
-                        'attendeesRaw': attendees_raw or '',
-                        
-                        'provider': row[8] or 'internal',
-                        'Provider': row[8] or 'internal',
-                        'Meeting_Link': row[9],
-                        'meetingUrl': row[9],
-                        'meeting_url': row[9],
-                        'location': row[10] or '',
-                        'Location': row[10] or '',
-                        
-                        'reminderMinutes': reminder_minutes,
-                        'ReminderMinutes': reminder_minutes,
-                        
-                        'Settings': {
-                            'createCalendarEvent': bool(row[13]),
-                            'sendInvitations': bool(row[14]),
-                            'setReminders': bool(row[15]),
-                            'addMeetingLink': bool(row[16]),
-                        },
-                        
-                        'Settings_CreateCalendarEvent': bool(row[13]),
-                        'Settings_SendInvitations': bool(row[14]),
-                        'Settings_SetReminders': bool(row[15]),
-                        'Settings_AddMeetingLink': bool(row[16]),
-                        
-                        'CalendarSettings': {
-                            'addToHostCalendar': bool(row[17]) if row[17] is not None else True,
-                            'addToParticipantCalendars': bool(row[18]) if row[18] is not None else True,
-                            'reminderTimes': reminder_minutes
-                        },
-                        'Settings_AddToHostCalendar': bool(row[17]) if row[17] is not None else True,
-                        'Settings_AddToParticipantCalendars': bool(row[18]) if row[18] is not None else True,
-                        
-                        # ONLY CHANGE: Use calculated status
-                        'Status': calculated_status,
-                        'status': calculated_status,
-                        
-                        # UNCHANGED: All remaining fields
-                        'CreatedAt': row[19].isoformat() if row[19] else None,
-                        'Is_Recording_Enabled': bool(row[20]),
-                        'recordingEnabled': bool(row[20]),
-                        'Waiting_Room_Enabled': bool(row[21]),
-                        'waitingRoomEnabled': bool(row[21]),
-                        'type': 'calendar',
-                        
-                        'LiveKit_Room_Name': row[22] if len(row) > 22 else None,
-                        'LiveKit_Room_SID': row[23] if len(row) > 23 else None,
-                        
-                        'is_host': is_host,
-                        'is_participant': is_participant,
-                        'user_role': 'host' if is_host else 'participant',
-                        
-                        'participant_count': len(final_email_list),
-                        'has_participants': len(final_email_list) > 0
-                    }
-                    
+                    meeting = format_calendar_meeting_row(row, user_id, user_email, schema)
                     meetings.append(meeting)
                     
                 except Exception as row_error:
                     logging.error(f"Error processing meeting row: {row_error}")
                     continue
-            
-            return JsonResponse(meetings, safe=False, status=200)
+
+            if calendar_window:
+                for series, occurrence_start, occurrence_end in list_user_series_occurrences(
+                    user_id, normalize_email(user_email), *calendar_window
+                ):
+                    meetings.append(format_series_occurrence(series, occurrence_start, occurrence_end, user_id, user_email, schema))
+                start_key = 'start' if schema == SCHEMA_V2 else 'startTime'
+                meetings.sort(key=lambda m: m.get(start_key) or '', reverse=True)
+
+            # v1 keeps the bare list the frontend expects; v2 is wrapped and versioned
+            meetings = project_items(request, meetings)
+            if schema == SCHEMA_V2:
+                return conditional_json_response(request, {
+                    "schema": SCHEMA_V2,
+                    "count": len(meetings),
+                    "meetings": meetings,
+                })
+            return conditional_json_response(request, meetings)
             
     except Exception as e:
         import traceback
@@ -4810,7 +5274,7 @@ def Get_User_Calendar_Meetings(request):
 # meetings.py - FIXED LiveKit join_livekit_meeting function
 @require_http_methods(["POST"])
 @csrf_exempt
-def join_livekit_meeting(request):
+async def join_livekit_meeting(request):
     """FIXED: Fast join for 50+ participants with proper parameter validation"""
     try:
         logging.info("🚀 LiveKit join request received")
@@ -4908,32 +5372,29 @@ def join_livekit_meeting(request):
         livekit_room_name = None
         
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT Host_ID, Meeting_Name, Status, LiveKit_Room_Name 
-                    FROM tbl_Meetings 
-                    WHERE ID = %s
-                """, [meeting_id])
+            # Cached meeting row; the lookup runs in a worker thread on a miss
+            meeting_info = await get_meeting_info_cached(meeting_id)
+            if meeting_info:
+                host_id = meeting_info['host_id']
+                meeting_name = meeting_info['meeting_name']
+                status = meeting_info['status']
+                livekit_room_name = meeting_info['livekit_room_name']
+                logging.info(f"📋 Found meeting: {meeting_name} (Status: {status})")
                 
-                meeting_row = cursor.fetchone()
-                if meeting_row:
-                    host_id, meeting_name, status, livekit_room_name = meeting_row
-                    logging.info(f"📋 Found meeting: {meeting_name} (Status: {status})")
-                    
-                    if status and status.lower() == 'ended':
-                        return JsonResponse({
-                            'error': 'Meeting has ended',
-                            'meeting_id': meeting_id,
-                            'meeting_name': meeting_name,
-                            'status': status
-                        }, status=400)
-                else:
-                    logging.error(f"Meeting not found: {meeting_id}")
+                if status and status.lower() == 'ended':
                     return JsonResponse({
-                        'error': 'Meeting not found',
+                        'error': 'Meeting has ended',
                         'meeting_id': meeting_id,
-                        'details': 'No meeting exists with the provided ID'
-                    }, status=404)
+                        'meeting_name': meeting_name,
+                        'status': status
+                    }, status=400)
+            else:
+                logging.error(f"Meeting not found: {meeting_id}")
+                return JsonResponse({
+                    'error': 'Meeting not found',
+                    'meeting_id': meeting_id,
+                    'details': 'No meeting exists with the provided ID'
+                }, status=404)
                         
         except Exception as db_error:
             logging.error(f"Database error: {db_error}")
@@ -5005,45 +5466,17 @@ def join_livekit_meeting(request):
                 'participant_identity': participant_identity
             }, status=500)
         
-        # FIXED: Record participant join asynchronously (non-blocking)
-        try:
-            ist_timezone = pytz.timezone("Asia/Kolkata")
-            join_time = timezone.now().astimezone(ist_timezone)
-            
-            with connection.cursor() as cursor:
-                # Check if participant already exists
-                cursor.execute("""
-                    SELECT ID FROM tbl_Participants 
-                    WHERE Meeting_ID = %s AND User_ID = %s AND Leave_Time IS NULL
-                """, [meeting_id, user_id])
-                
-                existing = cursor.fetchone()
-                if not existing:
-                    # Insert new participant record
-                    cursor.execute("""
-                        INSERT INTO tbl_Participants 
-                        (Meeting_ID, User_ID, Full_Name, Join_Time, Role, Status)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, [meeting_id, user_id, user_name, join_time, participant_role, 'active'])
-                    
-                    logging.info(f"✅ Participant join recorded for user {user_id}")
-                else:
-                    # Update existing record
-                    cursor.execute("""
-                        UPDATE tbl_Participants 
-                        SET Join_Time = %s, Status = %s, Full_Name = %s
-                        WHERE Meeting_ID = %s AND User_ID = %s AND Leave_Time IS NULL
-                    """, [join_time, 'active', user_name, meeting_id, user_id])
-                    
-                    logging.info(f"✅ Updated existing participant record for user {user_id}")
-                        
-        except Exception as participant_error:
-            logging.warning(f"Failed to record participant join (non-critical): {participant_error}")
+        # FIXED: Record participant join off the event loop (failures are non-critical)
+        await record_participant_join_async(
+            meeting_id, user_id, user_name, is_host_user, meeting_info.get('meeting_type')
+        )
         
         # SUCCESS: Fast response for immediate connection
         response_data = {
             'success': True,
             'access_token': access_token,
+            # Authenticates ws/meeting/<id>/?token= as this user
+            'ws_token': issue_meeting_socket_token(meeting_id, user_id),
             'room_name': room_name,
             'participant_identity': participant_identity,
             'livekit_url': LIVEKIT_CONFIG['url'],
@@ -5180,9 +5613,109 @@ def bulk_send_invitations(request):
         logging.error(f"Error in bulk_send_invitations: {e}")
         return JsonResponse({"error": f"Server error: {str(e)}"}, status=500)
 
+def _livekit_has_user(participants: List[Dict], user_id) -> bool:
+    """True when any LiveKit participant's identity or metadata belongs to user_id"""
+    for p in participants:
+        identity = p.get('identity', '')
+        metadata = p.get('metadata', {})
+        
+        # Check if this participant matches our user
+        if str(user_id) in identity:
+            return True
+        
+        # Also check metadata
+        if isinstance(metadata, dict) and str(metadata.get('user_id')) == str(user_id):
+            return True
+        elif isinstance(metadata, str):
+            try:
+                meta_dict = json.loads(metadata)
+                if str(meta_dict.get('user_id')) == str(user_id):
+                    return True
+            except:
+                pass
+    return False
+
+def _record_livekit_leave(meeting_id, user_id, leave_reason):
+    """Database side of a leave: participant leave record + attendance stop"""
+    # UPDATED: Record participant leave with immediate processing
+    try:
+        participant_data = {
+            'meeting_id': meeting_id,
+            'user_id': user_id,
+            'event_type': 'leave',
+            'action': 'leave',
+            'reason': leave_reason,
+            'manual_leave': True,
+            'source': 'livekit_leave_endpoint',
+            'immediate': True
+        }
+        
+        from types import SimpleNamespace
+        mock_request = SimpleNamespace()
+        mock_request.body = json.dumps(participant_data).encode()
+        mock_request.method = 'POST'
+        
+        participant_response = record_participant_leave(mock_request)
+        
+        leave_recorded = False
+        if hasattr(participant_response, 'content'):
+            participant_result = json.loads(participant_response.content.decode())
+            if participant_result.get('success'):
+                leave_recorded = True
+                logging.info(f"✅ Immediate participant leave recorded for user {user_id}")
+            else:
+                logging.warning(f"⚠️ Failed to record participant leave: {participant_result}")
+                
+    except Exception as participant_error:
+        logging.warning(f"Failed to record participant leave: {participant_error}")
+        leave_recorded = False
+    
+    # ========== ATTENDANCE INTEGRATION ==========
+    # Stop attendance tracking before leaving
+    try:
+        attendance_stopped = stop_attendance_tracking(meeting_id, user_id)
+        if attendance_stopped:
+            logging.info(f"✅ ATTENDANCE: Stopped tracking for user {user_id} in meeting {meeting_id}")
+            attendance_tracking_stopped = True
+        else:
+            logging.warning(f"⚠️ ATTENDANCE: No active tracking found for user {user_id}")
+            attendance_tracking_stopped = False
+    except Exception as attendance_error:
+        logging.error(f"❌ ATTENDANCE: Error stopping tracking: {attendance_error}")
+        attendance_tracking_stopped = False
+    # ============================================
+    
+    return leave_recorded, attendance_tracking_stopped
+
+async def _verify_livekit_leave(room_name: str, user_id) -> Dict:
+    """ADDED: Verify user is really gone from LiveKit (bounded to 2 seconds)"""
+    try:
+        current_participants = await asyncio.wait_for(
+            livekit_service.alist_participants(room_name), timeout=2
+        )
+    except Exception as e:
+        logging.warning(f"Could not verify LiveKit leave status: {e}")
+        return {
+            'user_still_in_livekit': False,
+            'verification_completed': False,
+            'error': str(e) or 'timeout'
+        }
+    
+    user_still_in_livekit = _livekit_has_user(current_participants, user_id)
+    if not user_still_in_livekit:
+        logging.info(f"✅ Verified: User {user_id} is no longer in LiveKit room {room_name}")
+    else:
+        logging.warning(f"⚠️ User {user_id} still appears in LiveKit after leave attempt")
+    
+    return {
+        'user_still_in_livekit': user_still_in_livekit,
+        'verification_completed': True,
+        'remaining_participants': len(current_participants)
+    }
+
 @require_http_methods(["POST"])
 @csrf_exempt
-def leave_livekit_meeting(request):
+async def leave_livekit_meeting(request):
     """UPDATED: Leave a LiveKit meeting with attendance tracking integration"""
     if not LIVEKIT_ENABLED:
         return JsonResponse({'error': 'LiveKit service not available'}, status=503)
@@ -5200,147 +5733,39 @@ def leave_livekit_meeting(request):
         
         room_name = f"meeting_{meeting_id}"
         
-        # Get actual room name from database
+        # Get actual room name (cached meeting row)
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT LiveKit_Room_Name FROM tbl_Meetings WHERE ID = %s", [meeting_id])
-                row = cursor.fetchone()
-                if row and row[0]:
-                    room_name = row[0]
+            meeting_info = await get_meeting_info_cached(meeting_id)
+            if meeting_info and meeting_info['livekit_room_name']:
+                room_name = meeting_info['livekit_room_name']
         except Exception as e:
             logging.warning(f"Could not get room name from database: {e}")
         
-        # FIXED: Remove from LiveKit room with timeout protection
-        try:
-            if participant_identity:
-                import signal
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("LiveKit remove timeout")
-                
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(2)  # FIXED: 2 second timeout
-                
-                try:
-                    livekit_service.remove_participant(room_name, participant_identity)
+        # FIXED: Remove from LiveKit room with a 2 second timeout
+        # (asyncio timeout instead of SIGALRM, which only works in the main thread)
+        if participant_identity:
+            try:
+                removed = await asyncio.wait_for(
+                    livekit_service.aremove_participant(room_name, participant_identity), timeout=2
+                )
+                if removed:
                     logging.info(f"✅ Removed participant {participant_identity} from LiveKit room")
-                except AttributeError:
-                    # remove_participant method might not exist, that's okay
-                    logging.info(f"ℹ️ LiveKit will handle participant removal automatically")
-                except Exception as remove_error:
-                    logging.warning(f"Could not remove participant from LiveKit: {remove_error}")
-                finally:
-                    signal.alarm(0)
-        except (TimeoutError, Exception) as e:
-            logging.warning(f"LiveKit removal timeout/error: {e}")
-        
-        # UPDATED: Record participant leave with immediate processing
-        try:
-            participant_data = {
-                'meeting_id': meeting_id,
-                'user_id': user_id,
-                'event_type': 'leave',
-                'action': 'leave',
-                'reason': leave_reason,
-                'manual_leave': True,
-                'source': 'livekit_leave_endpoint',
-                'immediate': True
-            }
-            
-            from types import SimpleNamespace
-            mock_request = SimpleNamespace()
-            mock_request.body = json.dumps(participant_data).encode()
-            mock_request.method = 'POST'
-            
-            participant_response = record_participant_leave(mock_request)
-            
-            leave_recorded = False
-            if hasattr(participant_response, 'content'):
-                participant_result = json.loads(participant_response.content.decode())
-                if participant_result.get('success'):
-                    leave_recorded = True
-                    logging.info(f"✅ Immediate participant leave recorded for user {user_id}")
                 else:
-                    logging.warning(f"⚠️ Failed to record participant leave: {participant_result}")
-                    
-        except Exception as participant_error:
-            logging.warning(f"Failed to record participant leave: {participant_error}")
-            leave_recorded = False
+                    logging.info(f"ℹ️ LiveKit will handle participant removal automatically")
+            except Exception as e:
+                logging.warning(f"LiveKit removal timeout/error: {e}")
         
-        # ADDED: Verify user is really gone from LiveKit with timeout protection
+        # Database work (worker thread) and LiveKit verification run concurrently
         verification_result = {'user_still_in_livekit': False, 'verification_completed': False}
-        
         if LIVEKIT_ENABLED and livekit_service:
-            try:
-                import signal
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("Verification timeout")
-                
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(2)  # FIXED: 2 second timeout for verification
-                
-                try:
-                    current_participants = livekit_service.list_participants(room_name)
-                    user_still_in_livekit = False
-                    
-                    for p in current_participants:
-                        identity = p.get('identity', '')
-                        metadata = p.get('metadata', {})
-                        
-                        # Check if this participant matches our user
-                        if str(user_id) in identity:
-                            user_still_in_livekit = True
-                            break
-                        
-                        # Also check metadata
-                        if isinstance(metadata, dict) and str(metadata.get('user_id')) == str(user_id):
-                            user_still_in_livekit = True
-                            break
-                        elif isinstance(metadata, str):
-                            try:
-                                meta_dict = json.loads(metadata)
-                                if str(meta_dict.get('user_id')) == str(user_id):
-                                    user_still_in_livekit = True
-                                    break
-                            except:
-                                pass
-                    
-                    verification_result = {
-                        'user_still_in_livekit': user_still_in_livekit,
-                        'verification_completed': True,
-                        'remaining_participants': len(current_participants)
-                    }
-                    
-                    if not user_still_in_livekit:
-                        logging.info(f"✅ Verified: User {user_id} is no longer in LiveKit room {room_name}")
-                    else:
-                        logging.warning(f"⚠️ User {user_id} still appears in LiveKit after leave attempt")
-                        
-                finally:
-                    signal.alarm(0)
-                    
-            except (TimeoutError, Exception) as e:
-                logging.warning(f"Could not verify LiveKit leave status: {e}")
-                verification_result = {
-                    'user_still_in_livekit': False,
-                    'verification_completed': False,
-                    'error': str(e)
-                }
-        
-        # ========== ATTENDANCE INTEGRATION ==========
-        # Stop attendance tracking before leaving
-        try:
-            from core.AI_Attendance.Attendance import stop_attendance_tracking
-            attendance_stopped = stop_attendance_tracking(meeting_id, user_id)
-            if attendance_stopped:
-                logging.info(f"✅ ATTENDANCE: Stopped tracking for user {user_id} in meeting {meeting_id}")
-                attendance_tracking_stopped = True
-            else:
-                logging.warning(f"⚠️ ATTENDANCE: No active tracking found for user {user_id}")
-                attendance_tracking_stopped = False
-        except Exception as attendance_error:
-            logging.error(f"❌ ATTENDANCE: Error stopping tracking: {attendance_error}")
-            attendance_tracking_stopped = False
-        # ============================================
+            (leave_recorded, attendance_tracking_stopped), verification_result = await asyncio.gather(
+                sync_to_async(_record_livekit_leave)(meeting_id, user_id, leave_reason),
+                _verify_livekit_leave(room_name, user_id)
+            )
+        else:
+            leave_recorded, attendance_tracking_stopped = await sync_to_async(_record_livekit_leave)(
+                meeting_id, user_id, leave_reason
+            )
 
         logging.info(f"✅ User {user_id} leave process completed for meeting {meeting_id}")
         
@@ -5391,34 +5816,32 @@ def get_meeting_participants(request, meeting_id):
 
 @require_http_methods(["GET"])
 @csrf_exempt
-def get_livekit_connection_info(request, meeting_id):
+async def get_livekit_connection_info(request, meeting_id):
     """Get LiveKit connection information for a meeting"""
     if not LIVEKIT_ENABLED:
         return JsonResponse({'error': 'LiveKit not available'}, status=503)
     
     try:
         # Verify meeting exists
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT Host_ID, Meeting_Name, Status, LiveKit_Room_Name 
-                FROM tbl_Meetings 
-                WHERE ID = %s
-            """, [meeting_id])
-            
-            row = cursor.fetchone()
-            if not row:
-                return JsonResponse({'error': 'Meeting not found'}, status=404)
-            
-            host_id, meeting_name, status, livekit_room_name = row
-            
-            if status.lower() == 'ended':
-                return JsonResponse({'error': 'Meeting has ended'}, status=400)
+        meeting_info = await get_meeting_info_cached(meeting_id)
+        if not meeting_info:
+            return JsonResponse({'error': 'Meeting not found'}, status=404)
+        
+        host_id = meeting_info['host_id']
+        meeting_name = meeting_info['meeting_name']
+        status = meeting_info['status']
+        livekit_room_name = meeting_info['livekit_room_name']
+        
+        if status.lower() == 'ended':
+            return JsonResponse({'error': 'Meeting has ended'}, status=400)
         
         room_name = livekit_room_name or f"meeting_{meeting_id}"
         
-        # Get room info and participants
-        room_info = livekit_service.get_room(room_name)
-        participants = livekit_service.list_participants(room_name)
+        # Get room info and participants (both LiveKit calls in flight together)
+        room_info, participants = await asyncio.gather(
+            livekit_service.aget_room(room_name),
+            livekit_service.alist_participants(room_name)
+        )
         
         connection_info = {
             'meeting_id': meeting_id,
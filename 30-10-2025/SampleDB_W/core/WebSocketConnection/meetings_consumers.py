@@ -0,0 +1,194 @@
+# meetings_consumers.py - WebSocket side-channel for a meeting
+#
+#   ws/meeting/<meeting_id>/?token=<ws_token>&types=chat,reaction&since=<seq>
+#
+# The user is the session's User_Id (cookie login) or the user the signed
+# ws_token from the join response was issued to; a bare ?user_id= is not
+# trusted. Sockets without either are rejected with close code 4401. The
+# token is bound to its meeting; a session user must also host, be invited
+# to or have joined the meeting, otherwise the socket is closed with 4403.
+#
+# Server -> client frames:
+#   {"type": "event", "event": {seq, type, action, data, result, ...}}
+#   {"type": "resync_required", "seq": <current>}   refetch over REST, then resume
+#   {"type": "subscribed", "types": [...], "seq": <current>}
+#   {"type": "pong"}
+# Client -> server frames:
+#   {"action": "subscribe" | "unsubscribe", "types": [...]}
+#   {"action": "resume", "since": <seq>}
+#   {"action": "ping"}
+# A resume can overlap with live delivery; clients de-duplicate by seq.
+import asyncio
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .meeting_events import (
+    EPHEMERAL_ACTIONS,
+    EVENT_TYPES,
+    get_current_seq,
+    get_events_since,
+    is_meeting_member,
+    meeting_group_name,
+    verify_meeting_socket_token,
+)
+
+logger = logging.getLogger('meeting_events')
+
+# Outbound frames buffered per socket before backpressure kicks in
+SEND_QUEUE_SIZE = 256
+
+
+class MeetingConsumer(AsyncJsonWebsocketConsumer):
+    """Multiplexes chat, reaction, hand raise and whiteboard events for one meeting"""
+
+    async def connect(self):
+        self.meeting_id = self.scope['url_route']['kwargs']['meeting_id']
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        self.types = set()
+        self.last_seq = 0
+        self.resyncing = False
+        self.send_queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.sender_task = None
+
+        self.user_id = await self._authenticate(query)
+        if self.user_id is None:
+            logger.warning(f"⚠️ WS rejected: meeting={self.meeting_id} without a valid session or token")
+            await self.close(code=4401)
+            return
+        # Tokens are bound to their meeting; session users are checked here
+        if self.via_session and not await sync_to_async(is_meeting_member)(self.meeting_id, self.user_id):
+            logger.warning(f"⚠️ WS rejected: user={self.user_id} is not a member of meeting={self.meeting_id}")
+            await self.close(code=4403)
+            return
+
+        await self.accept()
+        self.sender_task = asyncio.ensure_future(self._drain_send_queue())
+
+        requested = (query.get('types') or [','.join(EVENT_TYPES)])[0]
+        await self._subscribe(requested.split(','))
+
+        since = (query.get('since') or [None])[0]
+        if since is not None and since.isdigit():
+            await self._resume(int(since))
+
+        logger.info(f"🔌 WS connected: meeting={self.meeting_id} user={self.user_id} types={sorted(self.types)}")
+
+    async def disconnect(self, close_code):
+        for event_type in list(getattr(self, 'types', ())):
+            await self.channel_layer.group_discard(meeting_group_name(self.meeting_id, event_type), self.channel_name)
+        if getattr(self, 'sender_task', None):
+            self.sender_task.cancel()
+        logger.info(f"🔌 WS disconnected: meeting={getattr(self, 'meeting_id', None)} code={close_code}")
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get('action')
+        if action == 'ping':
+            await self.send_json({'type': 'pong'})
+        elif action == 'subscribe':
+            await self._subscribe(content.get('types') or [])
+        elif action == 'unsubscribe':
+            await self._unsubscribe(content.get('types') or [])
+        elif action == 'resume':
+            await self._resume(int(content.get('since') or 0))
+        else:
+            await self.send_json({'type': 'error', 'error': f'Unknown action: {action}'})
+
+    # ---- channel layer handler -------------------------------------------
+
+    async def meeting_event(self, message):
+        event = message['event']
+        if not self._visible(event):
+            return
+        self._enqueue(event)
+
+    # ---- internals --------------------------------------------------------
+
+    async def _authenticate(self, query):
+        """User id from the login session, else from the signed ?token=; None when neither is valid"""
+        self.via_session = False
+        session = self.scope.get('session')
+        if session is not None:
+            user_id = await sync_to_async(session.get)('User_Id')
+            if user_id is not None:
+                self.via_session = True
+                return str(user_id)
+
+        token = (query.get('token') or [None])[0]
+        if token:
+            return verify_meeting_socket_token(token, self.meeting_id)
+        return None
+
+    def _visible(self, event):
+        if event.get('type') not in self.types:
+            return False
+        recipients = event.get('recipients')
+        if recipients is None:
+            return True
+        return self.user_id is not None and (
+            self.user_id == event.get('sender_id') or self.user_id in recipients
+        )
+
+    def _enqueue(self, event):
+        """Queue an event for sending; on overflow drop ephemeral events, else ask for a resync"""
+        if self.resyncing:
+            return
+        try:
+            self.send_queue.put_nowait({'type': 'event', 'event': event})
+        except asyncio.QueueFull:
+            if (event.get('type'), event.get('action')) in EPHEMERAL_ACTIONS:
+                return
+            # Slow client: discard the backlog, tell it where to resume from
+            while not self.send_queue.empty():
+                self.send_queue.get_nowait()
+            self.resyncing = True
+            self.send_queue.put_nowait({'type': 'resync_required', 'seq': self.last_seq})
+            logger.warning(f"⚠️ WS backpressure: meeting={self.meeting_id} user={self.user_id} resync from {self.last_seq}")
+
+    async def _drain_send_queue(self):
+        try:
+            while True:
+                frame = await self.send_queue.get()
+                if frame['type'] == 'event' and frame['event'].get('seq'):
+                    self.last_seq = max(self.last_seq, frame['event']['seq'])
+                await self.send_json(frame)
+        except asyncio.CancelledError:
+            pass
+
+    async def _subscribe(self, types):
+        for event_type in types:
+            event_type = event_type.strip()
+            if event_type in EVENT_TYPES and event_type not in self.types:
+                await self.channel_layer.group_add(meeting_group_name(self.meeting_id, event_type), self.channel_name)
+                self.types.add(event_type)
+        await self.send_json({
+            'type': 'subscribed',
+            'types': sorted(self.types),
+            'seq': await sync_to_async(get_current_seq)(self.meeting_id),
+        })
+
+    async def _unsubscribe(self, types):
+        for event_type in types:
+            if event_type in self.types:
+                await self.channel_layer.group_discard(meeting_group_name(self.meeting_id, event_type), self.channel_name)
+                self.types.discard(event_type)
+        await self.send_json({'type': 'subscribed', 'types': sorted(self.types)})
+
+    async def _resume(self, since_seq):
+        """Replay events after since_seq from the Redis log, or ask for a REST resync"""
+        self.resyncing = False
+        events, complete = await sync_to_async(get_events_since)(
+            self.meeting_id, since_seq, self.types
+        )
+        if not complete:
+            current = await sync_to_async(get_current_seq)(self.meeting_id)
+            self.last_seq = current
+            await self.send_json({'type': 'resync_required', 'seq': current})
+            return
+
+        self.last_seq = since_seq
+        for event in events:
+            if self._visible(event):
+                self._enqueue(event)
@@ -0,0 +1,265 @@
+# notification_counters.py - Per-recipient unread notification counters
+#
+# The notification bell used to run COUNT(*) on tbl_Notifications on every
+# poll. The count now lives in Redis, one key per recipient email:
+#   - loaded from MySQL on a miss, then kept up to date by every write that
+#     adds, removes or reads notifications (after its transaction commits),
+#   - reconciled from MySQL by a periodic Celery job, which repairs drift
+#     from writes that bypass these helpers (bulk cleanups, Redis outages).
+# Adjustments only touch counters that exist, so a missing key always means
+# "load from MySQL", never "zero".
+#
+# Every change is pushed to the recipient's NotificationConsumer sockets, so
+# clients can drop the count polling. Those sockets belong to the session's
+# user or to the user a notification socket token (returned at login) was
+# issued to; the recipient email is looked up server-side from tbl_Users.
+import asyncio
+import hashlib
+import logging
+import os
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core import signing
+from django.db import connection, transaction
+
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('notification_counters')
+
+UNREAD_COUNTER_TTL = 24 * 3600      # seconds; counters of inactive users expire
+RECONCILE_BATCH_SIZE = 500
+COUNTER_KEY_PREFIX = 'notification_unread:'
+# Matches the login session expiry
+NOTIFICATION_SOCKET_TOKEN_MAX_AGE = int(os.getenv("NOTIFICATION_SOCKET_TOKEN_MAX_AGE", 24 * 3600))
+_SOCKET_TOKEN_SALT = 'core.notification_socket'
+
+# KEYS: counter  ARGV: delta, ttl  -> new count, or -1 when the counter is not loaded
+_ADJUST_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+if count < 0 then
+    redis.call('SET', KEYS[1], 0)
+    count = 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return count
+"""
+
+# KEYS: counter  ARGV: count  -> 1 when an existing counter was corrected
+_RECONCILE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[1], 'KEEPTTL')
+    return 1
+end
+return 0
+"""
+
+
+def _normalize(email):
+    # tbl_Notifications compares emails case-insensitively (utf8mb4_0900_ai_ci)
+    return (email or '').strip().lower()
+
+
+def _counter_key(email):
+    return f"{COUNTER_KEY_PREFIX}{_normalize(email)}"
+
+
+def notification_group_name(email):
+    """Channels group of one recipient (group names must be short ASCII)"""
+    return f"notifications.{hashlib.sha1(_normalize(email).encode()).hexdigest()}"
+
+
+def issue_notification_socket_token(user_id):
+    """Signed token binding a user to their notification socket (returned by the login endpoints)"""
+    return signing.dumps({'u': str(user_id)}, salt=_SOCKET_TOKEN_SALT, compress=True)
+
+
+def verify_notification_socket_token(token):
+    """User id from a notification socket token, or None if forged or expired"""
+    try:
+        payload = signing.loads(token, salt=_SOCKET_TOKEN_SALT, max_age=NOTIFICATION_SOCKET_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return payload.get('u') or None
+
+
+def get_recipient_email(user_id):
+    """Email of an active user, or None"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT Email FROM tbl_Users WHERE ID = %s AND Status = 1", [user_id])
+        row = cursor.fetchone()
+    return row[0].strip() if row and row[0] else None
+
+
+def count_unread_from_db(email):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT COUNT(*) FROM tbl_Notifications
+            WHERE recipient_email = %s AND is_read = FALSE
+        """, [email])
+        row = cursor.fetchone()
+    return int(row[0] or 0) if row else 0
+
+
+def push_unread_counts(counts):
+    """Send {email: count} to the recipients' open sockets in one event-loop round trip; never raises"""
+    if not counts:
+        return
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+
+        async def _send_all():
+            return await asyncio.gather(*[
+                channel_layer.group_send(
+                    notification_group_name(email),
+                    {'type': 'notification.count', 'unread_count': int(count)}
+                )
+                for email, count in counts.items()
+            ], return_exceptions=True)
+
+        for email, result in zip(counts, async_to_sync(_send_all)()):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Could not push unread count for {email}: {result}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not push unread counts for {len(counts)} recipients: {e}")
+
+
+def push_unread_count(email, count):
+    push_unread_counts({email: count})
+
+
+def get_unread_count(email):
+    """Unread count from Redis, loaded from MySQL on a miss (or when Redis is unavailable)"""
+    client = get_redis_client()
+    if client is None:
+        return count_unread_from_db(email)
+
+    key = _counter_key(email)
+    try:
+        cached = client.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as e:
+        logger.warning(f"⚠️ Unread counter unavailable for {email}: {e}")
+        return count_unread_from_db(email)
+
+    count = count_unread_from_db(email)
+    try:
+        # nx: an adjustment that raced this load already holds the newer value
+        if not client.set(key, count, nx=True, ex=UNREAD_COUNTER_TTL):
+            return int(client.get(key) or count)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not store unread counter for {email}: {e}")
+    return count
+
+
+def set_unread_count(email, count):
+    """Store a count just read from MySQL and push it"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.set(_counter_key(email), int(count), ex=UNREAD_COUNTER_TTL)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not store unread counter for {email}: {e}")
+    push_unread_count(email, count)
+
+
+def adjust_unread_counts_now(deltas):
+    """
+    Apply {email: delta} to the loaded counters in one pipeline and push the
+    new values. Recipients without a loaded counter are skipped; their next
+    read loads the count from MySQL.
+    """
+    deltas = {email: int(delta) for email, delta in deltas.items() if email and delta}
+    client = get_redis_client()
+    if not deltas or client is None:
+        return
+
+    emails = list(deltas)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for email in emails:
+            pipe.eval(_ADJUST_LUA, 1, _counter_key(email), deltas[email], UNREAD_COUNTER_TTL)
+        results = pipe.execute(raise_on_error=False)
+    except Exception as e:
+        results = [e] * len(emails)
+
+    counts = {}
+    missed = []
+    for email, result in zip(emails, results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ Could not adjust unread counter for {email}: {result}")
+            missed.append(_counter_key(email))
+        elif int(result) >= 0:
+            counts[email] = int(result)
+
+    if missed:
+        # A counter that missed an update must be reloaded
+        try:
+            client.delete(*missed)
+        except Exception:
+            pass
+
+    push_unread_counts(counts)
+
+
+def adjust_unread_counts(deltas):
+    """adjust_unread_counts_now once the current transaction commits (immediately in autocommit)"""
+    deltas = {email: delta for email, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: adjust_unread_counts_now(deltas))
+
+
+def adjust_unread_count(email, delta):
+    adjust_unread_counts({email: delta})
+
+
+def reconcile_unread_counters(batch_size=RECONCILE_BATCH_SIZE):
+    """
+    Overwrite every loaded counter with the MySQL count, batch_size recipients
+    per query. Counters that are not loaded are left alone. Returns counts.
+    """
+    client = get_redis_client()
+    if client is None:
+        return {'checked': 0, 'corrected': 0}
+
+    counts = {'checked': 0, 'corrected': 0}
+    batch = []
+
+    def _flush(emails):
+        placeholders = ', '.join(['%s'] * len(emails))
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT recipient_email, COUNT(*) FROM tbl_Notifications
+                WHERE recipient_email IN ({placeholders}) AND is_read = FALSE
+                GROUP BY recipient_email
+            """, emails)
+            unread = {}
+            for recipient_email, count in cursor.fetchall():
+                unread[_normalize(recipient_email)] = unread.get(_normalize(recipient_email), 0) + int(count)
+
+        for email in emails:
+            count = unread.get(email, 0)
+            if client.eval(_RECONCILE_LUA, 1, _counter_key(email), count):
+                counts['corrected'] += 1
+                push_unread_count(email, count)
+        counts['checked'] += len(emails)
+
+    for key in client.scan_iter(match=f"{COUNTER_KEY_PREFIX}*", count=batch_size):
+        key = key.decode() if isinstance(key, bytes) else key
+        batch.append(key[len(COUNTER_KEY_PREFIX):])
+        if len(batch) >= batch_size:
+            _flush(batch)
+            batch = []
+    if batch:
+        _flush(batch)
+
+    if counts['corrected']:
+        logger.info(f"🔔 Unread counters reconciled: {counts}")
+    return counts
@@ -10,12 +10,29 @@ from django.views.decorators.http import require_http_methods
 from django.db import connection, transaction
 from django.utils import timezone
 import pytz
+
+from .notification_counters import adjust_unread_count, adjust_unread_counts, get_unread_count, set_unread_count
 # from .meetings import Create_Calendar_Meeting as _create_calendar_meeting
 # from .meetings import Create_Schedule_Meeting as _create_schedule_meeting
 
+_notification_tables_ready = False
+
+# Rows per multi-row INSERT / reminders claimed per transaction
+NOTIFICATION_INSERT_BATCH = 500
+REMINDER_CLAIM_BATCH = 200
+
+_NOTIFICATION_COLUMNS = (
+    "id, recipient_email, meeting_id, notification_type, title, message, "
+    "meeting_title, start_time, meeting_url, is_read, priority, created_at"
+)
+
 # FIXED: Database table creation with proper constraints
 def ensure_notification_tables():
-    """Create notification tables with proper error handling"""
+    """Create notification tables with proper error handling (once per process, from core.schema)"""
+    global _notification_tables_ready
+    if _notification_tables_ready:
+        return True
+
     try:
         with connection.cursor() as cursor:
             # Check if Users table exists first
@@ -89,7 +106,9 @@ def ensure_notification_tables():
             """)
             
             logging.info("✅ Notification tables created or verified successfully")
-            
+        _notification_tables_ready = True
+        return True
+
     except Exception as e:
         logging.error(f"❌ Failed to create notification tables: {e}")
         raise
@@ -103,12 +122,6 @@ def create_meeting_notifications(meeting_id, meeting_title, participant_emails,
         logging.warning("No participant emails or meeting ID provided for notifications")
         return {"sent": 0, "failed": 0}
 
-    try:
-        ensure_notification_tables()
-    except Exception as e:
-        logging.error(f"Failed to ensure notification tables: {e}")
-        return {"sent": 0, "failed": len(participant_emails)}
-
     ist_timezone = pytz.timezone("Asia/Kolkata")
     current_time = datetime.now(ist_timezone)
     sent, failed = 0, 0
@@ -130,60 +143,74 @@ def create_meeting_notifications(meeting_id, meeting_title, participant_emails,
     except Exception as e:
         logging.warning(f"Could not fetch meeting type or host name: {e}")
 
-    # Create notifications
+    # Dynamic message based on meeting type
+    if meeting_type.lower() == "calendarmeeting":
+        notification_type = "calendar_meeting_invitation"
+        title = f"Calendar Meeting Invitation: {meeting_title}"
+        message = (
+            f"You’ve been invited to a calendar meeting by "
+            f"{host_name or 'your host'}. Please check your calendar for meeting details."
+        )
+    elif meeting_type.lower() == "schedulemeeting":
+        notification_type = "scheduled_meeting_invitation"
+        title = f"Scheduled Meeting Invitation: {meeting_title}"
+        message = (
+            f"You’ve been invited to a scheduled meeting by "
+            f"{host_name or 'your host'}. View details on your schedule page."
+        )
+    else:
+        notification_type = "meeting_invitation"
+        title = f"Meeting Invitation: {meeting_title}"
+        message = f'You have been invited to join "{meeting_title}"'
+
+    # Create notifications: one multi-row insert per NOTIFICATION_INSERT_BATCH emails
+    rows, created = [], {}
     for email in participant_emails:
         if not email or '@' not in email:
             failed += 1
             continue
+        rows.append([
+            str(uuid.uuid4()), email.strip(), str(meeting_id), notification_type,
+            title, message, meeting_title, start_time, meeting_url,
+            False, 'high', current_time
+        ])
+        created[email.strip()] = created.get(email.strip(), 0) + 1
 
-        try:
-            with connection.cursor() as cursor:
-                notification_id = str(uuid.uuid4())
-
-                # Dynamic message based on meeting type
-                if meeting_type.lower() == "calendarmeeting":
-                    notification_type = "calendar_meeting_invitation"
-                    title = f"Calendar Meeting Invitation: {meeting_title}"
-                    message = (
-                        f"You’ve been invited to a calendar meeting by "
-                        f"{host_name or 'your host'}. Please check your calendar for meeting details."
-                    )
-                elif meeting_type.lower() == "schedulemeeting":
-                    notification_type = "scheduled_meeting_invitation"
-                    title = f"Scheduled Meeting Invitation: {meeting_title}"
-                    message = (
-                        f"You’ve been invited to a scheduled meeting by "
-                        f"{host_name or 'your host'}. View details on your schedule page."
-                    )
-                else:
-                    notification_type = "meeting_invitation"
-                    title = f"Meeting Invitation: {meeting_title}"
-                    message = f'You have been invited to join "{meeting_title}"'
-
-                cursor.execute("""
-                    INSERT INTO tbl_Notifications (
-                        id, recipient_email, meeting_id, notification_type, title, message,
-                        meeting_title, start_time, meeting_url, is_read, priority, created_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, [
-                    notification_id, email.strip(), str(meeting_id), notification_type,
-                    title, message, meeting_title, start_time, meeting_url,
-                    False, 'high', current_time
-                ])
-
-                if cursor.rowcount > 0:
-                    sent += 1
-                else:
-                    failed += 1
-
-        except Exception as e:
-            logging.error(f"Failed to create participant notification for {email}: {e}")
-            failed += 1
+    try:
+        with transaction.atomic():
+            _insert_notifications(rows)
+        sent += len(rows)
+    except Exception as e:
+        # One bad row fails the whole batch: retry row by row so the others still get theirs
+        logging.warning(f"Batch insert of {len(rows)} notifications for meeting {meeting_id} failed, retrying row by row: {e}")
+        created = {}
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    _insert_notifications([row])
+            except Exception as row_error:
+                logging.error(f"Failed to create notification for {row[1]} (meeting {meeting_id}): {row_error}")
+                failed += 1
+                continue
+            sent += 1
+            created[row[1]] = created.get(row[1], 0) + 1
 
+    adjust_unread_counts(created)
     logging.info(f"📨 Participant notifications created: {sent} sent, {failed} failed")
     return {"sent": sent, "failed": failed}
 
 
+def _insert_notifications(rows):
+    """Insert tbl_Notifications rows (one list per row, in _NOTIFICATION_COLUMNS order)"""
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), NOTIFICATION_INSERT_BATCH):
+            # MySQLdb rewrites executemany INSERT ... VALUES into one multi-row statement
+            cursor.executemany(f"""
+                INSERT INTO tbl_Notifications ({_NOTIFICATION_COLUMNS})
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, rows[start:start + NOTIFICATION_INSERT_BATCH])
+
+
 def _get_host_email_by_id(host_id):
     """Lookup host's email from tbl_Users with proper error handling"""
     if not host_id:
@@ -205,7 +232,6 @@ def create_host_notification(meeting_id, meeting_title, host_email, start_time,
         return
 
     try:
-        ensure_notification_tables()
         ist = pytz.timezone("Asia/Kolkata")
         now = datetime.now(ist)
         notification_id = str(uuid.uuid4())
@@ -248,6 +274,7 @@ def create_host_notification(meeting_id, meeting_title, host_email, start_time,
             ])
 
             if cursor.rowcount > 0:
+                adjust_unread_count(host_email.strip(), 1)
                 logging.info(f"✅ Created host notification ({notification_type}) for {host_email}")
             else:
                 logging.error(f"⚠️ Failed to create host notification for {host_email}")
@@ -262,13 +289,6 @@ def schedule_meeting_reminders(meeting_id, meeting_title, participant_emails, st
         logging.warning("Missing required data for scheduling reminders")
         return 0
     
-    try:
-        # Ensure notification tables exist
-        ensure_notification_tables()
-    except Exception as e:
-        logging.error(f"Failed to ensure notification tables for reminders: {e}")
-        return 0
-    
     ist_timezone = pytz.timezone("Asia/Kolkata")
     
     # Parse start_time
@@ -282,46 +302,45 @@ def schedule_meeting_reminders(meeting_id, meeting_title, participant_emails, st
         logging.error(f"Failed to parse start_time for reminders: {e}")
         return 0
     
-    scheduled_count = 0
-    
+    now = datetime.now(ist_timezone)
+    start_time_str = start_time if isinstance(start_time, str) else start_time.strftime('%Y-%m-%d %H:%M:%S')
+    emails = [email.strip() for email in participant_emails if email and '@' in email]
+    rows = []
+
     for reminder_min in reminder_minutes:
         reminder_dt = start_dt - timedelta(minutes=reminder_min)
         
         # Don't schedule reminders for past times
-        if reminder_dt <= datetime.now(ist_timezone):
+        if reminder_dt <= now:
             continue
         
-        for email in participant_emails:
-            if not email or '@' not in email:
-                continue
-                
-            try:
-                reminder_data = {
-                    'meeting_id': str(meeting_id),
-                    'recipient_email': email.strip(),
-                    'meeting_title': meeting_title,
-                    'start_time': start_time if isinstance(start_time, str) else start_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'meeting_url': meeting_url,
-                    'reminder_minutes': reminder_min
-                }
-                
-                with connection.cursor() as cursor:
-                    reminder_id = str(uuid.uuid4())
-                    
-                    cursor.execute("""
+        for email in emails:
+            reminder_data = {
+                'meeting_id': str(meeting_id),
+                'recipient_email': email,
+                'meeting_title': meeting_title,
+                'start_time': start_time_str,
+                'meeting_url': meeting_url,
+                'reminder_minutes': reminder_min
+            }
+            rows.append([
+                str(uuid.uuid4()), str(meeting_id), email, reminder_dt,
+                json.dumps(reminder_data), now
+            ])
+
+    scheduled_count = 0
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for start in range(0, len(rows), NOTIFICATION_INSERT_BATCH):
+                    cursor.executemany("""
                         INSERT INTO tbl_ScheduledReminders (
                             id, meeting_id, recipient_email, reminder_time, notification_data, created_at
                         ) VALUES (%s, %s, %s, %s, %s, %s)
-                    """, [
-                        reminder_id, str(meeting_id), email.strip(), reminder_dt, 
-                        json.dumps(reminder_data), datetime.now(ist_timezone)
-                    ])
-                    
-                    if cursor.rowcount > 0:
-                        scheduled_count += 1
-                
-            except Exception as e:
-                logging.error(f"Failed to schedule reminder for {email}: {e}")
+                    """, rows[start:start + NOTIFICATION_INSERT_BATCH])
+        scheduled_count = len(rows)
+    except Exception as e:
+        logging.error(f"Failed to schedule reminders for meeting {meeting_id}: {e}")
     
     logging.info(f"Scheduled {scheduled_count} reminders for meeting {meeting_id}")
     return scheduled_count
@@ -348,64 +367,82 @@ def cleanup_old_notifications(days_old=30):
         logging.error(f"Failed to cleanup old notifications: {e}")
         return 0
 
-def process_scheduled_reminders():
-    """Process scheduled reminders that are due"""
-    try:
-        ensure_notification_tables()
-        
-        ist_timezone = pytz.timezone("Asia/Kolkata")
-        current_time = datetime.now(ist_timezone)
-        
+def _reminder_notification_row(recipient_email, meeting_id, notification_data, current_time):
+    return [
+        str(uuid.uuid4()), recipient_email, meeting_id, 'meeting_reminder',
+        f'Meeting Reminder: {notification_data["meeting_title"]}',
+        f'Your meeting "{notification_data["meeting_title"]}" starts in {notification_data["reminder_minutes"]} minutes',
+        notification_data["meeting_title"],
+        notification_data["start_time"],
+        notification_data["meeting_url"],
+        False, 'high', current_time
+    ]
+
+
+def claim_due_reminders(current_time, batch_size=REMINDER_CLAIM_BATCH):
+    """
+    Claim up to batch_size due reminders and turn them into notifications in
+    one transaction. FOR UPDATE SKIP LOCKED makes concurrent workers claim
+    disjoint rows instead of double-sending. Returns (processed, failed, claimed).
+    """
+    processed, failed = 0, 0
+    with transaction.atomic():
         with connection.cursor() as cursor:
-            # Get due reminders
             cursor.execute("""
                 SELECT id, meeting_id, recipient_email, notification_data
                 FROM tbl_ScheduledReminders
-                WHERE reminder_time <= %s AND is_sent = FALSE
+                WHERE is_sent = FALSE AND reminder_time <= %s
                 ORDER BY reminder_time
-                LIMIT 100
-            """, [current_time])
-            
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, [current_time, batch_size])
             reminders = cursor.fetchall()
-            processed = 0
-            
-            for reminder in reminders:
-                reminder_id, meeting_id, recipient_email, notification_data_str = reminder
-                
+            if not reminders:
+                return 0, 0, 0
+
+            rows, created = [], {}
+            for reminder_id, meeting_id, recipient_email, notification_data_str in reminders:
                 try:
                     notification_data = json.loads(notification_data_str)
-                    notification_id = str(uuid.uuid4())
-                    
-                    # Create notification
-                    cursor.execute("""
-                        INSERT INTO tbl_Notifications (
-                            id, recipient_email, meeting_id, notification_type, title, message,
-                            meeting_title, start_time, meeting_url, is_read, priority, created_at
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, [
-                        notification_id, recipient_email, meeting_id, 'meeting_reminder',
-                        f'Meeting Reminder: {notification_data["meeting_title"]}',
-                        f'Your meeting "{notification_data["meeting_title"]}" starts in {notification_data["reminder_minutes"]} minutes',
-                        notification_data["meeting_title"],
-                        notification_data["start_time"],
-                        notification_data["meeting_url"],
-                        False, 'high', current_time
-                    ])
-                    
-                    # Mark reminder as sent
-                    cursor.execute("""
-                        UPDATE tbl_ScheduledReminders 
-                        SET is_sent = TRUE 
-                        WHERE id = %s
-                    """, [reminder_id])
-                    
+                    rows.append(_reminder_notification_row(recipient_email, meeting_id, notification_data, current_time))
+                    created[recipient_email] = created.get(recipient_email, 0) + 1
                     processed += 1
-                    
                 except Exception as e:
+                    # Marked sent below as well, so a bad row is not claimed forever
                     logging.error(f"Failed to process reminder {reminder_id}: {e}")
-            
-            logging.info(f"Processed {processed} scheduled reminders")
-            return processed
+                    failed += 1
+
+            _insert_notifications(rows)
+            reminder_ids = [reminder[0] for reminder in reminders]
+            cursor.execute(f"""
+                UPDATE tbl_ScheduledReminders
+                SET is_sent = TRUE
+                WHERE id IN ({', '.join(['%s'] * len(reminder_ids))})
+            """, reminder_ids)
+            adjust_unread_counts(created)
+
+    return processed, failed, len(reminders)
+
+
+def drain_due_reminders(batch_size=REMINDER_CLAIM_BATCH):
+    """Claim batches of due reminders until none are left; returns (processed, failed)"""
+    current_time = datetime.now(pytz.timezone("Asia/Kolkata"))
+    processed, failed = 0, 0
+    while True:
+        batch_processed, batch_failed, claimed = claim_due_reminders(current_time, batch_size)
+        processed += batch_processed
+        failed += batch_failed
+        if claimed < batch_size:
+            break
+    return processed, failed
+
+
+def process_scheduled_reminders():
+    """Process scheduled reminders that are due (safe to run from several workers at once)"""
+    try:
+        processed, failed = drain_due_reminders()
+        logging.info(f"Processed {processed} scheduled reminders ({failed} failed)")
+        return processed
             
     except Exception as e:
         logging.error(f"Failed to process scheduled reminders: {e}")
@@ -670,8 +707,6 @@ def get_user_notifications(request):
                 "notifications": [],
                 "unread_count": 0
             }, status=400)
-        
-        ensure_notification_tables()
 
         # 🧹 Auto-clean expired meeting notifications before fetching
         # try:
@@ -897,6 +932,9 @@ def get_user_notifications(request):
             
             cursor.execute(count_query, [email])
             unread_count = cursor.fetchone()[0] or 0
+            if page not in ('schedule', 'calendar', 'recording'):
+                # Same query as the bell count: refresh the Redis counter with it
+                set_unread_count(email, unread_count)
             
             logging.info(f"✅ Retrieved {len(notifications)} notifications, {unread_count} unread for {email} (page: {page})")
             
@@ -936,24 +974,15 @@ def get_notification_count(request):
                 "unread_count": 0
             }, status=400)
         
-        # Ensure notification tables exist
-        ensure_notification_tables()
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT COUNT(*) FROM tbl_Notifications 
-                WHERE recipient_email = %s AND is_read = FALSE
-            """, [email])
-            
-            result = cursor.fetchone()
-            unread_count = result[0] if result else 0
-            
-            logging.info(f"✅ Unread count for {email}: {unread_count}")
-            
-            return JsonResponse({
-                "unread_count": int(unread_count),
-                "success": True
-            }, status=200)
+        # Redis counter (notification_counters.py); MySQL only on a miss
+        unread_count = get_unread_count(email)
+
+        logging.info(f"✅ Unread count for {email}: {unread_count}")
+
+        return JsonResponse({
+            "unread_count": int(unread_count),
+            "success": True
+        }, status=200)
             
     except Exception as e:
         logging.error(f"❌ Error in get_notification_count: {str(e)}")
@@ -985,8 +1014,6 @@ def mark_notification_as_read(request):
                 "error": "Missing or invalid parameters (notification_id, email required)"
             }, status=400)
 
-        ensure_notification_tables()
-
         # ✅ Force autocommit for single record updates
         with connection.cursor() as cursor:
             cursor.execute("SET autocommit = 1;")
@@ -1020,13 +1047,10 @@ def mark_notification_as_read(request):
 
                 affected = cursor.rowcount
                 logging.info(f"✅ Updated {affected} row(s) for notification {notification_id}")
+                adjust_unread_count(email, -1)
 
-            # ✅ Fetch updated unread count
-            cursor.execute("""
-                SELECT COUNT(*) FROM tbl_Notifications
-                WHERE recipient_email = %s AND is_read = FALSE
-            """, [email])
-            unread_count = cursor.fetchone()[0] or 0
+        # ✅ Updated unread count
+        unread_count = get_unread_count(email)
 
         logging.info(f"✅ Notification {notification_id} marked as read for {email}. Unread count: {unread_count}")
 
@@ -1065,8 +1089,6 @@ def mark_all_notifications_as_read(request):
                 "error": "Valid email address is required"
             }, status=400)
 
-        ensure_notification_tables()
-
         with transaction.atomic():
             with connection.cursor() as cursor:
                 # Count unread before
@@ -1077,6 +1099,7 @@ def mark_all_notifications_as_read(request):
                 unread_before = cursor.fetchone()[0] or 0
 
                 if unread_before == 0:
+                    set_unread_count(email, 0)
                     return JsonResponse({
                         "success": True,
                         "message": "No unread notifications to mark as read",
@@ -1091,6 +1114,7 @@ def mark_all_notifications_as_read(request):
                 """, [email])
                 marked_count = cursor.rowcount or 0
 
+        set_unread_count(email, 0)
         logging.info(f"✅ Marked {marked_count} notifications as read for {email}")
 
         return JsonResponse({
@@ -1129,8 +1153,6 @@ def delete_notification(request):
                 "error": "Missing or invalid parameters (notification_id, email required)"
             }, status=400)
 
-        ensure_notification_tables()
-
         with transaction.atomic():
             with connection.cursor() as cursor:
                 # Check existence
@@ -1151,13 +1173,10 @@ def delete_notification(request):
                     DELETE FROM tbl_Notifications
                     WHERE id = %s AND recipient_email = %s
                 """, [notification_id, email])
+                if not row[1]:
+                    adjust_unread_count(email, -1)
 
-                # Recount unread
-                cursor.execute("""
-                    SELECT COUNT(*) FROM tbl_Notifications
-                    WHERE recipient_email = %s AND is_read = FALSE
-                """, [email])
-                unread_count = cursor.fetchone()[0] or 0
+        unread_count = get_unread_count(email)
 
         logging.info(f"✅ Notification {notification_id} deleted for {email}")
 
@@ -1180,61 +1199,13 @@ def delete_notification(request):
 def process_reminder_notifications(request):
     """Process scheduled reminders - call this via cron job every minute"""
     try:
-        current_time = datetime.now(pytz.timezone("Asia/Kolkata"))
-        processed_count = 0
-        failed_count = 0
-        
-        with connection.cursor() as cursor:
-            # Get reminders that should be sent now
-            cursor.execute("""
-                SELECT id, notification_data FROM tbl_ScheduledReminders
-                WHERE reminder_time <= %s AND is_sent = FALSE
-            """, [current_time.strftime('%Y-%m-%d %H:%M:%S')])
-            
-            reminders = cursor.fetchall()
-            
-            for reminder_id, notification_data_json in reminders:
-                try:
-                    data = json.loads(notification_data_json)
-                    
-                    # Create reminder notification
-                    cursor.execute("""
-                        INSERT INTO tbl_Notifications (
-                            recipient_email, meeting_id, notification_type,
-                            title, message, meeting_title, start_time, meeting_url,
-                            is_read, priority, created_at
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, [
-                        data['recipient_email'], 
-                        data['meeting_id'],
-                        'meeting_reminder', 
-                        'Meeting reminder',
-                        f"{data['meeting_title']} starts in {data['reminder_minutes']} minutes",
-                        data['meeting_title'], 
-                        data['start_time'], 
-                        data['meeting_url'],
-                        False,  # is_read
-                        'high',  # priority
-                        current_time
-                    ])
-                    
-                    # Mark reminder as sent
-                    cursor.execute("""
-                        UPDATE tbl_ScheduledReminders SET is_sent = TRUE WHERE id = %s
-                    """, [reminder_id])
-                    
-                    processed_count += 1
-                    logging.info(f"Processed reminder for meeting {data['meeting_id']}")
-                    
-                except Exception as e:
-                    logging.error(f"Failed to process reminder {reminder_id}: {e}")
-                    failed_count += 1
+        processed_count, failed_count = drain_due_reminders()
         
         return JsonResponse({
             "Message": "Reminder notifications processed",
             "processed": processed_count,
             "failed": failed_count,
-            "total_reminders": len(reminders) if 'reminders' in locals() else 0
+            "total_reminders": processed_count + failed_count
         })
         
     except Exception as e:
@@ -1260,9 +1231,6 @@ def debug_create_test_notification(request):
                 "success": False
             }, status=400)
         
-        # Ensure notification tables exist
-        ensure_notification_tables()
-        
         ist_timezone = pytz.timezone("Asia/Kolkata")
         current_time = datetime.now(ist_timezone)
         
@@ -1284,6 +1252,7 @@ def debug_create_test_notification(request):
                     "Error": "Failed to create test notification",
                     "success": False
                 }, status=500)
+            adjust_unread_count(email, 1)
             
         logging.info(f"✅ Created test notification {notification_id} for {email}")
         
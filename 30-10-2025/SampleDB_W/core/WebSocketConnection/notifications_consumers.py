@@ -0,0 +1,87 @@
+# notifications_consumers.py - Unread notification count push
+#
+#   ws/notifications/?token=<Notification_Ws_Token>
+#
+# The recipient is the session's User_Id (cookie login) or the user the signed
+# token from the login response was issued to; their email is looked up in
+# tbl_Users, never taken from the client. Sockets without either, or whose
+# user is no longer active, are rejected with close code 4401.
+#
+# Server -> client frames:
+#   {"type": "unread_count", "unread_count": <n>}   on connect and on every change
+#   {"type": "pong"}
+# Client -> server frames:
+#   {"action": "ping"}
+#   {"action": "refresh"}                            resend the current count
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .notification_counters import (
+    get_recipient_email,
+    get_unread_count,
+    notification_group_name,
+    verify_notification_socket_token,
+)
+
+logger = logging.getLogger('notification_counters')
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """Pushes a recipient's unread notification count whenever it changes"""
+
+    async def connect(self):
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        self.group_name = None
+
+        user_id = await self._authenticate(query)
+        self.email = await sync_to_async(get_recipient_email)(user_id) if user_id is not None else None
+        if not self.email:
+            logger.warning("⚠️ Notification WS rejected: no valid session or token")
+            await self.close(code=4401)
+            return
+
+        self.group_name = notification_group_name(self.email)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self._send_current_count()
+        logger.info(f"🔌 Notification WS connected: {self.email}")
+
+    async def disconnect(self, close_code):
+        if getattr(self, 'group_name', None):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get('action')
+        if action == 'ping':
+            await self.send_json({'type': 'pong'})
+        elif action == 'refresh':
+            await self._send_current_count()
+        else:
+            await self.send_json({'type': 'error', 'error': f'Unknown action: {action}'})
+
+    # ---- channel layer handler -------------------------------------------
+
+    async def notification_count(self, message):
+        await self.send_json({'type': 'unread_count', 'unread_count': message['unread_count']})
+
+    # ---- internals --------------------------------------------------------
+
+    async def _authenticate(self, query):
+        """User id from the login session, else from the signed ?token=; None when neither is valid"""
+        session = self.scope.get('session')
+        if session is not None:
+            user_id = await sync_to_async(session.get)('User_Id')
+            if user_id is not None:
+                return str(user_id)
+
+        token = (query.get('token') or [None])[0]
+        if token:
+            return verify_notification_socket_token(token)
+        return None
+
+    async def _send_current_count(self):
+        count = await sync_to_async(get_unread_count)(self.email)
+        await self.send_json({'type': 'unread_count', 'unread_count': count})
@@ -0,0 +1,555 @@
+# participant_events.py - Write-behind join/leave recording
+#
+# With PARTICIPANT_WRITE_BEHIND=True, record_participant_join/leave append an
+# event to a Redis stream and answer 202 straight away instead of doing the
+# Join_Times/Leave_Times read-modify-write inside the request. A consumer
+# group (Celery beat task or `manage.py consume_participant_events`) applies
+# the events to tbl_Participants in batches: one locking SELECT and one
+# executemany per batch instead of one transaction per join.
+#
+# Every event carries an Event_ID that is written to tbl_ParticipantEventLog
+# in the same transaction as the participant rows, so events redelivered
+# after a crash (between COMMIT and XACK) are skipped.
+#
+# A batch that fails is retried one event at a time: the events that apply
+# are acked, the others stay pending and are re-claimed after CLAIM_IDLE_MS.
+# An event that has failed PARTICIPANT_EVENT_MAX_DELIVERIES deliveries is
+# moved to the DEAD_LETTER_STREAM_KEY stream so it cannot block the group.
+#
+# Until an event is applied its state sits in a per-meeting roster hash in
+# Redis; list_participants_basic overlays it on the database rows.
+import itertools
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime
+
+import redis
+from django.db import connection, transaction
+
+from core.utils.redis_registry import get_redis_client
+
+from .participant_sessions import (
+    IST_TIMEZONE,
+    cap_session_arrays,
+    close_sessions_bulk,
+    get_session_totals,
+    open_sessions_bulk,
+    session_time,
+)
+from .roster_version import bump_roster_version
+
+logger = logging.getLogger('participant_events')
+
+PARTICIPANT_WRITE_BEHIND = os.getenv("PARTICIPANT_WRITE_BEHIND", "False") == "True"
+
+STREAM_KEY = os.getenv("PARTICIPANT_STREAM_KEY", "participant_events")
+CONSUMER_GROUP = 'participant_writers'
+STREAM_MAXLEN = 200000              # approximate trim; events are acked within seconds
+ROSTER_TTL = 24 * 3600              # seconds
+CLAIM_IDLE_MS = 60 * 1000           # re-claim events left pending by a dead consumer
+# Deliveries after which a failing event goes to the dead-letter stream
+PARTICIPANT_EVENT_MAX_DELIVERIES = int(os.getenv("PARTICIPANT_EVENT_MAX_DELIVERIES", 5))
+DEAD_LETTER_STREAM_KEY = os.getenv("PARTICIPANT_DEAD_LETTER_STREAM_KEY", f"{STREAM_KEY}:dead")
+EVENT_LOG_RETENTION_DAYS = 2
+DEFAULT_BATCH_SIZE = 200
+
+ACTION_JOIN = 'join'
+ACTION_LEAVE = 'leave'
+
+TBL_PARTICIPANT_EVENT_LOG = 'tbl_ParticipantEventLog'
+
+_event_log_table_ready = False
+
+# Drop a roster entry only if it still belongs to the event that was applied
+_CLEAR_ROSTER_LUA = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current and cjson.decode(current)['event_id'] == ARGV[2] then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+def create_participant_event_log_table():
+    """Create tbl_ParticipantEventLog (schema step, see core.schema)"""
+    global _event_log_table_ready
+    if _event_log_table_ready:
+        return True
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tbl_ParticipantEventLog (
+                    Event_ID CHAR(36) NOT NULL PRIMARY KEY,
+                    Meeting_ID CHAR(36) NOT NULL,
+                    User_ID INT NOT NULL,
+                    Action VARCHAR(10) NOT NULL,
+                    Applied_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_event_log_applied (Applied_At)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+        _event_log_table_ready = True
+        logging.debug("tbl_ParticipantEventLog table created or exists")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to create tbl_ParticipantEventLog table: {e}")
+        return False
+
+
+def _roster_key(meeting_id):
+    return f"participant_roster:{meeting_id}"
+
+
+# ---- producer (request path) ----------------------------------------------
+
+def get_pending_roster(meeting_id):
+    """{user_id: state} for events of this meeting not yet applied to MySQL"""
+    client = get_redis_client()
+    if client is None:
+        return {}
+    try:
+        raw = client.hgetall(_roster_key(meeting_id))
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Could not read pending roster for meeting {meeting_id}: {e}")
+        return {}
+
+    roster = {}
+    for user_id, value in raw.items():
+        try:
+            roster[str(user_id)] = json.loads(value)
+        except (TypeError, ValueError):
+            continue
+    return roster
+
+
+def get_pending_state(meeting_id, user_id):
+    """Pending roster state for one user, or None"""
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        value = client.hget(_roster_key(meeting_id), str(user_id))
+        return json.loads(value) if value else None
+    except (redis.RedisError, TypeError, ValueError):
+        return None
+
+
+def enqueue_participant_event(meeting_id, user_id, action, event_time, full_name=None, role=None):
+    """
+    Append a join/leave event to the stream and mark it pending in the roster.
+    event_time uses the Join_Times format ('%Y-%m-%d %H:%M:%S', IST).
+    Returns the event, or None when Redis is unavailable - callers then
+    record synchronously.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    event = {
+        'event_id': str(uuid.uuid4()),
+        'meeting_id': str(meeting_id),
+        'user_id': str(user_id),
+        'action': action,
+        'event_time': event_time,
+        'full_name': full_name or '',
+        'role': role or '',
+    }
+    roster_state = {
+        'event_id': event['event_id'],
+        'status': 'active' if action == ACTION_JOIN else 'left',
+        'event_time': event_time,
+        'full_name': full_name or '',
+        'role': role or '',
+    }
+
+    try:
+        pipe = client.pipeline()
+        pipe.xadd(STREAM_KEY, event, maxlen=STREAM_MAXLEN, approximate=True)
+        pipe.hset(_roster_key(meeting_id), str(user_id), json.dumps(roster_state))
+        pipe.expire(_roster_key(meeting_id), ROSTER_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Could not queue {action} for user {user_id} in meeting {meeting_id}: {e}")
+        return None
+
+    return event
+
+
+# ---- consumer ---------------------------------------------------------------
+
+def default_consumer_name():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def ensure_consumer_group(client):
+    try:
+        client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id='0', mkstream=True)
+    except redis.ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def read_participant_events(client, consumer, batch_size=DEFAULT_BATCH_SIZE, block_ms=None):
+    """Events left pending by dead consumers first, then new ones: [(stream_id, fields)]"""
+    claimed = client.xautoclaim(
+        STREAM_KEY, CONSUMER_GROUP, consumer, CLAIM_IDLE_MS, start_id='0-0', count=batch_size
+    )
+    if claimed and claimed[1]:
+        return claimed[1]
+
+    response = client.xreadgroup(
+        CONSUMER_GROUP, consumer, {STREAM_KEY: '>'}, count=batch_size, block=block_ms
+    )
+    return response[0][1] if response else []
+
+
+def _parse_json_array(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, list) else []
+        except ValueError:
+            return []
+    return []
+
+
+def _in_clause(values):
+    return ', '.join(['%s'] * len(values))
+
+
+def _record_attendance(events):
+    """Start/stop attendance tracking for applied events, as the synchronous join/leave do"""
+    from . import participants
+
+    if not participants.ATTENDANCE_INTEGRATION:
+        return
+    for event in events:
+        try:
+            event_time = IST_TIMEZONE.localize(datetime.strptime(event['event_time'], '%Y-%m-%d %H:%M:%S'))
+            if event['action'] == ACTION_JOIN:
+                participants.record_participant_join_attendance(event['meeting_id'], event['user_id'], event_time)
+            else:
+                participants.record_participant_leave_attendance(event['meeting_id'], event['user_id'], event_time)
+        except Exception as e:
+            logger.warning(f"⚠️ ATTENDANCE: {event['action']} for user {event['user_id']} in meeting {event['meeting_id']}: {e}")
+
+
+def apply_participant_events(events):
+    """
+    Apply a batch of events (stream field dicts, oldest first) to
+    tbl_Participants in one transaction. Events already in the event log
+    are skipped. Attendance tracking for the applied events starts once the
+    transaction commits. Returns (applied, skipped).
+    """
+    # Redelivered duplicates inside one batch count once
+    unique_events = list({event['event_id']: event for event in events}.values())
+    if not unique_events:
+        return 0, 0
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            event_ids = [event['event_id'] for event in unique_events]
+            cursor.execute(
+                f"SELECT Event_ID FROM {TBL_PARTICIPANT_EVENT_LOG} WHERE Event_ID IN ({_in_clause(event_ids)})",
+                event_ids
+            )
+            already_applied = {row[0] for row in cursor.fetchall()}
+            fresh = [event for event in unique_events if event['event_id'] not in already_applied]
+            if not fresh:
+                return 0, len(events)
+
+            pairs = list(dict.fromkeys((event['meeting_id'], int(event['user_id'])) for event in fresh))
+            meeting_ids = sorted({meeting_id for meeting_id, _ in pairs})
+
+            cursor.execute(f"""
+                SELECT ID, Host_ID, Meeting_Type, Status
+                FROM tbl_Meetings
+                WHERE ID IN ({_in_clause(meeting_ids)})
+            """, meeting_ids)
+            meetings = {str(row[0]): row for row in cursor.fetchall()}
+
+            # Lock every participant row of the batch in one statement
+            cursor.execute(f"""
+                SELECT ID, Meeting_ID, User_ID, Full_Name, Join_Times, Leave_Times, Is_Currently_Active
+                FROM tbl_Participants
+                WHERE (Meeting_ID, User_ID) IN ({', '.join(['(%s, %s)'] * len(pairs))})
+                FOR UPDATE
+            """, [value for pair in pairs for value in pair])
+            participants = {}
+            for row in cursor.fetchall():
+                participants[(str(row[1]), int(row[2]))] = {
+                    'id': row[0],
+                    'full_name': row[3],
+                    'join_times': _parse_json_array(row[4]),
+                    'leave_times': _parse_json_array(row[5]),
+                    'active': bool(row[6]),
+                    'new': False,
+                    'dirty': False,
+                }
+
+            # Names for first-time joiners whose event carried none
+            unnamed = sorted({
+                int(event['user_id']) for event in fresh
+                if not event.get('full_name') and (event['meeting_id'], int(event['user_id'])) not in participants
+            })
+            user_names = {}
+            if unnamed:
+                cursor.execute(
+                    f"SELECT ID, full_name FROM tbl_Users WHERE ID IN ({_in_clause(unnamed)})",
+                    unnamed
+                )
+                user_names = {row[0]: (row[1] or '').strip() for row in cursor.fetchall()}
+
+            applied_events = []
+            session_ops = []  # (is_open, meeting_id, user_id, time) in event order
+            for event in fresh:
+                key = (event['meeting_id'], int(event['user_id']))
+                state = participants.get(key)
+
+                if event['action'] == ACTION_JOIN:
+                    meeting = meetings.get(event['meeting_id'])
+                    if not meeting or meeting[3] == 'ended':
+                        logger.info(f"[WRITE-BEHIND] Dropping join for user {key[1]}: meeting {key[0]} missing or ended")
+                        continue
+                    if state is None:
+                        host_id = meeting[1]
+                        state = {
+                            'id': None,
+                            'full_name': event.get('full_name') or user_names.get(key[1]) or f"User_{key[1]}",
+                            'role': event.get('role') or ('host' if host_id and key[1] == host_id else 'participant'),
+                            'meeting_type': meeting[2] or 'InstantMeeting',
+                            'join_times': [],
+                            'leave_times': [],
+                            'active': False,
+                            'new': True,
+                            'dirty': False,
+                        }
+                        participants[key] = state
+                    if state['active']:
+                        continue
+                    state['join_times'].append(event['event_time'])
+                    state['active'] = True
+                    session_ops.append((True, key[0], key[1], event['event_time']))
+                    if event.get('full_name'):
+                        state['full_name'] = event['full_name']
+
+                elif event['action'] == ACTION_LEAVE:
+                    if state is None or not state['active'] or not state['join_times']:
+                        continue
+                    state['leave_times'].append(event['event_time'])
+                    state['active'] = False
+                    session_ops.append((False, key[0], key[1], event['event_time']))
+
+                else:
+                    continue
+
+                state['dirty'] = True
+                applied_events.append(event)
+
+            # Session rows in event order: one executemany per run of opens/closes
+            for is_open, run in itertools.groupby(session_ops, key=lambda op: op[0]):
+                rows = [op[1:] for op in run]
+                (open_sessions_bulk if is_open else close_sessions_bulk)(cursor, rows)
+
+            # Durations and session counts from tbl_ParticipantSessions, one query per meeting
+            dirty = [(key, state) for key, state in participants.items() if state['dirty']]
+            now = session_time()
+            totals = {}
+            for meeting_id, group in itertools.groupby(sorted(dirty, key=lambda item: item[0]), key=lambda item: item[0][0]):
+                user_totals = get_session_totals(cursor, meeting_id, [key[1] for key, _ in group], now)
+                totals.update({(meeting_id, user_id): values for user_id, values in user_totals.items()})
+            for key, state in dirty:
+                state['join_times'], state['leave_times'] = cap_session_arrays(state['join_times'], state['leave_times'])
+                state['minutes'] = totals.get(key, {}).get('minutes', 0.0)
+                state['sessions'] = totals.get(key, {}).get('sessions', 0)
+
+            inserts = [(key, state) for key, state in dirty if state['new']]
+            updates = [state for _, state in dirty if not state['new']]
+
+            if inserts:
+                cursor.executemany("""
+                    INSERT INTO tbl_Participants
+                    (Meeting_ID, User_ID, Full_Name, Role, Meeting_Type,
+                     Join_Times, Leave_Times, Total_Duration_Minutes, Total_Sessions,
+                     Is_Currently_Active, Attendance_Percentagebasedon_host)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 0.00)
+                """, [
+                    (
+                        key[0], key[1], state['full_name'], state['role'], state['meeting_type'],
+                        json.dumps(state['join_times']), json.dumps(state['leave_times']),
+                        state['minutes'], state['sessions'], state['active'],
+                    )
+                    for key, state in inserts
+                ])
+
+            if updates:
+                cursor.executemany("""
+                    UPDATE tbl_Participants
+                    SET Join_Times = %s,
+                        Leave_Times = %s,
+                        Total_Duration_Minutes = %s,
+                        Total_Sessions = %s,
+                        Is_Currently_Active = %s,
+                        Full_Name = %s
+                    WHERE ID = %s
+                """, [
+                    (
+                        json.dumps(state['join_times']), json.dumps(state['leave_times']),
+                        state['minutes'], state['sessions'], state['active'], state['full_name'], state['id'],
+                    )
+                    for state in updates
+                ])
+
+            cursor.executemany(f"""
+                INSERT INTO {TBL_PARTICIPANT_EVENT_LOG} (Event_ID, Meeting_ID, User_ID, Action)
+                VALUES (%s, %s, %s, %s)
+            """, [
+                (event['event_id'], event['meeting_id'], int(event['user_id']), event['action'])
+                for event in fresh
+            ])
+
+            # Live participant pollers see the batch once it commits
+            for meeting_id, group in itertools.groupby(sorted(key for key, _ in dirty), key=lambda key: key[0]):
+                bump_roster_version(meeting_id, [user_id for _, user_id in group])
+
+            transaction.on_commit(lambda: _record_attendance(applied_events))
+
+    applied = len(applied_events)
+    logger.info(
+        f"[WRITE-BEHIND] Batch of {len(events)} events: {applied} applied, "
+        f"{len(inserts)} inserted, {len(updates)} updated"
+    )
+    return applied, len(events) - applied
+
+
+def _finish_batch(client, messages, events):
+    """Ack the stream entries and clear roster entries that are now in MySQL"""
+    clear_roster = client.register_script(_CLEAR_ROSTER_LUA)
+    pipe = client.pipeline(transaction=False)
+    pipe.xack(STREAM_KEY, CONSUMER_GROUP, *[stream_id for stream_id, _ in messages])
+    for event in events:
+        clear_roster(
+            keys=[_roster_key(event['meeting_id'])],
+            args=[event['user_id'], event['event_id']],
+            client=pipe
+        )
+    pipe.execute()
+
+
+def _delivery_count(client, stream_id):
+    pending = client.xpending_range(STREAM_KEY, CONSUMER_GROUP, min=stream_id, max=stream_id, count=1)
+    return pending[0]['times_delivered'] if pending else 0
+
+
+def _dead_letter(client, stream_id, event, error, deliveries):
+    """Move an event that keeps failing to the dead-letter stream and ack it"""
+    client.xadd(DEAD_LETTER_STREAM_KEY, {
+        **event,
+        'stream_id': stream_id,
+        'deliveries': deliveries,
+        'error': str(error)[:1000],
+    }, maxlen=STREAM_MAXLEN, approximate=True)
+    _finish_batch(client, [(stream_id, event)], [event])
+    logger.error(
+        f"[WRITE-BEHIND] Event {event.get('event_id')} ({stream_id}) failed {deliveries} deliveries, "
+        f"moved to {DEAD_LETTER_STREAM_KEY}: {error}"
+    )
+
+
+def _apply_one_by_one(client, messages):
+    """
+    Retry a failed batch event by event. Returns (applied, skipped, failed,
+    dead_lettered). Later events of a user whose event failed stay pending
+    behind it so they are not applied out of order.
+    """
+    applied = skipped = failed = dead_lettered = 0
+    blocked = set()
+    for stream_id, event in messages:
+        if not event:
+            client.xack(STREAM_KEY, CONSUMER_GROUP, stream_id)
+            continue
+        key = (event.get('meeting_id'), event.get('user_id'))
+        if key in blocked:
+            failed += 1
+            continue
+        try:
+            event_applied, event_skipped = apply_participant_events([event])
+        except Exception as e:
+            deliveries = _delivery_count(client, stream_id)
+            if deliveries >= PARTICIPANT_EVENT_MAX_DELIVERIES:
+                _dead_letter(client, stream_id, event, e, deliveries)
+                dead_lettered += 1
+            else:
+                logger.warning(
+                    f"⚠️ [WRITE-BEHIND] Event {event.get('event_id')} failed "
+                    f"(delivery {deliveries}/{PARTICIPANT_EVENT_MAX_DELIVERIES}), left pending: {e}"
+                )
+                blocked.add(key)
+                failed += 1
+            continue
+        _finish_batch(client, [(stream_id, event)], [event])
+        applied += event_applied
+        skipped += event_skipped
+    return applied, skipped, failed, dead_lettered
+
+
+def drain_participant_events(batch_size=DEFAULT_BATCH_SIZE, max_batches=50, consumer=None, block_ms=None):
+    """
+    Read and apply batches until the stream is empty (or max_batches).
+    A failing batch is retried event by event; events that still fail stay
+    pending (re-claimed after CLAIM_IDLE_MS) until they go to the dead-letter
+    stream after PARTICIPANT_EVENT_MAX_DELIVERIES deliveries.
+    """
+    client = get_redis_client()
+    if client is None:
+        return {'success': False, 'error': 'Redis unavailable', 'applied': 0, 'skipped': 0, 'batches': 0}
+
+    ensure_consumer_group(client)
+    consumer = consumer or default_consumer_name()
+    totals = {'success': True, 'applied': 0, 'skipped': 0, 'failed': 0, 'dead_lettered': 0, 'batches': 0}
+
+    for _ in range(max_batches):
+        messages = read_participant_events(client, consumer, batch_size, block_ms)
+        if not messages:
+            break
+
+        # Entries trimmed from the stream come back without fields; just ack them
+        events = [fields for _, fields in messages if fields]
+        try:
+            applied, skipped = apply_participant_events(events)
+        except Exception as e:
+            logger.warning(f"⚠️ [WRITE-BEHIND] Batch of {len(events)} failed, applying one by one: {e}")
+            applied, skipped, failed, dead_lettered = _apply_one_by_one(client, messages)
+            totals['failed'] += failed
+            totals['dead_lettered'] += dead_lettered
+            if failed:
+                totals.update(success=False, error=str(e))
+        else:
+            _finish_batch(client, messages, events)
+
+        totals['applied'] += applied
+        totals['skipped'] += skipped
+        totals['batches'] += 1
+
+    return totals
+
+
+def purge_participant_event_log(retention_days=EVENT_LOG_RETENTION_DAYS, batch_size=5000):
+    """Delete idempotency keys older than the stream can redeliver"""
+    deleted = 0
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(f"""
+                DELETE FROM {TBL_PARTICIPANT_EVENT_LOG}
+                WHERE Applied_At < NOW() - INTERVAL %s DAY
+                LIMIT %s
+            """, [retention_days, batch_size])
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+    return deleted
@@ -0,0 +1,379 @@
+# participant_sessions.py - One row per join/leave session
+#
+# tbl_Participants.Join_Times / Leave_Times used to be the only record of a
+# participant's sessions and were rewritten in full on every rejoin. Every
+# session now also gets a row here (Meeting_ID, User_ID, Joined_At, Left_At).
+# Durations, session counts and attendance percentages are SQL aggregates
+# over this table. The JSON arrays keep only the most recent
+# SESSION_ARRAY_LIMIT sessions for the existing response fields, once the
+# backfill migration (BACKFILL_MIGRATION) has copied the older sessions here;
+# until then they are left whole.
+#
+# Times are IST wall-clock values, same as the JSON arrays.
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+import pytz
+from django.db import connection, transaction
+
+TBL_PARTICIPANT_SESSIONS = 'tbl_ParticipantSessions'
+
+SESSION_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+SESSION_ARRAY_LIMIT = int(os.getenv("PARTICIPANT_SESSION_ARRAY_LIMIT", 20))
+BACKFILL_BATCH_SIZE = 500
+BACKFILL_MIGRATION = ('core', '0006_backfill_participant_sessions')
+BACKFILL_CHECK_INTERVAL = 300       # seconds between checks while the backfill is pending
+
+IST_TIMEZONE = pytz.timezone('Asia/Kolkata')
+
+_sessions_table_ready = False
+_backfill_done = False
+_backfill_checked_at = None
+
+# Minutes of one session; open sessions run until the "until" parameter
+_SESSION_MINUTES_SQL = "GREATEST(TIMESTAMPDIFF(SECOND, Joined_At, COALESCE(Left_At, %s)), 0) / 60"
+
+
+def create_participant_sessions_table():
+    """Create tbl_ParticipantSessions once per process"""
+    global _sessions_table_ready
+    if _sessions_table_ready:
+        return True
+
+    try:
+        with connection.cursor() as cursor:
+            # Open_Session is 1 while Left_At is NULL and NULL afterwards, so the
+            # unique key allows at most one open session per participant
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tbl_ParticipantSessions (
+                    ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    Meeting_ID CHAR(36) NOT NULL,
+                    User_ID INT NOT NULL,
+                    Joined_At DATETIME NOT NULL,
+                    Left_At DATETIME NULL,
+                    Open_Session TINYINT AS (IF(Left_At IS NULL, 1, NULL)) STORED,
+                    UNIQUE KEY uq_session_open (Meeting_ID, User_ID, Open_Session),
+                    INDEX idx_session_meeting_user (Meeting_ID, User_ID, Joined_At),
+                    INDEX idx_session_user_joined (User_ID, Joined_At),
+                    CONSTRAINT FK_ParticipantSessions_Meetings FOREIGN KEY (Meeting_ID)
+                        REFERENCES tbl_Meetings(ID)
+                        ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+        _sessions_table_ready = True
+        logging.debug("tbl_ParticipantSessions table created or exists")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to create tbl_ParticipantSessions table: {e}")
+        return False
+
+
+def session_time(value=None):
+    """IST wall-clock string for a datetime (aware or naive IST) or existing string; now if None"""
+    if value is None:
+        value = datetime.now(IST_TIMEZONE)
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(IST_TIMEZONE)
+    return value.strftime(SESSION_TIME_FORMAT)
+
+
+def session_backfill_done():
+    """True once the backfill migration is recorded (checked every BACKFILL_CHECK_INTERVAL until then)"""
+    global _backfill_done, _backfill_checked_at
+    if _backfill_done:
+        return True
+
+    now = time.monotonic()
+    if _backfill_checked_at is not None and now - _backfill_checked_at < BACKFILL_CHECK_INTERVAL:
+        return False
+    _backfill_checked_at = now
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM django_migrations WHERE app = %s AND name = %s", list(BACKFILL_MIGRATION))
+            _backfill_done = cursor.fetchone() is not None
+    except Exception as e:
+        logging.warning(f"⚠️ Could not check the participant session backfill: {e}")
+    return _backfill_done
+
+
+def cap_session_arrays(join_times, leave_times):
+    """
+    Keep the most recent SESSION_ARRAY_LIMIT sessions; join/leave pairs stay
+    aligned. Arrays are left whole until the backfill has copied them to
+    tbl_ParticipantSessions.
+    """
+    drop = max(0, len(join_times) - SESSION_ARRAY_LIMIT)
+    if drop and not session_backfill_done():
+        return join_times, leave_times
+    if not drop:
+        return join_times, leave_times
+    return join_times[drop:], leave_times[drop:]
+
+
+# ---- writes ---------------------------------------------------------------
+
+def open_session(cursor, meeting_id, user_id, joined_at=None):
+    """Start a session; a no-op while the participant already has an open one"""
+    cursor.execute("""
+        INSERT INTO tbl_ParticipantSessions (Meeting_ID, User_ID, Joined_At)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE Joined_At = Joined_At
+    """, [meeting_id, user_id, session_time(joined_at)])
+
+
+def close_session(cursor, meeting_id, user_id, left_at=None):
+    """Close the open session, if any; returns the number of sessions closed"""
+    cursor.execute("""
+        UPDATE tbl_ParticipantSessions
+        SET Left_At = GREATEST(Joined_At, %s)
+        WHERE Meeting_ID = %s AND User_ID = %s AND Left_At IS NULL
+    """, [session_time(left_at), meeting_id, user_id])
+    return cursor.rowcount
+
+
+def close_meeting_sessions(cursor, meeting_id, left_at=None):
+    """Close every open session of a meeting (meeting end)"""
+    cursor.execute("""
+        UPDATE tbl_ParticipantSessions
+        SET Left_At = GREATEST(Joined_At, %s)
+        WHERE Meeting_ID = %s AND Left_At IS NULL
+    """, [session_time(left_at), meeting_id])
+    return cursor.rowcount
+
+
+def open_sessions_bulk(cursor, rows):
+    """rows: [(meeting_id, user_id, joined_at)]"""
+    if not rows:
+        return
+    cursor.executemany("""
+        INSERT INTO tbl_ParticipantSessions (Meeting_ID, User_ID, Joined_At)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE Joined_At = Joined_At
+    """, [(meeting_id, user_id, session_time(joined_at)) for meeting_id, user_id, joined_at in rows])
+
+
+def close_sessions_bulk(cursor, rows):
+    """rows: [(meeting_id, user_id, left_at)]"""
+    if not rows:
+        return
+    cursor.executemany("""
+        UPDATE tbl_ParticipantSessions
+        SET Left_At = GREATEST(Joined_At, %s)
+        WHERE Meeting_ID = %s AND User_ID = %s AND Left_At IS NULL
+    """, [(session_time(left_at), meeting_id, user_id) for meeting_id, user_id, left_at in rows])
+
+
+# ---- aggregates -------------------------------------------------------------
+
+def get_session_totals(cursor, meeting_id, user_ids=None, until=None):
+    """
+    {user_id: {'minutes', 'sessions', 'first_join', 'last_leave'}} for a meeting.
+    'sessions' counts completed sessions (the old Total_Sessions meaning).
+    """
+    params = [session_time(until), meeting_id]
+    user_filter = ""
+    if user_ids:
+        user_filter = f"AND User_ID IN ({', '.join(['%s'] * len(user_ids))})"
+        params.extend(user_ids)
+
+    cursor.execute(f"""
+        SELECT User_ID,
+               ROUND(SUM({_SESSION_MINUTES_SQL}), 2),
+               SUM(Left_At IS NOT NULL),
+               MIN(Joined_At),
+               MAX(Left_At)
+        FROM tbl_ParticipantSessions
+        WHERE Meeting_ID = %s {user_filter}
+        GROUP BY User_ID
+    """, params)
+
+    return {
+        row[0]: {
+            'minutes': float(row[1] or 0),
+            'sessions': int(row[2] or 0),
+            'first_join': row[3],
+            'last_leave': row[4],
+        }
+        for row in cursor.fetchall()
+    }
+
+
+def get_meetings_session_totals(cursor, meeting_ids, user_ids, until=None):
+    """get_session_totals for many meetings at once: {(meeting_id, user_id): {...}}"""
+    if not meeting_ids or not user_ids:
+        return {}
+    meeting_ids, user_ids = list(meeting_ids), list(user_ids)
+    cursor.execute(f"""
+        SELECT Meeting_ID, User_ID,
+               ROUND(SUM({_SESSION_MINUTES_SQL}), 2),
+               SUM(Left_At IS NOT NULL),
+               MIN(Joined_At),
+               MAX(Left_At)
+        FROM tbl_ParticipantSessions
+        WHERE Meeting_ID IN ({', '.join(['%s'] * len(meeting_ids))})
+          AND User_ID IN ({', '.join(['%s'] * len(user_ids))})
+        GROUP BY Meeting_ID, User_ID
+    """, [session_time(until)] + meeting_ids + user_ids)
+
+    return {
+        (str(row[0]), row[1]): {
+            'minutes': float(row[2] or 0),
+            'sessions': int(row[3] or 0),
+            'first_join': row[4],
+            'last_leave': row[5],
+        }
+        for row in cursor.fetchall()
+    }
+
+
+def get_session_minutes(cursor, meeting_id, user_id, until=None):
+    """Total minutes of one participant across all sessions"""
+    totals = get_session_totals(cursor, meeting_id, [user_id], until)
+    return totals.get(int(user_id), {}).get('minutes', 0.0)
+
+
+def apply_session_totals(cursor, meeting_id, end_time):
+    """
+    Meeting end, set-based: append the end time to Leave_Times of still-active
+    rows, then write Total_Duration_Minutes / Total_Sessions from the session
+    aggregate and mark everyone inactive. Call after close_meeting_sessions.
+    """
+    end_time = session_time(end_time)
+    # Separate statement: multi-table UPDATE does not guarantee assignment order,
+    # and this must see Is_Currently_Active before it is cleared
+    cursor.execute("""
+        UPDATE tbl_Participants
+        SET Leave_Times = JSON_ARRAY_APPEND(Leave_Times, '$', %s)
+        WHERE Meeting_ID = %s
+          AND Is_Currently_Active = TRUE
+          AND JSON_LENGTH(Join_Times) > JSON_LENGTH(Leave_Times)
+    """, [end_time, meeting_id])
+    cursor.execute(f"""
+        UPDATE tbl_Participants p
+        LEFT JOIN (
+            SELECT User_ID,
+                   ROUND(SUM({_SESSION_MINUTES_SQL}), 2) AS Minutes,
+                   SUM(Left_At IS NOT NULL) AS Completed
+            FROM tbl_ParticipantSessions
+            WHERE Meeting_ID = %s
+            GROUP BY User_ID
+        ) s ON s.User_ID = p.User_ID
+        SET p.End_Meeting_Time = %s,
+            p.Total_Duration_Minutes = COALESCE(s.Minutes, 0),
+            p.Total_Sessions = COALESCE(s.Completed, 0),
+            p.Is_Currently_Active = FALSE
+        WHERE p.Meeting_ID = %s
+    """, [end_time, meeting_id, end_time, meeting_id])
+    return cursor.rowcount
+
+
+def apply_host_attendance(cursor, meeting_id, host_minutes):
+    """Attendance_Percentagebasedon_host for every row of a meeting in one UPDATE"""
+    cursor.execute("""
+        UPDATE tbl_Participants
+        SET Attendance_Percentagebasedon_host = CASE
+            WHEN Role = 'host' THEN 100.00
+            WHEN %s > 0 THEN ROUND(Total_Duration_Minutes / %s * 100, 2)
+            ELSE 0.00
+        END
+        WHERE Meeting_ID = %s
+    """, [host_minutes, host_minutes, meeting_id])
+    return cursor.rowcount
+
+
+# ---- backfill -----------------------------------------------------------------
+
+def _parse_times(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, list) else []
+        except ValueError:
+            return []
+    return []
+
+
+def sessions_from_arrays(join_times, leave_times, is_active, end_meeting_time=None):
+    """
+    Pair Join_Times[i] with Leave_Times[i]. Only the last session of an active
+    participant stays open; other unmatched joins are closed at the meeting end
+    time (or at the join itself when that is unknown).
+    """
+    sessions = []
+    for index, joined_at in enumerate(join_times):
+        if index < len(leave_times):
+            left_at = leave_times[index]
+        elif is_active and index == len(join_times) - 1:
+            left_at = None
+        else:
+            left_at = session_time(end_meeting_time) if end_meeting_time else joined_at
+        sessions.append((joined_at, left_at))
+    return sessions
+
+
+def backfill_participant_sessions(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Build tbl_ParticipantSessions from the Join_Times/Leave_Times arrays.
+    Sessions written since the table went live are already there, so per
+    participant only the array sessions that started before their earliest
+    session row are copied; re-running copies nothing twice. Returns counts.
+    """
+    if not create_participant_sessions_table():
+        raise RuntimeError("tbl_ParticipantSessions could not be created")
+
+    counts = {'participants': 0, 'sessions': 0, 'skipped': 0}
+    last_id = 0
+
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT p.ID, p.Meeting_ID, p.User_ID, p.Join_Times, p.Leave_Times,
+                           p.Is_Currently_Active, p.End_Meeting_Time,
+                           (SELECT MIN(s.Joined_At) FROM tbl_ParticipantSessions s
+                            WHERE s.Meeting_ID = p.Meeting_ID AND s.User_ID = p.User_ID) AS First_Session
+                    FROM tbl_Participants p
+                    WHERE p.ID > %s
+                    ORDER BY p.ID
+                    LIMIT %s
+                """, [last_id, batch_size])
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+
+                session_rows = []
+                for participant_id, meeting_id, user_id, join_json, leave_json, is_active, end_time, first_session in rows:
+                    last_id = participant_id
+                    join_times = _parse_times(join_json)
+                    sessions = sessions_from_arrays(join_times, _parse_times(leave_json), bool(is_active), end_time)
+                    if first_session is not None:
+                        # Sessions from this one on were recorded by the live code
+                        first_session = session_time(first_session)
+                        sessions = [
+                            session for session in sessions
+                            if str(session[0]).replace('T', ' ')[:19] < first_session
+                        ]
+                    if not sessions:
+                        counts['skipped'] += 1
+                        continue
+                    session_rows.extend((meeting_id, user_id, joined_at, left_at) for joined_at, left_at in sessions)
+                    counts['participants'] += 1
+
+                if session_rows:
+                    cursor.executemany("""
+                        INSERT INTO tbl_ParticipantSessions (Meeting_ID, User_ID, Joined_At, Left_At)
+                        VALUES (%s, %s, %s, %s)
+                    """, session_rows)
+                    counts['sessions'] += len(session_rows)
+
+        logging.info(f"Participant session backfill progress: {counts}")
+
+    return counts
@@ -1,13 +1,18 @@
 # participants.py - Enhanced with Full LiveKit Integration
 from core.WebSocketConnection import enhanced_logging_config
 from django.db import connection, transaction
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified, JsonResponse
 from django.views.decorators.http import require_http_methods
-from core.AI_Attendance.Attendance import start_attendance_tracking, stop_attendance_tracking
+from core.AI_Attendance.Attendance import (
+    start_attendance_tracking,
+    stop_attendance_tracking,
+    stop_meeting_attendance_tracking,
+)
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
 from django.utils import timezone
 from datetime import datetime, timedelta
+import hashlib
 import json
 import logging
 import re
@@ -19,8 +24,51 @@ import pytz
 import time
 import socket
 from datetime import timedelta  # Add this import at the top
+import asyncio
 import redis
+from asgiref.sync import sync_to_async
+from core.UserDashBoard.analytics_rollups import refresh_meeting_rollups
+from core.utils.keyset import InvalidCursor
+from core.utils.redis_registry import DEFAULT_STORE, get_async_redis_client, get_redis_client
 from django.conf import settings   
+from .participant_events import (
+    ACTION_JOIN,
+    ACTION_LEAVE,
+    PARTICIPANT_WRITE_BEHIND,
+    drain_participant_events,
+    enqueue_participant_event,
+    get_pending_roster,
+    get_pending_state,
+)
+from .participant_sessions import (
+    apply_host_attendance,
+    apply_session_totals,
+    cap_session_arrays,
+    close_meeting_sessions,
+    close_session,
+    close_sessions_bulk,
+    create_participant_sessions_table,
+    get_meetings_session_totals,
+    get_session_minutes,
+    get_session_totals,
+    open_session,
+    open_sessions_bulk,
+)
+from .roster_version import (
+    bump_roster_version,
+    get_roster_changes,
+    get_roster_snapshot,
+    get_roster_version,
+)
+from .meeting_history import (
+    HISTORY_MAX_PAGE_SIZE,
+    fetch_user_meeting_page,
+    format_session_time,
+    get_history_summary,
+    history_page_size,
+    invalidate_history_summaries,
+    load_meeting_stats,
+)
 
 # Add this import section at the top after other imports
 try:
@@ -51,126 +99,23 @@ def convert_to_ist(dt):
     return dt.astimezone(IST_TIMEZONE)
 
 
-DEFAULT_REDIS_CONFIG = {
-    'host': os.getenv("DEFAULT_REDIS_HOST", "localhost"),
-    'port': int(os.getenv("DEFAULT_REDIS_PORT", 6379)),
-    'db': int(os.getenv("DEFAULT_REDIS_DB", 0)),
-    'decode_responses': os.getenv("DEFAULT_REDIS_DECODE_RESPONSES", "True") == "True"
-}
-
-REDIS_CONFIG = getattr(settings, 'REDIS_CONFIG', DEFAULT_REDIS_CONFIG)
-# Import LiveKit service from meetings.py
-redis_client = None
-
-# Replace your existing Redis functions with this single, clean implementation
-# Add this to your participants.py file
-
 def get_redis():
     """
-    Get Redis connection with auto-configuration detection and fallback
-    Returns None if Redis is unavailable (allows database-only operation)
+    Pooled Redis client for the default store, or None while Redis is
+    unreachable (allows database-only operation). Connects on first use and
+    backs off after failures - see core.utils.redis_registry.
     """
-    global redis_client
-    
-    if redis_client is None:
-        # Configurations to try in order
-        configs_to_try = [
-            # Original configuration
-            {
-                'host': '192.168.48.201',
-                'port': 6379,
-                'db': 0,
-                'decode_responses': True,
-                'socket_timeout': 3,
-                'socket_connect_timeout': 3,
-            },
-            # Localhost fallback
-            {
-                'host': 'localhost', 
-                'port': 6379,
-                'db': 0,
-                'decode_responses': True,
-                'socket_timeout': 3,
-                'socket_connect_timeout': 3,
-            },
-            # 127.0.0.1 fallback
-            {
-                'host': '127.0.0.1',
-                'port': 6379, 
-                'db': 0,
-                'decode_responses': True,
-                'socket_timeout': 3,
-                'socket_connect_timeout': 3,
-            }
-        ]
-        
-        for config in configs_to_try:
-            try:
-                client = redis.StrictRedis(**config)
-                
-                # Test connection with ping
-                client.ping()
-                
-                # If we get here, connection works
-                redis_client = client
-                logging.info(f"Redis connected successfully to {config['host']}:{config['port']}")
-                
-                # Update global config to working one
-                global REDIS_CONFIG
-                REDIS_CONFIG = config
-                break
-                
-            except redis.ConnectionError:
-                logging.debug(f"Redis connection failed for {config['host']}:{config['port']}")
-                continue
-            except redis.TimeoutError:
-                logging.debug(f"Redis timeout for {config['host']}:{config['port']}")
-                continue
-            except Exception as e:
-                logging.debug(f"Redis error for {config['host']}:{config['port']}: {e}")
-                continue
-        
-        if redis_client is None:
-            logging.warning("All Redis configurations failed - co-host features will use database-only mode")
-    
-    return redis_client
-
-# Remove any get_redis_client() functions - use get_redis() directly
-# Initialize on module load
-redis_client = None
-
-# Test Redis connection immediately when module loads
-try:
-    test_redis = get_redis()
-    if test_redis:
-        logging.info("Redis initialization successful on module load")
-    else:
-        logging.info("Redis unavailable - database-only mode enabled")
-except Exception as e:
-    logging.warning(f"Redis initialization error: {e}")
-def init_redis_connection():
-    """Initialize Redis connection on module load"""
-    global redis_client
-    try:
-        redis_client = get_redis()
-        if redis_client:
-            logging.info("✅ Redis client initialized successfully for co-host functionality")
-        else:
-            logging.warning("⚠️ Redis client initialization failed - co-host features disabled")
-    except Exception as e:
-        logging.error(f"❌ Redis initialization error: {e}")
-        redis_client = None
-
-# Call initialization when module loads
-init_redis_connection()
+    return get_redis_client(DEFAULT_STORE)
 
 try:
-    from .meetings import livekit_service, LIVEKIT_ENABLED, LIVEKIT_CONFIG
+    from .meetings import livekit_service, LIVEKIT_ENABLED, LIVEKIT_CONFIG, invalidate_meeting_info_cache
     logging.info("✅ LiveKit service imported successfully")
 except ImportError:
     livekit_service = None
     LIVEKIT_ENABLED = False
     LIVEKIT_CONFIG = {}
+    def invalidate_meeting_info_cache(meeting_id):
+        pass
     logging.warning("⚠️ LiveKit service not available")
 
 # Global Variables (aligned with meetings.py style)
@@ -190,6 +135,17 @@ LOG_FORMAT = '%(asctime)s %(levelname)s %(message)s'
 
 logging.basicConfig(filename=LOG_FILE_PATH, level=LOG_LEVEL, format=LOG_FORMAT)
 
+# end_meeting finalises inline while the estimate stays within this budget
+END_MEETING_LATENCY_BUDGET_MS = int(os.getenv("END_MEETING_LATENCY_BUDGET_MS", 1500))
+END_MEETING_INLINE_MIN_PARTICIPANTS = 50  # smaller meetings always finalise inline
+_finalize_ms_per_participant = 2.0  # running estimate, updated after each inline finalisation
+
+# Sync_LiveKit_Participants_Fixed runs at most once per meeting per interval;
+# concurrent and later callers within the interval get the cached result
+PARTICIPANT_SYNC_INTERVAL = int(os.getenv("PARTICIPANT_SYNC_INTERVAL", 5))  # seconds
+PARTICIPANT_SYNC_LOCK_MS = 15000  # upper bound on one sync run
+PARTICIPANT_SYNC_WAIT_SECONDS = 3.0  # how long a caller waits for a running sync
+
 
 
 def calculate_duration_from_arrays(join_times, leave_times):
@@ -238,8 +194,7 @@ def get_host_duration_for_meeting(meeting_id):
             cursor.execute("""
                 SELECT 
                     Total_Duration_Minutes,
-                    Join_Times,
-                    Leave_Times
+                    User_ID
                 FROM tbl_Participants
                 WHERE Meeting_ID = %s 
                 AND Role = 'host'
@@ -252,28 +207,13 @@ def get_host_duration_for_meeting(meeting_id):
             if not host_data:
                 return 0.0
             
-            total_duration, join_times_json, leave_times_json = host_data
+            total_duration, host_user_id = host_data
             
             if total_duration and total_duration > 0:
                 return float(total_duration)
             
-            try:
-                if isinstance(join_times_json, str):
-                    join_times = json.loads(join_times_json)
-                else:
-                    join_times = join_times_json or []
-                
-                if isinstance(leave_times_json, str):
-                    leave_times = json.loads(leave_times_json)
-                else:
-                    leave_times = leave_times_json or []
-                
-                duration = calculate_duration_from_arrays(join_times, leave_times)
-                return duration
-                
-            except Exception as e:
-                logging.error(f"Error parsing host times: {e}")
-                return 0.0
+            # Not finalised yet - sum the host's sessions in SQL
+            return get_session_minutes(cursor, meeting_id, host_user_id, get_ist_now())
                 
     except Exception as e:
         logging.error(f"Error getting host duration: {e}")
@@ -286,9 +226,7 @@ def get_user_duration_for_meeting(meeting_id, user_id):
         with connection.cursor() as cursor:
             cursor.execute("""
                 SELECT 
-                    Total_Duration_Minutes,
-                    Join_Times,
-                    Leave_Times
+                    Total_Duration_Minutes
                 FROM tbl_Participants
                 WHERE Meeting_ID = %s 
                 AND User_ID = %s
@@ -301,28 +239,13 @@ def get_user_duration_for_meeting(meeting_id, user_id):
             if not user_data:
                 return 0.0
             
-            total_duration, join_times_json, leave_times_json = user_data
+            total_duration = user_data[0]
             
             if total_duration and total_duration > 0:
                 return float(total_duration)
             
-            try:
-                if isinstance(join_times_json, str):
-                    join_times = json.loads(join_times_json)
-                else:
-                    join_times = join_times_json or []
-                
-                if isinstance(leave_times_json, str):
-                    leave_times = json.loads(leave_times_json)
-                else:
-                    leave_times = leave_times_json or []
-                
-                duration = calculate_duration_from_arrays(join_times, leave_times)
-                return duration
-                
-            except Exception as e:
-                logging.error(f"Error parsing user times: {e}")
-                return 0.0
+            # Not finalised yet - sum the user's sessions in SQL
+            return get_session_minutes(cursor, meeting_id, user_id, get_ist_now())
                 
     except Exception as e:
         logging.error(f"Error getting user duration: {e}")
@@ -443,13 +366,11 @@ class Participants(models.Model):
             return f"{mins}m"
 
 def create_participants_table():
-    """Create tbl_Participants table with session arrays"""
+    """Create tbl_Participants table with session arrays (existing rows are kept)"""
     try:
         with connection.cursor() as cursor:
             cursor.execute("""
-                DROP TABLE IF EXISTS tbl_Participants;
-                
-                CREATE TABLE tbl_Participants (
+                CREATE TABLE IF NOT EXISTS tbl_Participants (
                     ID INT AUTO_INCREMENT PRIMARY KEY,
                     Meeting_ID CHAR(36) NOT NULL,
                     User_ID INT NOT NULL,
@@ -492,12 +413,14 @@ def create_participants_table():
                     INDEX idx_active_users (Meeting_ID, Is_Currently_Active)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Stores participant data with session arrays'
             """)
-            logging.info("✅ tbl_Participants table created with session arrays")
+            logging.info("✅ tbl_Participants table created or exists")
+        return True
             
     except Exception as e:
         logging.error(f"❌ Failed to create tbl_Participants table: {e}")
         import traceback
         logging.error(f"Traceback: {traceback.format_exc()}")
+        return False
 
 
 def calculate_session_duration(session_start, session_end=None):
@@ -562,6 +485,162 @@ def get_duration_breakdown(total_seconds):
         'seconds': seconds
     }
 
+def queue_participant_event(meeting_id, user_id, action, is_host=False):
+    """
+    Write-behind path for record_participant_join/leave: validate against the
+    cached meeting row and the pending roster, queue the event, answer 202.
+    Returns None when Redis is unavailable so the caller records synchronously.
+    """
+    from .meetings import get_meeting_info
+    
+    meeting = get_meeting_info(meeting_id)
+    if not meeting:
+        return JsonResponse({
+            'success': False,
+            'error': 'Meeting not found'
+        }, status=404)
+    
+    if action == ACTION_JOIN and meeting['status'] == 'ended':
+        return JsonResponse({
+            'success': False,
+            'error': 'Meeting has ended'
+        }, status=400)
+    
+    pending = get_pending_state(meeting_id, user_id)
+    if pending and action == ACTION_JOIN and pending['status'] == 'active':
+        return JsonResponse({
+            'success': True,
+            'message': 'User already in meeting',
+            'participant_id': None,
+            'action': 'already_active'
+        }, status=200)
+    if pending and action == ACTION_LEAVE and pending['status'] == 'left':
+        return JsonResponse({
+            'success': False,
+            'error': 'Participant has already left',
+            'participant_id': None,
+            'status': 'already_left'
+        }, status=400)
+    
+    event_time = get_ist_now().strftime('%Y-%m-%d %H:%M:%S')
+    role = None
+    if action == ACTION_JOIN:
+        role = 'host' if (is_host or (meeting['host_id'] and user_id == meeting['host_id'])) else 'participant'
+    
+    event = enqueue_participant_event(meeting_id, user_id, action, event_time, role=role)
+    if event is None:
+        return None
+    
+    logging.info(f"✅ [{action.upper()} QUEUED] User {user_id} in meeting {meeting_id} ({event['event_id']})")
+    
+    response = {
+        'success': True,
+        'message': f'Participant {action} queued',
+        'participant_id': None,
+        'meeting_id': meeting_id,
+        'user_id': user_id,
+        'event_id': event['event_id'],
+        'action': 'queued'
+    }
+    if action == ACTION_JOIN:
+        response.update({'role': role, 'join_time': event_time})
+    else:
+        response.update({'leave_time': event_time, 'status': 'leave_queued'})
+    return JsonResponse(response, status=202)
+
+def write_participant_join(meeting_id, user_id, full_name, role, meeting_type):
+    """
+    Synchronous join write, shared by record_participant_join and the LiveKit
+    join endpoint: insert the first join or append a rejoin to the session
+    arrays, open a session row, bump the roster version, start attendance.
+    Returns (participant_id, action, join_time_str); action is 'first_join',
+    'rejoin' or 'already_active' (nothing written).
+    """
+    join_time = get_ist_now()
+    join_time_str = join_time.strftime('%Y-%m-%d %H:%M:%S')
+    
+    with connection.cursor() as cursor:
+        # Check if user already has a record
+        cursor.execute("""
+            SELECT ID, Join_Times, Leave_Times, Is_Currently_Active, Total_Sessions
+            FROM tbl_Participants 
+            WHERE Meeting_ID = %s AND User_ID = %s
+        """, [meeting_id, user_id])
+        
+        existing = cursor.fetchone()
+        
+        if not existing:
+            # ===== FIRST TIME JOIN =====
+            logging.info(f"[JOIN] First time join for user {user_id}")
+            
+            cursor.execute("""
+                INSERT INTO tbl_Participants 
+                (Meeting_ID, User_ID, Full_Name, Role, Meeting_Type,
+                 Join_Times, Leave_Times, Total_Duration_Minutes, Total_Sessions,
+                 Is_Currently_Active, Attendance_Percentagebasedon_host)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, 0, 0, TRUE, 0.00)
+            """, [
+                meeting_id, 
+                user_id, 
+                full_name, 
+                role, 
+                meeting_type,
+                json.dumps([join_time_str]),
+                json.dumps([])
+            ])
+            
+            participant_id = cursor.lastrowid
+            open_session(cursor, meeting_id, user_id, join_time_str)
+            action = 'first_join'
+            
+        else:
+            # ===== REJOIN =====
+            participant_id, join_times_json, leave_times_json, is_active, total_sessions = existing
+            
+            if is_active:
+                logging.warning(f"[JOIN] User {user_id} already active - treating as duplicate")
+                return participant_id, 'already_active', join_time_str
+            
+            # Parse arrays
+            try:
+                join_times = json.loads(join_times_json) if isinstance(join_times_json, str) else (join_times_json or [])
+            except:
+                join_times = []
+            
+            try:
+                leave_times = json.loads(leave_times_json) if isinstance(leave_times_json, str) else (leave_times_json or [])
+            except:
+                leave_times = []
+            
+            # Append new join time (arrays keep only the recent sessions)
+            join_times.append(join_time_str)
+            join_times, leave_times = cap_session_arrays(join_times, leave_times)
+            
+            cursor.execute("""
+                UPDATE tbl_Participants 
+                SET Join_Times = %s,
+                    Leave_Times = %s,
+                    Is_Currently_Active = TRUE,
+                    Full_Name = %s
+                WHERE ID = %s
+            """, [json.dumps(join_times), json.dumps(leave_times), full_name, participant_id])
+            open_session(cursor, meeting_id, user_id, join_time_str)
+            
+            action = 'rejoin'
+            logging.info(f"[JOIN] User {user_id} rejoined (session #{(total_sessions or 0) + 1})")
+    
+    bump_roster_version(meeting_id, [user_id])
+    
+    # Attendance integration
+    if ATTENDANCE_INTEGRATION:
+        try:
+            record_participant_join_attendance(meeting_id, str(user_id), join_time)
+            logging.info(f"✅ ATTENDANCE: Started for user {user_id}")
+        except Exception as e:
+            logging.warning(f"⚠️ ATTENDANCE: {e}")
+    
+    return participant_id, action, join_time_str
+
 @require_http_methods(["POST"])
 @csrf_exempt
 def record_participant_join(request):
@@ -592,6 +671,12 @@ def record_participant_join(request):
                 'error': 'user_id must be integer'
             }, status=400)
         
+        # Write-behind: queue the join and return; the consumer writes tbl_Participants
+        if PARTICIPANT_WRITE_BEHIND:
+            queued = queue_participant_event(meeting_id, user_id, ACTION_JOIN, is_host=is_host)
+            if queued is not None:
+                return queued
+        
         # Get user name from tbl_Users
         # actual_user_name = f"User_{user_id}"
 
@@ -650,102 +735,33 @@ def record_participant_join(request):
         
         # Determine role
         role = 'host' if (is_host or (host_id and user_id == host_id)) else 'participant'
-        join_time = get_ist_now()
-        join_time_str = join_time.strftime('%Y-%m-%d %H:%M:%S')
         
         try:
-            with connection.cursor() as cursor:
-                # Check if user already has a record
-                cursor.execute("""
-                    SELECT ID, Join_Times, Leave_Times, Is_Currently_Active, Total_Sessions
-                    FROM tbl_Participants 
-                    WHERE Meeting_ID = %s AND User_ID = %s
-                """, [meeting_id, user_id])
-                
-                existing = cursor.fetchone()
-                
-                if not existing:
-                    # ===== FIRST TIME JOIN =====
-                    logging.info(f"[JOIN] First time join for user {user_id}")
-                    
-                    cursor.execute("""
-                        INSERT INTO tbl_Participants 
-                        (Meeting_ID, User_ID, Full_Name, Role, Meeting_Type,
-                         Join_Times, Leave_Times, Total_Duration_Minutes, Total_Sessions,
-                         Is_Currently_Active, Attendance_Percentagebasedon_host)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, 0, 0, TRUE, 0.00)
-                    """, [
-                        meeting_id, 
-                        user_id, 
-                        actual_user_name, 
-                        role, 
-                        meeting_type,
-                        json.dumps([join_time_str]),
-                        json.dumps([])
-                    ])
-                    
-                    participant_id = cursor.lastrowid
-                    action = 'first_join'
-                    
-                else:
-                    # ===== REJOIN =====
-                    participant_id, join_times_json, leave_times_json, is_active, total_sessions = existing
-                    
-                    # Parse arrays
-                    try:
-                        join_times = json.loads(join_times_json) if isinstance(join_times_json, str) else (join_times_json or [])
-                    except:
-                        join_times = []
-                    
-                    try:
-                        leave_times = json.loads(leave_times_json) if isinstance(leave_times_json, str) else (leave_times_json or [])
-                    except:
-                        leave_times = []
-                    
-                    if is_active:
-                        logging.warning(f"[JOIN] User {user_id} already active - treating as duplicate")
-                        return JsonResponse({
-                            'success': True,
-                            'message': 'User already in meeting',
-                            'participant_id': participant_id,
-                            'action': 'already_active'
-                        }, status=200)
-                    
-                    # Append new join time
-                    join_times.append(join_time_str)
-                    
-                    cursor.execute("""
-                        UPDATE tbl_Participants 
-                        SET Join_Times = %s,
-                            Is_Currently_Active = TRUE,
-                            Full_Name = %s
-                        WHERE ID = %s
-                    """, [json.dumps(join_times), actual_user_name, participant_id])
-                    
-                    action = 'rejoin'
-                    logging.info(f"[JOIN] User {user_id} rejoined (session #{len(join_times)})")
-                
-                # Attendance integration
-                if ATTENDANCE_INTEGRATION:
-                    try:
-                        record_participant_join_attendance(meeting_id, str(user_id), join_time)
-                        logging.info(f"✅ ATTENDANCE: Started for user {user_id}")
-                    except Exception as e:
-                        logging.warning(f"⚠️ ATTENDANCE: {e}")
-                
-                logging.info(f"✅ [JOIN SUCCESS] User {user_id} - {action}")
-                
+            participant_id, action, join_time_str = write_participant_join(
+                meeting_id, user_id, actual_user_name, role, meeting_type
+            )
+            
+            if action == 'already_active':
                 return JsonResponse({
                     'success': True,
-                    'message': f'Participant join recorded - {action}',
+                    'message': 'User already in meeting',
                     'participant_id': participant_id,
-                    'meeting_id': meeting_id,
-                    'user_id': user_id,
-                    'full_name': actual_user_name,
-                    'role': role,
-                    'join_time': join_time_str,
-                    'action': action
-                }, status=201 if action == 'first_join' else 200)
+                    'action': 'already_active'
+                }, status=200)
+            
+            logging.info(f"✅ [JOIN SUCCESS] User {user_id} - {action}")
+            
+            return JsonResponse({
+                'success': True,
+                'message': f'Participant join recorded - {action}',
+                'participant_id': participant_id,
+                'meeting_id': meeting_id,
+                'user_id': user_id,
+                'full_name': actual_user_name,
+                'role': role,
+                'join_time': join_time_str,
+                'action': action
+            }, status=201 if action == 'first_join' else 200)
                 
         except Exception as db_error:
             logging.error(f"[JOIN] Database error: {db_error}")
@@ -802,6 +818,12 @@ def record_participant_leave(request):
                 'error': 'user_id must be integer'
             }, status=400)
         
+        # Write-behind: queue the leave and return; the consumer writes tbl_Participants
+        if PARTICIPANT_WRITE_BEHIND:
+            queued = queue_participant_event(meeting_id, user_id, ACTION_LEAVE)
+            if queued is not None:
+                return queued
+        
         leave_time = get_ist_now()
         leave_time_str = leave_time.strftime('%Y-%m-%d %H:%M:%S')
         
@@ -878,24 +900,29 @@ def record_participant_leave(request):
                         'error': 'No join time found for this user'
                     }, status=400)
                 
-                # Append to leave times array
+                # Append to leave times array (arrays keep only the recent sessions)
                 leave_times.append(leave_time_str)
+                join_times, leave_times = cap_session_arrays(join_times, leave_times)
                 
-                # ===== CRITICAL: Calculate total duration from ALL sessions =====
-                total_duration_minutes = calculate_duration_from_arrays(join_times, leave_times)
-                completed_sessions = len(leave_times)
+                # ===== CRITICAL: Total duration over ALL sessions, from tbl_ParticipantSessions =====
+                close_session(cursor, meeting_id, user_id, leave_time_str)
+                bump_roster_version(meeting_id, [user_id])
+                totals = get_session_totals(cursor, meeting_id, [user_id], leave_time_str).get(user_id, {})
+                total_duration_minutes = totals.get('minutes', 0.0)
+                completed_sessions = totals.get('sessions', 0)
                 
                 logging.info(f"[LEAVE] Calculated duration: {total_duration_minutes:.2f} minutes across {completed_sessions} sessions")
                 
                 # Update participant record
                 cursor.execute("""
                     UPDATE tbl_Participants
-                    SET Leave_Times = %s,
+                    SET Join_Times = %s,
+                        Leave_Times = %s,
                         Total_Duration_Minutes = %s,
                         Total_Sessions = %s,
                         Is_Currently_Active = FALSE
                     WHERE ID = %s
-                """, [json.dumps(leave_times), total_duration_minutes, completed_sessions, participant_id])
+                """, [json.dumps(join_times), json.dumps(leave_times), total_duration_minutes, completed_sessions, participant_id])
                 
                 if cursor.rowcount == 0:
                     return JsonResponse({
@@ -1143,19 +1170,25 @@ def Leave_Meeting(request, participant_id):
             
             # Append to leave times
             leave_times.append(leave_time_str)
+            join_times, leave_times = cap_session_arrays(join_times, leave_times)
             
             # Calculate total duration
-            total_duration = calculate_duration_from_arrays(join_times, leave_times)
+            close_session(cursor, meeting_id, user_id, leave_time_str)
+            bump_roster_version(meeting_id, [user_id])
+            totals = get_session_totals(cursor, meeting_id, [user_id], leave_time_str).get(user_id, {})
+            total_duration = totals.get('minutes', 0.0)
+            total_sessions = totals.get('sessions', 0)
             
             # Update participant
             cursor.execute("""
                 UPDATE tbl_Participants
-                SET Leave_Times = %s,
+                SET Join_Times = %s,
+                    Leave_Times = %s,
                     Is_Currently_Active = FALSE,
                     Total_Duration_Minutes = %s,
                     Total_Sessions = %s
                 WHERE ID = %s
-            """, [json.dumps(leave_times), total_duration, len(leave_times), participant_id])
+            """, [json.dumps(join_times), json.dumps(leave_times), total_duration, total_sessions, participant_id])
 
             # Format duration
             hours = int(total_duration // 60)
@@ -1174,10 +1207,55 @@ def Leave_Meeting(request, participant_id):
         "Leave_Time": leave_time_str,
         "Total_Duration_Minutes": round(total_duration, 2),
         "Duration_Display": duration_display,
-        "Total_Sessions": len(leave_times)
+        "Total_Sessions": total_sessions
     }, status=200)
 
 
+def overlay_pending_roster(meeting_id, participants):
+    """Apply pending write-behind roster state to participant dicts (in place)"""
+    pending = get_pending_roster(meeting_id)
+    if not pending:
+        return participants
+    
+    by_user = {str(p['user_id']): p for p in participants}
+    for user_id, state in pending.items():
+        is_active = state.get('status') == 'active'
+        participant = by_user.get(user_id)
+        if participant is None:
+            if not is_active:
+                continue
+            participant = {
+                'id': None,
+                'meeting_id': meeting_id,
+                'user_id': int(user_id) if user_id.isdigit() else user_id,
+                'full_name': state.get('full_name') or f"User {user_id}",
+                'role': state.get('role') or 'participant',
+                'meeting_type': None,
+                'first_join_time': state.get('event_time'),
+                'last_leave_time': None,
+                'end_meeting_time': None,
+                'join_times': [state.get('event_time')],
+                'leave_times': [],
+                'total_sessions': 0,
+                'total_duration_minutes': 0.0,
+                'duration_display': '0m',
+            }
+            participants.insert(0, participant)
+        elif participant['is_currently_active'] != is_active:
+            if is_active:
+                participant['join_times'] = participant['join_times'] + [state.get('event_time')]
+            else:
+                participant['leave_times'] = participant['leave_times'] + [state.get('event_time')]
+                participant['last_leave_time'] = state.get('event_time')
+        
+        participant.update({
+            'is_currently_active': is_active,
+            'status': 'active' if is_active else 'left',
+            'is_online': is_active,
+            'pending_write': True,
+        })
+    return participants
+
 @require_http_methods(["GET"])
 @csrf_exempt
 def list_participants_basic(request, meeting_id):
@@ -1301,6 +1379,10 @@ def list_participants_basic(request, meeting_id):
                 'details': str(e)
             }, status=500)
         
+        # Joins/leaves queued by the write-behind path but not yet in MySQL
+        if PARTICIPANT_WRITE_BEHIND:
+            overlay_pending_roster(meeting_id, participants)
+        
         # Summary stats
         total_participants = len(participants)
         active_participants = len([p for p in participants if p['status'] == 'active'])
@@ -1340,6 +1422,11 @@ def Get_User_Meeting_History(request):
     For PARTICIPANT:
       - duration: Meeting duration (host's time) 
       - participation_duration: Participant's own time
+
+    Ended meetings only, newest first. With ?limit= (or ?cursor= from
+    pagination.next_cursor) one keyset page per request, otherwise all. Fixed number of
+    queries per page; the summary covers all ended meetings and is cached
+    per user (?refresh_summary=true recomputes, ?include_summary=false skips).
     """
     try:
         user_id = request.GET.get('user_id', '').strip()
@@ -1347,158 +1434,68 @@ def Get_User_Meeting_History(request):
         
         if not user_id:
             return JsonResponse({"Error": "user_id is required"}, status=400)
+        if not user_id.isdigit():
+            return JsonResponse({"Error": "user_id must be integer"}, status=400)
         
-        logging.info(f"Getting meeting history for user_id: {user_id}")
+        limit = history_page_size(request)
+        include_summary = request.GET.get('include_summary', 'true').lower() != 'false'
+        refresh_summary = request.GET.get('refresh_summary', 'false').lower() == 'true'
         
-        meetings_dict = {}
+        logging.info(f"Getting meeting history for user_id: {user_id}")
         
         with connection.cursor() as cursor:
-            # --- Meetings where user is host ---
             try:
-                cursor.execute("""
-                    SELECT ID, Meeting_Name, Meeting_Type, Meeting_Link, Status, 
-                           Created_At, Started_At, Ended_At, Host_ID, 
-                           Is_Recording_Enabled, Waiting_Room_Enabled,
-                           livekit_room_name, LiveKit_Room_SID
-                    FROM tbl_Meetings 
-                    WHERE Host_ID = %s
-                    ORDER BY Created_At DESC
-                """, [user_id])
-                
-                for row in cursor.fetchall():
-                    meeting_id = str(row[0])
-                    meetings_dict[meeting_id] = {
-                        'id': meeting_id,
-                        'title': row[1] or "Untitled Meeting",
-                        'meeting_type': row[2] or "InstantMeeting",
-                        'meeting_link': row[3],
-                        'status': row[4] or "unknown",
-                        'created_at': row[5],
-                        'started_at': row[6],
-                        'ended_at': row[7],
-                        'host_id': row[8],
-                        'recording': bool(row[9]),
-                        'waiting_room': bool(row[10]),
-                        'livekit_room': row[11],
-                        'livekit_room_sid': row[12],
-                        'is_host': True,
-                        'user_participated': True,
-                        'user_role': 'host'
-                    }
-            except Exception as e:
-                logging.warning(f"Error getting host meetings: {e}")
+                rows, next_cursor = fetch_user_meeting_page(
+                    cursor, user_id, limit,
+                    after=request.GET.get('cursor'),
+                    ended_only=True
+                )
+            except InvalidCursor as e:
+                return JsonResponse({"Error": str(e)}, status=400)
             
-            # --- Meetings where user participated ---
-            try:
-                cursor.execute("""
-                    SELECT DISTINCT p.Meeting_ID, m.Meeting_Name, m.Meeting_Type, 
-                           m.Meeting_Link, m.Status, m.Created_At, m.Started_At, 
-                           m.Ended_At, m.Host_ID, m.Is_Recording_Enabled, 
-                           m.Waiting_Room_Enabled, m.livekit_room_name, m.LiveKit_Room_SID
-                    FROM tbl_Participants p
-                    JOIN tbl_Meetings m ON p.Meeting_ID = m.ID
-                    WHERE p.User_ID = %s
-                    ORDER BY m.Created_At DESC
-                """, [user_id])
-                
-                for row in cursor.fetchall():
-                    meeting_id = str(row[0])
-                    if meeting_id not in meetings_dict:
-                        meetings_dict[meeting_id] = {
-                            'id': meeting_id,
-                            'title': row[1] or "Untitled Meeting",
-                            'meeting_type': row[2] or "InstantMeeting",
-                            'meeting_link': row[3],
-                            'status': row[4] or "unknown",
-                            'created_at': row[5],
-                            'started_at': row[6],
-                            'ended_at': row[7],
-                            'host_id': row[8],
-                            'recording': bool(row[9]),
-                            'waiting_room': bool(row[10]),
-                            'livekit_room': row[11],
-                            'livekit_room_sid': row[12],
-                            'is_host': False,
-                            'user_participated': True,
-                            'user_role': 'participant'
-                        }
-            except Exception as e:
-                logging.warning(f"Error getting participant meetings: {e}")
+            hosts, counts, sessions = load_meeting_stats(cursor, [row['id'] for row in rows], user_id)
+            summary = get_history_summary(cursor, user_id, refresh=refresh_summary) if include_summary else None
         
         # --- Process meetings ---
         final_meetings = []
-        for meeting_id, meeting_data in meetings_dict.items():
+        today = datetime.now().date()
+        for row in rows:
+            meeting_id = row['id']
             try:
-                # Get host name
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("SELECT full_name FROM tbl_Users WHERE ID = %s", [meeting_data['host_id']])
-                        host_row = cursor.fetchone()
-                        meeting_data['host'] = host_row[0] if host_row else "Unknown Host"
-                except:
-                    meeting_data['host'] = "Unknown Host"
-                
                 # ✅ Get BOTH durations
                 # 1. Meeting duration (from host)
-                meeting_duration_decimal = get_host_duration_for_meeting(meeting_id)
-                meeting_duration_display = format_duration_mmss(meeting_duration_decimal)
+                host_user_id, host_total = hosts.get(meeting_id, (None, 0.0))
+                if host_total > 0:
+                    meeting_duration_decimal = host_total
+                else:
+                    meeting_duration_decimal = sessions.get((meeting_id, host_user_id), {}).get('minutes', 0.0)
                 
                 # 2. User's participation duration
-                user_duration_decimal = get_user_duration_for_meeting(meeting_id, user_id)
+                user_total = float(row['user_duration'] or 0)
+                user_sessions = sessions.get((meeting_id, int(user_id)), {})
+                user_duration_decimal = user_total if user_total > 0 else user_sessions.get('minutes', 0.0)
                 user_duration_display = format_duration_mmss(user_duration_decimal)
                 
-                logging.info(f"Meeting {meeting_id}: Host time={meeting_duration_decimal}, User {user_id} time={user_duration_decimal}")
-                
-                # Get additional participation details
-                user_join_time = None
-                user_leave_time = None
-                participant_name = None
-                
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("""
-                            SELECT Join_Times, Leave_Times, Full_Name, Role
-                            FROM tbl_Participants 
-                            WHERE Meeting_ID = %s AND User_ID = %s
-                            ORDER BY ID DESC LIMIT 1
-                        """, [meeting_id, user_id])
-                        row = cursor.fetchone()
-                        if row:
-                            join_times = json.loads(row[0]) if isinstance(row[0], str) else row[0] or []
-                            leave_times = json.loads(row[1]) if isinstance(row[1], str) else row[1] or []
-                            participant_name = row[2]
-                            user_role = row[3]
-                            user_join_time = join_times[0] if join_times else None
-                            user_leave_time = leave_times[-1] if leave_times else None
-                            
-                            if user_role:
-                                meeting_data['user_role'] = user_role
-                                meeting_data['is_host'] = (user_role == 'host')
-                                
-                except Exception as e:
-                    logging.error(f"Error getting participation details: {e}")
+                is_host = True
+                user_role = 'host'
+                if row['user_role']:
+                    user_role = row['user_role']
+                    is_host = (user_role == 'host')
+                elif str(row['host_id']) != user_id:
+                    user_role = 'participant'
+                    is_host = False
                 
                 # Fallback if durations are 0
-                if meeting_duration_decimal == 0 and meeting_data['started_at'] and meeting_data['ended_at']:
+                if meeting_duration_decimal == 0 and row['started_at'] and row['ended_at']:
                     try:
-                        start_dt = meeting_data['started_at']
-                        end_dt = meeting_data['ended_at']
-                        if isinstance(start_dt, str):
-                            start_dt = datetime.fromisoformat(start_dt.replace('Z', '+00:00'))
-                        if isinstance(end_dt, str):
-                            end_dt = datetime.fromisoformat(end_dt.replace('Z', '+00:00'))
-                        meeting_duration_decimal = (end_dt - start_dt).total_seconds() / 60.0
-                        meeting_duration_display = format_duration_mmss(meeting_duration_decimal)
+                        meeting_duration_decimal = (row['ended_at'] - row['started_at']).total_seconds() / 60.0
                     except Exception as e:
                         logging.error(f"Error calculating fallback duration: {e}")
+                meeting_duration_display = format_duration_mmss(meeting_duration_decimal)
                 
                 # Time category
                 try:
-                    meeting_date = meeting_data['started_at'] or meeting_data['created_at']
-                    if isinstance(meeting_date, str):
-                        meeting_date = datetime.fromisoformat(meeting_date.replace('Z', '+00:00'))
-                    today = datetime.now().date()
-                    meeting_date_only = meeting_date.date()
+                    meeting_date_only = row['meeting_time'].date()
                     if meeting_date_only == today:
                         time_category = 'today'
                     elif meeting_date_only > today:
@@ -1509,7 +1506,8 @@ def Get_User_Meeting_History(request):
                     time_category = 'unknown'
                 
                 # Meeting type display
-                mt = meeting_data['meeting_type'].lower()
+                meeting_type = row['meeting_type'] or "InstantMeeting"
+                mt = meeting_type.lower()
                 if 'schedule' in mt:
                     type_display = 'schedule'
                 elif 'calendar' in mt:
@@ -1517,44 +1515,17 @@ def Get_User_Meeting_History(request):
                 else:
                     type_display = 'instant'
                 
-                # Status normalization
-                status_raw = (meeting_data['status'] or 'unknown').lower()
-                if status_raw in ['ended', 'completed']:
-                    frontend_status = 'ended'
-                elif time_category == 'upcoming':
-                    frontend_status = 'scheduled'
-                elif time_category == 'today' and status_raw == 'active':
-                    frontend_status = 'active'
-                else:
-                    frontend_status = status_raw
-                
-                # Only show ended meetings
-                if frontend_status != 'ended':
-                    continue
-                
-                # Get participant count
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("""
-                            SELECT COUNT(DISTINCT User_ID) 
-                            FROM tbl_Participants 
-                            WHERE Meeting_ID = %s
-                        """, [meeting_id])
-                        participant_count = cursor.fetchone()[0] or 1
-                except:
-                    participant_count = 1
-                
                 # ✅ Build meeting object with BOTH durations
                 meeting_obj = {
-                    "id": meeting_data['id'],
-                    "title": meeting_data['title'],
+                    "id": meeting_id,
+                    "title": row['meeting_name'] or "Untitled Meeting",
                     "type": type_display,
-                    "status": frontend_status,
-                    "meeting_link": meeting_data['meeting_link'],
-                    "date": meeting_data['started_at'] or meeting_data['created_at'],
-                    "created_at": meeting_data['created_at'],
-                    "started_at": meeting_data['started_at'],
-                    "ended_at": meeting_data['ended_at'],
+                    "status": 'ended',
+                    "meeting_link": row['meeting_link'],
+                    "date": row['started_at'] or row['created_at'],
+                    "created_at": row['created_at'],
+                    "started_at": row['started_at'],
+                    "ended_at": row['ended_at'],
                     "time_category": time_category,
                     
                     # ✅ MEETING DURATION (host's time = total meeting length)
@@ -1568,27 +1539,27 @@ def Get_User_Meeting_History(request):
                     # ✅ MAIN DURATION FIELD (for backward compatibility)
                     # For HOST: Show their time (same as meeting duration)
                     # For PARTICIPANT: Can show either meeting or participation duration
-                    "duration": user_duration_display if meeting_data['is_host'] else meeting_duration_display,
-                    "duration_decimal_minutes": round(user_duration_decimal if meeting_data['is_host'] else meeting_duration_decimal, 2),
+                    "duration": user_duration_display if is_host else meeting_duration_display,
+                    "duration_decimal_minutes": round(user_duration_decimal if is_host else meeting_duration_decimal, 2),
                     
-                    "participants": participant_count,
-                    "host": meeting_data['host'],
+                    "participants": counts.get(meeting_id) or 1,
+                    "host": row['host_name'] or "Unknown Host",
                     "host_email": None,
-                    "is_host": meeting_data['is_host'],
-                    "user_role": meeting_data['user_role'],
-                    "user_participated": meeting_data['user_participated'],
-                    "user_join_time": user_join_time,
-                    "user_leave_time": user_leave_time,
-                    "recording": meeting_data['recording'],
-                    "waiting_room": meeting_data['waiting_room'],
+                    "is_host": is_host,
+                    "user_role": user_role,
+                    "user_participated": True,
+                    "user_join_time": format_session_time(user_sessions.get('first_join')),
+                    "user_leave_time": format_session_time(user_sessions.get('last_leave')),
+                    "recording": bool(row['recording']),
+                    "waiting_room": bool(row['waiting_room']),
                     "starred": False,
-                    "livekit_room": meeting_data['livekit_room'],
-                    "livekit_room_sid": meeting_data['livekit_room_sid'],
-                    "livekit_enabled": bool(meeting_data['livekit_room']),
+                    "livekit_room": row['livekit_room'],
+                    "livekit_room_sid": row['livekit_room_sid'],
+                    "livekit_enabled": bool(row['livekit_room']),
                     "description": None,
                     "location": None,
-                    "meeting_type": meeting_data['meeting_type'],
-                    "involvement_type": "host" if meeting_data['is_host'] else "participant"
+                    "meeting_type": meeting_type,
+                    "involvement_type": "host" if is_host else "participant"
                 }
                 
                 final_meetings.append(meeting_obj)
@@ -1599,52 +1570,39 @@ def Get_User_Meeting_History(request):
                 logging.error(traceback.format_exc())
                 continue
         
-        # Sort by created date
-        try:
-            final_meetings.sort(key=lambda x: x.get('created_at') or datetime.min, reverse=True)
-        except:
-            pass
-        
-        # Summary stats
-        total_meetings = len(final_meetings)
-        hosted_meetings = sum(1 for m in final_meetings if m.get('is_host'))
-        participated_meetings = sum(1 for m in final_meetings if m.get('user_participated'))
-        ended_meetings = total_meetings
-        
-        total_meeting_time = 0.0
-        total_participation_time = 0.0
-        
-        try:
-            if participated_meetings > 0:
-                total_meeting_time = sum(m['meeting_duration_decimal'] for m in final_meetings)
-                total_participation_time = sum(m['participation_duration_decimal'] for m in final_meetings)
-        except:
-            pass
-        
         logging.info(f"✅ Returning {len(final_meetings)} meetings with both durations")
         
-        return JsonResponse({
+        response = {
             "success": True,
             "meetings": final_meetings,
-            "summary": {
+            "pagination": {
+                "limit": limit,
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor
+            },
+            "filter_applied": date_filter,
+            "duration_format": "MM:SS"
+        }
+        if summary is not None:
+            total_meetings = summary['total_meetings']
+            response["summary"] = {
                 "user_id": user_id,
                 "total_meetings": total_meetings,
-                "hosted_meetings": hosted_meetings,
-                "participated_meetings": participated_meetings,
+                "hosted_meetings": summary['hosted_meetings'],
+                "participated_meetings": summary['participated_meetings'],
                 "status_breakdown": {
-                    "ended": ended_meetings
+                    "ended": total_meetings
                 },
                 "analytics": {
-                    "total_meeting_time_minutes": round(total_meeting_time, 2),
-                    "total_meeting_time_formatted": format_duration_mmss(total_meeting_time),
-                    "total_participation_time_minutes": round(total_participation_time, 2),
-                    "total_participation_time_formatted": format_duration_mmss(total_participation_time),
-                    "participation_rate": round((participated_meetings / max(total_meetings, 1)) * 100, 2)
+                    "total_meeting_time_minutes": summary['total_meeting_time_minutes'],
+                    "total_meeting_time_formatted": format_duration_mmss(summary['total_meeting_time_minutes']),
+                    "total_participation_time_minutes": summary['total_participation_time_minutes'],
+                    "total_participation_time_formatted": format_duration_mmss(summary['total_participation_time_minutes']),
+                    "participation_rate": round((summary['participated_meetings'] / max(total_meetings, 1)) * 100, 2)
                 }
-            },
-            "filter_applied": date_filter,
-            "duration_format": "MM:SS"
-        }, status=200)
+            }
+        
+        return JsonResponse(response, status=200)
     
     except Exception as e:
         logging.error(f"CRITICAL ERROR in Get_User_Meeting_History: {e}")
@@ -1663,6 +1621,8 @@ def Get_User_Meetings_By_Date(request):
     """
     Get user's meetings for a specific date range
     CORRECTED to match actual database schema
+
+    Oldest first; one keyset page per request with ?limit= or ?cursor=, otherwise all.
     """
     try:
         user_id = request.GET.get('user_id', '').strip()
@@ -1671,100 +1631,42 @@ def Get_User_Meetings_By_Date(request):
         
         if not user_id:
             return JsonResponse({"Error": "user_id is required"}, status=BAD_REQUEST_STATUS)
+        if not user_id.isdigit():
+            return JsonResponse({"Error": "user_id must be integer"}, status=BAD_REQUEST_STATUS)
         
         # Default to today if no dates provided
         if not start_date:
             start_date = datetime.now().strftime('%Y-%m-%d')
         if not end_date:
             end_date = start_date
+        
+        try:
+            range_start = datetime.strptime(start_date, '%Y-%m-%d')
+            range_end = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+        except ValueError:
+            return JsonResponse({"Error": "start_date and end_date must be YYYY-MM-DD"}, status=BAD_REQUEST_STATUS)
+        
+        limit = history_page_size(request, HISTORY_MAX_PAGE_SIZE)
             
         logging.info(f"Getting meetings for user {user_id} from {start_date} to {end_date}")
         
         with connection.cursor() as cursor:
-            # CORRECTED: Query based on actual database schema
-            query = """
-            SELECT DISTINCT
-                m.ID,
-                m.Meeting_Name,
-                m.Meeting_Type,
-                m.Status,
-                m.Started_At,
-                m.Ended_At,
-                m.Host_ID,
-                m.Created_At,
-                m.Meeting_Link,
-                m.Is_Recording_Enabled,
-                m.Waiting_Room_Enabled,
-                m.livekit_room_name,
-                m.LiveKit_Room_SID,
-                
-                -- Host information
-                COALESCE(host_user.full_name, 'Unknown Host') as host_name,
-                host_user.email as host_email,
-                
-                -- Duration from appropriate table
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
-                    WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN 
-                        TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
-                    ELSE 60
-                END as duration_minutes,
-                
-                -- User's participation info
-                p.Role as user_role,
-                p.Join_Time,
-                p.Leave_Time,
-                p.End_Meeting_Time,
-                p.Duration as user_participation_duration,
-                p.Full_Name as participant_name,
-                
-                -- Meeting details
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.description
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
-                    ELSE NULL
-                END as meeting_description,
-                
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN sm.location
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN cm.location
-                    ELSE NULL
-                END as meeting_location
-                
-            FROM tbl_Meetings m
-            
-            -- Join for host information
-            LEFT JOIN tbl_Users host_user ON m.Host_ID = host_user.ID
-            
-            -- Join for scheduled meeting details
-            LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-            
-            -- Join for calendar meeting details
-            LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-            
-            -- Join for user's participation details
-            LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID AND p.User_ID = %s
-            
-            WHERE (
-                -- User is the host of the meeting
-                m.Host_ID = %s 
-                OR 
-                -- User actually participated in the meeting
-                p.User_ID IS NOT NULL
-            )
-            AND DATE(COALESCE(m.Started_At, m.Created_At)) BETWEEN %s AND %s
-            
-            ORDER BY COALESCE(m.Started_At, m.Created_At) ASC
-            """
-            
-            # CORRECTED: 4 parameters to match the query
-            params = [user_id, user_id, start_date, end_date]
-            
+            # Range on the meeting time itself (no DATE() wrapper) so the index can be used
             try:
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+                rows, next_cursor = fetch_user_meeting_page(
+                    cursor, user_id, limit,
+                    after=request.GET.get('cursor'),
+                    descending=False,
+                    time_from=range_start.strftime('%Y-%m-%d %H:%M:%S'),
+                    time_to=range_end.strftime('%Y-%m-%d %H:%M:%S'),
+                    with_details=True
+                )
+                sessions = get_meetings_session_totals(
+                    cursor, [row['id'] for row in rows], [int(user_id)], get_ist_now()
+                )
                 logging.info(f"Date range query returned {len(rows)} meetings")
+            except InvalidCursor as e:
+                return JsonResponse({"Error": str(e)}, status=BAD_REQUEST_STATUS)
             except Exception as db_error:
                 logging.error(f"SQL execution error in Get_User_Meetings_By_Date: {db_error}")
                 return JsonResponse({"Error": f"Database query failed: {str(db_error)}"}, status=SERVER_ERROR_STATUS)
@@ -1772,37 +1674,19 @@ def Get_User_Meetings_By_Date(request):
             meetings = []
             for i, row in enumerate(rows):
                 try:
-                    # CORRECTED: Index positions based on actual SELECT columns
-                    meeting_id = str(row[0])
-                    meeting_name = row[1]
-                    meeting_type = row[2]
-                    status = row[3]
-                    started_at = row[4]
-                    ended_at = row[5]
-                    host_id = row[6]
-                    created_at = row[7]
-                    meeting_link = row[8]
-                    is_recording_enabled = row[9]
-                    waiting_room_enabled = row[10]
-                    livekit_room_name = row[11]
-                    livekit_room_sid = row[12]
-                    host_name = row[13]
-                    host_email = row[14]
-                    duration_minutes = row[15]
-                    user_role = row[16]
-                    user_join_time = row[17]
-                    user_leave_time = row[18]
-                    user_end_meeting_time = row[19]
-                    user_participation_duration = row[20]
-                    participant_name = row[23]
-                    meeting_description = row[24]
-                    meeting_location = row[25]
+                    meeting_id = row['id']
+                    meeting_type = row['meeting_type']
+                    user_sessions = sessions.get((meeting_id, int(user_id)), {})
                     
-                    is_host = str(host_id) == str(user_id)
-                    user_participated = user_join_time is not None
+                    is_host = str(row['host_id']) == str(user_id)
+                    user_participated = row['user_role'] is not None
+                    
+                    user_participation_duration = None
+                    if user_participated:
+                        user_participation_duration = float(row['user_duration'] or 0) or user_sessions.get('minutes', 0.0)
                     
                     # Format duration
-                    duration_mins = duration_minutes or 60
+                    duration_mins = row['scheduled_duration'] or 60
                     duration_str = f"{duration_mins}m"
                     if duration_mins >= 60:
                         hours = duration_mins // 60
@@ -1815,45 +1699,45 @@ def Get_User_Meetings_By_Date(request):
                     meeting = {
                         # Basic info
                         "id": meeting_id,
-                        "title": meeting_name or "Meeting",
+                        "title": row['meeting_name'] or "Meeting",
                         "type": type_display,
-                        "status": status or "unknown",
-                        "meeting_link": meeting_link,
+                        "status": row['status'] or "unknown",
+                        "meeting_link": row['meeting_link'],
                         
                         # Timing
-                        "date": started_at or created_at,
-                        "started_at": started_at,
-                        "ended_at": ended_at,
-                        "created_at": created_at,
+                        "date": row['started_at'] or row['created_at'],
+                        "started_at": row['started_at'],
+                        "ended_at": row['ended_at'],
+                        "created_at": row['created_at'],
                         
                         # Duration
                         "duration": duration_str,
                         "duration_minutes": duration_mins,
                         
                         # Host info
-                        "host_name": host_name or "Unknown Host",
-                        "host_email": host_email,
+                        "host_name": row['host_name'] or "Unknown Host",
+                        "host_email": row['host_email'],
                         "is_host": is_host,
                         
                         # User participation
-                        "user_role": "host" if is_host else (user_role or "participant"),
+                        "user_role": "host" if is_host else (row['user_role'] or "participant"),
                         "user_participated": user_participated,
-                        "user_join_time": user_join_time,
-                        "user_leave_time": user_leave_time,
-                        "user_end_meeting_time": user_end_meeting_time,
+                        "user_join_time": format_session_time(user_sessions.get('first_join')),
+                        "user_leave_time": format_session_time(user_sessions.get('last_leave')),
+                        "user_end_meeting_time": row['user_end_meeting_time'],
                         "user_participation_duration": user_participation_duration,
                         
                         # Features
-                        "recording": bool(is_recording_enabled),
-                        "waiting_room": bool(waiting_room_enabled),
+                        "recording": bool(row['recording']),
+                        "waiting_room": bool(row['waiting_room']),
                         
                         # LiveKit
-                        "livekit_room": livekit_room_name,
-                        "livekit_room_sid": livekit_room_sid,
+                        "livekit_room": row['livekit_room'],
+                        "livekit_room_sid": row['livekit_room_sid'],
                         
                         # Additional details
-                        "description": meeting_description,
-                        "location": meeting_location,
+                        "description": row['description'],
+                        "location": row['location'],
                         "meeting_type": meeting_type  # Original type
                     }
                     meetings.append(meeting)
@@ -1870,6 +1754,11 @@ def Get_User_Meetings_By_Date(request):
                     "end_date": end_date
                 },
                 "count": len(meetings),
+                "pagination": {
+                    "limit": limit,
+                    "has_more": next_cursor is not None,
+                    "next_cursor": next_cursor
+                },
                 "user_id": user_id
             }, status=SUCCESS_STATUS)
             
@@ -1893,85 +1782,41 @@ def Get_User_Today_Meetings(request):
     """
     Get user's meetings for today specifically
     CORRECTED version with direct implementation
+
+    Oldest first; one keyset page per request with ?limit= or ?cursor=, otherwise all.
     """
     try:
         user_id = request.GET.get('user_id', '').strip()
         
         if not user_id:
             return JsonResponse({"Error": "user_id is required"}, status=BAD_REQUEST_STATUS)
+        if not user_id.isdigit():
+            return JsonResponse({"Error": "user_id must be integer"}, status=BAD_REQUEST_STATUS)
         
         # Get today's date in the correct format
-        today = datetime.now().strftime('%Y-%m-%d')
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        tomorrow = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+        limit = history_page_size(request, HISTORY_MAX_PAGE_SIZE)
         
         logging.info(f"Getting today's meetings for user {user_id} on {today}")
         
         with connection.cursor() as cursor:
-            # CORRECTED: Direct query for today's meetings
-            query = """
-            SELECT DISTINCT
-                m.ID,
-                m.Meeting_Name,
-                m.Meeting_Type,
-                m.Status,
-                m.Started_At,
-                m.Ended_At,
-                m.Host_ID,
-                m.Created_At,
-                m.Meeting_Link,
-                
-                -- Host information
-                COALESCE(host_user.full_name, 'Unknown Host') as host_name,
-                
-                -- Duration
-                CASE 
-                    WHEN m.Meeting_Type = 'ScheduleMeeting' THEN COALESCE(sm.duration_minutes, 60)
-                    WHEN m.Meeting_Type = 'CalendarMeeting' THEN COALESCE(cm.duration, 60)
-                    WHEN m.Started_At IS NOT NULL AND m.Ended_At IS NOT NULL THEN 
-                        TIMESTAMPDIFF(MINUTE, m.Started_At, m.Ended_At)
-                    ELSE 60
-                END as duration_minutes,
-                
-                -- User participation
-                p.Role as user_role,
-                p.Join_Time,
-                p.Leave_Time,
-                
-                -- Time category for today
-                CASE 
-                    WHEN m.Started_At IS NULL THEN 'scheduled'
-                    WHEN TIME(m.Started_At) <= CURTIME() AND (m.Ended_At IS NULL OR TIME(m.Ended_At) >= CURTIME()) THEN 'active'
-                    WHEN TIME(m.Started_At) > CURTIME() THEN 'upcoming'
-                    ELSE 'ended'
-                END as meeting_status_today
-                
-            FROM tbl_Meetings m
-            
-            -- Join for host information
-            LEFT JOIN tbl_Users host_user ON m.Host_ID = host_user.ID
-            
-            -- Join for meeting type details
-            LEFT JOIN tbl_ScheduledMeetings sm ON m.ID = sm.id AND m.Meeting_Type = 'ScheduleMeeting'
-            LEFT JOIN tbl_CalendarMeetings cm ON m.ID = cm.ID AND m.Meeting_Type = 'CalendarMeeting'
-            
-            -- Join for user's participation
-            LEFT JOIN tbl_Participants p ON m.ID = p.Meeting_ID AND p.User_ID = %s
-            
-            WHERE (
-                m.Host_ID = %s OR p.User_ID IS NOT NULL
-            )
-            AND DATE(COALESCE(m.Started_At, m.Created_At)) = %s
-            
-            ORDER BY 
-                COALESCE(m.Started_At, m.Created_At) ASC,
-                m.Created_At ASC
-            """
-            
-            params = [user_id, user_id, today]
-            
             try:
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+                rows, next_cursor = fetch_user_meeting_page(
+                    cursor, user_id, limit,
+                    after=request.GET.get('cursor'),
+                    descending=False,
+                    time_from=today,
+                    time_to=tomorrow,
+                    with_details=True
+                )
+                sessions = get_meetings_session_totals(
+                    cursor, [row['id'] for row in rows], [int(user_id)], get_ist_now()
+                )
                 logging.info(f"Today's meetings query returned {len(rows)} meetings")
+            except InvalidCursor as e:
+                return JsonResponse({"Error": str(e)}, status=BAD_REQUEST_STATUS)
             except Exception as db_error:
                 logging.error(f"SQL execution error in Get_User_Today_Meetings: {db_error}")
                 return JsonResponse({"Error": f"Database query failed: {str(db_error)}"}, status=SERVER_ERROR_STATUS)
@@ -1979,27 +1824,29 @@ def Get_User_Today_Meetings(request):
             meetings = []
             for i, row in enumerate(rows):
                 try:
-                    meeting_id = str(row[0])
-                    meeting_name = row[1]
-                    meeting_type = row[2]
-                    status = row[3]
-                    started_at = row[4]
-                    ended_at = row[5]
-                    host_id = row[6]
-                    created_at = row[7]
-                    meeting_link = row[8]
-                    host_name = row[9]
-                    duration_minutes = row[10]
-                    user_role = row[11]
-                    user_join_time = row[12]
-                    user_leave_time = row[13]
-                    meeting_status_today = row[16]
+                    meeting_id = row['id']
+                    meeting_type = row['meeting_type']
+                    status = row['status']
+                    started_at = row['started_at']
+                    ended_at = row['ended_at']
+                    user_role = row['user_role']
+                    user_sessions = sessions.get((meeting_id, int(user_id)), {})
+                    
+                    # Time category for today
+                    if started_at is None:
+                        meeting_status_today = 'scheduled'
+                    elif started_at.time() <= now.time() and (ended_at is None or ended_at.time() >= now.time()):
+                        meeting_status_today = 'active'
+                    elif started_at.time() > now.time():
+                        meeting_status_today = 'upcoming'
+                    else:
+                        meeting_status_today = 'ended'
                     
-                    is_host = str(host_id) == str(user_id)
-                    user_participated = user_join_time is not None
+                    is_host = str(row['host_id']) == str(user_id)
+                    user_participated = user_role is not None
                     
                     # Format duration
-                    duration_mins = duration_minutes or 60
+                    duration_mins = row['scheduled_duration'] or 60
                     duration_str = f"{duration_mins}m"
                     if duration_mins >= 60:
                         hours = duration_mins // 60
@@ -2020,10 +1867,10 @@ def Get_User_Today_Meetings(request):
                     
                     meeting = {
                         "id": meeting_id,
-                        "title": meeting_name or "Meeting",
+                        "title": row['meeting_name'] or "Meeting",
                         "type": (meeting_type or 'instant').lower().replace('meeting', ''),
                         "status": meeting_status_today or status or "unknown",
-                        "meeting_link": meeting_link,
+                        "meeting_link": row['meeting_link'],
                         
                         # Today-specific timing
                         "start_time": start_time_str,
@@ -2032,14 +1879,14 @@ def Get_User_Today_Meetings(request):
                         "ended_at": ended_at,
                         
                         "duration": duration_str,
-                        "host_name": host_name or "Unknown Host",
+                        "host_name": row['host_name'] or "Unknown Host",
                         "is_host": is_host,
                         
                         # User participation
                         "user_role": "host" if is_host else (user_role or "participant"),
                         "user_participated": user_participated,
-                        "user_join_time": user_join_time,
-                        "user_leave_time": user_leave_time,
+                        "user_join_time": format_session_time(user_sessions.get('first_join')),
+                        "user_leave_time": format_session_time(user_sessions.get('last_leave')),
                         
                         # Quick status for today's view
                         "is_upcoming": meeting_status_today == 'upcoming',
@@ -2072,6 +1919,11 @@ def Get_User_Today_Meetings(request):
                     "active_count": len(active),
                     "ended_count": len(ended)
                 },
+                "pagination": {
+                    "limit": limit,
+                    "has_more": next_cursor is not None,
+                    "next_cursor": next_cursor
+                },
                 "user_id": user_id
             }, status=SUCCESS_STATUS)
         
@@ -2088,142 +1940,142 @@ def Get_User_Today_Meetings(request):
             }
         }, status=SERVER_ERROR_STATUS)
 
-@require_http_methods(["GET"])
-@csrf_exempt
-def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
+def _build_live_roster(meeting_id):
     """
-    ✅ FIXED: Get live participants with proper names from tbl_Users
-    Returns participant data with correct schema (Join_Times, Leave_Times arrays)
-    ✅ NEW: Added role-based filtering support
+    Database part of the live participant list: one row per participant with
+    its name from tbl_Users and parsed Join_Times/Leave_Times. Contains no
+    per-request data, so it is cached per roster version (roster_version.py).
     """
-    try:
-        # ✅ Get requesting user's ID for role-based filtering (optional parameter)
-        requesting_user_id = request.GET.get('user_id')
-        if requesting_user_id:
-            requesting_user_id = int(requesting_user_id)
-        
-        db_participants = []
-        
-        # ===== STEP 1: Get database participants with CORRECTED SCHEMA =====
-        try:
-            with connection.cursor() as cursor:
-                # ✅ FIXED: Using correct column names from new schema INCLUDING Attendance_Percentagebasedon_host
-                cursor.execute("""
-                    SELECT 
-                        p.ID,                                    -- 0
-                        p.Meeting_ID,                            -- 1
-                        p.User_ID,                               -- 2
-                        p.Full_Name,                             -- 3
-                        p.Join_Times,                            -- 4 ✅ JSON array (not Join_Time)
-                        p.Leave_Times,                           -- 5 ✅ JSON array (not Leave_Time)
-                        p.End_Meeting_Time,                      -- 6
-                        p.Role,                                  -- 7
-                        p.Meeting_Type,                          -- 8
-                        p.Total_Duration_Minutes,                -- 9 ✅ Calculated field (not Duration)
-                        p.Is_Currently_Active,                   -- 10 ✅ FIXED INDEX
-                        p.Attendance_Percentagebasedon_host,     -- 11 ✅ NEW COLUMN
-                        u.email,                                 -- 12 ✅ FIXED INDEX
-                        u.full_name as user_table_name           -- 13 ✅ FIXED INDEX - Get name from tbl_Users as backup
-                    FROM tbl_Participants p
-                    LEFT JOIN tbl_Users u ON p.User_ID = u.ID
-                    WHERE p.Meeting_ID = %s
-                    ORDER BY p.ID ASC
-                """, [meeting_id])
-                
-                rows = cursor.fetchall()
-                
-                for row in rows:
-                    # Parse data with CORRECTED INDICES
-                    participant_id = row[0]
-                    meeting_id_val = row[1]
-                    user_id = row[2]
-                    participant_name = row[3]  # Name from tbl_Participants
-                    join_times_json = row[4]
-                    leave_times_json = row[5]
-                    end_meeting_time = row[6]
-                    role = row[7]
-                    meeting_type = row[8]
-                    total_duration = row[9]
-                    # CORRECT:
-                    is_active = row[10]                    # Fixed index
-                    attendance_basedon_host = row[11]      # Get the existing column
-                    email = row[12]                        # Fixed index
-                    user_table_name = row[13]              # Fixed index                    # ✅ FIXED: was row[14] - Name from tbl_Users
-                    
-                    # ✅ PRIORITY: Use tbl_Users name if available, fallback to tbl_Participants
-                    display_name = user_table_name if user_table_name else participant_name
-                    if not display_name:
-                        display_name = f"User {user_id}"
-                    
-                    # ✅ Add "(You)" label for requesting user
-                    if requesting_user_id and user_id == requesting_user_id:
-                        if not display_name.endswith('(You)'):
-                            display_name = f"{display_name} (You)"
-                    
-                    # Parse JSON arrays safely
-                    join_times = []
-                    leave_times = []
-                    
-                    try:
-                        if join_times_json:
-                            if isinstance(join_times_json, str):
-                                join_times = json.loads(join_times_json)
-                            elif isinstance(join_times_json, list):
-                                join_times = join_times_json
-                    except Exception as e:
-                        logging.error(f"Error parsing join_times: {e}")
-                    
-                    try:
-                        if leave_times_json:
-                            if isinstance(leave_times_json, str):
-                                leave_times = json.loads(leave_times_json)
-                            elif isinstance(leave_times_json, list):
-                                leave_times = leave_times_json
-                    except Exception as e:
-                        logging.error(f"Error parsing leave_times: {e}")
-                    
-                    # Get first join time and last leave time
-                    first_join = join_times[0] if join_times else None
-                    last_leave = leave_times[-1] if leave_times else None
-                    
-                    # Build participant object
-                    participant = {
-                        'ID': participant_id,
-                        'Meeting_ID': meeting_id_val,
-                        'User_ID': user_id,
-                        'Full_Name': display_name,  # ✅ Correct name with "(You)" label
-                        'email': email,
-                        
-                        # Time data with arrays
-                        'Join_Time': first_join,  # For backwards compatibility
-                        'Leave_Time': last_leave,  # For backwards compatibility
-                        'Join_Times': join_times,
-                        'Leave_Times': leave_times,
-                        'End_Meeting_Time': end_meeting_time.isoformat() if end_meeting_time else None,
-                        
-                        # Role and type
-                        'Role': role,
-                        'Meeting_Type': meeting_type,
-                        
-                        # Duration and metrics
-                        'Duration': float(total_duration) if total_duration else 0.0,
-                        'Total_Duration_Minutes': float(total_duration) if total_duration else 0.0,
-                        'Attendance_Percentagebasedon_host': float(attendance_basedon_host) if attendance_basedon_host else 0.0,
-                        
-                        # Status - based on Is_Currently_Active and Leave_Time
-                        'Is_Currently_Active': bool(is_active),
-                        'Status': 'checking' if is_active else 'offline',
-                        
-                        # LiveKit status (will be updated below)
-                        'LiveKit_Connected': False,
-                        'Has_Stream': False,
-                        'Debug_Info': {}
-                    }
-                    
-                    db_participants.append(participant)
-                    
-                logging.info(f"✅ Retrieved {len(db_participants)} participants from database")
-                
+    roster = []
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT 
+                p.ID,                                    -- 0
+                p.Meeting_ID,                            -- 1
+                p.User_ID,                               -- 2
+                p.Full_Name,                             -- 3
+                p.Join_Times,                            -- 4
+                p.Leave_Times,                           -- 5
+                p.End_Meeting_Time,                      -- 6
+                p.Role,                                  -- 7
+                p.Meeting_Type,                          -- 8
+                p.Total_Duration_Minutes,                -- 9
+                p.Is_Currently_Active,                   -- 10
+                p.Attendance_Percentagebasedon_host,     -- 11
+                u.email,                                 -- 12
+                u.full_name as user_table_name           -- 13 - Get name from tbl_Users as backup
+            FROM tbl_Participants p
+            LEFT JOIN tbl_Users u ON p.User_ID = u.ID
+            WHERE p.Meeting_ID = %s
+            ORDER BY p.ID ASC
+        """, [meeting_id])
+        
+        for row in cursor.fetchall():
+            (participant_id, meeting_id_val, user_id, participant_name, join_times_json,
+             leave_times_json, end_meeting_time, role, meeting_type, total_duration,
+             is_active, attendance_basedon_host, email, user_table_name) = row
+            
+            # ✅ PRIORITY: Use tbl_Users name if available, fallback to tbl_Participants
+            display_name = user_table_name if user_table_name else participant_name
+            if not display_name:
+                display_name = f"User {user_id}"
+            
+            # Parse JSON arrays safely
+            join_times = []
+            leave_times = []
+            
+            try:
+                if join_times_json:
+                    if isinstance(join_times_json, str):
+                        join_times = json.loads(join_times_json)
+                    elif isinstance(join_times_json, list):
+                        join_times = join_times_json
+            except Exception as e:
+                logging.error(f"Error parsing join_times: {e}")
+            
+            try:
+                if leave_times_json:
+                    if isinstance(leave_times_json, str):
+                        leave_times = json.loads(leave_times_json)
+                    elif isinstance(leave_times_json, list):
+                        leave_times = leave_times_json
+            except Exception as e:
+                logging.error(f"Error parsing leave_times: {e}")
+            
+            roster.append({
+                'ID': participant_id,
+                'Meeting_ID': meeting_id_val,
+                'User_ID': user_id,
+                'Full_Name': display_name,
+                'email': email,
+                
+                # Time data with arrays
+                'Join_Time': join_times[0] if join_times else None,  # For backwards compatibility
+                'Leave_Time': leave_times[-1] if leave_times else None,  # For backwards compatibility
+                'Join_Times': join_times,
+                'Leave_Times': leave_times,
+                'End_Meeting_Time': end_meeting_time.isoformat() if end_meeting_time else None,
+                
+                # Role and type
+                'Role': role,
+                'Meeting_Type': meeting_type,
+                
+                # Duration and metrics
+                'Duration': float(total_duration) if total_duration else 0.0,
+                'Total_Duration_Minutes': float(total_duration) if total_duration else 0.0,
+                'Attendance_Percentagebasedon_host': float(attendance_basedon_host) if attendance_basedon_host else 0.0,
+                
+                'Is_Currently_Active': bool(is_active),
+            })
+    
+    return roster
+
+
+def _live_participants_etag(roster_version, participants, requesting_user_id):
+    """
+    ETag of a live participant list: the roster version plus each
+    participant's derived Status / LiveKit_Connected, which change without a
+    roster bump (LiveKit connects, connecting -> connection_lost after 120s)
+    """
+    statuses = sorted((str(p['User_ID']), p['Status'], p['LiveKit_Connected']) for p in participants)
+    digest = hashlib.sha1(
+        json.dumps([roster_version, requesting_user_id, statuses], separators=(',', ':')).encode('utf-8')
+    ).hexdigest()[:16]
+    return f'"{roster_version}-{digest}"'
+
+
+@require_http_methods(["GET"])
+@csrf_exempt
+def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
+    """
+    ✅ FIXED: Get live participants with proper names from tbl_Users
+    Returns participant data with correct schema (Join_Times, Leave_Times arrays)
+    ✅ NEW: Added role-based filtering support
+    ✅ NEW: ?since_version=N returns only participants changed after roster
+    version N; every response carries roster_version / X-Roster-Version for
+    the next poll and an ETag over the roster version and the derived
+    statuses (304 for a matching If-None-Match)
+    """
+    try:
+        # ✅ Get requesting user's ID for role-based filtering (optional parameter)
+        requesting_user_id = request.GET.get('user_id')
+        if requesting_user_id:
+            requesting_user_id = int(requesting_user_id)
+        
+        # ===== STEP 0: Roster version =====
+        roster_version = get_roster_version(meeting_id)
+        since_version = request.GET.get('since_version')
+        since_version = int(since_version) if since_version and since_version.isdigit() else None
+        
+        # Participants changed after since_version (None = send the full list).
+        # A since_version ahead of the counter means it was reset: full list.
+        changed_user_ids = None
+        if roster_version and since_version is not None and since_version < roster_version:
+            changed_user_ids = get_roster_changes(meeting_id, since_version)
+        
+        # ===== STEP 1: Database participants, one build per roster version =====
+        try:
+            roster = get_roster_snapshot(meeting_id, roster_version, lambda: _build_live_roster(meeting_id))
         except Exception as e:
             logging.error(f"❌ Database error: {e}")
             import traceback
@@ -2234,6 +2086,24 @@ def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
                 "details": str(e)
             }, status=500)
         
+        db_participants = []
+        for cached in roster:
+            participant = {
+                **cached,
+                # Status - based on Is_Currently_Active (refined with LiveKit below)
+                'Status': 'checking' if cached['Is_Currently_Active'] else 'offline',
+                'LiveKit_Connected': False,
+                'Has_Stream': False,
+                'Debug_Info': {}
+            }
+            # ✅ Add "(You)" label for requesting user
+            if requesting_user_id and participant['User_ID'] == requesting_user_id:
+                if not participant['Full_Name'].endswith('(You)'):
+                    participant['Full_Name'] = f"{participant['Full_Name']} (You)"
+            db_participants.append(participant)
+        
+        logging.info(f"✅ Retrieved {len(db_participants)} participants (roster version {roster_version})")
+        
         # ===== STEP 2: Get LiveKit participants =====
         livekit_participants = []
         livekit_user_mapping = {}
@@ -2360,6 +2230,14 @@ def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
                     # User has left (Is_Currently_Active = False)
                     db_participant['Status'] = 'offline'
         
+        # 304 only when neither the roster nor any derived status changed
+        etag = _live_participants_etag(roster_version, db_participants, requesting_user_id)
+        if roster_version and etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            response['X-Roster-Version'] = str(roster_version)
+            return response
+        
         # ===== STEP 4: Apply role-based filtering (if user_id provided) =====
         filtered_participants = db_participants
         requesting_user_role = 'participant'
@@ -2392,9 +2270,20 @@ def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
         currently_live = len([p for p in filtered_participants if p['Status'] == 'live'])
         currently_connecting = len([p for p in filtered_participants if p['Status'] == 'connecting'])
         
+        # Delta: only changed participants, plus changed users no longer in the roster
+        removed_user_ids = []
+        if changed_user_ids is not None:
+            filtered_participants = [p for p in filtered_participants if str(p['User_ID']) in changed_user_ids]
+            present = {str(p['User_ID']) for p in db_participants}
+            removed_user_ids = sorted(changed_user_ids - present)
+        
         response_data = {
             'success': True,
             'meeting_id': meeting_id,
+            'roster_version': roster_version,
+            'delta': changed_user_ids is not None,
+            'since_version': since_version if changed_user_ids is not None else None,
+            'removed_user_ids': removed_user_ids,
             'summary': {
                 'total_participants': total_participants,
                 'filtered_participants': filtered_count,
@@ -2421,9 +2310,13 @@ def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
 - Currently live: {currently_live}
 - Connecting: {currently_connecting}
 - Requesting user: {requesting_user_id} ({requesting_user_role})
+- Roster version: {roster_version} (delta since {since_version if changed_user_ids is not None else '-'})
         """)
         
-        return JsonResponse(response_data, status=200)
+        response = JsonResponse(response_data, status=200)
+        response['ETag'] = etag
+        response['X-Roster-Version'] = str(roster_version)
+        return response
         
     except Exception as e:
         logging.error(f"❌ Critical error in Get_Live_Participants_Enhanced_No_Status: {e}")
@@ -2435,11 +2328,343 @@ def Get_Live_Participants_Enhanced_No_Status(request, meeting_id):
             "details": str(e)
         }, status=500)
 
+def _get_sync_meeting_row(meeting_id):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT LiveKit_Room_Name, Host_ID, Started_At, Status 
+            FROM tbl_Meetings 
+            WHERE ID = %s
+        """, [meeting_id])
+        return cursor.fetchone()
+
+def _map_livekit_participants(livekit_participants):
+    """Map LiveKit participants to user IDs: {user_id: participant + parsing info}"""
+    livekit_user_mapping = {}
+    
+    # Parse LiveKit participants with multiple extraction methods
+    for lk_participant in livekit_participants:
+        try:
+            identity = lk_participant.get('identity', '')
+            metadata = lk_participant.get('metadata', {})
+            name = lk_participant.get('name', '')
+            user_id = None
+            parsing_method = "none"
+            
+            # Method 1: From metadata (most reliable)
+            if isinstance(metadata, dict) and metadata.get('user_id'):
+                user_id = str(metadata['user_id'])
+                parsing_method = "metadata_dict"
+            elif isinstance(metadata, str) and metadata.strip():
+                try:
+                    meta_dict = json.loads(metadata)
+                    if meta_dict.get('user_id'):
+                        user_id = str(meta_dict['user_id'])
+                        parsing_method = "metadata_json"
+                except json.JSONDecodeError:
+                    pass
+            
+            # Method 2: From identity pattern "user_{id}_{timestamp}"
+            if not user_id and 'user_' in identity.lower():
+                try:
+                    parts = identity.split('_')
+                    if len(parts) >= 2:
+                        potential_id = parts[1]
+                        if potential_id.isdigit():
+                            user_id = potential_id
+                            parsing_method = "identity_pattern"
+                except Exception:
+                    pass
+            
+            # Method 3: Direct numeric identity
+            if not user_id and identity.isdigit():
+                user_id = identity
+                parsing_method = "identity_numeric"
+            
+            # Method 4: Extract from name field
+            if not user_id and name:
+                if name.isdigit():
+                    user_id = name
+                    parsing_method = "name_numeric"
+                elif 'user_' in name.lower():
+                    try:
+                        import re
+                        match = re.search(r'user_(\d+)', name.lower())
+                        if match:
+                            user_id = match.group(1)
+                            parsing_method = "name_pattern"
+                    except Exception:
+                        pass
+            
+            # Method 5: Regex extraction - find any number
+            if not user_id:
+                try:
+                    import re
+                    # Try identity first
+                    numbers = re.findall(r'\d+', identity)
+                    if numbers:
+                        user_id = numbers[0]
+                        parsing_method = "regex_identity"
+                    else:
+                        # Try name
+                        numbers = re.findall(r'\d+', name)
+                        if numbers:
+                            user_id = numbers[0]
+                            parsing_method = "regex_name"
+                except Exception:
+                    pass
+            
+            if user_id:
+                livekit_user_mapping[str(user_id)] = {
+                    **lk_participant,
+                    'parsed_user_id': user_id,
+                    'original_identity': identity,
+                    'original_name': name,
+                    'parsing_method': parsing_method
+                }
+                logging.info(f"[SYNC-FIXED] Mapped: {identity} -> User {user_id} (method: {parsing_method})")
+            else:
+                logging.warning(f"[SYNC-FIXED] Could not extract user_id from identity='{identity}', name='{name}'")
+                
+        except Exception as e:
+            logging.error(f"[SYNC-FIXED] Error processing LiveKit participant: {e}")
+            continue
+    
+    return livekit_user_mapping
+
+
+def _parse_sync_times(value, user_id, label):
+    try:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return json.loads(value) if value.strip() else []
+        if isinstance(value, list):
+            return value
+    except Exception as e:
+        logging.error(f"[SYNC-FIXED] Error parsing {label} for user {user_id}: {e}")
+    return []
+
+
+def _load_sync_db_participants(meeting_id):
+    """Active / inactive tbl_Participants rows keyed by user ID (errors propagate)"""
+    active_db_users = {}
+    inactive_db_users = {}
+    
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT User_ID, Is_Currently_Active, Join_Times, Leave_Times, ID
+            FROM tbl_Participants 
+            WHERE Meeting_ID = %s
+        """, [meeting_id])
+        db_participants = cursor.fetchall()
+    
+    for row in db_participants:
+        user_id, is_active, join_times_json, leave_times_json, participant_id = row
+        
+        participant_info = {
+            'id': participant_id,
+            'join_times': _parse_sync_times(join_times_json, user_id, 'join_times'),
+            'leave_times': _parse_sync_times(leave_times_json, user_id, 'leave_times'),
+        }
+        
+        if is_active:
+            active_db_users[str(user_id)] = participant_info
+        else:
+            inactive_db_users[str(user_id)] = participant_info
+    
+    logging.info(f"[SYNC-FIXED] Database state: {len(active_db_users)} active, {len(inactive_db_users)} inactive")
+    
+    return active_db_users, inactive_db_users
+
+
+def _bulk_update_participants(cursor, rows, columns, fixed_sql):
+    """
+    One UPDATE for many tbl_Participants rows: rows are (ID, value per column);
+    each column becomes a CASE on ID, fixed_sql is set on all of them.
+    """
+    assignments = []
+    params = []
+    for index, column in enumerate(columns, start=1):
+        assignments.append(f"{column} = CASE ID {' '.join(['WHEN %s THEN %s'] * len(rows))} END")
+        for row in rows:
+            params.extend((row[0], row[index]))
+    ids = [row[0] for row in rows]
+    cursor.execute(f"""
+        UPDATE tbl_Participants
+        SET {', '.join(assignments)}, {fixed_sql}
+        WHERE ID IN ({', '.join(['%s'] * len(ids))})
+    """, params + ids)
+    return cursor.rowcount
+
+
+def _apply_livekit_sync(meeting_id, host_id, livekit_user_mapping, active_db_users, inactive_db_users,
+                        current_time, current_time_str):
+    """
+    Write the LiveKit/database diff with a fixed number of statements per
+    kind of change (left, rejoined, added); marks active_db_users entries
+    that left (mutated in place)
+    """
+    sync_results = {
+        'added': 0, 
+        'removed': 0, 
+        'rejoined': 0, 
+        'already_synced': 0,
+        'errors': []
+    }
+    changed_user_ids = []
+    
+    # ===== Users no longer in LiveKit (15 second grace period after their last join) =====
+    leavers = []
+    for user_id, participant_info in active_db_users.items():
+        if user_id in livekit_user_mapping or not participant_info['join_times']:
+            continue
+        try:
+            last_join_dt = datetime.strptime(participant_info['join_times'][-1], '%Y-%m-%d %H:%M:%S')
+            if last_join_dt.tzinfo is None:
+                last_join_dt = IST_TIMEZONE.localize(last_join_dt)
+            if (current_time - last_join_dt).total_seconds() > 15:
+                leavers.append(user_id)
+        except Exception as e:
+            logging.error(f"[SYNC-FIXED] Error calculating grace period for user {user_id}: {e}")
+    
+    if leavers:
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    close_sessions_bulk(cursor, [(meeting_id, user_id, current_time_str) for user_id in leavers])
+                    totals = get_session_totals(cursor, meeting_id, [int(user_id) for user_id in leavers], current_time_str)
+                    
+                    rows = []
+                    for user_id in leavers:
+                        info = active_db_users[user_id]
+                        join_times, leave_times = cap_session_arrays(
+                            list(info['join_times']), info['leave_times'] + [current_time_str]
+                        )
+                        user_totals = totals.get(int(user_id), {})
+                        rows.append((
+                            info['id'], json.dumps(join_times), json.dumps(leave_times),
+                            user_totals.get('minutes', 0.0), user_totals.get('sessions', 0)
+                        ))
+                    _bulk_update_participants(
+                        cursor, rows,
+                        ('Join_Times', 'Leave_Times', 'Total_Duration_Minutes', 'Total_Sessions'),
+                        "Is_Currently_Active = FALSE"
+                    )
+            
+            for user_id in leavers:
+                del active_db_users[user_id]
+            sync_results['removed'] = len(leavers)
+            changed_user_ids.extend(leavers)
+            logging.info(f"[SYNC-FIXED] Marked {len(leavers)} users as left (grace period expired)")
+        except Exception as e:
+            logging.error(f"[SYNC-FIXED] Error marking users as left: {e}")
+            sync_results['errors'].append(f"Failed to mark {len(leavers)} users as left: {str(e)}")
+    
+    # ===== LiveKit participants: already synced, rejoined or new =====
+    rejoiners = [user_id for user_id in livekit_user_mapping if user_id in inactive_db_users]
+    newcomers = [
+        user_id for user_id in livekit_user_mapping
+        if user_id not in active_db_users and user_id not in inactive_db_users
+    ]
+    sync_results['already_synced'] = len(livekit_user_mapping) - len(rejoiners) - len(newcomers)
+    
+    if rejoiners:
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    rows = []
+                    for user_id in rejoiners:
+                        info = inactive_db_users[user_id]
+                        join_times, leave_times = cap_session_arrays(
+                            info['join_times'] + [current_time_str], list(info['leave_times'])
+                        )
+                        rows.append((info['id'], json.dumps(join_times), json.dumps(leave_times)))
+                    _bulk_update_participants(
+                        cursor, rows, ('Join_Times', 'Leave_Times'), "Is_Currently_Active = TRUE"
+                    )
+                    open_sessions_bulk(cursor, [(meeting_id, user_id, current_time_str) for user_id in rejoiners])
+            
+            sync_results['rejoined'] = len(rejoiners)
+            changed_user_ids.extend(rejoiners)
+            logging.info(f"[SYNC-FIXED] {len(rejoiners)} users rejoined")
+        except Exception as e:
+            logging.error(f"[SYNC-FIXED] Error rejoining users: {e}")
+            sync_results['errors'].append(f"Failed to rejoin {len(rejoiners)} users: {str(e)}")
+    
+    if newcomers:
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    # Actual user names from tbl_Users, one query
+                    cursor.execute(
+                        f"SELECT ID, full_name FROM tbl_Users WHERE ID IN ({', '.join(['%s'] * len(newcomers))})",
+                        newcomers
+                    )
+                    user_names = {str(row[0]): (row[1] or '').strip() for row in cursor.fetchall()}
+                    
+                    cursor.executemany("""
+                        INSERT INTO tbl_Participants 
+                        (Meeting_ID, User_ID, Full_Name, Role, Meeting_Type,
+                         Join_Times, Leave_Times, Total_Duration_Minutes, Total_Sessions,
+                         Is_Currently_Active, Attendance_Percentagebasedon_host)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, 0, 0, TRUE, 0.00)
+                    """, [
+                        (
+                            meeting_id,
+                            user_id,
+                            user_names.get(user_id) or f"User {user_id}",
+                            'host' if str(user_id) == str(host_id) else 'participant',
+                            'InstantMeeting',
+                            json.dumps([current_time_str]),
+                            json.dumps([])
+                        )
+                        for user_id in newcomers
+                    ])
+                    open_sessions_bulk(cursor, [(meeting_id, user_id, current_time_str) for user_id in newcomers])
+            
+            sync_results['added'] = len(newcomers)
+            changed_user_ids.extend(newcomers)
+            logging.info(f"[SYNC-FIXED] Added {len(newcomers)} new users")
+        except Exception as e:
+            logging.error(f"[SYNC-FIXED] Error adding users: {e}")
+            sync_results['errors'].append(f"Failed to add {len(newcomers)} users: {str(e)}")
+    
+    if changed_user_ids:
+        bump_roster_version(meeting_id, changed_user_ids)
+    
+    return sync_results
+
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _sync_result_key(meeting_id):
+    return f"participant_sync_result:{meeting_id}"
+
+
+def _sync_lock_key(meeting_id):
+    return f"participant_sync_lock:{meeting_id}"
+
+
+async def _get_cached_sync_response(client, meeting_id):
+    cached = await client.get(_sync_result_key(meeting_id))
+    if not cached:
+        return None
+    return JsonResponse({**json.loads(cached), 'cached': True}, status=200)
+
+
 @require_http_methods(["POST"])
 @csrf_exempt
-def Sync_LiveKit_Participants_Fixed(request, meeting_id):
+async def Sync_LiveKit_Participants_Fixed(request, meeting_id):
     """
     ✅ FULLY CORRECTED: Sync LiveKit participants with comprehensive error handling
+    ✅ Single-flight per meeting: a Redis lock lets one caller run the sync,
+    its result is cached for PARTICIPANT_SYNC_INTERVAL and served to everyone
+    else (cached=true)
     """
     
     # First check - LiveKit availability
@@ -2456,6 +2681,60 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
             "livekit_enabled": False
         }, status=200)
     
+    client = get_async_redis_client()
+    if client is None:
+        return await _run_participant_sync(meeting_id)
+    
+    lock_key = _sync_lock_key(meeting_id)
+    token = uuid.uuid4().hex
+    try:
+        cached_response = await _get_cached_sync_response(client, meeting_id)
+        if cached_response is not None:
+            return cached_response
+        
+        if not await client.set(lock_key, token, nx=True, px=PARTICIPANT_SYNC_LOCK_MS):
+            # Another caller is syncing this meeting - wait for its result
+            deadline = time.monotonic() + PARTICIPANT_SYNC_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+                cached_response = await _get_cached_sync_response(client, meeting_id)
+                if cached_response is not None:
+                    return cached_response
+            
+            return JsonResponse({
+                "success": True,
+                "message": "Sync already in progress",
+                "sync_in_progress": True,
+                "meeting_id": meeting_id,
+                "sync_results": {
+                    "added": 0, 
+                    "removed": 0, 
+                    "rejoined": 0, 
+                    "already_synced": 0
+                },
+                "livekit_enabled": True
+            }, status=200)
+    except redis.RedisError as e:
+        logging.warning(f"[SYNC-FIXED] Single-flight unavailable for meeting {meeting_id}: {e}")
+        return await _run_participant_sync(meeting_id)
+    
+    try:
+        response = await _run_participant_sync(meeting_id)
+        if response.status_code == 200:
+            try:
+                await client.setex(_sync_result_key(meeting_id), PARTICIPANT_SYNC_INTERVAL, response.content)
+            except redis.RedisError as e:
+                logging.warning(f"[SYNC-FIXED] Could not cache sync result for meeting {meeting_id}: {e}")
+        return response
+    finally:
+        try:
+            await client.eval(_RELEASE_LOCK_LUA, 1, lock_key, token)
+        except redis.RedisError as e:
+            logging.warning(f"[SYNC-FIXED] Could not release sync lock for meeting {meeting_id}: {e}")
+
+
+async def _run_participant_sync(meeting_id):
+    """One LiveKit/database reconciliation for a meeting, as a JsonResponse"""
     try:
         logging.info(f"[SYNC-FIXED] Starting sync for meeting {meeting_id}")
         
@@ -2469,41 +2748,35 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
         meeting_status = None
         
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT LiveKit_Room_Name, Host_ID, Started_At, Status 
-                    FROM tbl_Meetings 
-                    WHERE ID = %s
-                """, [meeting_id])
-                row = cursor.fetchone()
-                
-                if not row:
-                    logging.error(f"[SYNC-FIXED] Meeting {meeting_id} not found in database")
-                    return JsonResponse({
-                        "success": False,
-                        "error": "Meeting not found"
-                    }, status=404)
-                
-                room_name, host_id, started_at, meeting_status = row
-                
-                if not room_name:
-                    room_name = f"meeting_{meeting_id}"
-                    logging.info(f"[SYNC-FIXED] Using default room name: {room_name}")
+            row = await sync_to_async(_get_sync_meeting_row)(meeting_id)
+            
+            if not row:
+                logging.error(f"[SYNC-FIXED] Meeting {meeting_id} not found in database")
+                return JsonResponse({
+                    "success": False,
+                    "error": "Meeting not found"
+                }, status=404)
+            
+            room_name, host_id, started_at, meeting_status = row
+            
+            if not room_name:
+                room_name = f"meeting_{meeting_id}"
+                logging.info(f"[SYNC-FIXED] Using default room name: {room_name}")
+            
+            # Don't sync ended meetings
+            if meeting_status == 'ended':
+                logging.info(f"[SYNC-FIXED] Meeting {meeting_id} already ended - skipping sync")
+                return JsonResponse({
+                    "success": True,
+                    "message": "Meeting already ended - no sync needed",
+                    "sync_results": {
+                        "added": 0, 
+                        "removed": 0, 
+                        "rejoined": 0, 
+                        "already_synced": 0
+                    }
+                }, status=200)
                 
-                # Don't sync ended meetings
-                if meeting_status == 'ended':
-                    logging.info(f"[SYNC-FIXED] Meeting {meeting_id} already ended - skipping sync")
-                    return JsonResponse({
-                        "success": True,
-                        "message": "Meeting already ended - no sync needed",
-                        "sync_results": {
-                            "added": 0, 
-                            "removed": 0, 
-                            "rejoined": 0, 
-                            "already_synced": 0
-                        }
-                    }, status=200)
-                    
         except Exception as e:
             logging.error(f"[SYNC-FIXED] Database error getting meeting: {e}")
             import traceback
@@ -2514,337 +2787,40 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
                 "details": str(e)
             }, status=500)
         
-        # ===== STEP 2: Get LiveKit participants =====
+        # ===== STEP 2 + 3: LiveKit participants and database participants, concurrently =====
         livekit_participants = []
         livekit_user_mapping = {}
         
-        try:
-            livekit_participants = livekit_service.list_participants(room_name)
-            logging.info(f"[SYNC-FIXED] Retrieved {len(livekit_participants)} LiveKit participants")
-            
-            # Parse LiveKit participants with multiple extraction methods
-            for lk_participant in livekit_participants:
-                try:
-                    identity = lk_participant.get('identity', '')
-                    metadata = lk_participant.get('metadata', {})
-                    name = lk_participant.get('name', '')
-                    user_id = None
-                    parsing_method = "none"
-                    
-                    # Method 1: From metadata (most reliable)
-                    if isinstance(metadata, dict) and metadata.get('user_id'):
-                        user_id = str(metadata['user_id'])
-                        parsing_method = "metadata_dict"
-                    elif isinstance(metadata, str) and metadata.strip():
-                        try:
-                            meta_dict = json.loads(metadata)
-                            if meta_dict.get('user_id'):
-                                user_id = str(meta_dict['user_id'])
-                                parsing_method = "metadata_json"
-                        except json.JSONDecodeError:
-                            pass
-                    
-                    # Method 2: From identity pattern "user_{id}_{timestamp}"
-                    if not user_id and 'user_' in identity.lower():
-                        try:
-                            parts = identity.split('_')
-                            if len(parts) >= 2:
-                                potential_id = parts[1]
-                                if potential_id.isdigit():
-                                    user_id = potential_id
-                                    parsing_method = "identity_pattern"
-                        except Exception:
-                            pass
-                    
-                    # Method 3: Direct numeric identity
-                    if not user_id and identity.isdigit():
-                        user_id = identity
-                        parsing_method = "identity_numeric"
-                    
-                    # Method 4: Extract from name field
-                    if not user_id and name:
-                        if name.isdigit():
-                            user_id = name
-                            parsing_method = "name_numeric"
-                        elif 'user_' in name.lower():
-                            try:
-                                import re
-                                match = re.search(r'user_(\d+)', name.lower())
-                                if match:
-                                    user_id = match.group(1)
-                                    parsing_method = "name_pattern"
-                            except Exception:
-                                pass
-                    
-                    # Method 5: Regex extraction - find any number
-                    if not user_id:
-                        try:
-                            import re
-                            # Try identity first
-                            numbers = re.findall(r'\d+', identity)
-                            if numbers:
-                                user_id = numbers[0]
-                                parsing_method = "regex_identity"
-                            else:
-                                # Try name
-                                numbers = re.findall(r'\d+', name)
-                                if numbers:
-                                    user_id = numbers[0]
-                                    parsing_method = "regex_name"
-                        except Exception:
-                            pass
-                    
-                    if user_id:
-                        livekit_user_mapping[str(user_id)] = {
-                            **lk_participant,
-                            'parsed_user_id': user_id,
-                            'original_identity': identity,
-                            'original_name': name,
-                            'parsing_method': parsing_method
-                        }
-                        logging.info(f"[SYNC-FIXED] Mapped: {identity} -> User {user_id} (method: {parsing_method})")
-                    else:
-                        logging.warning(f"[SYNC-FIXED] Could not extract user_id from identity='{identity}', name='{name}'")
-                        
-                except Exception as e:
-                    logging.error(f"[SYNC-FIXED] Error processing LiveKit participant: {e}")
-                    continue
-            
-            logging.info(f"[SYNC-FIXED] Successfully mapped {len(livekit_user_mapping)} participants")
-            
-        except Exception as e:
-            logging.error(f"[SYNC-FIXED] LiveKit API error: {e}")
-            import traceback
-            logging.error(f"Traceback: {traceback.format_exc()}")
+        livekit_result, db_result = await asyncio.gather(
+            livekit_service.alist_participants(room_name),
+            sync_to_async(_load_sync_db_participants)(meeting_id),
+            return_exceptions=True
+        )
+        
+        if isinstance(livekit_result, Exception):
+            logging.error(f"[SYNC-FIXED] LiveKit API error: {livekit_result}")
             # Don't fail completely - continue with database operations
             logging.warning("[SYNC-FIXED] Continuing without LiveKit data")
+        else:
+            livekit_participants = livekit_result
+            logging.info(f"[SYNC-FIXED] Retrieved {len(livekit_participants)} LiveKit participants")
+            livekit_user_mapping = _map_livekit_participants(livekit_participants)
+            logging.info(f"[SYNC-FIXED] Successfully mapped {len(livekit_user_mapping)} participants")
         
-        # ===== STEP 3: Get database participants =====
-        active_db_users = {}
-        inactive_db_users = {}
-        
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT User_ID, Is_Currently_Active, Join_Times, Leave_Times, ID
-                    FROM tbl_Participants 
-                    WHERE Meeting_ID = %s
-                """, [meeting_id])
-                db_participants = cursor.fetchall()
-            
-            for row in db_participants:
-                user_id, is_active, join_times_json, leave_times_json, participant_id = row
-                user_key = str(user_id)
-                
-                # Parse join_times safely
-                join_times = []
-                try:
-                    if join_times_json is None:
-                        join_times = []
-                    elif isinstance(join_times_json, str):
-                        join_times = json.loads(join_times_json) if join_times_json.strip() else []
-                    elif isinstance(join_times_json, list):
-                        join_times = join_times_json
-                    else:
-                        join_times = []
-                except Exception as e:
-                    logging.error(f"[SYNC-FIXED] Error parsing join_times for user {user_id}: {e}")
-                    join_times = []
-                
-                participant_info = {
-                    'id': participant_id,
-                    'join_times': join_times
-                }
-                
-                if is_active:
-                    active_db_users[user_key] = participant_info
-                else:
-                    inactive_db_users[user_key] = participant_info
-            
-            logging.info(f"[SYNC-FIXED] Database state: {len(active_db_users)} active, {len(inactive_db_users)} inactive")
-            
-        except Exception as e:
-            logging.error(f"[SYNC-FIXED] Database query error: {e}")
-            import traceback
-            logging.error(f"Traceback: {traceback.format_exc()}")
+        if isinstance(db_result, Exception):
+            logging.error(f"[SYNC-FIXED] Database query error: {db_result}")
             return JsonResponse({
                 "success": False,
                 "error": "Database error retrieving participants",
-                "details": str(e)
+                "details": str(db_result)
             }, status=500)
+        active_db_users, inactive_db_users = db_result
         
         # ===== STEP 4: Sync logic =====
-        sync_results = {
-            'added': 0, 
-            'removed': 0, 
-            'rejoined': 0, 
-            'already_synced': 0,
-            'errors': []
-        }
-        
-        # Mark users as left if not in LiveKit (with grace period)
-        for user_id, participant_info in list(active_db_users.items()):
-            if user_id not in livekit_user_mapping:
-                join_times = participant_info.get('join_times', [])
-                
-                if join_times and len(join_times) > 0:
-                    try:
-                        last_join_str = join_times[-1]
-                        last_join_dt = datetime.strptime(last_join_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        # Make timezone aware
-                        if last_join_dt.tzinfo is None:
-                            last_join_dt = IST_TIMEZONE.localize(last_join_dt)
-                        
-                        time_since_join = (current_time - last_join_dt).total_seconds()
-                        
-                        # 15 second grace period before marking as left
-                        if time_since_join > 15:
-                            try:
-                                with connection.cursor() as cursor:
-                                    # Get current leave times
-                                    cursor.execute("""
-                                        SELECT Leave_Times FROM tbl_Participants WHERE ID = %s
-                                    """, [participant_info['id']])
-                                    leave_times_row = cursor.fetchone()
-                                    
-                                    if leave_times_row:
-                                        leave_times = []
-                                        try:
-                                            if leave_times_row[0] is None:
-                                                leave_times = []
-                                            elif isinstance(leave_times_row[0], str):
-                                                leave_times = json.loads(leave_times_row[0]) if leave_times_row[0].strip() else []
-                                            elif isinstance(leave_times_row[0], list):
-                                                leave_times = leave_times_row[0]
-                                        except Exception as e:
-                                            logging.error(f"[SYNC-FIXED] Error parsing leave_times: {e}")
-                                            leave_times = []
-                                        
-                                        # Append current time to leave times
-                                        leave_times.append(current_time_str)
-                                        
-                                        # Calculate total duration
-                                        total_duration = calculate_duration_from_arrays(join_times, leave_times)
-                                        
-                                        # Update participant
-                                        cursor.execute("""
-                                            UPDATE tbl_Participants 
-                                            SET Leave_Times = %s,
-                                                Is_Currently_Active = FALSE,
-                                                Total_Duration_Minutes = %s,
-                                                Total_Sessions = %s
-                                            WHERE ID = %s
-                                        """, [
-                                            json.dumps(leave_times), 
-                                            total_duration, 
-                                            len(leave_times), 
-                                            participant_info['id']
-                                        ])
-                                        
-                                        if cursor.rowcount > 0:
-                                            sync_results['removed'] += 1
-                                            logging.info(f"[SYNC-FIXED] User {user_id} marked as left (grace period expired)")
-                                            del active_db_users[user_id]
-                                            
-                            except Exception as e:
-                                logging.error(f"[SYNC-FIXED] Error updating user {user_id}: {e}")
-                                sync_results['errors'].append(f"Failed to update user {user_id}: {str(e)}")
-                                
-                    except Exception as e:
-                        logging.error(f"[SYNC-FIXED] Error calculating grace period for user {user_id}: {e}")
-        
-        # Process LiveKit participants
-        for user_id in livekit_user_mapping.keys():
-            try:
-                if user_id in active_db_users:
-                    # User already active - no action needed
-                    sync_results['already_synced'] += 1
-                    
-                elif user_id in inactive_db_users:
-                    # User rejoined - append to Join_Times array
-                    participant_id = inactive_db_users[user_id]['id']
-                    
-                    try:
-                        with connection.cursor() as cursor:
-                            cursor.execute("""
-                                SELECT Join_Times FROM tbl_Participants WHERE ID = %s
-                            """, [participant_id])
-                            row = cursor.fetchone()
-                            
-                            if row:
-                                join_times = []
-                                try:
-                                    if row[0] is None:
-                                        join_times = []
-                                    elif isinstance(row[0], str):
-                                        join_times = json.loads(row[0]) if row[0].strip() else []
-                                    elif isinstance(row[0], list):
-                                        join_times = row[0]
-                                except Exception as e:
-                                    logging.error(f"[SYNC-FIXED] Error parsing join_times: {e}")
-                                    join_times = []
-                                
-                                # Append new join time
-                                join_times.append(current_time_str)
-                                
-                                cursor.execute("""
-                                    UPDATE tbl_Participants 
-                                    SET Join_Times = %s, Is_Currently_Active = TRUE
-                                    WHERE ID = %s
-                                """, [json.dumps(join_times), participant_id])
-                                
-                                sync_results['rejoined'] += 1
-                                logging.info(f"[SYNC-FIXED] User {user_id} rejoined (session #{len(join_times)})")
-                                
-                    except Exception as e:
-                        logging.error(f"[SYNC-FIXED] Error rejoining user {user_id}: {e}")
-                        sync_results['errors'].append(f"Failed to rejoin user {user_id}: {str(e)}")
-                        
-                else:
-                    # New user - create record
-                    role = 'host' if str(user_id) == str(host_id) else 'participant'
-                    user_name = f"User {user_id}"
-                    
-                    # Get actual user name from tbl_Users
-                    try:
-                        with connection.cursor() as cursor:
-                            cursor.execute("SELECT full_name FROM tbl_Users WHERE ID = %s", [user_id])
-                            user_row = cursor.fetchone()
-                            if user_row and user_row[0]:
-                                user_name = user_row[0].strip()
-                    except Exception as e:
-                        logging.warning(f"[SYNC-FIXED] Could not get user name: {e}")
-                    
-                    try:
-                        with connection.cursor() as cursor:
-                            cursor.execute("""
-                                INSERT INTO tbl_Participants 
-                                (Meeting_ID, User_ID, Full_Name, Role, Meeting_Type,
-                                 Join_Times, Leave_Times, Total_Duration_Minutes, Total_Sessions,
-                                 Is_Currently_Active, Attendance_Percentagebasedon_host)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, 0, 0, TRUE, 0.00)
-                            """, [
-                                meeting_id, 
-                                user_id, 
-                                user_name, 
-                                role, 
-                                'InstantMeeting',
-                                json.dumps([current_time_str]),
-                                json.dumps([])
-                            ])
-                            
-                            sync_results['added'] += 1
-                            logging.info(f"[SYNC-FIXED] Added new user {user_id} ({user_name})")
-                            
-                    except Exception as e:
-                        logging.error(f"[SYNC-FIXED] Error adding user {user_id}: {e}")
-                        sync_results['errors'].append(f"Failed to add user {user_id}: {str(e)}")
-                        
-            except Exception as e:
-                logging.error(f"[SYNC-FIXED] Error processing user {user_id}: {e}")
-                sync_results['errors'].append(f"Error processing user {user_id}: {str(e)}")
-                continue
+        sync_results = await sync_to_async(_apply_livekit_sync)(
+            meeting_id, host_id, livekit_user_mapping, active_db_users, inactive_db_users,
+            current_time, current_time_str
+        )
         
         # Log final results
         logging.info(f"""
@@ -2878,6 +2854,98 @@ def Sync_LiveKit_Participants_Fixed(request, meeting_id):
             "meeting_id": meeting_id
         }, status=500)
 
+def finalize_meeting_participants(meeting_id, end_time_str):
+    """
+    Close every session of an ended meeting and write durations, session
+    counts and host-based attendance percentages in one transaction with a
+    fixed number of statements, whatever the meeting size.
+    host_duration is None when the meeting has no host row; percentages are
+    then left untouched.
+    """
+    global _finalize_ms_per_participant
+    started = time.monotonic()
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            close_meeting_sessions(cursor, meeting_id, end_time_str)
+            apply_session_totals(cursor, meeting_id, end_time_str)
+
+            cursor.execute("""
+                SELECT Total_Duration_Minutes
+                FROM tbl_Participants
+                WHERE Meeting_ID = %s AND Role = 'host'
+                ORDER BY ID ASC
+                LIMIT 1
+            """, [meeting_id])
+            host_row = cursor.fetchone()
+            host_duration = float(host_row[0] or 0) if host_row else None
+
+            if host_duration and host_duration > 0:
+                apply_host_attendance(cursor, meeting_id, host_duration)
+
+            cursor.execute("""
+                SELECT User_ID, Role, Total_Duration_Minutes, Attendance_Percentagebasedon_host
+                FROM tbl_Participants
+                WHERE Meeting_ID = %s
+            """, [meeting_id])
+            rows = cursor.fetchall()
+
+    participants_output = [
+        {
+            "user_id": user_id,
+            "role": role,
+            "attendance_percentagebasedon_host": float(attendance or 0),
+            "duration_minutes": round(float(duration or 0), 2)
+        }
+        for user_id, role, duration, attendance in rows
+    ]
+
+    invalidate_history_summaries([row[0] for row in rows])
+    bump_roster_version(meeting_id, [row[0] for row in rows])
+
+    try:
+        refresh_meeting_rollups(meeting_id)
+    except Exception as e:
+        logging.warning(f"[end_meeting] Analytics rollups not refreshed for {meeting_id}: {e}")
+
+    # Feeds the end_meeting inline/background decision
+    elapsed_ms = (time.monotonic() - started) * 1000
+    if rows:
+        _finalize_ms_per_participant = 0.7 * _finalize_ms_per_participant + 0.3 * (elapsed_ms / len(rows))
+    logging.info(f"[end_meeting] Finalised {len(rows)} participants of {meeting_id} in {elapsed_ms:.0f} ms")
+
+    return {
+        "participants_processed": len(rows),
+        "host_duration": host_duration,
+        "participants": participants_output,
+    }
+
+
+def flush_participant_events(meeting_id):
+    """
+    Apply queued write-behind join/leave events before a meeting is finalised.
+    True when none of this meeting's events are left outside MySQL.
+    """
+    if not PARTICIPANT_WRITE_BEHIND or not get_pending_roster(meeting_id):
+        return True
+    result = drain_participant_events()
+    if not result.get('success'):
+        logging.warning(f"[end_meeting] Draining participant events for {meeting_id}: {result.get('error')}")
+    return not get_pending_roster(meeting_id)
+
+
+def queue_meeting_finalization(meeting_id, end_time_str):
+    """Hand finalize_meeting_participants to Celery; False when the broker is unavailable"""
+    try:
+        from core.scheduler.tasks import finalize_meeting_task
+        finalize_meeting_task.delay(meeting_id, end_time_str)
+        logging.info(f"[end_meeting] Finalisation of {meeting_id} queued")
+        return True
+    except Exception as e:
+        logging.warning(f"[end_meeting] Could not queue finalisation of {meeting_id}, running inline: {e}")
+        return False
+
+
 @require_http_methods(["POST"])
 @csrf_exempt
 def end_meeting(request, meeting_id):
@@ -2926,9 +2994,6 @@ def end_meeting(request, meeting_id):
             logging.error(f"[end_meeting] Meeting validation error: {e}")
             return JsonResponse({"error": "Database error", "details": str(e)}, status=500)
 
-        participants_processed = 0
-        participants_data = []
-
         # ===== Step 1: Mark meeting ended =====
         try:
             with transaction.atomic():
@@ -2942,132 +3007,73 @@ def end_meeting(request, meeting_id):
             logging.error(f"[end_meeting] Failed to mark meeting ended: {e}")
             return JsonResponse({"error": "Failed to update meeting status", "details": str(e)}, status=500)
 
-        # ===== Step 2: Update each participant’s durations =====
-        try:
-            with transaction.atomic():
-                with connection.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT ID, User_ID, Full_Name, Role, Meeting_Type,
-                               Join_Times, Leave_Times, Is_Currently_Active
-                        FROM tbl_Participants
-                        WHERE Meeting_ID = %s
-                    """, [meeting_id])
-
-                    all_participants = cursor.fetchall()
-
-                    for row in all_participants:
-                        participant_id, user_id, full_name, role, meeting_type, join_times_json, leave_times_json, is_active = row
+        # Joins must see the ended status immediately, not after the cache TTL
+        invalidate_meeting_info_cache(meeting_id)
 
-                        # Parse arrays
-                        try:
-                            join_times = json.loads(join_times_json) if isinstance(join_times_json, str) else join_times_json or []
-                            leave_times = json.loads(leave_times_json) if isinstance(leave_times_json, str) else leave_times_json or []
-                        except Exception:
-                            join_times, leave_times = [], []
-
-                        # If participant still active -> append end time
-                        if is_active and len(join_times) > len(leave_times):
-                            leave_times.append(end_time_str)
-
-                        # Calculate total duration (in minutes)
-                        total_duration_minutes = calculate_duration_from_arrays(join_times, leave_times)
-                        completed_sessions = len(leave_times)
-
-                        # Update DB
-                        cursor.execute("""
-                            UPDATE tbl_Participants
-                            SET Leave_Times = %s,
-                                End_Meeting_Time = %s,
-                                Total_Duration_Minutes = %s,
-                                Total_Sessions = %s,
-                                Is_Currently_Active = FALSE
-                            WHERE ID = %s
-                        """, [
-                            json.dumps(leave_times),
-                            end_time,
-                            total_duration_minutes,
-                            completed_sessions,
-                            participant_id
-                        ])
-
-                        participants_processed += 1
-                        participants_data.append({
-                            "user_id": user_id,
-                            "full_name": full_name or f"User {user_id}",
-                            "role": role,
-                            "meeting_type": meeting_type,
-                            "total_sessions": completed_sessions,
-                            "total_duration_minutes": round(total_duration_minutes, 2),
-                        })
+        # ===== Step 2: Attendance tracking state of this process, flushed in bulk =====
+        try:
+            stop_meeting_attendance_tracking(meeting_id)
         except Exception as e:
-            logging.error(f"[end_meeting] Participant duration update error: {e}")
-            return JsonResponse({"error": "Failed to finalize participant data", "details": str(e)}, status=500)
+            logging.warning(f"⚠️ ATTENDANCE flush error: {e}")
 
-        # ===== Step 3: Attendance integration (AI_Attendance) =====
         if ATTENDANCE_INTEGRATION:
             try:
                 calculate_meeting_end_attendance(meeting_id, end_time)
             except Exception as e:
                 logging.warning(f"⚠️ ATTENDANCE integration error: {e}")
 
-        # ===== Step 4: Host-based attendance percentage =====
+        # ===== Step 3: Durations + host-based attendance, set-based =====
+        # Large meetings are finalised by a Celery task when the estimated
+        # time would exceed END_MEETING_LATENCY_BUDGET_MS
         try:
             with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT User_ID, Role, Total_Duration_Minutes
-                    FROM tbl_Participants
-                    WHERE Meeting_ID = %s
-                """, [meeting_id])
-                rows = cursor.fetchall()
+                cursor.execute("SELECT COUNT(*) FROM tbl_Participants WHERE Meeting_ID = %s", [meeting_id])
+                participant_count = cursor.fetchone()[0] or 0
         except Exception as e:
             logging.error(f"[end_meeting] Fetch participants error: {e}")
             return JsonResponse({"error": "Failed to fetch participants", "details": str(e)}, status=500)
 
-        if not rows:
+        if not participant_count:
             return JsonResponse({"error": "No participants found for this meeting"}, status=404)
 
-        # Identify host duration
-        host_row = next((r for r in rows if str(r[1]).lower() == "host"), None)
-        if not host_row:
-            return JsonResponse({"error": "No host found for this meeting"}, status=400)
+        # Joins/leaves still queued by the write-behind are left to the task, which retries until they land
+        finalize_inline = (
+            participant_count <= END_MEETING_INLINE_MIN_PARTICIPANTS
+            or participant_count * _finalize_ms_per_participant <= END_MEETING_LATENCY_BUDGET_MS
+        ) and flush_participant_events(meeting_id)
+        if not finalize_inline and queue_meeting_finalization(meeting_id, end_time_str):
+            return JsonResponse({
+                "success": True,
+                "message": "Meeting ended; durations and attendance are being finalised in the background",
+                "meeting_id": meeting_id,
+                "meeting_name": meeting_name,
+                "ended_at": end_time_str,
+                "participants_processed": 0,
+                "participant_count": participant_count,
+                "finalizing": True
+            }, status=202)
 
-        host_duration = float(host_row[2] or 0)
+        try:
+            finalized = finalize_meeting_participants(meeting_id, end_time_str)
+        except Exception as e:
+            logging.error(f"[end_meeting] Participant finalisation error: {e}")
+            return JsonResponse({"error": "Failed to finalize participant data", "details": str(e)}, status=500)
+
+        participants_processed = finalized['participants_processed']
+        host_duration = finalized['host_duration']
+        if host_duration is None:
+            return JsonResponse({"error": "No host found for this meeting"}, status=400)
         if host_duration <= 0:
             return JsonResponse({"error": "Invalid host duration"}, status=400)
 
-        participants_output = []
-        total_participant_percentage = 0.0
-        participant_count = 0
-
-        try:
-            with transaction.atomic():
-                with connection.cursor() as cursor:
-                    for user_id, role, duration in rows:
-                        duration = float(duration or 0)
-                        if role.lower() == "host":
-                            attendance_host = 100.00
-                        else:
-                            attendance_host = round((duration / host_duration) * 100, 2) if host_duration > 0 else 0.0
-                            total_participant_percentage += attendance_host
-                            participant_count += 1
-
-                        cursor.execute("""
-                            UPDATE tbl_Participants
-                            SET Attendance_Percentagebasedon_host = %s
-                            WHERE Meeting_ID = %s AND User_ID = %s
-                        """, [attendance_host, meeting_id, user_id])
-
-                        participants_output.append({
-                            "user_id": user_id,
-                            "role": role,
-                            "attendance_percentagebasedon_host": attendance_host,
-                            "duration_minutes": round(duration, 2)
-                        })
-        except Exception as e:
-            logging.error(f"[end_meeting] Host-based attendance error: {e}")
-            return JsonResponse({"error": "Failed during host-based attendance calc", "details": str(e)}, status=500)
+        participants_output = finalized['participants']
+        participant_percentages = [
+            p["attendance_percentagebasedon_host"] for p in participants_output if p["role"].lower() != "host"
+        ]
+        total_participant_percentage = sum(participant_percentages)
+        participant_count = len(participant_percentages)
 
-        # ===== Step 5: Meeting summary =====
+        # ===== Step 4: Meeting summary =====
         summary_average = round(total_participant_percentage / participant_count, 2) if participant_count > 0 else 0.0
         meeting_duration_display = "Unknown"
         total_meeting_duration_minutes = None
@@ -3079,7 +3085,7 @@ def end_meeting(request, meeting_id):
             mins = int(total_meeting_duration_minutes % 60)
             meeting_duration_display = f"{hours}h {mins}m" if hours > 0 else f"{mins}m"
 
-        # ===== Step 6: Return summary =====
+        # ===== Step 5: Return summary =====
         return JsonResponse({
             "success": True,
             "message": "Meeting ended successfully and attendance calculated",
@@ -3244,6 +3250,7 @@ def assign_co_host(request):
                         'error': 'Failed to update participant role'
                     }, status=500)
                 
+                bump_roster_version(meeting_id, [user_id])
                 logging.info(f"✅ [COHOST] Updated participant {participant_id} to co-host")
         
         except Exception as e:
@@ -3475,6 +3482,7 @@ def remove_co_host(request):
                         'error': 'Failed to update participant role'
                     }, status=500)
                 
+                bump_roster_version(meeting_id, [user_id])
                 logging.info(f"✅ [REMOVE-COHOST] Updated role to participant ({rows_affected} row(s))")
         
         except Exception as e:
@@ -3893,26 +3901,33 @@ def remove_participant_from_meeting(request):
                 
                 # Append current time to leave times
                 leave_times.append(remove_time_str)
+                join_times, leave_times = cap_session_arrays(join_times, leave_times)
                 
                 logging.info(f"[REMOVE-PARTICIPANT] Sessions - Join: {len(join_times)}, Leave: {len(leave_times)}")
                 
                 # Calculate total duration
-                total_duration = 0.0
+                close_session(cursor, meeting_id, user_id_to_remove, remove_time_str)
+                totals = {}
                 try:
-                    total_duration = calculate_duration_from_arrays(join_times, leave_times)
-                    logging.info(f"[REMOVE-PARTICIPANT] Calculated duration: {total_duration:.2f} minutes")
+                    totals = get_session_totals(
+                        cursor, meeting_id, [user_id_to_remove], remove_time_str
+                    ).get(int(user_id_to_remove), {})
+                    logging.info(f"[REMOVE-PARTICIPANT] Calculated duration: {totals.get('minutes', 0.0):.2f} minutes")
                 except Exception as e:
                     logging.error(f"[REMOVE-PARTICIPANT] Error calculating duration: {e}")
+                total_duration = totals.get('minutes', 0.0)
                 
                 # Update participant record
                 cursor.execute("""
                     UPDATE tbl_Participants 
-                    SET Leave_Times = %s,
+                    SET Join_Times = %s,
+                        Leave_Times = %s,
                         Is_Currently_Active = FALSE,
                         Total_Duration_Minutes = %s,
                         Total_Sessions = %s
                     WHERE ID = %s
-                """, [json.dumps(leave_times), total_duration, len(leave_times), participant_id])
+                """, [json.dumps(join_times), json.dumps(leave_times), total_duration,
+                      totals.get('sessions', 0), participant_id])
                 
                 rows_affected = cursor.rowcount
                 
@@ -3923,6 +3938,7 @@ def remove_participant_from_meeting(request):
                         'error': 'Failed to update participant record'
                     }, status=500)
                 
+                bump_roster_version(meeting_id, [user_id_to_remove])
                 logging.info(f"✅ [REMOVE-PARTICIPANT] Updated participant record ({rows_affected} row(s))")
         
         except Exception as e:
@@ -1,6 +1,8 @@
 # cache_only_reactions.py - Ephemeral Reactions System (Cache Only, No Database)
 
 import redis
+from core.utils.redis_registry import RedisStore
+from core.WebSocketConnection.meeting_events import EVENT_REACTION, broadcasts_meeting_event
 import json
 import os
 import time
@@ -16,25 +18,9 @@ from django.db import connection
 # Configure logging
 logger = logging.getLogger('cache_reactions')
 
-# Redis configuration for cache-only reactions
-CACHE_REACTIONS_CONFIG = {
-    'host': os.getenv("CACHE_REACTIONS_HOST", "localhost"),
-    'port': int(os.getenv("CACHE_REACTIONS_PORT", 6379)),
-    'db': int(os.getenv("CACHE_REACTIONS_DB", 5)),
-    'decode_responses': os.getenv("CACHE_REACTIONS_DECODE_RESPONSES", "True") == "True",
-    'socket_timeout': int(os.getenv("CACHE_REACTIONS_SOCKET_TIMEOUT", 5)),
-    'socket_connect_timeout': int(os.getenv("CACHE_REACTIONS_CONNECT_TIMEOUT", 5)),
-    'retry_on_timeout': os.getenv("CACHE_REACTIONS_RETRY_ON_TIMEOUT", "True") == "True"
-}
-
-# Initialize cache-only reactions Redis client
-try:
-    cache_reactions_redis = redis.Redis(**CACHE_REACTIONS_CONFIG)
-    cache_reactions_redis.ping()
-    logger.info("✅ Cache-only reactions Redis connected successfully")
-except Exception as e:
-    logger.warning(f"⚠ Cache-only reactions Redis not available: {e}")
-    cache_reactions_redis = None
+# Cache-only reactions Redis client - pooled and connected on first use.
+# Host/DB still come from the CACHE_REACTIONS_* env variables (see core.utils.redis_registry).
+cache_reactions_redis = RedisStore('reactions')
 
 # Cache settings - reactions exist ONLY during meeting
 CACHE_SETTINGS = {
@@ -62,8 +48,12 @@ class CacheOnlyReactionsManager:
     
     def __init__(self):
         self.redis_client = cache_reactions_redis
-        self.enabled = cache_reactions_redis is not None
-        logger.info(f"😊 Cache-only reactions manager initialized: {'Enabled' if self.enabled else 'Disabled'}")
+        logger.info("😊 Cache-only reactions manager initialized (Redis store 'reactions')")
+
+    @property
+    def enabled(self):
+        """True while the store is reachable (health-checked with backoff)"""
+        return bool(self.redis_client)
     
     def _get_reactions_key(self, meeting_id):
         """Generate Redis key for active reactions"""
@@ -440,6 +430,7 @@ cache_reactions_manager = CacheOnlyReactionsManager()
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_REACTION, 'start')
 def start_meeting_reactions(request):
     """Start reactions system for a meeting (initialize cache)"""
     try:
@@ -542,6 +533,7 @@ def start_meeting_reactions(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_REACTION, 'add')
 def add_reaction(request):
     """
     Add reaction with INSTANT broadcast - Zero delay
@@ -748,6 +740,7 @@ def add_reaction(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_REACTION, 'clear_all')
 def clear_all_reactions(request):
     """Host clears all reactions"""
     try:
@@ -860,6 +853,7 @@ def get_reaction_counts(request, meeting_id):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_REACTION, 'end')
 def end_meeting_reactions(request):
     """End meeting and DELETE ALL reaction data immediately"""
     try:
@@ -0,0 +1,129 @@
+# roster_version.py - Per-meeting participant roster version
+#
+# Every join, leave, role change or removal bumps a per-meeting counter in
+# Redis and records, per user, the version at which that participant last
+# changed. Live participant polling can then answer:
+#   ETag (version + derived statuses) unchanged -> 304, nothing to send
+#   since_version <  current   -> only participants changed after since_version
+# The database part of the roster is cached per version, so all pollers of a
+# meeting share one build per change.
+#
+# Bumps run after the surrounding transaction commits, so a snapshot built
+# for a version never misses the change that produced it.
+import json
+import logging
+import time
+
+from django.db import transaction
+
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('roster_version')
+
+ROSTER_VERSION_TTL = 24 * 3600      # seconds; counters of idle meetings expire
+SNAPSHOT_TTL = 120                  # seconds a built snapshot stays cached
+SNAPSHOT_BUILD_LOCK_MS = 3000
+SNAPSHOT_WAIT_SECONDS = 1.0         # how long a poller waits for another's build
+SNAPSHOT_WAIT_STEP = 0.05
+
+# KEYS: version, changes  ARGV: ttl, user_id...
+_BUMP_LUA = """
+local version = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+    redis.call('ZADD', KEYS[2], version, ARGV[i])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return version
+"""
+
+
+def _version_key(meeting_id):
+    return f"participant_roster_version:{meeting_id}"
+
+
+def _changes_key(meeting_id):
+    return f"participant_roster_changes:{meeting_id}"
+
+
+def _snapshot_key(meeting_id, version):
+    return f"participant_roster_snapshot:{meeting_id}:{version}"
+
+
+def bump_roster_version_now(meeting_id, user_ids):
+    """Bump the version and mark user_ids as changed; returns the new version or None"""
+    client = get_redis_client()
+    if client is None or not meeting_id:
+        return None
+    try:
+        return int(client.eval(
+            _BUMP_LUA, 2, _version_key(meeting_id), _changes_key(meeting_id),
+            ROSTER_VERSION_TTL, *[str(user_id) for user_id in user_ids]
+        ))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not bump roster version for meeting {meeting_id}: {e}")
+        return None
+
+
+def bump_roster_version(meeting_id, user_ids):
+    """bump_roster_version_now once the current transaction commits (immediately in autocommit)"""
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: bump_roster_version_now(meeting_id, user_ids))
+
+
+def get_roster_version(meeting_id):
+    """Current version; 0 when unknown or Redis is unavailable"""
+    client = get_redis_client()
+    if client is None:
+        return 0
+    try:
+        return int(client.get(_version_key(meeting_id)) or 0)
+    except Exception:
+        return 0
+
+
+def get_roster_changes(meeting_id, since_version):
+    """User IDs (as strings) changed after since_version, or None when Redis is unavailable"""
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        members = client.zrangebyscore(_changes_key(meeting_id), f"({int(since_version)}", '+inf')
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read roster changes for meeting {meeting_id}: {e}")
+        return None
+    return {member.decode() if isinstance(member, bytes) else str(member) for member in members}
+
+
+def get_roster_snapshot(meeting_id, version, build):
+    """
+    build() for this version, cached in Redis. Concurrent pollers wait
+    briefly for the first one's build instead of all querying MySQL.
+    """
+    client = get_redis_client()
+    if client is None or not version:
+        return build()
+
+    key = _snapshot_key(meeting_id, version)
+    try:
+        cached = client.get(key)
+        if cached:
+            return json.loads(cached)
+
+        if not client.set(f"{key}:lock", '1', nx=True, px=SNAPSHOT_BUILD_LOCK_MS):
+            deadline = time.monotonic() + SNAPSHOT_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(SNAPSHOT_WAIT_STEP)
+                cached = client.get(key)
+                if cached:
+                    return json.loads(cached)
+    except Exception as e:
+        logger.warning(f"⚠️ Roster snapshot cache unavailable for meeting {meeting_id}: {e}")
+        return build()
+
+    snapshot = build()
+    try:
+        client.setex(key, SNAPSHOT_TTL, json.dumps(snapshot, default=str))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not cache roster snapshot for meeting {meeting_id}: {e}")
+    return snapshot
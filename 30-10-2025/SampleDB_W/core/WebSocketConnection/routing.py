@@ -1,27 +1,12 @@
-# # 1. use routing.py
-# from django.urls import re_path
-# from .unified_consumer import UnifiedMeetingConsumer
-
-# websocket_urlpatterns = [
-#     re_path(r'ws/meeting/(?P<meeting_id>[^/]+)/$', UnifiedMeetingConsumer.as_asgi()),
-# ]
-
-
-# 2.routing.py
-# from django.urls import re_path
-# from .unified_consumer import UnifiedMeetingConsumer
-
-# websocket_urlpatterns = [
-#     re_path(r'^ws/meeting/(?P<meeting_id>[^/]+)/?$', UnifiedMeetingConsumer.as_asgi()),
-# ]
-
-
-# FIXED: routing.py - Create this file in core/WebSocketConnection/routing.py
-
 from django.urls import re_path
 from .meetings_consumers import MeetingConsumer
+from .notifications_consumers import NotificationConsumer
 
 websocket_urlpatterns = [
-    # FIXED: Handle all meeting ID formats including instant
-    re_path(r'wss/meeting/(?P<meeting_id>[^/]+)/$', MeetingConsumer.as_asgi()),
-]
\ No newline at end of file
+    # Meeting side-channel: chat, reactions, hand raise and whiteboard events
+    re_path(r'^ws/meeting/(?P<meeting_id>[^/]+)/?$', MeetingConsumer.as_asgi()),
+    # Legacy path used by older clients
+    re_path(r'^wss/meeting/(?P<meeting_id>[^/]+)/?$', MeetingConsumer.as_asgi()),
+    # Unread notification count push (replaces polling api/notifications/count/)
+    re_path(r'^ws/notifications/?$', NotificationConsumer.as_asgi()),
+]
@@ -9,12 +9,11 @@ import logging
 import uuid
 import pytz
 import redis
+from core.utils.redis_registry import RedisStore
+from core.WebSocketConnection.meeting_events import EVENT_WHITEBOARD, broadcasts_meeting_event
 import os
 from typing import Dict, List, Optional
 import traceback
-from redis.connection import ConnectionPool
-from redis.retry import Retry
-from redis.backoff import ExponentialBackoff
 
 logger = logging.getLogger('whiteboard')
 IST_TIMEZONE = pytz.timezone("Asia/Kolkata")
@@ -75,33 +74,11 @@ def log_state_transition(meeting_id, can_undo, can_redo, undo_count, redo_count)
 # REDIS CONFIGURATION
 # ================================
 
-# Redis configuration with connection pooling
-REDIS_CONFIG = {
-    'host': os.getenv("REDIS_HOST", "127.0.0.1"),
-    'port': int(os.getenv("REDIS_PORT", 6379)),
-    'db': int(os.getenv("REDIS_DB", 0)),
-    'decode_responses': True,
-    'socket_timeout': 5,
-    'socket_connect_timeout': 5,
-    'socket_keepalive': True,
-    'socket_keepalive_options': {},
-    'health_check_interval': 30,
-    'retry_on_timeout': True,
-    'retry_on_error': [ConnectionError, TimeoutError],
-    'retry': Retry(ExponentialBackoff(), 3)
-}
-
-# Initialize Redis with connection pool
-try:
-    pool = ConnectionPool(**REDIS_CONFIG, max_connections=20)
-    redis_client = redis.Redis(connection_pool=pool)
-    redis_client.ping()
-    REDIS_AVAILABLE = True
-    logger.info("✅ Redis connected successfully for whiteboard cache")
-except Exception as e:
-    logger.warning(f"⚠️ Redis not available: {e}")
-    redis_client = None
-    REDIS_AVAILABLE = False
+# Whiteboard cache shares the registry's pooled client (REDIS_* env variables).
+# Reachability is health-checked per call with backoff, so importing this
+# module never blocks on an unreachable Redis.
+redis_client = RedisStore('whiteboard')
+REDIS_AVAILABLE = True
 
 # Cache key patterns
 CACHE_KEYS = {
@@ -553,6 +530,7 @@ class WhiteboardCache:
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'session')
 def create_whiteboard_session(request):
     """Create whiteboard session - OPTIMIZED LOGGING"""
     try:
@@ -659,6 +637,7 @@ def get_whiteboard_state(request, meeting_id):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'drawing')
 def add_drawing(request):
     """Add a new drawing with undo/redo support - FIXED FOR FREEHAND"""
     try:
@@ -755,6 +734,7 @@ def add_drawing(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'undo')
 def undo_action(request):
     """Undo the last action - COMPLETELY FIXED"""
     try:
@@ -849,6 +829,7 @@ def undo_action(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'redo')
 def redo_action(request):
     """Redo the last undone action - COMPLETELY FIXED"""
     try:
@@ -938,6 +919,7 @@ def redo_action(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'clear')
 def clear_whiteboard(request):
     """Clear all drawings with undo support - FIXED VERSION"""
     try:
@@ -1013,6 +995,7 @@ def clear_whiteboard(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'settings')
 def update_whiteboard_settings(request):
     """Update whiteboard settings in cache"""
     try:
@@ -1133,6 +1116,7 @@ def create_checkpoint(request):
 
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'navigate')
 def navigate_to_state(request):
     """Navigate to a specific checkpoint state"""
     try:
@@ -1278,7 +1262,7 @@ def get_cache_status(request):
                     ('redo_stacks', 'whiteboard:redo:*')
                 ]:
                     try:
-                        key_counts[key_type] = len(redis_client.keys(pattern))
+                        key_counts[key_type] = sum(1 for _ in redis_client.scan_iter(match=pattern, count=500))
                     except Exception as key_error:
                         logger.error(f"❌ Error counting {key_type} keys: {key_error}")
                         key_counts[key_type] = 0
@@ -1319,6 +1303,7 @@ def get_cache_status(request):
 # FIXED: Add text drawing
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'text')
 def add_text(request):
     """Add text to whiteboard with undo/redo support"""
     try:
@@ -1416,6 +1401,7 @@ def add_text(request):
 # FIXED: Update text
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'text_update')
 def update_text(request):
     """Update existing text on whiteboard"""
     try:
@@ -1510,6 +1496,7 @@ def update_text(request):
 # FIXED: Select items (text or drawings)
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'select')
 def select_items(request):
     """Select multiple items on whiteboard (for moving, deleting, etc.)"""
     try:
@@ -1558,6 +1545,7 @@ def select_items(request):
 # FIXED: Delete selected items
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'delete_selected')
 def delete_selected_items(request):
     """Delete selected items from whiteboard"""
     try:
@@ -1635,6 +1623,7 @@ def delete_selected_items(request):
 # FIXED: Move selected items
 @require_http_methods(["POST"])
 @csrf_exempt
+@broadcasts_meeting_event(EVENT_WHITEBOARD, 'move_selected')
 def move_selected_items(request):
     """Move selected items on whiteboard"""
     try:
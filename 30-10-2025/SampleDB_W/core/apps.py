@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Raw SQL tables and indexes added after 0004_bootstrap_schema
+        from .schema import bootstrap_schema_after_migrate
+        post_migrate.connect(bootstrap_schema_after_migrate, sender=self, dispatch_uid='core.bootstrap_schema')
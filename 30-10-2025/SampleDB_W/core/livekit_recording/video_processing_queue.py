@@ -14,7 +14,6 @@ import json
 import signal
 from datetime import datetime
 from typing import Dict, Tuple, Optional, List
-from pymongo import MongoClient
 from django.conf import settings
 
 logger = logging.getLogger('video_processing_queue')
@@ -790,6 +789,7 @@ class VideoProcessingQueue:
     def _ensure_db_connection(self):
         """Ensure MongoDB connection"""
         if self._mongodb_client is None:
+            from pymongo import MongoClient
             self._mongodb_client = MongoClient(settings.MONGODB_URI)
             db = self._mongodb_client[settings.MONGODB_DATABASE]
             self._collection = db['recordings']
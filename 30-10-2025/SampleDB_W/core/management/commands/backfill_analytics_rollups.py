@@ -0,0 +1,36 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+import logging
+
+from core.UserDashBoard.analytics_rollups import BACKFILL_BATCH_SIZE, backfill_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the host analytics rollup tables from tbl_Meetings, tbl_Participants and attendance sessions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help='Host-days per transaction',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Only rebuild meetings created in the last N days (default: all history)',
+        )
+
+    def handle(self, *args, **options):
+        since = date.today() - timedelta(days=options['days']) if options['days'] else None
+        self.stdout.write(f"Backfilling analytics rollups{f' since {since}' if since else ''}...")
+        try:
+            counts = backfill_rollups(batch_size=options['batch_size'], since=since)
+        except Exception as e:
+            logging.error(f"Analytics rollup backfill failed: {e}")
+            self.stdout.write(self.style.ERROR(f'Analytics rollup backfill failed: {e}'))
+            raise
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {counts['host_days']} host-days"))
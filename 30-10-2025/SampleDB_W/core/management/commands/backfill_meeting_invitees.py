@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+import logging
+
+from core.WebSocketConnection.meeting_invitees import BACKFILL_BATCH_SIZE, backfill_meeting_invitees
+
+
+class Command(BaseCommand):
+    help = 'Rebuild tbl_MeetingInvitees from the email columns of scheduled and calendar meetings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help='Meetings per transaction',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Backfilling meeting invitees...')
+        try:
+            counts = backfill_meeting_invitees(batch_size=options['batch_size'])
+        except Exception as e:
+            logging.error(f"Invitee backfill failed: {e}")
+            self.stdout.write(self.style.ERROR(f'Invitee backfill failed: {e}'))
+            raise
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {counts['invitees']} invitees from "
+                f"{counts['calendar_meetings']} calendar and "
+                f"{counts['scheduled_meetings']} scheduled meetings"
+            )
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+import logging
+
+from core.WebSocketConnection.participant_sessions import BACKFILL_BATCH_SIZE, backfill_participant_sessions
+
+
+class Command(BaseCommand):
+    help = 'Build tbl_ParticipantSessions from the Join_Times/Leave_Times arrays of tbl_Participants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help='Participant rows per transaction',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Backfilling participant sessions...')
+        try:
+            counts = backfill_participant_sessions(batch_size=options['batch_size'])
+        except Exception as e:
+            logging.error(f"Participant session backfill failed: {e}")
+            self.stdout.write(self.style.ERROR(f'Participant session backfill failed: {e}'))
+            raise
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {counts['sessions']} sessions for {counts['participants']} participants "
+                f"({counts['skipped']} participants with nothing to copy)"
+            )
+        )
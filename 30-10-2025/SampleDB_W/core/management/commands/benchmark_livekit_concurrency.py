@@ -0,0 +1,92 @@
+from django.core.management.base import BaseCommand, CommandError
+import asyncio
+import json
+import ssl
+import statistics
+import time
+
+import aiohttp
+
+# Endpoint name -> (method, path template, JSON body template)
+ENDPOINTS = {
+    'join': ('POST', '/api/livekit/join-meeting/', {'meeting_id': '{meeting_id}', 'user_id': '{user_id}'}),
+    'leave': ('POST', '/api/livekit/leave-meeting/', {'meeting_id': '{meeting_id}', 'user_id': '{user_id}'}),
+    'connection-info': ('GET', '/api/livekit/connection-info/{meeting_id}/', None),
+    'sync': ('POST', '/api/participants/sync-optimized/{meeting_id}/', {}),
+}
+
+
+def _fill(template, **values):
+    if template is None:
+        return None
+    return {key: value.format(**values) if isinstance(value, str) else value
+            for key, value in template.items()}
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent requests at the LiveKit join/leave/connection-info/sync endpoints '
+        'of a running server and report throughput and latency (run against WSGI and ASGI to compare)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to benchmark')
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='connection-info')
+        parser.add_argument('--meeting-id', required=True, help='Existing meeting to target')
+        parser.add_argument('--requests', type=int, default=200, help='Total requests')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once')
+
+    def handle(self, *args, **options):
+        method, path, body = ENDPOINTS[options['endpoint']]
+        url = options['base_url'].rstrip('/') + path.format(meeting_id=options['meeting_id'])
+
+        latencies, statuses, elapsed = asyncio.run(self._run(method, url, body, options))
+        if not latencies:
+            raise CommandError("No requests completed")
+
+        errors = sum(1 for status in statuses if status is None or status >= 500)
+        self.stdout.write(
+            f"{options['endpoint']}: {len(latencies)} requests, concurrency {options['concurrency']}, "
+            f"{len(latencies) / elapsed:.1f} req/s"
+        )
+        self.stdout.write(
+            f"  latency ms  p50 {statistics.median(latencies):.0f}  "
+            f"p95 {_percentile(latencies, 95):.0f}  max {max(latencies):.0f}"
+        )
+        self.stdout.write(f"  status codes: {json.dumps({str(s): statuses.count(s) for s in set(statuses)})}")
+        if errors:
+            self.stdout.write(self.style.WARNING(f"⚠️ {errors} failed requests"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ All requests completed"))
+
+    async def _run(self, method, url, body, options):
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        latencies, statuses = [], []
+
+        async def one(session, index):
+            payload = _fill(body, meeting_id=options['meeting_id'], user_id=str(900000 + index))
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    async with session.request(method, url, json=payload) as response:
+                        await response.read()
+                        statuses.append(response.status)
+                except aiohttp.ClientError:
+                    statuses.append(None)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        connector = aiohttp.TCPConnector(ssl=ssl_context, limit=options['concurrency'])
+        async with aiohttp.ClientSession(connector=connector) as session:
+            started = time.perf_counter()
+            await asyncio.gather(*(one(session, i) for i in range(options['requests'])))
+            elapsed = time.perf_counter() - started
+
+        return latencies, statuses, elapsed
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from datetime import datetime, timedelta
+import json
+import time
+
+from core.utils.api_response import ORJSON_AVAILABLE, SCHEMA_V2, fast_json_dumps
+from core.WebSocketConnection.meetings import format_calendar_meeting_row
+
+
+def _synthetic_calendar_row(index, guests_per_meeting):
+    """Row shaped like the Get_User_Calendar_Meetings SELECT"""
+    start = datetime(2025, 1, 1, 9, 0) + timedelta(hours=index)
+    guests = [f"guest{index}_{n}@example.com" for n in range(guests_per_meeting)]
+    return (
+        f"00000000-0000-0000-0000-{index:012d}", 1, f"Meeting {index}", start,
+        start + timedelta(hours=1), 60, "host@example.com", ",".join(guests),
+        "internal", f"https://meet.example.com/{index}", "Room 1", ";".join(guests),
+        "[15, 30]", 1, 1, 1, 1, 1, 1, start, "scheduled", 0, 1,
+        f"room-{index}", f"RM_{index}", f"Meeting {index}",
+    )
+
+
+class Command(BaseCommand):
+    help = 'Compare v1/v2 meeting list payload sizes and JSON serialisation time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Meetings per list')
+        parser.add_argument('--guests', type=int, default=10, help='Guests per meeting')
+        parser.add_argument('--repeat', type=int, default=20, help='Serialisation repetitions')
+
+    def handle(self, *args, **options):
+        rows = [_synthetic_calendar_row(i, options['guests']) for i in range(options['rows'])]
+        v1 = [format_calendar_meeting_row(row, 1, "host@example.com") for row in rows]
+        v2 = [format_calendar_meeting_row(row, 1, "host@example.com", SCHEMA_V2) for row in rows]
+
+        def timed(fn, payload):
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                body = fn(payload)
+            return len(body), (time.perf_counter() - started) * 1000 / options['repeat']
+
+        def stdlib_dumps(payload):
+            # What JsonResponse does today
+            return json.dumps(payload, cls=DjangoJSONEncoder).encode('utf-8')
+
+        results = [
+            ('v1 + json (before)', *timed(stdlib_dumps, v1)),
+            ('v1 + fast encoder', *timed(fast_json_dumps, v1)),
+            ('v2 + json', *timed(stdlib_dumps, v2)),
+            ('v2 + fast encoder (after)', *timed(fast_json_dumps, v2)),
+        ]
+
+        self.stdout.write(
+            f"{options['rows']} meetings x {options['guests']} guests, "
+            f"orjson {'enabled' if ORJSON_AVAILABLE else 'not installed'}"
+        )
+        baseline_bytes, baseline_ms = results[0][1], results[0][2]
+        for label, size, elapsed in results:
+            self.stdout.write(
+                f"  {label:<28} {size / 1024:>9.1f} KB  {elapsed:>8.2f} ms  "
+                f"({size / baseline_bytes:.0%} size, {elapsed / baseline_ms:.0%} time)"
+            )
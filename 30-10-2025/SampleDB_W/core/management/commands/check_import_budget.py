@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+import os
+import subprocess
+import sys
+
+from core.utils.lazy_imports import HEAVY_MODULES
+
+# Boot = django.setup() + loading the URLconf, in a fresh interpreter
+BOOT_SNIPPET = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SampleDB.settings'); "
+    "django.setup(); "
+    "import SampleDB.urls"
+)
+
+DEFAULT_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+
+def parse_importtime(stderr):
+    """Parse `python -X importtime` output into [(module, self_us, cumulative_us)]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, timings = line.split(":", 1)
+            self_us, cumulative_us, module = timings.split("|", 2)
+            # Nesting is shown as two spaces per level after the separator
+            entries.append((module[1:].rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+class Command(BaseCommand):
+    help = 'Fail when booting Django (settings + URLconf) imports ML/media libraries or exceeds an import-time budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget-ms',
+            type=int,
+            default=DEFAULT_BUDGET_MS,
+            help='Maximum total import time in milliseconds (env IMPORT_TIME_BUDGET_MS)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Number of slowest top-level imports to print',
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SNIPPET],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Django boot failed:\n{result.stderr[-2000:]}")
+
+        entries = parse_importtime(result.stderr)
+        total_ms = sum(self_us for _, self_us, _ in entries) / 1000
+
+        # Top-level entries are the ones -X importtime prints without indentation
+        top_level = sorted(
+            (entry for entry in entries if not entry[0].startswith(" ")),
+            key=lambda entry: entry[2],
+            reverse=True,
+        )
+        self.stdout.write(f"Boot import time: {total_ms:.0f} ms (budget {options['budget_ms']} ms)")
+        for module, _, cumulative_us in top_level[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {module.strip()}")
+
+        heavy = sorted({
+            module.strip().split(".")[0]
+            for module, _, _ in entries
+            if module.strip().split(".")[0] in HEAVY_MODULES
+        })
+        if heavy:
+            raise CommandError(f"Heavy modules imported at boot: {', '.join(heavy)}")
+
+        if total_ms > options['budget_ms']:
+            raise CommandError(f"Boot import time {total_ms:.0f} ms exceeds budget of {options['budget_ms']} ms")
+
+        self.stdout.write(self.style.SUCCESS("✅ Import budget OK"))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+import logging
+
+from core.WebSocketConnection.participant_events import (
+    DEFAULT_BATCH_SIZE,
+    default_consumer_name,
+    drain_participant_events,
+)
+
+
+class Command(BaseCommand):
+    help = 'Apply write-behind participant join/leave events from the Redis stream to tbl_Participants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Events per transaction',
+        )
+        parser.add_argument(
+            '--consumer',
+            default=None,
+            help='Consumer name within the group (default: hostname-pid)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the stream once and exit instead of blocking for new events',
+        )
+
+    def handle(self, *args, **options):
+        consumer = options['consumer'] or default_consumer_name()
+        self.stdout.write(f'Consuming participant events as {consumer}...')
+
+        while True:
+            result = drain_participant_events(
+                batch_size=options['batch_size'],
+                consumer=consumer,
+                block_ms=None if options['once'] else 2000,
+            )
+            if result['batches']:
+                self.stdout.write(
+                    f"Applied {result['applied']} events, skipped {result['skipped']} "
+                    f"in {result['batches']} batches"
+                )
+            if not result['success']:
+                logging.error(f"Participant event consumer: {result.get('error')}")
+                self.stdout.write(self.style.ERROR(f"Batch failed: {result.get('error')}"))
+            if options['once']:
+                break
+
+        self.stdout.write(self.style.SUCCESS('✅ Participant event stream drained'))
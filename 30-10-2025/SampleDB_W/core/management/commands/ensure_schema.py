@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.schema import apply_schema
+
+
+class Command(BaseCommand):
+    help = 'Create the raw SQL tables and indexes the request paths expect (safe to run repeatedly)'
+
+    def handle(self, *args, **options):
+        self.stdout.write("Applying schema bootstrap...")
+        failed = apply_schema(force=True)
+        if failed:
+            self.stdout.write(self.style.ERROR(f"Schema bootstrap finished with failed steps: {', '.join(failed)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Schema bootstrap finished"))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+import logging
+
+from core.WebSocketConnection.meeting_occurrences import OCCURRENCE_BATCH_SIZE, refresh_meeting_occurrences
+
+
+class Command(BaseCommand):
+    help = 'Rebuild tbl_MeetingOccurrences (used for conflict checks) from scheduled and calendar meetings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OCCURRENCE_BATCH_SIZE,
+            help='Meetings per transaction',
+        )
+        parser.add_argument(
+            '--recurring-only',
+            action='store_true',
+            help='Only roll recurring series forward (what the daily Celery job does)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Materialising meeting occurrences...')
+        try:
+            counts = refresh_meeting_occurrences(
+                recurring_only=options['recurring_only'],
+                batch_size=options['batch_size'],
+            )
+        except Exception as e:
+            logging.error(f"Occurrence materialisation failed: {e}")
+            self.stdout.write(self.style.ERROR(f'Occurrence materialisation failed: {e}'))
+            raise
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {counts['occurrences']} occurrences for "
+                f"{counts['scheduled_meetings']} scheduled and "
+                f"{counts['calendar_meetings']} calendar meetings"
+            )
+        )
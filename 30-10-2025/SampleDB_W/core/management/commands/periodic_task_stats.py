@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.scheduler.periodic import get_periodic_stats
+
+
+class Command(BaseCommand):
+    help = 'Show run counts, durations and overlap skips of the periodic Celery jobs'
+
+    def handle(self, *args, **options):
+        stats = get_periodic_stats()
+        if not stats:
+            self.stdout.write(self.style.ERROR('No periodic job stats recorded (or Redis is unavailable)'))
+            return
+
+        for name in sorted(stats):
+            job = stats[name]
+            runs = int(job.get('runs', 0))
+            average = float(job.get('total_duration', 0)) / runs if runs else 0.0
+            self.stdout.write(
+                f"{name}: {runs} runs, {int(job.get('skipped', 0))} skipped, "
+                f"last {float(job.get('last_duration', 0)):.2f}s, avg {average:.2f}s, "
+                f"last finished {job.get('last_finished_at', '-')}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(stats)} periodic jobs"))
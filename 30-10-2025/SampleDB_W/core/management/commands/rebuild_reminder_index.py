@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+import logging
+
+from core.scheduler.reminder_index import REMINDER_REBUILD_HORIZON_DAYS, rebuild_reminder_index
+
+
+class Command(BaseCommand):
+    help = 'Re-materialise the Redis due-time index of meeting reminder emails from tbl_ScheduledMeetings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-days',
+            type=int,
+            default=REMINDER_REBUILD_HORIZON_DAYS,
+            help='Index meetings starting within this many days',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding reminder index...')
+        try:
+            counts = rebuild_reminder_index(horizon_days=options['horizon_days'])
+        except Exception as e:
+            logging.error(f"Reminder index rebuild failed: {e}")
+            self.stdout.write(self.style.ERROR(f'Reminder index rebuild failed: {e}'))
+            raise
+
+        if counts is None:
+            self.stdout.write(self.style.ERROR('Redis is unavailable; reminders fall back to the daily scan'))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {counts['reminders']} reminders for {counts['meetings']} meetings")
+        )
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import statistics
+import time
+
+from core.utils.redis_registry import get_redis_client
+from core.WebSocketConnection.participant_events import (
+    ACTION_JOIN,
+    ACTION_LEAVE,
+    STREAM_KEY,
+    drain_participant_events,
+    enqueue_participant_event,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate a join storm through the write-behind path: enqueue joins (and leaves) '
+        'concurrently against Redis, then optionally apply them to MySQL and time both sides'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting-id', required=True, help='Existing, not ended meeting')
+        parser.add_argument('--first-user-id', type=int, required=True,
+                            help='First of a range of existing tbl_Users IDs')
+        parser.add_argument('--participants', type=int, default=200, help='Users joining at once')
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent producers')
+        parser.add_argument('--with-leaves', action='store_true', help='Enqueue a leave after every join')
+        parser.add_argument('--apply', action='store_true', help='Drain the stream into tbl_Participants')
+        parser.add_argument('--batch-size', type=int, default=200, help='Events per transaction when applying')
+
+    def handle(self, *args, **options):
+        client = get_redis_client()
+        if client is None:
+            raise CommandError('Redis is not reachable (REDIS_HOST/REDIS_PORT)')
+
+        user_ids = range(options['first_user_id'], options['first_user_id'] + options['participants'])
+        actions = [ACTION_JOIN, ACTION_LEAVE] if options['with_leaves'] else [ACTION_JOIN]
+
+        def produce(user_id):
+            latencies = []
+            for action in actions:
+                started = time.perf_counter()
+                event = enqueue_participant_event(
+                    options['meeting_id'], user_id, action,
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                )
+                if event is None:
+                    raise CommandError('Redis dropped out during the storm')
+                latencies.append((time.perf_counter() - started) * 1000)
+            return latencies
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            latencies = [ms for result in pool.map(produce, user_ids) for ms in result]
+        enqueue_seconds = time.perf_counter() - started
+
+        ordered = sorted(latencies)
+        self.stdout.write(
+            f"Enqueued {len(latencies)} events in {enqueue_seconds:.2f}s "
+            f"({len(latencies) / enqueue_seconds:.0f}/s), latency ms p50 {statistics.median(ordered):.1f} "
+            f"p95 {ordered[int(len(ordered) * 0.95) - 1]:.1f} max {ordered[-1]:.1f}"
+        )
+        self.stdout.write(f"Stream {STREAM_KEY} length: {client.xlen(STREAM_KEY)}")
+
+        if not options['apply']:
+            return
+
+        started = time.perf_counter()
+        result = drain_participant_events(batch_size=options['batch_size'], max_batches=10000)
+        apply_seconds = time.perf_counter() - started
+        if not result['success']:
+            raise CommandError(f"Applying events failed: {result.get('error')}")
+
+        self.stdout.write(
+            f"Applied {result['applied']} events (skipped {result['skipped']}) in "
+            f"{result['batches']} batches, {apply_seconds:.2f}s"
+        )
+        self.stdout.write(self.style.SUCCESS('✅ Join storm simulation complete'))
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def bootstrap_schema(apps, schema_editor):
+    # Fails the migration when a table or index could not be created
+    from core.schema import bootstrap_schema as apply_schema_or_raise
+    apply_schema_or_raise()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_attendancesession_break_count_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(bootstrap_schema, migrations.RunPython.noop),
+    ]
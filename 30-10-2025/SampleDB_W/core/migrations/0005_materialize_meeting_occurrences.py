@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def materialize_existing_occurrences(apps, schema_editor):
+    # Conflict checks only see tbl_MeetingOccurrences; fill it for meetings created before it existed
+    from core.WebSocketConnection.meeting_occurrences import refresh_meeting_occurrences
+    refresh_meeting_occurrences()
+
+
+class Migration(migrations.Migration):
+
+    # refresh_meeting_occurrences commits one batch at a time
+    atomic = False
+
+    dependencies = [
+        ('core', '0004_bootstrap_schema'),
+    ]
+
+    operations = [
+        migrations.RunPython(materialize_existing_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def backfill_participant_sessions(apps, schema_editor):
+    # Copy sessions recorded only in Join_Times/Leave_Times; the arrays are capped once this is applied
+    from core.WebSocketConnection.participant_sessions import backfill_participant_sessions as backfill
+    backfill()
+
+
+class Migration(migrations.Migration):
+
+    # backfill_participant_sessions commits one batch at a time
+    atomic = False
+
+    dependencies = [
+        ('core', '0005_materialize_meeting_occurrences'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_participant_sessions, migrations.RunPython.noop),
+    ]
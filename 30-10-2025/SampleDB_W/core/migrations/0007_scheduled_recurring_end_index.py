@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def add_recurring_end_index(apps, schema_editor):
+    # Added to SCHEMA_INDEXES after 0004_bootstrap_schema ran; the recurring sweep filters on it
+    from core.schema import ensure_index
+    with schema_editor.connection.cursor() as cursor:
+        ensure_index(cursor, 'tbl_ScheduledMeetings', 'idx_scheduled_recurring_end', ('is_recurring', 'end_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_backfill_participant_sessions'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_recurring_end_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+# advancement_queue.py - Delayed advancement of recurring meeting series
+#
+# update_recurring_meetings() used to load every active recurring series each
+# minute just to find the few whose current occurrence had ended. Each series
+# is now queued once, in a Redis sorted set scored by the time it becomes due
+# (occurrence end + ADVANCE_BUFFER_MINUTES):
+#   - queued when a recurring scheduled meeting is created or updated, and
+#     again by the advancement itself for the next occurrence,
+#   - removed when the meeting is deleted or stops recurring.
+# The per-minute tick claims (ZRANGEBYSCORE + ZREM in one Lua call) only the
+# series that are due and advances them together in one transaction. The
+# periodic consistency sweep in recurring_scheduler picks up series whose
+# entry was lost (Redis outage, writes that bypass these helpers), and
+# seed_advancement_queue() queues every active series when a worker starts.
+import logging
+import os
+from datetime import timedelta
+
+from django.db import transaction
+
+from core.utils.date_utils import convert_to_ist, get_current_ist_datetime, parse_datetime_safely
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('advancement_queue')
+
+ADVANCEMENT_QUEUE_KEY = 'recurring_series:advance_due'
+# A series advances this long after its current occurrence ends
+ADVANCE_BUFFER_MINUTES = 5
+ADVANCEMENT_CLAIM_BATCH = int(os.getenv("ADVANCEMENT_CLAIM_BATCH", 500))
+
+# KEYS: queue  ARGV: now, limit  -> claimed meeting ids
+_CLAIM_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+def advancement_due_at(end_time):
+    """When a series whose current occurrence ends at end_time should advance"""
+    end = parse_datetime_safely(end_time) if isinstance(end_time, str) else end_time
+    if not end:
+        return None
+    return convert_to_ist(end) + timedelta(minutes=ADVANCE_BUFFER_MINUTES)
+
+
+def schedule_series_advancement_now(entries, only_new=False):
+    """Queue {meeting_id: end_time} (only_new: keep existing entries); returns False when Redis is unavailable"""
+    client = get_redis_client()
+    if client is None:
+        return False
+
+    mapping = {}
+    for meeting_id, end_time in entries.items():
+        due_at = advancement_due_at(end_time)
+        if due_at:
+            mapping[str(meeting_id)] = due_at.timestamp()
+    if not mapping:
+        return True
+    try:
+        client.zadd(ADVANCEMENT_QUEUE_KEY, mapping, nx=only_new)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Could not queue series advancement for {len(mapping)} meetings: {e}")
+        return False
+
+
+def schedule_series_advancement(meeting_id, end_time):
+    """schedule_series_advancement_now once the current transaction commits"""
+    transaction.on_commit(lambda: schedule_series_advancement_now({meeting_id: end_time}))
+
+
+def unschedule_series_advancement(meeting_id):
+    def _remove():
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.zrem(ADVANCEMENT_QUEUE_KEY, str(meeting_id))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not unqueue series advancement for {meeting_id}: {e}")
+
+    transaction.on_commit(_remove)
+
+
+def claim_due_series(batch_size=ADVANCEMENT_CLAIM_BATCH):
+    """Atomically take up to batch_size due meeting ids off the queue; None without Redis"""
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    now = get_current_ist_datetime().timestamp()
+    try:
+        due = client.eval(_CLAIM_LUA, 1, ADVANCEMENT_QUEUE_KEY, now, batch_size)
+    except Exception as e:
+        logger.warning(f"⚠️ Series advancement queue unavailable: {e}")
+        return None
+    return [member.decode() if isinstance(member, bytes) else member for member in due]
@@ -1,17 +1,100 @@
 import logging
 import json
-import threading
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from django.core.mail import EmailMessage
-from django.conf import settings
+from core.scheduler.mail_dispatch import dispatch_mail
+from core.scheduler.periodic import claim_daily_item, release_daily_item
 from core.utils.date_utils import get_current_ist_datetime, parse_datetime_safely
 from core.utils.recurring_calculator import calculate_next_occurrence, should_send_reminder
+from core.scheduler.reminder_index import (
+    MEETING_REMINDER_CLAIM_BATCH,
+    REMINDER_MAX_LATENESS,
+    claim_due_meeting_reminders,
+    parse_reminder_times,
+    release_meeting_reminders,
+    start_key,
+)
 
 def send_daily_meeting_reminders():
-    """Send daily reminders for all applicable meetings"""
+    """Send the meeting reminders that are due (claimed from the reminder index)"""
+    reminders_sent = send_due_meeting_reminders()
+    if reminders_sent is None:
+        # Reminder index unavailable (Redis down): fall back to scanning today's meetings
+        reminders_sent = scan_todays_meeting_reminders()
+    return reminders_sent
+
+def send_due_meeting_reminders():
+    """
+    Claim due reminders from the index in batches and send them.
+    Reminders that could not be sent go back into the index for the next
+    tick. Returns the number sent, or None when the index is unavailable.
+    """
+    from core.scheduler.recurring_scheduler import get_scheduled_meetings_by_ids
+    
+    reminders_sent = 0
+    unsent = []
+    try:
+        while True:
+            claimed = claim_due_meeting_reminders()
+            if claimed is None:
+                return None if reminders_sent == 0 else reminders_sent
+            if not claimed:
+                break
+            
+            current_time = get_current_ist_datetime()
+            try:
+                meetings = get_scheduled_meetings_by_ids([meeting_id for meeting_id, _, _ in claimed])
+            except Exception as e:
+                logging.error(f"Could not load {len(claimed)} claimed reminders, putting them back: {e}")
+                unsent.extend(claimed)
+                break
+            
+            for reminder in claimed:
+                meeting_id, reminder_minutes, indexed_start = reminder
+                meeting = meetings.get(meeting_id)
+                try:
+                    if not is_claimed_reminder_current(meeting, reminder_minutes, indexed_start, current_time):
+                        logging.info(f"Skipped stale {reminder_minutes}-minute reminder for meeting {meeting_id}")
+                        continue
+                    if send_meeting_reminder(meeting, reminder_minutes):
+                        reminders_sent += 1
+                        logging.info(f"Sent {reminder_minutes}-minute reminder for meeting {meeting_id}")
+                    else:
+                        unsent.append(reminder)
+                except Exception as e:
+                    logging.error(f"Error sending reminder for meeting {meeting_id}: {e}")
+                    unsent.append(reminder)
+            
+            if len(claimed) < MEETING_REMINDER_CLAIM_BATCH:
+                break
+    except Exception as e:
+        logging.error(f"Error in send_due_meeting_reminders: {e}")
+    finally:
+        # Put back after the loop so this tick does not claim them again
+        if unsent:
+            logging.warning(f"Putting back {release_meeting_reminders(unsent)} unsent reminders for the next tick")
+    
+    logging.info(f"Due reminders completed: {reminders_sent} reminders sent")
+    return reminders_sent
+
+def is_claimed_reminder_current(meeting, reminder_minutes, indexed_start, current_time):
+    """A claimed reminder is sent only if the meeting still starts when it was indexed for"""
+    if not meeting or not meeting.get('reminders_email', True):
+        return False
+    if start_key(meeting.get('start_time')) != indexed_start:
+        return False
+    if reminder_minutes not in parse_reminder_times(meeting.get('reminders_times')):
+        return False
+    
+    start_time = parse_datetime_safely(indexed_start)
+    if not start_time or current_time >= start_time:
+        return False
+    reminder_time = start_time - timedelta(minutes=reminder_minutes)
+    return (current_time - reminder_time).total_seconds() <= REMINDER_MAX_LATENESS
+
+def scan_todays_meeting_reminders():
+    """Send daily reminders for all applicable meetings (full scan, used without Redis)"""
     try:
-        from core.scheduler.recurring_scheduler import get_active_recurring_meetings, get_todays_scheduled_meetings
+        from core.scheduler.recurring_scheduler import get_todays_scheduled_meetings
         
         current_time = get_current_ist_datetime()
         reminders_sent = 0
@@ -52,7 +135,7 @@ def send_daily_meeting_reminders():
         return reminders_sent
         
     except Exception as e:
-        logging.error(f"Error in send_daily_meeting_reminders: {e}")
+        logging.error(f"Error in scan_todays_meeting_reminders: {e}")
         return 0
 
 def should_send_meeting_reminder_now(meeting, reminder_minutes, current_time):
@@ -137,60 +220,30 @@ Meet Pro Team"""
         return False
 
 def send_emails_to_participants(email_data, participant_emails):
-    """Send emails to participants using threading"""
+    """Queue the email for the participants on the shared mail service (mail_dispatch.py)"""
     try:
-        successful_sends = 0
-        
-        def send_single_reminder_email(email_address):
-            try:
-                email_message = EmailMessage(
-                    subject=email_data['subject'],
-                    body=email_data['message'],
-                    from_email=settings.DEFAULT_FROM_EMAIL or 'noreply@meetpro.com',
-                    to=[email_address],
-                )
-                
-                email_message.content_subtype = "plain"
-                email_message.send(fail_silently=False)
-                
-                logging.info(f"Successfully sent reminder to: {email_address}")
-                return True
-                
-            except Exception as e:
-                logging.error(f"Failed to send reminder email to {email_address}: {e}")
-                return False
-        
-        # Use ThreadPoolExecutor for concurrent sending
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_email = {
-                executor.submit(send_single_reminder_email, email): email 
-                for email in participant_emails
-            }
-            
-            for future in future_to_email:
-                try:
-                    success = future.result(timeout=30)
-                    if success:
-                        successful_sends += 1
-                except Exception as e:
-                    email = future_to_email[future]
-                    logging.error(f"Reminder email sending failed for {email}: {e}")
-        
-        return successful_sends
+        return dispatch_mail(email_data['subject'], email_data['message'], participant_emails)
         
     except Exception as e:
         logging.error(f"Error in send_emails_to_participants: {e}")
         return 0
 
-def send_daily_invitation_emails():
-    """Send invitation emails for today's recurring meetings"""
+def send_daily_invitation_emails(meeting_ids=None):
+    """
+    Send invitation emails for today's recurring meetings (or only the given
+    meeting ids, one fan-out chunk). Each meeting is invited once per day.
+    """
     try:
-        from core.scheduler.recurring_scheduler import get_todays_scheduled_meetings
+        from core.scheduler.recurring_scheduler import get_scheduled_meetings_by_ids, get_todays_scheduled_meetings
         
-        todays_meetings = get_todays_scheduled_meetings()
+        if meeting_ids is None:
+            todays_meetings = get_todays_scheduled_meetings()
+        else:
+            todays_meetings = list(get_scheduled_meetings_by_ids(meeting_ids).values())
         invitations_sent = 0
         
         for meeting in todays_meetings:
+            claimed = False
             try:
                 # Only send invitations for recurring meetings
                 if not meeting.get('is_recurring'):
@@ -205,14 +258,24 @@ def send_daily_invitation_emails():
                 if not participant_emails:
                     continue
                 
+                # Overlapping runs and chunks must not invite twice on the same day
+                if not claim_daily_item('daily_invitations', meeting['id']):
+                    continue
+                claimed = True
+                
                 # Send invitation email
                 success = send_daily_meeting_invitation(meeting, participant_emails)
                 if success:
                     invitations_sent += 1
                     logging.info(f"Sent daily invitation for recurring meeting {meeting['id']}")
+                else:
+                    # Let the next run retry it today
+                    release_daily_item('daily_invitations', meeting['id'])
                     
             except Exception as e:
                 logging.error(f"Error sending daily invitation for meeting {meeting.get('id', 'unknown')}: {e}")
+                if claimed:
+                    release_daily_item('daily_invitations', meeting['id'])
                 continue
         
         logging.info(f"Daily invitations completed: {invitations_sent} invitations sent")
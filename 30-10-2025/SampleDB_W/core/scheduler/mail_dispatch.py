@@ -0,0 +1,238 @@
+# mail_dispatch.py - Shared outbound mail service
+#
+# Every mail path (invitations, reminders, daily recurring mails, OTP) goes
+# through here instead of opening its own SMTP connection per message:
+#   dispatch_mail()     split the recipients into batches and queue one
+#                       send_mail_batch_task per batch (sends inline when the
+#                       broker is unavailable)
+#   send_mail_now()     send one batch over a pooled, already authenticated
+#                       SMTP connection; used by the task and by OTP mail
+#
+# Each recipient gets its own message (guests never see each other's
+# addresses), sends are throttled per rate bucket across all workers through
+# a Redis counter (bulk mail to MAIL_RATE_PER_SECOND, OTP mail to its own
+# MAIL_OTP_RATE_PER_SECOND so a mail burst never delays a login), and
+# recipients that failed with a transient error (4xx replies, dropped
+# connections, timeouts) are retried by the task with exponential backoff.
+import logging
+import os
+import queue
+import smtplib
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('mail_dispatch')
+
+# Recipients per queued task (and per SMTP session)
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 50))
+# Open SMTP connections kept per process and SMTP account
+MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", 2))
+# Pooled connections idle longer than this are reopened (servers drop idle sessions)
+MAIL_CONNECTION_MAX_IDLE = float(os.getenv("MAIL_CONNECTION_MAX_IDLE", 60))
+# Provider limit, messages per second across all workers
+MAIL_RATE_PER_SECOND = float(os.getenv("MAIL_RATE_PER_SECOND", 10))
+MAIL_OTP_RATE_PER_SECOND = float(os.getenv("MAIL_OTP_RATE_PER_SECOND", 5))
+MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", 3))
+MAIL_RETRY_BACKOFF = int(os.getenv("MAIL_RETRY_BACKOFF", 30))  # seconds, doubled per retry
+
+DEFAULT_FROM_ADDRESS = 'noreply@meetpro.com'
+
+RATE_BUCKET_BULK = 'bulk'
+RATE_BUCKET_OTP = 'otp'
+
+_TRANSIENT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    socket.timeout,
+    ConnectionError,
+)
+
+_pools = {}
+_pools_lock = threading.Lock()
+_local_rate_lock = threading.Lock()
+_local_next_send = {}
+
+
+class _PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.last_used = 0.0
+
+
+def _pool_key(connection_kwargs):
+    return tuple(sorted((connection_kwargs or {}).items()))
+
+
+def _get_pool(connection_kwargs):
+    key = _pool_key(connection_kwargs)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, queue.LifoQueue(maxsize=MAIL_POOL_SIZE))
+    return pool
+
+
+def _acquire(connection_kwargs):
+    """An open SMTP connection from the pool, or a newly opened one"""
+    pool = _get_pool(connection_kwargs)
+    try:
+        pooled = pool.get_nowait()
+        if time.monotonic() - pooled.last_used > MAIL_CONNECTION_MAX_IDLE:
+            _discard(pooled)
+            raise queue.Empty
+    except queue.Empty:
+        pooled = _PooledConnection(get_connection(fail_silently=False, **(connection_kwargs or {})))
+    pooled.connection.open()
+    return pooled
+
+
+def _release(pooled, connection_kwargs):
+    pooled.last_used = time.monotonic()
+    try:
+        _get_pool(connection_kwargs).put_nowait(pooled)
+    except queue.Full:
+        _discard(pooled)
+
+
+def _discard(pooled):
+    try:
+        pooled.connection.close()
+    except Exception:
+        pass
+
+
+def _is_transient(error):
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # {recipient: (code, message)}; greylisting and full mailboxes answer 4xx
+        codes = [refusal[0] for refusal in error.recipients.values()]
+        return bool(codes) and all(isinstance(code, int) and 400 <= code < 500 for code in codes)
+    code = getattr(error, 'smtp_code', None)
+    return isinstance(code, int) and 400 <= code < 500
+
+
+def _bucket_rate(bucket):
+    return MAIL_OTP_RATE_PER_SECOND if bucket == RATE_BUCKET_OTP else MAIL_RATE_PER_SECOND
+
+
+def _wait_for_send_slot(bucket=RATE_BUCKET_BULK):
+    """Block until a send fits within the bucket's rate (shared through Redis when available)"""
+    rate = _bucket_rate(bucket)
+    if rate <= 0:
+        return
+    client = get_redis_client()
+    if client is not None:
+        try:
+            while True:
+                now = time.time()
+                key = f"mail_rate:{bucket}:{int(now)}"
+                pipe = client.pipeline()
+                pipe.incr(key)
+                pipe.expire(key, 2)
+                count = pipe.execute()[0]
+                if count <= rate:
+                    return
+                time.sleep(int(now) + 1 - now)
+        except Exception as e:
+            logger.warning(f"⚠️ Mail rate limiter unavailable, throttling per process: {e}")
+
+    with _local_rate_lock:
+        now = time.monotonic()
+        next_send = _local_next_send.get(bucket, 0.0)
+        delay = next_send - now
+        _local_next_send[bucket] = max(now, next_send) + 1.0 / rate
+    if delay > 0:
+        time.sleep(delay)
+
+
+def build_message(subject, body, recipient, from_email=None, content_subtype='plain'):
+    message = EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=from_email or getattr(settings, 'DEFAULT_FROM_EMAIL', None) or DEFAULT_FROM_ADDRESS,
+        to=[recipient],
+    )
+    message.content_subtype = content_subtype
+    return message
+
+
+def send_mail_now(subject, body, recipients, from_email=None, content_subtype='plain', connection_kwargs=None,
+                  rate_bucket=RATE_BUCKET_BULK):
+    """
+    Send one message per recipient over a pooled SMTP connection, throttled
+    in rate_bucket. Returns (sent, permanently_failed, transiently_failed)
+    recipient lists.
+    """
+    sent, failed, transient = [], [], []
+    pending = [recipient for recipient in recipients if recipient and '@' in recipient]
+    failed.extend(recipient for recipient in recipients if not recipient or '@' not in recipient)
+    if not pending:
+        return sent, failed, transient
+
+    try:
+        pooled = _acquire(connection_kwargs)
+    except Exception as e:
+        logger.error(f"❌ Could not open SMTP connection: {e}")
+        return sent, failed, transient + pending
+
+    healthy = True
+    for index, recipient in enumerate(pending):
+        _wait_for_send_slot(rate_bucket)
+        try:
+            pooled.connection.send_messages([build_message(subject, body, recipient, from_email, content_subtype)])
+            sent.append(recipient)
+        except Exception as e:
+            if not _is_transient(e):
+                logger.error(f"❌ Mail to {recipient} rejected: {e}")
+                failed.append(recipient)
+                continue
+            logger.warning(f"⚠️ Transient mail failure for {recipient}: {e}")
+            transient.append(recipient)
+            if isinstance(e, (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)):
+                # The session is gone; the rest of the batch goes to the retry
+                healthy = False
+                transient.extend(pending[index + 1:])
+                break
+
+    if healthy:
+        _release(pooled, connection_kwargs)
+    else:
+        _discard(pooled)
+
+    logger.info(f"📧 Mail batch '{subject}': {len(sent)} sent, {len(failed)} failed, {len(transient)} to retry")
+    return sent, failed, transient
+
+
+def dispatch_mail(subject, body, recipients, from_email=None, content_subtype='plain'):
+    """
+    Queue the mail in batches of MAIL_BATCH_SIZE recipients. Returns the number
+    of recipients accepted for delivery.
+    """
+    from core.scheduler.tasks import send_mail_batch_task
+
+    if isinstance(recipients, str):
+        recipients = [email.strip() for email in recipients.split(',') if email.strip()]
+    recipients = list(dict.fromkeys(email.strip() for email in recipients if email and '@' in email))
+
+    for start in range(0, len(recipients), MAIL_BATCH_SIZE):
+        mail = {
+            'subject': subject,
+            'body': body,
+            'recipients': recipients[start:start + MAIL_BATCH_SIZE],
+            'from_email': from_email,
+            'content_subtype': content_subtype,
+        }
+        try:
+            send_mail_batch_task.delay(mail)
+        except Exception as e:
+            logger.warning(f"⚠️ Mail queue unavailable, sending inline: {e}")
+            send_mail_now(**mail)
+
+    return len(recipients)
@@ -0,0 +1,225 @@
+# periodic.py - Run locks, checkpoints and fan-out for periodic Celery jobs
+#
+# Beat fires every job on its interval whether or not the previous run has
+# finished, so slow runs used to stack up and redo the same emails and
+# updates. Periodic tasks now go through these helpers:
+#   @singleton_task(name)   only one run of a job holds periodic_lock:<name>;
+#                           overlapping runs are skipped and counted
+#   fan_out_pages()         page ids by keyset and queue one chunk task per
+#                           page on the scheduler queue, so big tables are
+#                           spread across workers; the last dispatched id is
+#                           checkpointed and an interrupted pass resumes there
+#   claim_daily_item()      once-per-day claim of one item (daily invitations),
+#                           which keeps chunks idempotent across runs;
+#   release_daily_item()    gives the claim back when the send failed, so the
+#                           next run retries it instead of skipping it all day
+# Run counts, durations and skips are kept per job in periodic_stats:<name>
+# (shown by the periodic_task_stats command).
+#
+# Without Redis jobs run unlocked and unchecked, as before.
+import functools
+import logging
+import os
+import time
+import uuid
+
+from core.utils.date_utils import get_current_ist_datetime
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('periodic')
+
+LOCK_PREFIX = 'periodic_lock:'
+STATS_PREFIX = 'periodic_stats:'
+CHECKPOINT_PREFIX = 'periodic_checkpoint:'
+DAILY_CLAIM_PREFIX = 'periodic_done:'
+
+# Upper bound on one run; a crashed worker's lock expires after this
+PERIODIC_LOCK_TIMEOUT = int(os.getenv("PERIODIC_LOCK_TIMEOUT", 15 * 60))
+CHECKPOINT_TTL = 24 * 3600
+FAN_OUT_CHUNK_SIZE = int(os.getenv("FAN_OUT_CHUNK_SIZE", 200))
+
+# KEYS: lock  ARGV: token  -> 1 when this run's lock was released
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _record_skip(client, name):
+    try:
+        client.hincrby(f"{STATS_PREFIX}{name}", 'skipped', 1)
+    except Exception:
+        pass
+
+
+def _record_run(client, name, duration):
+    logger.info(f"⏱️ {name} finished in {duration:.2f}s")
+    if client is None:
+        return
+    try:
+        key = f"{STATS_PREFIX}{name}"
+        pipe = client.pipeline()
+        pipe.hincrby(key, 'runs', 1)
+        pipe.hincrbyfloat(key, 'total_duration', round(duration, 3))
+        pipe.hset(key, mapping={
+            'last_duration': round(duration, 3),
+            'last_finished_at': get_current_ist_datetime().isoformat(),
+        })
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record run stats for {name}: {e}")
+
+
+def singleton_task(name, lock_timeout=PERIODIC_LOCK_TIMEOUT):
+    """
+    Decorator for a periodic task body: skip the run while another run of
+    `name` holds the lock, and record the duration of every run. Goes under
+    @shared_task so the task name is unchanged.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            client = get_redis_client()
+            lock_key = f"{LOCK_PREFIX}{name}"
+            token = uuid.uuid4().hex
+            locked = False
+
+            if client is not None:
+                try:
+                    if not client.set(lock_key, token, nx=True, ex=lock_timeout):
+                        _record_skip(client, name)
+                        logger.info(f"⏭️ {name} is still running elsewhere, skipping this run")
+                        return {'success': True, 'skipped': True, 'task': name}
+                    locked = True
+                except Exception as e:
+                    logger.warning(f"⚠️ Run lock unavailable for {name}, running unlocked: {e}")
+                    client = None
+
+            started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, dict):
+                    result.setdefault('duration_seconds', round(time.monotonic() - started, 3))
+                return result
+            finally:
+                _record_run(client, name, time.monotonic() - started)
+                if locked:
+                    try:
+                        client.eval(_RELEASE_LOCK_LUA, 1, lock_key, token)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not release run lock for {name}: {e}")
+        return wrapper
+    return decorator
+
+
+def get_checkpoint(name):
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        return client.get(f"{CHECKPOINT_PREFIX}{name}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read checkpoint for {name}: {e}")
+        return None
+
+
+def set_checkpoint(name, position):
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.set(f"{CHECKPOINT_PREFIX}{name}", str(position), ex=CHECKPOINT_TTL)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not store checkpoint for {name}: {e}")
+
+
+def clear_checkpoint(name):
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.delete(f"{CHECKPOINT_PREFIX}{name}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not clear checkpoint for {name}: {e}")
+
+
+def claim_daily_item(name, item, day=None):
+    """True the first time `item` is claimed for `name` today (always True without Redis)"""
+    client = get_redis_client()
+    if client is None:
+        return True
+    day = day or get_current_ist_datetime().date()
+    key = f"{DAILY_CLAIM_PREFIX}{name}:{day.isoformat()}"
+    try:
+        pipe = client.pipeline()
+        pipe.sadd(key, str(item))
+        pipe.expire(key, 2 * 24 * 3600)
+        return bool(pipe.execute()[0])
+    except Exception as e:
+        logger.warning(f"⚠️ Daily claim unavailable for {name}: {e}")
+        return True
+
+
+def release_daily_item(name, item, day=None):
+    """Undo claim_daily_item() for `item` after a failed send (never raises)"""
+    client = get_redis_client()
+    if client is None:
+        return
+    day = day or get_current_ist_datetime().date()
+    try:
+        client.srem(f"{DAILY_CLAIM_PREFIX}{name}:{day.isoformat()}", str(item))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not release daily claim of {item} for {name}: {e}")
+
+
+def dispatch_chunk(task, items):
+    """Queue one chunk task; run it inline when the broker is unavailable"""
+    try:
+        task.delay(items)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Scheduler queue unavailable, running {task.name} inline: {e}")
+        task(items)
+        return False
+
+
+def fan_out_pages(name, fetch_page, task, chunk_size=FAN_OUT_CHUNK_SIZE):
+    """
+    Queue task(ids) for every page returned by fetch_page(after_id, limit),
+    resuming after the checkpoint of a pass that did not finish.
+    Returns {'chunks', 'items', 'resumed'}.
+    """
+    position = get_checkpoint(name)
+    counts = {'chunks': 0, 'items': 0, 'resumed': bool(position)}
+    position = position or ''
+
+    while True:
+        ids = fetch_page(position, chunk_size)
+        if not ids:
+            break
+        dispatch_chunk(task, [str(item) for item in ids])
+        counts['chunks'] += 1
+        counts['items'] += len(ids)
+        position = str(ids[-1])
+        set_checkpoint(name, position)
+        if len(ids) < chunk_size:
+            break
+
+    clear_checkpoint(name)
+    if counts['chunks']:
+        logger.info(f"📦 {name}: queued {counts['items']} items in {counts['chunks']} chunks")
+    return counts
+
+
+def get_periodic_stats():
+    """{job name: stats dict} for every job that has run"""
+    client = get_redis_client()
+    if client is None:
+        return {}
+    stats = {}
+    for key in client.scan_iter(match=f"{STATS_PREFIX}*", count=100):
+        key = key.decode() if isinstance(key, bytes) else key
+        stats[key[len(STATS_PREFIX):]] = client.hgetall(key)
+    return stats
@@ -306,63 +306,65 @@ from core.utils.recurring_calculator import (
     is_recurrence_ended,
     should_send_reminder
 )
+from core.WebSocketConnection.meeting_occurrences import rematerialize_meeting_occurrences
 from .email_scheduler import send_daily_meeting_reminders
+from .reminder_index import index_meeting_reminders
+from .advancement_queue import (
+    ADVANCE_BUFFER_MINUTES,
+    ADVANCEMENT_CLAIM_BATCH,
+    claim_due_series,
+    schedule_series_advancement,
+    schedule_series_advancement_now,
+)
 
 def update_recurring_meetings():
     """
-    Main function to update recurring meetings ONLY after current meetings have ended
+    Advance the recurring series whose current occurrence has ended. Only the
+    series claimed from the advancement queue are loaded; without Redis the
+    consistency sweep is used instead.
     """
-    logging.info("Starting daily recurring meetings update...")
-    
+    logging.info("Starting recurring meetings update...")
+
     try:
         current_time = get_current_ist_datetime()
-        
-        # Get all active recurring meetings
-        recurring_meetings = get_active_recurring_meetings()
-        
         updated_count = 0
         ended_count = 0
-        
-        for meeting in recurring_meetings:
-            try:
-                # Check if recurrence has ended
-                if is_recurrence_ended(meeting):
-                    mark_meeting_recurrence_ended(meeting['id'])
-                    ended_count += 1
-                    logging.info(f"Marked recurring meeting {meeting['id']} as ended")
-                    continue
-                
-                # CRITICAL FIX: Only update if current meeting has ended
-                if should_update_to_next_occurrence(meeting, current_time):
-                    next_occurrence = calculate_next_occurrence(meeting, current_time)
-                    
-                    if next_occurrence:
-                        success = update_meeting_to_next_occurrence(meeting, next_occurrence)
-                        if success:
-                            updated_count += 1
-                            logging.info(f"Updated meeting {meeting['id']} to next occurrence")
-                
-            except Exception as e:
-                logging.error(f"Error processing meeting {meeting.get('id', 'unknown')}: {e}")
-                continue
-        
-        # Send daily reminders (unchanged)
+
+        while True:
+            meeting_ids = claim_due_series()
+            if meeting_ids is None:
+                # Advancement queue unavailable: find overdue series in MySQL
+                sweep = sweep_recurring_meetings(current_time)
+                updated_count += sweep['updated_count']
+                ended_count += sweep['ended_count']
+                break
+            if not meeting_ids:
+                break
+
+            updated, ended = advance_recurring_meetings(get_recurring_meetings_by_ids(meeting_ids), current_time)
+            updated_count += updated
+            ended_count += ended
+
+            if len(meeting_ids) < ADVANCEMENT_CLAIM_BATCH:
+                break
+
+        # Send due reminders (unchanged)
         reminder_count = send_daily_meeting_reminders()
-        
+
         logging.info(f"""
-        Daily recurring meetings update completed:
+        Recurring meetings update completed:
         - Meetings updated to next occurrence: {updated_count}
         - Meetings ended: {ended_count}
         - Reminders sent: {reminder_count}
         """)
-        
+
         return {
             'success': True,
             'updated_count': updated_count,
             'ended_count': ended_count,
             'reminder_count': reminder_count
         }
-        
+
     except Exception as e:
         logging.error(f"Error in update_recurring_meetings: {e}")
         return {
@@ -370,6 +372,133 @@ def update_recurring_meetings():
             'error': str(e)
         }
 
+def seed_advancement_queue():
+    """
+    Queue every active recurring series that has no advancement entry yet
+    (series created before the queue existed, entries lost with Redis).
+    Returns the number of series seen, or None without Redis.
+    """
+    meetings = get_active_recurring_meetings()
+    if not schedule_series_advancement_now(
+        {meeting['id']: meeting.get('end_time') for meeting in meetings}, only_new=True
+    ):
+        return None
+    logging.info(f"Advancement queue seeded with {len(meetings)} active recurring series")
+    return len(meetings)
+
+def sweep_recurring_meetings(current_time=None):
+    """
+    Consistency sweep: advance the series that are overdue but were never
+    claimed from the advancement queue (lost entries, Redis outages)
+    """
+    current_time = current_time or get_current_ist_datetime()
+    overdue = get_active_recurring_meetings(
+        ended_before=current_time - timedelta(minutes=ADVANCE_BUFFER_MINUTES)
+    )
+    updated_count, ended_count = advance_recurring_meetings(overdue, current_time)
+
+    if updated_count or ended_count:
+        logging.info(f"Recurring sweep advanced {updated_count} and ended {ended_count} overdue series")
+    return {
+        'success': True,
+        'updated_count': updated_count,
+        'ended_count': ended_count
+    }
+
+def advance_recurring_meetings(meetings, current_time):
+    """
+    Move every due series to its next occurrence (or mark its recurrence ended)
+    in one transaction, then queue the next advancement and reminders.
+    Returns (updated_count, ended_count).
+    """
+    from core.utils.date_utils import parse_datetime_safely
+
+    advanced = []
+    ended_ids = []
+    requeue = {}
+
+    for meeting in meetings:
+        try:
+            if is_recurrence_ended(meeting):
+                ended_ids.append(meeting['id'])
+                continue
+
+            if not should_update_to_next_occurrence(meeting, current_time):
+                # Rescheduled since it was queued: wait for the new end time
+                requeue[meeting['id']] = meeting.get('end_time')
+                continue
+
+            next_occurrence = calculate_next_occurrence(meeting, current_time)
+            if not next_occurrence:
+                continue
+
+            start_datetime = parse_datetime_safely(next_occurrence['next_start_time'])
+            end_datetime = parse_datetime_safely(next_occurrence['next_end_time'])
+            if not start_datetime:
+                logging.error(f"Failed to parse start time for meeting {meeting['id']}")
+                continue
+
+            advanced.append((meeting, start_datetime, end_datetime))
+
+        except Exception as e:
+            logging.error(f"Error processing meeting {meeting.get('id', 'unknown')}: {e}")
+            continue
+
+    if not advanced and not ended_ids:
+        if requeue:
+            schedule_series_advancement_now(requeue)
+        return 0, 0
+
+    occurrence_rows = [
+        [format_datetime_for_db(start), format_datetime_for_db(end), meeting['id']]
+        for meeting, start, end in advanced
+    ]
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if occurrence_rows:
+                cursor.executemany("""
+                    UPDATE tbl_Meetings
+                    SET Started_At = %s, Ended_At = %s, Status = 'scheduled'
+                    WHERE ID = %s
+                """, occurrence_rows)
+                cursor.executemany("""
+                    UPDATE tbl_ScheduledMeetings
+                    SET start_time = %s, end_time = %s
+                    WHERE id = %s
+                """, occurrence_rows)
+                # Conflict checks read tbl_MeetingOccurrences; keep it in step with the new start
+                for meeting, _, _ in advanced:
+                    rematerialize_meeting_occurrences(cursor, meeting['id'], 'ScheduleMeeting')
+
+            if ended_ids:
+                placeholders = ', '.join(['%s'] * len(ended_ids))
+                cursor.execute(f"""
+                    UPDATE tbl_ScheduledMeetings
+                    SET is_recurring = 0
+                    WHERE id IN ({placeholders})
+                """, ended_ids)
+                cursor.execute(f"""
+                    UPDATE tbl_Meetings
+                    SET Status = 'recurrence_ended'
+                    WHERE ID IN ({placeholders})
+                """, ended_ids)
+
+        for meeting, start_datetime, end_datetime in advanced:
+            index_meeting_reminders(
+                meeting['id'], start_datetime,
+                meeting.get('reminders_times') if meeting.get('reminders_email', True) else []
+            )
+            requeue[meeting['id']] = end_datetime
+            logging.info(f"Updated meeting {meeting['id']} to next occurrence: {start_datetime}")
+
+        for meeting_id in ended_ids:
+            logging.info(f"Marked recurring meeting {meeting_id} as ended")
+
+        transaction.on_commit(lambda: schedule_series_advancement_now(requeue))
+
+    return len(advanced), len(ended_ids)
+
 # def should_update_to_next_occurrence(meeting, current_time):
 #     """
 #     SIMPLE: Only return True if the current meeting has completely ended
@@ -409,8 +538,7 @@ def should_update_to_next_occurrence(meeting, current_time):
         
         # CRITICAL FIX: Only update AFTER the meeting has completely ended
         # Add a small buffer (e.g., 5 minutes) to ensure meeting is truly finished
-        buffer_minutes = 5
-        meeting_truly_ended = current_time > (current_end_time + timedelta(minutes=buffer_minutes))
+        meeting_truly_ended = current_time > (current_end_time + timedelta(minutes=ADVANCE_BUFFER_MINUTES))
         
         if meeting_truly_ended:
             logging.info(f"Meeting {meeting.get('id')} has ended (with buffer), ready for next occurrence update")
@@ -471,6 +599,12 @@ def update_meeting_to_next_occurrence(meeting, next_occurrence):
                     meeting_id
                 ])
                 
+                index_meeting_reminders(
+                    meeting_id, start_datetime,
+                    meeting.get('reminders_times') if meeting.get('reminders_email', True) else []
+                )
+                schedule_series_advancement(meeting_id, end_datetime)
+                
                 logging.info(f"Updated meeting {meeting_id} to next occurrence: {start_datetime}")
                 return True
                 
@@ -478,13 +612,7 @@ def update_meeting_to_next_occurrence(meeting, next_occurrence):
         logging.error(f"Error updating meeting {meeting.get('id')} to next occurrence: {e}")
         return False
 
-def get_active_recurring_meetings():
-    """
-    Get all active recurring meetings - NO extra columns needed
-    """
-    try:
-        with connection.cursor() as cursor:
-            query = """
+_RECURRING_MEETING_SELECT = """
             SELECT 
                 sm.id, sm.host_id, sm.title, sm.description, sm.location,
                 sm.start_time, sm.end_time, sm.start_date, sm.end_date, sm.timezone, sm.duration_minutes,
@@ -502,9 +630,22 @@ def get_active_recurring_meetings():
                   OR sm.recurrence_end_date >= %s
               )
             """
+
+def get_active_recurring_meetings(ended_before=None):
+    """
+    Get all active recurring meetings - NO extra columns needed.
+    ended_before limits the result to series whose current occurrence ended
+    before that time (the consistency sweep).
+    """
+    try:
+        with connection.cursor() as cursor:
+            query = _RECURRING_MEETING_SELECT
+            params = [get_current_ist_datetime().date()]
+            if ended_before is not None:
+                query += "  AND sm.end_time < %s\n"
+                params.append(format_datetime_for_db(ended_before))
             
-            current_date = get_current_ist_datetime().date()
-            cursor.execute(query, [current_date])
+            cursor.execute(query, params)
             
             columns = [desc[0] for desc in cursor.description]
             meetings = []
@@ -520,6 +661,26 @@ def get_active_recurring_meetings():
         logging.error(f"Error getting active recurring meetings: {e}")
         return []
 
+def get_recurring_meetings_by_ids(meeting_ids):
+    """Active recurring meetings among the given ids (claimed from the advancement queue)"""
+    meeting_ids = list(dict.fromkeys(meeting_ids))
+    if not meeting_ids:
+        return []
+    
+    try:
+        placeholders = ', '.join(['%s'] * len(meeting_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _RECURRING_MEETING_SELECT + f"  AND sm.id IN ({placeholders})\n",
+                [get_current_ist_datetime().date()] + meeting_ids
+            )
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+    except Exception as e:
+        logging.error(f"Error getting recurring meetings by id: {e}")
+        return []
+
 def get_current_active_meetings():
     """
     NEW: Get meetings that are currently active (between start and end time)
@@ -618,6 +779,56 @@ def get_todays_scheduled_meetings():
         logging.error(f"Error getting today's meetings: {e}")
         return []
 
+def get_todays_recurring_meeting_ids(after_id, limit):
+    """One keyset page of today's recurring meeting ids (daily invitation fan-out)"""
+    today_start = get_current_ist_datetime().replace(hour=0, minute=0, second=0, microsecond=0)
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT sm.id
+            FROM tbl_ScheduledMeetings sm
+            INNER JOIN tbl_Meetings m ON sm.id = m.ID
+            WHERE sm.start_time >= %s AND sm.start_time < %s
+              AND sm.is_recurring = 1
+              AND m.Status IN ('scheduled', 'active')
+              AND sm.id > %s
+            ORDER BY sm.id
+            LIMIT %s
+        """, [
+            format_datetime_for_db(today_start),
+            format_datetime_for_db(today_start + timedelta(days=1)),
+            after_id, limit
+        ])
+        return [row[0] for row in cursor.fetchall()]
+
+def get_scheduled_meetings_by_ids(meeting_ids):
+    """
+    Reminder data of the given meetings, keyed by id (only meetings still
+    scheduled or active). Database errors propagate: an empty result would
+    read as "every meeting was cancelled".
+    """
+    meeting_ids = list(dict.fromkeys(meeting_ids))
+    if not meeting_ids:
+        return {}
+
+    placeholders = ', '.join(['%s'] * len(meeting_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+        SELECT 
+            sm.id, sm.host_id, sm.title, sm.description, sm.location,
+            sm.start_time, sm.end_time, sm.duration_minutes,
+            sm.is_recurring, sm.recurrence_type, sm.email, sm.reminders_email, sm.reminders_times,
+            m.Meeting_Link, m.Meeting_Name, m.Status,
+            u.full_name as host_name, u.email as host_email
+        FROM tbl_ScheduledMeetings sm
+        INNER JOIN tbl_Meetings m ON sm.id = m.ID
+        LEFT JOIN tbl_Users u ON sm.host_id = u.ID
+        WHERE sm.id IN ({placeholders})
+          AND m.Status IN ('scheduled', 'active')
+        """, meeting_ids)
+        
+        columns = [desc[0] for desc in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
 def process_meeting_reminders():
     """Process and send meeting reminders for today's meetings"""
     try:
@@ -0,0 +1,246 @@
+# reminder_index.py - Due-time index for meeting reminder emails
+#
+# Reminders used to be found by loading every meeting scheduled for the day on
+# each beat tick and re-checking every reminder offset. They are now
+# materialised when a meeting is created, updated or advanced to its next
+# occurrence, into one Redis sorted set scored by fire time:
+#   member  "<meeting_id>|<reminder_minutes>|<occurrence start, IST wall time>"
+#   score   unix time the reminder is due
+# A tick claims (ZRANGEBYSCORE + ZREM in one Lua call) only the members that
+# are due, so its cost follows the number of due reminders, not of meetings.
+# Concurrent ticks never claim the same member, and a claimed member is
+# remembered for REMINDER_SENT_TTL so re-indexing the meeting cannot queue it
+# again. Claimed reminders are still checked against MySQL before sending, so
+# members left behind by a cancelled or rescheduled meeting are dropped.
+# Reminders that could not be sent are put back with release_meeting_reminders()
+# and retried by the next tick until REMINDER_MAX_LATENESS has passed.
+#
+# rebuild_reminder_index() re-materialises the upcoming meetings from MySQL;
+# it runs when a worker starts and hourly, and repairs writes that happened
+# while Redis (or every worker) was down.
+import json
+import logging
+import os
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+from core.utils.date_utils import convert_to_ist, get_current_ist_datetime, parse_datetime_safely
+from core.utils.redis_registry import get_redis_client
+
+logger = logging.getLogger('reminder_index')
+
+REMINDER_INDEX_KEY = 'meeting_reminders:due'
+MEETING_MEMBERS_PREFIX = 'meeting_reminders:meeting:'
+SENT_MARKER_PREFIX = 'meeting_reminders:sent:'
+
+DEFAULT_REMINDER_TIMES = [15, 5]
+# Reminders due at most this long ago are still indexed (the old scan sent within +/- 2 minutes)
+REMINDER_GRACE_SECONDS = 120
+# Claimed reminders later than this (worker backlog, outage) are dropped instead of sent
+REMINDER_MAX_LATENESS = int(os.getenv("REMINDER_MAX_LATENESS", 600))
+REMINDER_SENT_TTL = 2 * 24 * 3600
+MEETING_REMINDER_CLAIM_BATCH = int(os.getenv("MEETING_REMINDER_CLAIM_BATCH", 200))
+REMINDER_REBUILD_HORIZON_DAYS = int(os.getenv("REMINDER_REBUILD_HORIZON_DAYS", 7))
+
+# KEYS: index, meeting members  ARGV: sent prefix, members ttl, score1, member1, ...
+# -> number of members indexed
+_REPLACE_LUA = """
+local old = redis.call('SMEMBERS', KEYS[2])
+for _, member in ipairs(old) do
+    redis.call('ZREM', KEYS[1], member)
+end
+redis.call('DEL', KEYS[2])
+local added = 0
+for i = 3, #ARGV, 2 do
+    local member = ARGV[i + 1]
+    if redis.call('EXISTS', ARGV[1] .. member) == 0 then
+        redis.call('ZADD', KEYS[1], ARGV[i], member)
+        redis.call('SADD', KEYS[2], member)
+        added = added + 1
+    end
+end
+if added > 0 then
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+return added
+"""
+
+# KEYS: index  ARGV: now, limit, sent prefix, sent ttl  -> claimed members
+_CLAIM_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('SET', ARGV[3] .. member, 1, 'EX', ARGV[4])
+end
+return due
+"""
+
+
+# KEYS: index  ARGV: sent prefix, score1, member1, ...  -> members put back
+_RELEASE_LUA = """
+for i = 2, #ARGV, 2 do
+    redis.call('DEL', ARGV[1] .. ARGV[i + 1])
+    redis.call('ZADD', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return (#ARGV - 1) / 2
+"""
+
+
+def parse_reminder_times(value):
+    """reminders_times column (JSON list or list) -> list of int minutes"""
+    if value is None or value == '':
+        return list(DEFAULT_REMINDER_TIMES)
+    try:
+        if isinstance(value, str):
+            value = json.loads(value)
+        if not value:
+            return []
+        return sorted({int(minutes) for minutes in value if int(minutes) >= 0}, reverse=True)
+    except (TypeError, ValueError):
+        return list(DEFAULT_REMINDER_TIMES)
+
+
+def _to_ist(start_time):
+    start = parse_datetime_safely(start_time) if isinstance(start_time, str) else start_time
+    if not start:
+        return None
+    return convert_to_ist(start)
+
+
+def start_key(start_time):
+    """Occurrence start as stored in index members"""
+    start = _to_ist(start_time)
+    return start.strftime('%Y-%m-%dT%H:%M:%S') if start else None
+
+
+def _member(meeting_id, reminder_minutes, start_time):
+    return f"{meeting_id}|{int(reminder_minutes)}|{start_key(start_time)}"
+
+
+def parse_member(member):
+    """Index member -> (meeting_id, reminder_minutes, start_key)"""
+    member = member.decode() if isinstance(member, bytes) else member
+    meeting_id, reminder_minutes, start = member.rsplit('|', 2)
+    return meeting_id, int(reminder_minutes), start
+
+
+def index_meeting_reminders_now(meeting_id, start_time, reminder_times):
+    """Replace the indexed reminders of a meeting. Returns the number indexed, None without Redis."""
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    start = _to_ist(start_time)
+    now = get_current_ist_datetime()
+    args = []
+    last_fire = None
+    if start:
+        for reminder_minutes in parse_reminder_times(reminder_times):
+            fire_at = start - timedelta(minutes=reminder_minutes)
+            if (now - fire_at).total_seconds() > REMINDER_GRACE_SECONDS:
+                continue
+            args.extend([fire_at.timestamp(), _member(meeting_id, reminder_minutes, start)])
+            last_fire = max(last_fire or fire_at, fire_at)
+
+    ttl = int((last_fire - now).total_seconds()) + REMINDER_SENT_TTL if last_fire else REMINDER_SENT_TTL
+    try:
+        return int(client.eval(
+            _REPLACE_LUA, 2, REMINDER_INDEX_KEY, f"{MEETING_MEMBERS_PREFIX}{meeting_id}",
+            SENT_MARKER_PREFIX, max(ttl, 60), *args
+        ))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not index reminders for meeting {meeting_id}: {e}")
+        return None
+
+
+def index_meeting_reminders(meeting_id, start_time, reminder_times):
+    """index_meeting_reminders_now once the current transaction commits (immediately in autocommit)"""
+    transaction.on_commit(lambda: index_meeting_reminders_now(meeting_id, start_time, reminder_times))
+
+
+def unindex_meeting_reminders(meeting_id):
+    index_meeting_reminders(meeting_id, None, [])
+
+
+def claim_due_meeting_reminders(batch_size=MEETING_REMINDER_CLAIM_BATCH):
+    """
+    Atomically take up to batch_size due reminders off the index.
+    Returns [(meeting_id, reminder_minutes, start_key)], or None without Redis.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    now = get_current_ist_datetime().timestamp()
+    try:
+        members = client.eval(_CLAIM_LUA, 1, REMINDER_INDEX_KEY, now, batch_size, SENT_MARKER_PREFIX, REMINDER_SENT_TTL)
+    except Exception as e:
+        logger.warning(f"⚠️ Reminder index unavailable: {e}")
+        return None
+
+    claimed = []
+    for member in members:
+        try:
+            meeting_id, reminder_minutes, start = parse_member(member)
+        except ValueError:
+            logger.warning(f"⚠️ Dropping malformed reminder index member: {member}")
+            continue
+        claimed.append((meeting_id, reminder_minutes, start))
+    return claimed
+
+
+def release_meeting_reminders(reminders):
+    """Put claimed [(meeting_id, reminder_minutes, start_key)] that were not sent back into the index"""
+    client = get_redis_client()
+    if client is None or not reminders:
+        return 0
+
+    args = []
+    for meeting_id, reminder_minutes, start in reminders:
+        start_time = _to_ist(start)
+        if start_time is None:
+            continue
+        fire_at = start_time - timedelta(minutes=reminder_minutes)
+        args.extend([fire_at.timestamp(), _member(meeting_id, reminder_minutes, start_time)])
+    if not args:
+        return 0
+    try:
+        return int(client.eval(_RELEASE_LUA, 1, REMINDER_INDEX_KEY, SENT_MARKER_PREFIX, *args))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not put back {len(reminders)} unsent reminders: {e}")
+        return 0
+
+
+def rebuild_reminder_index(horizon_days=REMINDER_REBUILD_HORIZON_DAYS):
+    """
+    Re-materialise the reminders of every meeting starting within horizon_days
+    (already sent reminders are skipped). Returns counts, or None without Redis.
+    """
+    if get_redis_client() is None:
+        return None
+
+    now = get_current_ist_datetime()
+    window_start = now - timedelta(seconds=REMINDER_GRACE_SECONDS)
+    window_end = now + timedelta(days=horizon_days)
+    counts = {'meetings': 0, 'reminders': 0}
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT sm.id, sm.start_time, sm.reminders_email, sm.reminders_times
+            FROM tbl_ScheduledMeetings sm
+            INNER JOIN tbl_Meetings m ON sm.id = m.ID
+            WHERE sm.start_time >= %s AND sm.start_time < %s
+              AND m.Status IN ('scheduled', 'active')
+        """, [window_start.strftime('%Y-%m-%d %H:%M:%S'), window_end.strftime('%Y-%m-%d %H:%M:%S')])
+        rows = cursor.fetchall()
+
+    for meeting_id, start_time, reminders_email, reminders_times in rows:
+        indexed = index_meeting_reminders_now(
+            meeting_id, start_time, reminders_times if reminders_email else []
+        )
+        counts['meetings'] += 1
+        counts['reminders'] += indexed or 0
+
+    logger.info(f"⏰ Reminder index rebuilt: {counts}")
+    return counts
@@ -1,9 +1,15 @@
 from celery import shared_task
 import logging
+import os
 from .recurring_scheduler import update_recurring_meetings, cleanup_old_meetings
 from .email_scheduler import send_daily_invitation_emails, send_daily_meeting_reminders
+from .periodic import fan_out_pages, singleton_task
+
+# Retries (exponential backoff, capped at 10 minutes) before a meeting is finalised as is
+FINALIZE_MAX_RETRIES = int(os.getenv("FINALIZE_MAX_RETRIES", 8))
 
 @shared_task
+@singleton_task('update_recurring_meetings', lock_timeout=5 * 60)
 def update_recurring_meetings_task():
     """Celery task to update recurring meetings"""
     try:
@@ -16,18 +22,44 @@ def update_recurring_meetings_task():
         return {'success': False, 'error': str(e)}
 
 @shared_task
+@singleton_task('sweep_recurring_meetings')
+def sweep_recurring_meetings_task():
+    """Celery task to advance overdue recurring series missing from the advancement queue"""
+    try:
+        from .recurring_scheduler import sweep_recurring_meetings
+        return sweep_recurring_meetings()
+    except Exception as e:
+        logging.error(f"Recurring sweep failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('send_daily_invitations')
 def send_daily_invitations_task():
-    """Celery task to send daily invitations"""
+    """Celery task to queue today's recurring meeting invitations in chunks on the scheduler queue"""
     try:
+        from .recurring_scheduler import get_todays_recurring_meeting_ids
         logging.info("Starting Celery task: send_daily_invitations")
-        result = send_daily_invitation_emails()
+        result = fan_out_pages(
+            'send_daily_invitations', get_todays_recurring_meeting_ids, send_daily_invitations_chunk_task
+        )
+        return {'success': True, **result}
+    except Exception as e:
+        logging.error(f"Daily invitations task failed: {e}")
+        return {'invitations_sent': 0, 'error': str(e)}
+
+@shared_task
+def send_daily_invitations_chunk_task(meeting_ids):
+    """Celery task to send the daily invitations of one chunk of meetings"""
+    try:
+        result = send_daily_invitation_emails(meeting_ids)
         logging.info(f"Daily invitations sent: {result}")
         return {'invitations_sent': result}
     except Exception as e:
-        logging.error(f"Daily invitations task failed: {e}")
+        logging.error(f"Daily invitations chunk failed: {e}")
         return {'invitations_sent': 0, 'error': str(e)}
 
 @shared_task
+@singleton_task('send_meeting_reminders', lock_timeout=5 * 60)
 def send_meeting_reminders_task():
     """Celery task to send meeting reminders"""
     try:
@@ -40,6 +72,7 @@ def send_meeting_reminders_task():
         return {'reminders_sent': 0, 'error': str(e)}
 
 @shared_task
+@singleton_task('cleanup_old_meetings', lock_timeout=60 * 60)
 def cleanup_old_meetings_task():
     """Celery task to cleanup old meetings"""
     try:
@@ -52,6 +85,7 @@ def cleanup_old_meetings_task():
         return {'archived_count': 0, 'error': str(e)}
 
 @shared_task
+@singleton_task('process_all_recurring_meetings')
 def process_all_recurring_meetings():
     """Combined task to process all recurring meeting operations"""
     try:
@@ -84,4 +118,155 @@ def process_all_recurring_meetings():
         
     except Exception as e:
         logging.error(f"Combined processing failed: {e}")
-        return {'success': False, 'error': str(e)}
\ No newline at end of file
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('refresh_meeting_occurrences', lock_timeout=60 * 60)
+def refresh_meeting_occurrences_task():
+    """Celery task to roll the materialised occurrence horizon of recurring meetings forward, in chunks"""
+    try:
+        from core.WebSocketConnection.meeting_occurrences import get_recurring_series_ids
+        logging.info("Starting Celery task: refresh_meeting_occurrences")
+        result = fan_out_pages(
+            'refresh_meeting_occurrences', get_recurring_series_ids, refresh_meeting_occurrences_chunk_task
+        )
+        return {'success': True, **result}
+    except Exception as e:
+        logging.error(f"Occurrence refresh task failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+def refresh_meeting_occurrences_chunk_task(meeting_ids):
+    """Celery task to re-materialise the occurrences of one chunk of recurring meetings"""
+    try:
+        from core.WebSocketConnection.meeting_occurrences import refresh_series_occurrences
+        stored = refresh_series_occurrences(meeting_ids)
+        logging.info(f"Meeting occurrences refreshed: {len(meeting_ids)} series, {stored} occurrences")
+        return {'success': True, 'series': len(meeting_ids), 'occurrences': stored}
+    except Exception as e:
+        logging.error(f"Occurrence refresh chunk failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('apply_participant_events', lock_timeout=60)
+def apply_participant_events_task():
+    """Celery task to apply queued write-behind join/leave events to tbl_Participants"""
+    try:
+        from core.WebSocketConnection.participant_events import drain_participant_events
+        result = drain_participant_events()
+        if result.get('batches'):
+            logging.info(f"Participant events applied: {result}")
+        return result
+    except Exception as e:
+        logging.error(f"Participant event task failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('purge_participant_event_log', lock_timeout=60 * 60)
+def purge_participant_event_log_task():
+    """Celery task to delete write-behind idempotency keys past the redelivery window"""
+    try:
+        from core.WebSocketConnection.participant_events import purge_participant_event_log
+        deleted = purge_participant_event_log()
+        logging.info(f"Participant event log purged: {deleted} rows")
+        return {'success': True, 'deleted': deleted}
+    except Exception as e:
+        logging.error(f"Participant event log purge failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task(bind=True, max_retries=None)
+def send_mail_batch_task(self, mail):
+    """Celery task to send one mail batch over a pooled SMTP connection, retrying transient failures"""
+    from core.scheduler.mail_dispatch import MAIL_MAX_RETRIES, MAIL_RETRY_BACKOFF, send_mail_now
+    sent, failed, transient = send_mail_now(**mail)
+    if transient and self.request.retries < MAIL_MAX_RETRIES:
+        countdown = MAIL_RETRY_BACKOFF * (2 ** self.request.retries)
+        logging.warning(f"Retrying {len(transient)} recipients of '{mail.get('subject')}' in {countdown}s")
+        raise self.retry(args=[{**mail, 'recipients': transient}], countdown=countdown)
+    if transient:
+        logging.error(f"Giving up on {len(transient)} recipients of '{mail.get('subject')}' after {MAIL_MAX_RETRIES} retries")
+    undeliverable = failed + transient
+    if undeliverable:
+        logging.error(f"Undeliverable recipients of '{mail.get('subject')}': {', '.join(undeliverable)}")
+    return {'sent': len(sent), 'failed': len(undeliverable), 'undeliverable': undeliverable}
+
+@shared_task
+def process_scheduled_reminders_task():
+    """Celery task to turn due tbl_ScheduledReminders rows into notifications (parallel-safe)"""
+    try:
+        from core.WebSocketConnection.notifications import drain_due_reminders
+        processed, failed = drain_due_reminders()
+        if processed or failed:
+            logging.info(f"Scheduled reminders processed: {processed} sent, {failed} failed")
+        return {'success': True, 'processed': processed, 'failed': failed}
+    except Exception as e:
+        logging.error(f"Scheduled reminder task failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('reconcile_notification_counters')
+def reconcile_notification_counters_task():
+    """Celery task to correct the Redis unread notification counters from tbl_Notifications"""
+    try:
+        from core.WebSocketConnection.notification_counters import reconcile_unread_counters
+        result = reconcile_unread_counters()
+        if result.get('corrected'):
+            logging.info(f"Unread notification counters reconciled: {result}")
+        return result
+    except Exception as e:
+        logging.error(f"Unread counter reconciliation failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('rebuild_reminder_index')
+def rebuild_reminder_index_task():
+    """Celery task to re-materialise the meeting reminder due-time index from MySQL"""
+    try:
+        from .reminder_index import rebuild_reminder_index
+        result = rebuild_reminder_index()
+        if result is None:
+            return {'success': False, 'error': 'Redis unavailable'}
+        return {'success': True, **result}
+    except Exception as e:
+        logging.error(f"Reminder index rebuild failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+@singleton_task('cleanup_chat_files')
+def cleanup_chat_files_task():
+    """Celery task to delete chat attachment blobs older than the chat FILE_CACHE_TTL"""
+    try:
+        from core.WebSocketConnection.chat_file_storage import chat_file_storage
+        from core.WebSocketConnection.chat_messages import CACHE_SETTINGS
+        removed = chat_file_storage.cleanup_stale(CACHE_SETTINGS['FILE_CACHE_TTL'])
+        if removed:
+            logging.info(f"Removed {removed} expired chat attachments from {chat_file_storage.name} storage")
+        return {'success': True, 'removed': removed}
+    except Exception as e:
+        logging.error(f"Chat file cleanup failed: {e}")
+        return {'success': False, 'error': str(e)}
+
+class PendingParticipantEvents(Exception):
+    """Write-behind join/leave events of the meeting are not in MySQL yet"""
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_backoff_max=600, retry_jitter=True,
+             max_retries=FINALIZE_MAX_RETRIES)
+def finalize_meeting_task(self, meeting_id, end_time_str):
+    """Celery task to finalise durations and attendance of an ended meeting, retried with backoff on failure"""
+    from core.WebSocketConnection.participants import finalize_meeting_participants, flush_participant_events
+    if not flush_participant_events(meeting_id):
+        if self.request.retries < self.max_retries:
+            raise PendingParticipantEvents(f"Participant events of {meeting_id} still queued")
+        logging.error(f"Finalising {meeting_id} with participant events still queued after {self.request.retries} retries")
+    try:
+        result = finalize_meeting_participants(meeting_id, end_time_str)
+    except Exception as e:
+        logging.error(f"Meeting finalisation task failed for {meeting_id} (attempt {self.request.retries + 1}): {e}")
+        raise
+    logging.info(f"Meeting {meeting_id} finalised: {result['participants_processed']} participants")
+    return {
+        'success': True,
+        'meeting_id': meeting_id,
+        'participants_processed': result['participants_processed'],
+        'host_duration': result['host_duration'],
+    }
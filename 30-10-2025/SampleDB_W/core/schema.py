@@ -0,0 +1,112 @@
+# schema.py - One-time schema bootstrap for the raw SQL tables
+#
+# The tables behind the views are created by create_*_table() helpers next to
+# the code that uses them. They used to run on every request (CREATE TABLE IF
+# NOT EXISTS, ALTER TABLE, information_schema lookups); now they run from the
+# 0004_bootstrap_schema migration, after every `manage.py migrate` (post_migrate,
+# so steps and indexes added later reach existing databases) or from
+# `manage.py ensure_schema`, and request paths assume the schema is in place.
+#
+# Steps run in dependency order (tbl_Users before tbl_Meetings before the
+# tables referencing it). A failing step is logged and the rest still run;
+# bootstrap_schema() then fails the migration with the list of failed steps.
+import importlib
+import logging
+
+from django.db import connection
+
+logger = logging.getLogger('schema')
+
+# (module, table helper); every helper must be safe to re-run on a live database
+SCHEMA_STEPS = (
+    ('core.UserDashBoard.users', 'create_user_table'),
+    ('core.UserDashBoard.users', 'create_otp_table'),
+    ('core.WebSocketConnection.meetings', 'create_meetings_table'),
+    ('core.WebSocketConnection.meetings', 'create_scheduled_meetings_table'),
+    ('core.WebSocketConnection.meetings', 'create_calendar_meeting_table'),
+    ('core.WebSocketConnection.meeting_invitees', 'create_meeting_invitees_table'),
+    ('core.WebSocketConnection.meeting_occurrences', 'create_meeting_occurrences_table'),
+    ('core.WebSocketConnection.participants', 'create_participants_table'),
+    ('core.WebSocketConnection.participant_sessions', 'create_participant_sessions_table'),
+    ('core.WebSocketConnection.participant_events', 'create_participant_event_log_table'),
+    ('core.WebSocketConnection.notifications', 'ensure_notification_tables'),
+    ('core.UserDashBoard.analytics_rollups', 'create_rollup_tables'),
+    ('core.UserDashBoard.feedback', 'create_feedback_table'),
+    ('core.UserDashBoard.meeting_invitations', 'create_meeting_invitations_table'),
+)
+
+# (table, index name, columns) for the hot request queries
+SCHEMA_INDEXES = (
+    # unread counts and notification lists: recipient + is_read, newest first
+    ('tbl_Notifications', 'idx_notifications_recipient_read', ('recipient_email', 'is_read', 'created_at')),
+    # due reminders: is_sent = FALSE AND reminder_time <= now ORDER BY reminder_time
+    ('tbl_ScheduledReminders', 'idx_reminders_due', ('is_sent', 'reminder_time')),
+    # host meeting lists and analytics by creation date
+    ('tbl_Meetings', 'idx_meetings_host_created', ('Host_ID', 'Created_At')),
+    # a user's meeting history
+    ('tbl_Participants', 'idx_participants_user_meeting', ('User_ID', 'Meeting_ID')),
+    # recurring consistency sweep: is_recurring = 1 AND end_time < now - buffer
+    ('tbl_ScheduledMeetings', 'idx_scheduled_recurring_end', ('is_recurring', 'end_time')),
+)
+
+_schema_ready = False
+
+
+def ensure_index(cursor, table, name, columns):
+    """Add an index unless it (or the table) is missing; MySQL has no CREATE INDEX IF NOT EXISTS"""
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM information_schema.tables
+             WHERE table_schema = DATABASE() AND table_name = %s),
+            (SELECT COUNT(*) FROM information_schema.statistics
+             WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s)
+    """, [table, table, name])
+    table_exists, index_exists = cursor.fetchone()
+    if not table_exists or index_exists:
+        return False
+    cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    logger.info(f"✅ Created index {name} on {table}")
+    return True
+
+
+def apply_schema(force=False):
+    """Create every table and index once per process; returns the failed steps"""
+    global _schema_ready
+    if _schema_ready and not force:
+        return []
+
+    failed = []
+    for module_path, function_name in SCHEMA_STEPS:
+        try:
+            result = getattr(importlib.import_module(module_path), function_name)()
+            if result is False:
+                failed.append(function_name)
+        except Exception as e:
+            logger.error(f"❌ Schema step {module_path}.{function_name} failed: {e}")
+            failed.append(function_name)
+
+    with connection.cursor() as cursor:
+        for table, name, columns in SCHEMA_INDEXES:
+            try:
+                ensure_index(cursor, table, name, columns)
+            except Exception as e:
+                logger.error(f"❌ Could not create index {name} on {table}: {e}")
+                failed.append(name)
+
+    _schema_ready = True
+    logger.info(f"✅ Schema bootstrap finished ({len(failed)} failed step(s))")
+    return failed
+
+
+def bootstrap_schema():
+    """apply_schema(force=True) for migrations; raises when any step or index failed"""
+    failed = apply_schema(force=True)
+    if failed:
+        raise RuntimeError(f"Schema bootstrap failed: {', '.join(failed)}")
+
+
+def bootstrap_schema_after_migrate(sender, using='default', **kwargs):
+    """post_migrate receiver (see CoreConfig.ready)"""
+    if using != 'default':
+        return
+    bootstrap_schema()
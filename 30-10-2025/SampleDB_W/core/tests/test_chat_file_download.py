@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from core.WebSocketConnection import chat_messages
+
+FILE_ID = 'a' * 32
+CONTENT = b'0123456789' * 10
+
+
+def fake_iter_file(file_id, start, end):
+    data = CONTENT[start:end + 1]
+    for offset in range(0, len(data), 16):
+        yield data[offset:offset + 16]
+
+
+class DownloadChatFileTests(SimpleTestCase):
+
+    def setUp(self):
+        manager = chat_messages.enhanced_cache_chat_manager
+        for name, value in (
+            ('get_file_info', mock.Mock(return_value={
+                'size': len(CONTENT), 'filename': 'notes.txt', 'content_type': 'application/octet-stream'
+            })),
+            ('iter_file', mock.Mock(side_effect=fake_iter_file)),
+        ):
+            patcher = mock.patch.object(manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def download(self, **headers):
+        request = RequestFactory().get(f'/chat/files/{FILE_ID}/', **headers)
+        return chat_messages.download_chat_file(request, FILE_ID)
+
+    async def read_body(self, response):
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    async def test_body_is_streamed_as_an_async_iterator(self):
+        response = self.download()
+
+        self.assertEqual(response.status_code, 200)
+        # A sync iterator would be read whole into memory before sending under ASGI
+        self.assertTrue(response.is_async)
+        self.assertTrue(hasattr(response.streaming_content, '__anext__'))
+        self.assertEqual(await self.read_body(response), CONTENT)
+
+    async def test_range_is_streamed(self):
+        response = self.download(HTTP_RANGE='bytes=10-29')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-29/{len(CONTENT)}')
+        self.assertTrue(response.is_async)
+        self.assertEqual(await self.read_body(response), CONTENT[10:30])
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+from core.management.commands.check_import_budget import BOOT_SNIPPET
+
+
+class UrlconfImportTests(SimpleTestCase):
+    """Booting Django and importing the URLconf must not load the S3/Mongo/OpenCV stacks"""
+
+    def boot_modules(self):
+        # A fresh interpreter, so modules imported by other tests do not count
+        snippet = BOOT_SNIPPET + "; import sys, json; print(json.dumps(sorted(sys.modules)))"
+        result = subprocess.run(
+            [sys.executable, "-c", snippet],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    def test_urlconf_does_not_import_heavy_clients(self):
+        modules = self.boot_modules()
+        for name in ('boto3', 'pymongo', 'cv2'):
+            with self.subTest(module=name):
+                self.assertNotIn(name, modules)
@@ -0,0 +1,124 @@
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from core.scheduler import mail_dispatch
+from core.scheduler.mail_dispatch import RATE_BUCKET_BULK, RATE_BUCKET_OTP, send_mail_now
+
+REFUSALS = {}
+
+
+class RefusingBackend(BaseEmailBackend):
+    """SMTP stand-in: refuses the recipients listed in REFUSALS with their (code, message)"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            refused = {to: REFUSALS[to] for to in message.to if to in REFUSALS}
+            if refused:
+                raise smtplib.SMTPRecipientsRefused(refused)
+            mail.outbox.append(message)
+        return len(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SendMailNowTests(SimpleTestCase):
+
+    def setUp(self):
+        mail.outbox = []
+        REFUSALS.clear()
+        mail_dispatch._pools.clear()
+        mail_dispatch._local_next_send.clear()
+        # No throttling
+        for patcher in (
+            mock.patch.object(mail_dispatch, 'get_redis_client', return_value=None),
+            mock.patch.object(mail_dispatch, 'MAIL_RATE_PER_SECOND', 0),
+            mock.patch.object(mail_dispatch, 'MAIL_OTP_RATE_PER_SECOND', 0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_one_message_per_recipient(self):
+        sent, failed, transient = send_mail_now('Hello', 'Body', ['a@example.com', 'b@example.com', 'not-an-email'])
+
+        self.assertEqual(sent, ['a@example.com', 'b@example.com'])
+        self.assertEqual(failed, ['not-an-email'])
+        self.assertEqual(transient, [])
+        self.assertEqual([message.to for message in mail.outbox], [['a@example.com'], ['b@example.com']])
+
+    def test_4xx_refusal_is_retried_and_5xx_is_not(self):
+        REFUSALS['greylisted@example.com'] = (450, b'Try again later')
+        REFUSALS['unknown@example.com'] = (550, b'No such user')
+        backend = {'backend': f'{__name__}.RefusingBackend'}
+
+        sent, failed, transient = send_mail_now(
+            'Hello', 'Body', ['greylisted@example.com', 'unknown@example.com', 'ok@example.com'],
+            connection_kwargs=backend,
+        )
+
+        self.assertEqual(sent, ['ok@example.com'])
+        self.assertEqual(failed, ['unknown@example.com'])
+        self.assertEqual(transient, ['greylisted@example.com'])
+
+    def test_batch_task_reports_undeliverable_recipients(self):
+        from core.scheduler.tasks import send_mail_batch_task
+
+        REFUSALS['unknown@example.com'] = (550, b'No such user')
+        result = send_mail_batch_task({
+            'subject': 'Invitation', 'body': 'Body', 'recipients': ['unknown@example.com', 'ok@example.com'],
+            'connection_kwargs': {'backend': f'{__name__}.RefusingBackend'},
+        })
+
+        self.assertEqual(result, {'sent': 1, 'failed': 1, 'undeliverable': ['unknown@example.com']})
+
+    def test_is_transient(self):
+        self.assertTrue(mail_dispatch._is_transient(smtplib.SMTPRecipientsRefused({'a@x.com': (421, b'busy')})))
+        self.assertFalse(mail_dispatch._is_transient(smtplib.SMTPRecipientsRefused({'a@x.com': (550, b'no')})))
+        self.assertTrue(mail_dispatch._is_transient(smtplib.SMTPServerDisconnected()))
+        self.assertTrue(mail_dispatch._is_transient(smtplib.SMTPDataError(451, b'later')))
+        self.assertFalse(mail_dispatch._is_transient(smtplib.SMTPDataError(554, b'rejected')))
+
+
+class RateBucketTests(SimpleTestCase):
+
+    def test_otp_has_its_own_bucket(self):
+        counters = {}
+
+        class Pipeline:
+            def __init__(self):
+                self.key = None
+
+            def incr(self, key):
+                self.key = key
+
+            def expire(self, key, seconds):
+                pass
+
+            def execute(self):
+                counters[self.key] = counters.get(self.key, 0) + 1
+                return [counters[self.key]]
+
+        clock = [1000.5]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        client = mock.Mock(pipeline=Pipeline)
+        with mock.patch.object(mail_dispatch, 'get_redis_client', return_value=client), \
+                mock.patch.object(mail_dispatch, 'MAIL_RATE_PER_SECOND', 2), \
+                mock.patch.object(mail_dispatch, 'MAIL_OTP_RATE_PER_SECOND', 2), \
+                mock.patch.object(mail_dispatch.time, 'time', side_effect=lambda: clock[0]), \
+                mock.patch.object(mail_dispatch.time, 'sleep', side_effect=sleep):
+            mail_dispatch._wait_for_send_slot(RATE_BUCKET_BULK)
+            mail_dispatch._wait_for_send_slot(RATE_BUCKET_BULK)
+            # The bulk bucket is full for this second; OTP mail still goes out at once
+            mail_dispatch._wait_for_send_slot(RATE_BUCKET_OTP)
+            self.assertEqual(sleeps, [])
+            mail_dispatch._wait_for_send_slot(RATE_BUCKET_BULK)
+
+        self.assertEqual(sleeps, [0.5])
+        self.assertEqual(counters, {'mail_rate:bulk:1000': 3, 'mail_rate:otp:1000': 1, 'mail_rate:bulk:1001': 1})
@@ -0,0 +1,42 @@
+from datetime import date, datetime, timedelta
+
+from django.test import SimpleTestCase
+
+from core.utils.date_utils import convert_to_ist
+from core.WebSocketConnection.meeting_occurrences import _scheduled_meeting_data, expand_series_for_horizon
+
+SERIES_START = date(2025, 11, 3)
+
+
+def scheduled_row(start_time, occurrences=5):
+    """A tbl_ScheduledMeetings row in SCHEDULED_SERIES_COLUMNS order: daily series from SERIES_START"""
+    return (
+        'series-1', 12, start_time, start_time + timedelta(hours=1), 60,
+        1, 'daily', 1,
+        occurrences, None,
+        None, None, None, None, SERIES_START,
+    )
+
+
+class AdvancedSeriesExpansionTests(SimpleTestCase):
+
+    def test_advanced_count_limited_series_ends_at_its_last_occurrence(self):
+        # The scheduler has advanced the series to its fourth occurrence
+        row = scheduled_row(datetime(2025, 11, 6, 10, 0))
+        now = convert_to_ist(datetime(2025, 11, 6, 9, 0))
+
+        occurrences = expand_series_for_horizon(_scheduled_meeting_data(row), now)
+
+        self.assertEqual(
+            [start.date() for start, _ in occurrences],
+            [date(2025, 11, 5), date(2025, 11, 6), date(2025, 11, 7)]
+        )
+        for start, end in occurrences:
+            self.assertEqual((start.hour, end - start), (10, timedelta(hours=1)))
+
+    def test_series_that_was_not_advanced_is_unchanged(self):
+        row = scheduled_row(datetime(2025, 11, 3, 10, 0))
+        meeting_data = _scheduled_meeting_data(row)
+
+        self.assertEqual(meeting_data['start_time'], convert_to_ist(datetime(2025, 11, 3, 10, 0)))
+        self.assertEqual(meeting_data['end_time'], convert_to_ist(datetime(2025, 11, 3, 11, 0)))
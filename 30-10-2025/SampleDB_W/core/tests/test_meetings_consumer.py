@@ -0,0 +1,105 @@
+from unittest import mock
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.test import SimpleTestCase, override_settings
+
+from core.WebSocketConnection.meeting_events import (
+    EVENT_CHAT,
+    EVENT_TYPES,
+    issue_meeting_socket_token,
+    meeting_group_name,
+)
+from core.WebSocketConnection.routing import websocket_urlpatterns
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+def with_session(application, user_id):
+    """Stands in for SessionMiddlewareStack with a logged-in session"""
+    async def app(scope, receive, send):
+        session = SessionStore()
+        session['User_Id'] = user_id
+        return await application(dict(scope, session=session), receive, send)
+    return app
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class MeetingConsumerTests(SimpleTestCase):
+
+    def setUp(self):
+        # Sequence numbers and the resume log live in Redis
+        for name, value in (('get_current_seq', 0), ('get_events_since', ([], True))):
+            patcher = mock.patch(f'core.WebSocketConnection.meetings_consumers.{name}', return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.application = URLRouter(websocket_urlpatterns)
+
+    async def open_socket(self, query='', meeting_id='m1', application=None):
+        communicator = WebsocketCommunicator(application or self.application, f'/ws/meeting/{meeting_id}/?{query}')
+        connected, code = await communicator.connect()
+        return communicator, connected, code
+
+    async def test_query_string_user_id_is_rejected(self):
+        communicator, connected, code = await self.open_socket('user_id=12')
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_token_for_another_meeting_is_rejected(self):
+        token = issue_meeting_socket_token('m2', '12')
+        communicator, connected, code = await self.open_socket(f'token={token}')
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_tampered_token_is_rejected(self):
+        token = issue_meeting_socket_token('m1', '12')
+        communicator, connected, code = await self.open_socket(f'token={token[:-2]}xx')
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_signed_token_connects_and_subscribes(self):
+        token = issue_meeting_socket_token('m1', '12')
+        communicator, connected, _ = await self.open_socket(f'token={token}')
+        self.assertTrue(connected)
+        frame = await communicator.receive_json_from()
+        self.assertEqual(frame, {'type': 'subscribed', 'types': sorted(EVENT_TYPES), 'seq': 0})
+        await communicator.disconnect()
+
+    async def test_session_member_connects(self):
+        with mock.patch('core.WebSocketConnection.meetings_consumers.is_meeting_member', return_value=True) as member:
+            communicator, connected, _ = await self.open_socket(
+                'types=chat', application=with_session(self.application, 7)
+            )
+        self.assertTrue(connected)
+        member.assert_called_once_with('m1', '7')
+        frame = await communicator.receive_json_from()
+        self.assertEqual(frame['types'], [EVENT_CHAT])
+        await communicator.disconnect()
+
+    async def test_session_user_outside_the_meeting_is_rejected(self):
+        with mock.patch('core.WebSocketConnection.meetings_consumers.is_meeting_member', return_value=False):
+            communicator, connected, code = await self.open_socket(application=with_session(self.application, 7))
+        self.assertFalse(connected)
+        self.assertEqual(code, 4403)
+
+    async def test_private_chat_reaches_only_sender_and_recipients(self):
+        sockets = {}
+        for user_id in ('1', '2', '3'):
+            token = issue_meeting_socket_token('m1', user_id)
+            communicator, connected, _ = await self.open_socket(f'token={token}&types=chat')
+            self.assertTrue(connected)
+            await communicator.receive_json_from()
+            sockets[user_id] = communicator
+
+        event = {'seq': 1, 'type': EVENT_CHAT, 'action': 'private', 'sender_id': '1', 'recipients': ['2']}
+        await get_channel_layer().group_send(
+            meeting_group_name('m1', EVENT_CHAT), {'type': 'meeting.event', 'event': event}
+        )
+
+        self.assertEqual((await sockets['1'].receive_json_from())['event'], event)
+        self.assertEqual((await sockets['2'].receive_json_from())['event'], event)
+        self.assertTrue(await sockets['3'].receive_nothing())
+        for communicator in sockets.values():
+            await communicator.disconnect()
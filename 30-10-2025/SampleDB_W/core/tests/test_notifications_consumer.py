@@ -0,0 +1,84 @@
+from unittest import mock
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.test import SimpleTestCase, override_settings
+
+from core.WebSocketConnection.notification_counters import (
+    issue_notification_socket_token,
+    notification_group_name,
+)
+from core.WebSocketConnection.routing import websocket_urlpatterns
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+EMAILS = {'7': 'seven@example.com', '12': 'twelve@example.com'}
+
+
+def with_session(application, user_id):
+    """Stands in for SessionMiddlewareStack with a logged-in session"""
+    async def app(scope, receive, send):
+        session = SessionStore()
+        session['User_Id'] = user_id
+        return await application(dict(scope, session=session), receive, send)
+    return app
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class NotificationConsumerTests(SimpleTestCase):
+
+    def setUp(self):
+        for name, value in (
+            ('get_recipient_email', mock.Mock(side_effect=EMAILS.get)),
+            ('get_unread_count', mock.Mock(return_value=3)),
+        ):
+            patcher = mock.patch(f'core.WebSocketConnection.notifications_consumers.{name}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.application = URLRouter(websocket_urlpatterns)
+
+    async def open_socket(self, query='', application=None):
+        communicator = WebsocketCommunicator(application or self.application, f'/ws/notifications/?{query}')
+        connected, code = await communicator.connect()
+        return communicator, connected, code
+
+    async def test_query_string_email_is_rejected(self):
+        communicator, connected, code = await self.open_socket('email=seven@example.com')
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_tampered_token_is_rejected(self):
+        token = issue_notification_socket_token('12')
+        communicator, connected, code = await self.open_socket(f'token={token[:-2]}xx')
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_token_for_inactive_user_is_rejected(self):
+        communicator, connected, code = await self.open_socket(f'token={issue_notification_socket_token("99")}')
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_signed_token_subscribes_to_own_counts(self):
+        communicator, connected, _ = await self.open_socket(f'token={issue_notification_socket_token("12")}')
+        self.assertTrue(connected)
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'unread_count', 'unread_count': 3})
+
+        await get_channel_layer().group_send(
+            notification_group_name('twelve@example.com'), {'type': 'notification.count', 'unread_count': 4}
+        )
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'unread_count', 'unread_count': 4})
+        await communicator.disconnect()
+
+    async def test_session_user_ignores_requested_email(self):
+        communicator, connected, _ = await self.open_socket(
+            'email=twelve@example.com', application=with_session(self.application, 7)
+        )
+        self.assertTrue(connected)
+        await communicator.receive_json_from()
+
+        await get_channel_layer().group_send(
+            notification_group_name('twelve@example.com'), {'type': 'notification.count', 'unread_count': 9}
+        )
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
@@ -0,0 +1,107 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.utils.redis_registry import get_redis_client
+from core.WebSocketConnection import participant_events
+from core.WebSocketConnection.participant_events import (
+    ACTION_JOIN,
+    ACTION_LEAVE,
+    CONSUMER_GROUP,
+    PARTICIPANT_EVENT_MAX_DELIVERIES,
+    drain_participant_events,
+    enqueue_participant_event,
+)
+
+STORM_USERS = 300
+POISON_USER = 7
+
+
+class RecordingApplier:
+    """Stands in for the MySQL apply: records each event once, fails on the poison join"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.applied = {}
+
+    def __call__(self, events):
+        if any(int(event['user_id']) == POISON_USER and event['action'] == ACTION_JOIN for event in events):
+            raise RuntimeError('poison event')
+        with self.lock:
+            fresh = [event for event in events if event['event_id'] not in self.applied]
+            for event in fresh:
+                self.applied[event['event_id']] = event
+        return len(fresh), len(events) - len(fresh)
+
+
+class ParticipantJoinStormTests(SimpleTestCase):
+    """Join/leave storm through a local Redis stream (skipped when Redis is not running)"""
+
+    def setUp(self):
+        self.client = get_redis_client()
+        if self.client is None:
+            self.skipTest('local Redis not available')
+
+        suffix = uuid.uuid4().hex[:8]
+        self.stream_key = f"test_participant_events:{suffix}"
+        self.dead_key = f"{self.stream_key}:dead"
+        self.meeting_id = str(uuid.uuid4())
+        self.applier = RecordingApplier()
+        for name, value in (
+            ('STREAM_KEY', self.stream_key),
+            ('DEAD_LETTER_STREAM_KEY', self.dead_key),
+            ('CLAIM_IDLE_MS', 0),
+            ('apply_participant_events', self.applier),
+        ):
+            patcher = mock.patch.object(participant_events, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(
+            self.client.delete, self.stream_key, self.dead_key, participant_events._roster_key(self.meeting_id)
+        )
+
+    def enqueue_user(self, user_id):
+        events = []
+        for action in (ACTION_JOIN, ACTION_LEAVE):
+            event = enqueue_participant_event(
+                self.meeting_id, user_id, action, '2025-10-30 10:00:00', full_name=f"User {user_id}"
+            )
+            self.assertIsNotNone(event)
+            events.append(event)
+        return events
+
+    def test_storm_is_applied_once_and_poison_event_is_dead_lettered(self):
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            events = [event for user_events in pool.map(self.enqueue_user, range(STORM_USERS)) for event in user_events]
+        poison = next(e for e in events if int(e['user_id']) == POISON_USER and e['action'] == ACTION_JOIN)
+
+        dead_lettered = 0
+        for _ in range(PARTICIPANT_EVENT_MAX_DELIVERIES + 2):
+            dead_lettered += drain_participant_events(batch_size=50)['dead_lettered']
+
+        self.assertEqual(dead_lettered, 1)
+        self.assertEqual(
+            set(self.applier.applied),
+            {event['event_id'] for event in events} - {poison['event_id']}
+        )
+
+        dead = self.client.xrange(self.dead_key)
+        self.assertEqual(len(dead), 1)
+        self.assertEqual(dead[0][1]['event_id'], poison['event_id'])
+        self.assertGreaterEqual(int(dead[0][1]['deliveries']), PARTICIPANT_EVENT_MAX_DELIVERIES)
+
+        self.assertEqual(self.client.xpending(self.stream_key, CONSUMER_GROUP)['pending'], 0)
+        self.assertEqual(self.client.hlen(participant_events._roster_key(self.meeting_id)), 0)
+
+    def test_leave_waits_behind_a_failing_join(self):
+        self.enqueue_user(POISON_USER)
+
+        result = drain_participant_events(batch_size=50, max_batches=1)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['failed'], 2)
+        self.assertEqual(self.applier.applied, {})
+        self.assertEqual(self.client.xpending(self.stream_key, CONSUMER_GROUP)['pending'], 2)
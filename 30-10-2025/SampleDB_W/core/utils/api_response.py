@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+# orjson is optional - fall back to the stdlib encoder when it is missing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+SCHEMA_V1 = 'v1'  # legacy payload with every field alias
+SCHEMA_V2 = 'v2'  # compact payload, one key per field
+
+SCHEMA_ALIASES = {
+    '1': SCHEMA_V1,
+    'v1': SCHEMA_V1,
+    'legacy': SCHEMA_V1,
+    '2': SCHEMA_V2,
+    'v2': SCHEMA_V2,
+    'compact': SCHEMA_V2,
+}
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def get_response_schema(request):
+    """Resolve the response schema from ?schema= or the X-Response-Schema header"""
+    requested = request.GET.get('schema') or request.META.get('HTTP_X_RESPONSE_SCHEMA', '')
+    return SCHEMA_ALIASES.get(str(requested).strip().lower(), SCHEMA_V1)
+
+
+def get_requested_fields(request):
+    """Parse ?fields=a,b,c into a list of keys, or None when no projection is requested"""
+    raw_fields = request.GET.get('fields', '')
+    fields = [field.strip() for field in raw_fields.split(',') if field.strip()]
+    return fields or None
+
+
+def compact_item(item, field_map):
+    """Build a compact dict from a legacy dict using a {compact_key: legacy_key} map"""
+    return {compact_key: item.get(legacy_key) for compact_key, legacy_key in field_map.items()}
+
+
+def project_fields(item, fields):
+    """Keep only the requested keys of a dict (unknown keys are ignored)"""
+    return {field: item[field] for field in fields if field in item}
+
+
+def project_items(request, items):
+    """Apply the fields= projection to a list of dicts already built in the requested schema"""
+    fields = get_requested_fields(request)
+    if fields:
+        items = [project_fields(item, fields) for item in items]
+    return items
+
+
+def shape_items(request, items, v2_field_map):
+    """Apply the requested schema and fields= projection to a list of legacy dicts"""
+    if get_response_schema(request) == SCHEMA_V2:
+        items = [compact_item(item, v2_field_map) for item in items]
+    return project_items(request, items)
+
+
+def _default(obj):
+    """
+    Serialize types the way JsonResponse would. Dates and times are passed
+    through orjson (OPT_PASSTHROUGH_DATETIME) so they keep the v1 format:
+    milliseconds and "Z" instead of microseconds and "+00:00".
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return _django_encoder.default(obj)
+
+
+def fast_json_dumps(data):
+    """Serialize to compact JSON bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+
+
+def compute_etag(body):
+    """Strong ETag for a serialized response body"""
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(request, etag):
+    """Check an ETag against the request's If-None-Match header (weak comparison)"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    candidates = [tag[2:] if tag.startswith('W/') else tag for tag in candidates]
+    return etag in candidates
+
+
+def conditional_json_response(request, data, status=200):
+    """
+    Serialize data once, tag it with an ETag and return 304 when the client
+    already holds the same representation.
+    """
+    body = fast_json_dumps(data)
+    etag = compute_etag(body)
+
+    if status == 200 and etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        logging.debug(f"304 Not Modified for {request.path} ({etag})")
+    else:
+        response = HttpResponse(body, content_type='application/json', status=status)
+        response['ETag'] = etag
+
+    # Let clients cache the list but always revalidate
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('X-Response-Schema',))
+    return response
@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import date, datetime
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor token cannot be decoded"""
+
+
+def keyset_value(value):
+    """JSON-safe form of a sort key (datetimes keep microseconds so ties stay ordered)"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+
+def encode_cursor(*values):
+    """Opaque, URL-safe token for the sort key of the last row on a page"""
+    raw = json.dumps([keyset_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Sort key values from a token made by encode_cursor; None for an empty token"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_page_size(request, default, maximum):
+    """?limit= clamped to 1..maximum"""
+    try:
+        limit = int(request.GET.get('limit', default))
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
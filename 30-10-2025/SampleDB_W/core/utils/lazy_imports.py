@@ -0,0 +1,42 @@
+import importlib
+import logging
+
+from django.utils.functional import SimpleLazyObject
+
+# Modules that must never be imported while Django loads settings/urls.
+# Checked by `manage.py check_import_budget`.
+HEAVY_MODULES = (
+    'torch',
+    'transformers',
+    'mediapipe',
+    'insightface',
+    'onnxruntime',
+    'graphviz',
+    'pydub',
+    'openai',
+    'boto3',
+    'pymongo',
+    'cv2',
+)
+
+
+def lazy_module(name, on_import=None):
+    """
+    Proxy for a module that is imported on first attribute access.
+
+    on_import(module) runs once, right after the real import, for module level
+    configuration such as API keys.
+    """
+    def _load():
+        module = importlib.import_module(name)
+        logging.debug(f"Lazy import: {name}")
+        if on_import:
+            on_import(module)
+        return module
+
+    return SimpleLazyObject(_load)
+
+
+def lazy_object(factory):
+    """Proxy for a client/model that is built by factory() on first use"""
+    return SimpleLazyObject(factory)
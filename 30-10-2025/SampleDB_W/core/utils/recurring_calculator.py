@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
+import calendar
 import json
 import logging
 from .date_utils import get_current_ist_datetime, convert_to_ist, parse_datetime_safely
@@ -377,4 +378,240 @@ def is_recurrence_ended(meeting_data, check_date=None):
         # For now, just use end date logic
         pass
     
-    return False
\ No newline at end of file
+    return False
+
+# ---------------------------------------------------------------------------
+# Occurrence expansion
+# ---------------------------------------------------------------------------
+
+WEEKDAY_NAMES = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+def _load_json_list(value):
+    """Accept a list or a JSON-encoded list; anything else becomes []"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, list) else []
+        except (json.JSONDecodeError, ValueError):
+            return []
+    return []
+
+def _normalize_weekdays(selected_days, default_weekday):
+    """Selected days as sorted weekday numbers (0=Monday), same mapping as calculate_weekly_occurrence"""
+    weekdays = set()
+    for day in _load_json_list(selected_days):
+        if isinstance(day, str) and not day.isdigit():
+            if day.lower() in WEEKDAY_NAMES:
+                weekdays.add(WEEKDAY_NAMES[day.lower()])
+        else:
+            try:
+                weekdays.add(int(day) % 7)
+            except (TypeError, ValueError):
+                continue
+    return sorted(weekdays) if weekdays else [default_weekday]
+
+def _normalize_month_days(meeting_data, start_time):
+    """Days of the month a monthly series lands on"""
+    pattern = meeting_data.get('monthly_pattern') or 'same-date'
+    if pattern in ('selected-dates', 'specific-dates'):
+        days = set()
+        for day in _load_json_list(meeting_data.get('selected_month_dates')):
+            try:
+                day = int(day)
+            except (TypeError, ValueError):
+                continue
+            if 1 <= day <= 31:
+                days.add(day)
+        if days:
+            return sorted(days)
+    return [start_time.day]
+
+def _months_between(earlier, later):
+    return (later.year - earlier.year) * 12 + (later.month - earlier.month)
+
+def _as_ist_datetime(value):
+    """Parse strings, dates and naive/aware datetimes into IST datetimes"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return convert_to_ist(value)
+    if hasattr(value, 'year') and not isinstance(value, datetime):
+        return convert_to_ist(datetime.combine(value, datetime.min.time()))
+    return parse_datetime_safely(value)
+
+def get_series_bounds(meeting_data):
+    """
+    Parse the fields every expansion needs.
+    Returns (start_time, duration, series_end, max_occurrences) or None.
+    """
+    start_time = _as_ist_datetime(meeting_data.get('start_time'))
+    if not start_time:
+        return None
+
+    end_time = _as_ist_datetime(meeting_data.get('end_time'))
+    if end_time and end_time > start_time:
+        duration = end_time - start_time
+    else:
+        duration = timedelta(minutes=int(meeting_data.get('duration_minutes') or 60))
+
+    # Series stops at the end of its recurrence end date (and visibility end date, if any)
+    series_end = None
+    for field in ('recurrence_end_date', 'end_date'):
+        boundary = _as_ist_datetime(meeting_data.get(field))
+        if boundary:
+            boundary = convert_to_ist(datetime.combine(boundary.date(), datetime.max.time()))
+            series_end = boundary if series_end is None else min(series_end, boundary)
+
+    max_occurrences = meeting_data.get('recurrence_occurrences')
+    try:
+        max_occurrences = int(max_occurrences) if max_occurrences else None
+    except (TypeError, ValueError):
+        max_occurrences = None
+
+    return start_time, duration, series_end, max_occurrences
+
+def _iter_period_dates(meeting_data, start_time, first_period):
+    """
+    Yield candidate occurrence dates in ascending order, starting at the
+    recurrence period `first_period`. Each period is computed directly from
+    its index, so callers can jump to a window without walking day by day.
+    """
+    recurrence_type = meeting_data.get('recurrence_type')
+    interval = max(int(meeting_data.get('recurrence_interval') or 1), 1)
+    start_date = start_time.date()
+
+    if recurrence_type == 'daily':
+        period = first_period
+        while True:
+            yield start_date + timedelta(days=period * interval)
+            period += 1
+
+    elif recurrence_type == 'weekly':
+        weekdays = _normalize_weekdays(meeting_data.get('selected_days'), start_time.weekday())
+        week_zero = start_date - timedelta(days=start_date.weekday())
+        period = first_period
+        while True:
+            week_start = week_zero + timedelta(weeks=period * interval)
+            for weekday in weekdays:
+                yield week_start + timedelta(days=weekday)
+            period += 1
+
+    elif recurrence_type == 'monthly':
+        month_days = _normalize_month_days(meeting_data, start_time)
+        month_zero = start_date.replace(day=1)
+        period = first_period
+        while True:
+            month_start = month_zero + relativedelta(months=period * interval)
+            last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+            for day in month_days:
+                if day <= last_day:
+                    yield month_start.replace(day=day)
+            period += 1
+
+def _first_period_for(meeting_data, start_time, from_date):
+    """Index of the recurrence period that contains from_date"""
+    if from_date <= start_time.date():
+        return 0
+
+    recurrence_type = meeting_data.get('recurrence_type')
+    interval = max(int(meeting_data.get('recurrence_interval') or 1), 1)
+    start_date = start_time.date()
+
+    if recurrence_type == 'daily':
+        return (from_date - start_date).days // interval
+    if recurrence_type == 'weekly':
+        week_zero = start_date - timedelta(days=start_date.weekday())
+        return ((from_date - week_zero).days // 7) // interval
+    if recurrence_type == 'monthly':
+        return _months_between(start_date, from_date) // interval
+    return 0
+
+def _occurrences_before_period(meeting_data, start_time, period):
+    """
+    How many occurrences a series has before recurrence period `period`, so a
+    count-limited series can jump to a window and still stop at its Nth date.
+    """
+    if period <= 0:
+        return 0
+
+    recurrence_type = meeting_data.get('recurrence_type')
+    start_date = start_time.date()
+
+    if recurrence_type == 'daily':
+        return period
+
+    if recurrence_type == 'weekly':
+        weekdays = _normalize_weekdays(meeting_data.get('selected_days'), start_time.weekday())
+        first_week = len([weekday for weekday in weekdays if weekday >= start_date.weekday()])
+        return first_week + (period - 1) * len(weekdays)
+
+    if recurrence_type == 'monthly':
+        interval = max(int(meeting_data.get('recurrence_interval') or 1), 1)
+        month_days = _normalize_month_days(meeting_data, start_time)
+        month_zero = start_date.replace(day=1)
+
+        last_day = calendar.monthrange(month_zero.year, month_zero.month)[1]
+        count = len([day for day in month_days if start_date.day <= day <= last_day])
+        if month_days[-1] <= 28:
+            # Every month has all the selected dates
+            return count + (period - 1) * len(month_days)
+        for index in range(1, period):
+            month_start = month_zero + relativedelta(months=index * interval)
+            last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+            count += len([day for day in month_days if day <= last_day])
+        return count
+
+    return 0
+
+def expand_occurrences(meeting_data, window_start, window_end):
+    """
+    Every occurrence of a meeting that overlaps [window_start, window_end),
+    as a list of (start, end) IST datetimes.
+
+    Handles one-off meetings and daily/weekly/monthly series with interval,
+    selected_days, selected_month_dates, monthly_pattern, end date and
+    occurrence count.
+    """
+    bounds = get_series_bounds(meeting_data)
+    if not bounds:
+        return []
+    start_time, duration, series_end, max_occurrences = bounds
+
+    window_start = convert_to_ist(window_start)
+    window_end = convert_to_ist(window_end)
+
+    if not meeting_data.get('is_recurring') or meeting_data.get('recurrence_type') not in ('daily', 'weekly', 'monthly'):
+        if start_time < window_end and start_time + duration > window_start:
+            return [(start_time, start_time + duration)]
+        return []
+
+    # Jump straight to the period containing the window; a count-limited
+    # series carries over the number of occurrences it already had.
+    first_period = _first_period_for(meeting_data, start_time, (window_start - duration).date())
+    emitted = _occurrences_before_period(meeting_data, start_time, first_period) if max_occurrences else 0
+    if max_occurrences and emitted >= max_occurrences:
+        return []
+
+    occurrences = []
+    for occurrence_date in _iter_period_dates(meeting_data, start_time, first_period):
+        occurrence_start = convert_to_ist(datetime.combine(occurrence_date, start_time.time()))
+        if occurrence_start < start_time:
+            continue
+        if occurrence_start >= window_end:
+            break
+        if series_end and occurrence_start > series_end:
+            break
+        if max_occurrences and emitted >= max_occurrences:
+            break
+
+        emitted += 1
+        occurrence_end = occurrence_start + duration
+        if occurrence_end > window_start:
+            occurrences.append((occurrence_start, occurrence_end))
+
+    return occurrences
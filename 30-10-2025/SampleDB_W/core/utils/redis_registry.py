@@ -0,0 +1,228 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+
+import redis
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+
+logger = logging.getLogger('redis_registry')
+
+# Logical stores -> env prefix and default DB. Each store keeps the env
+# variables its module used before (CACHE_CHAT_HOST, CACHE_CHAT_DB, ...).
+DEFAULT_STORE = 'default'
+
+REDIS_STORES = {
+    'default': {'env_prefix': 'REDIS', 'db': 0},
+    'whiteboard': {'env_prefix': 'REDIS', 'db': 0},
+    'chat': {'env_prefix': 'CACHE_CHAT', 'db': 3},
+    'hand_raise': {'env_prefix': 'CACHE_HAND_RAISE', 'db': 4},
+    'reactions': {'env_prefix': 'CACHE_REACTIONS', 'db': 5},
+}
+
+# Connections per pool (stores on the same host/port/db share one pool)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 20))
+# Seconds a caller waits for a free pooled connection
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 2))
+# Seconds between pings while a store is healthy
+REDIS_HEALTH_CHECK_INTERVAL = float(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+# Backoff window after a failed ping: doubles up to the max
+REDIS_BACKOFF_BASE = float(os.getenv("REDIS_BACKOFF_BASE", 1))
+REDIS_BACKOFF_MAX = float(os.getenv("REDIS_BACKOFF_MAX", 60))
+
+_lock = threading.Lock()
+_pools = {}
+# id(loop) -> (loop, {pool key: asyncio pool}); see _loop_async_pools()
+_async_pools = {}
+_health = {}
+
+
+class _PoolHealth:
+    def __init__(self):
+        self.ok_until = 0.0
+        self.down_until = 0.0
+        self.failures = 0
+
+
+def get_store_config(store):
+    """Connection kwargs for a logical store, read from the environment"""
+    if store not in REDIS_STORES:
+        raise KeyError(f"Unknown Redis store: {store}")
+    prefix = REDIS_STORES[store]['env_prefix']
+    return {
+        'host': os.getenv(f"{prefix}_HOST", "localhost"),
+        'port': int(os.getenv(f"{prefix}_PORT", 6379)),
+        'db': int(os.getenv(f"{prefix}_DB", REDIS_STORES[store]['db'])),
+        'decode_responses': os.getenv(f"{prefix}_DECODE_RESPONSES", "True") == "True",
+        'socket_timeout': float(os.getenv(f"{prefix}_SOCKET_TIMEOUT", 5)),
+        'socket_connect_timeout': float(os.getenv(f"{prefix}_CONNECT_TIMEOUT", 2)),
+    }
+
+
+def _pool_key(config):
+    return (config['host'], config['port'], config['db'], config['decode_responses'])
+
+
+def _get_pool(store):
+    """Create the blocking pool for a store on first use; no connection is opened here"""
+    config = get_store_config(store)
+    key = _pool_key(config)
+    pool = _pools.get(key)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = redis.BlockingConnectionPool(
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    timeout=REDIS_POOL_TIMEOUT,
+                    socket_keepalive=True,
+                    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                    retry_on_timeout=True,
+                    retry=Retry(ExponentialBackoff(cap=0.5, base=0.05), 2),
+                    **config
+                )
+                _pools[key] = pool
+                _health[key] = _PoolHealth()
+                logger.info(f"Redis pool created for {config['host']}:{config['port']}/{config['db']} (store '{store}')")
+    return key, pool
+
+
+def _mark_down(key, error):
+    health = _health[key]
+    health.failures += 1
+    backoff = min(REDIS_BACKOFF_BASE * (2 ** (health.failures - 1)), REDIS_BACKOFF_MAX)
+    health.ok_until = 0.0
+    health.down_until = time.monotonic() + backoff
+    logger.warning(f"⚠️ Redis {key[0]}:{key[1]}/{key[2]} unavailable ({error}); retrying in {backoff:.0f}s")
+
+
+def get_redis_client(store=DEFAULT_STORE):
+    """
+    Pooled client for a logical store, or None while the store is down.
+
+    The first call (and one call per health-check interval) pings the
+    server; after a failure the store is skipped until its backoff expires.
+    """
+    key, pool = _get_pool(store)
+    health = _health[key]
+    now = time.monotonic()
+
+    if now < health.down_until:
+        return None
+
+    client = redis.Redis(connection_pool=pool)
+    if now < health.ok_until:
+        return client
+
+    try:
+        client.ping()
+    except redis.RedisError as e:
+        _mark_down(key, e)
+        return None
+
+    if health.failures:
+        logger.info(f"✅ Redis {key[0]}:{key[1]}/{key[2]} reachable again")
+    health.failures = 0
+    health.ok_until = now + REDIS_HEALTH_CHECK_INTERVAL
+    return client
+
+
+def _loop_async_pools(loop):
+    """
+    asyncio pools of one event loop.
+
+    Pools are bound to the loop that opened their connections. Each async_to_sync
+    call from a plain thread runs on a new loop, so entries of closed loops are
+    dropped whenever a new loop registers; holding the loop in the entry keeps
+    its id from being reused by a later loop while the entry exists.
+    """
+    entry = _async_pools.get(id(loop))
+    if entry is None:
+        with _lock:
+            for loop_id, (other_loop, _) in list(_async_pools.items()):
+                if other_loop.is_closed():
+                    del _async_pools[loop_id]
+            entry = _async_pools.setdefault(id(loop), (loop, {}))
+    return entry[1]
+
+
+def get_async_redis_client(store=DEFAULT_STORE):
+    """
+    asyncio client for a logical store, pooled per event loop.
+    Returns None while the store is in its backoff window.
+    """
+    import redis.asyncio as aioredis
+
+    key, _ = _get_pool(store)
+    if time.monotonic() < _health[key].down_until:
+        return None
+
+    pools = _loop_async_pools(asyncio.get_running_loop())
+    pool = pools.get(key)
+    if pool is None:
+        pool = aioredis.BlockingConnectionPool(
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+            retry_on_timeout=True,
+            **get_store_config(store)
+        )
+        pools[key] = pool
+    return aioredis.Redis(connection_pool=pool)
+
+
+def redis_health_status():
+    """Per-pool state for status endpoints"""
+    now = time.monotonic()
+    status = {}
+    for store in REDIS_STORES:
+        config = get_store_config(store)
+        health = _health.get(_pool_key(config))
+        status[store] = {
+            'host': f"{config['host']}:{config['port']}/{config['db']}",
+            'initialized': health is not None,
+            'available': bool(health) and now >= health.down_until,
+            'failures': health.failures if health else 0,
+        }
+    return status
+
+
+class RedisStore:
+    """
+    Module-level handle for a logical store.
+
+    Truthy while the store is reachable (checked lazily, with backoff) and
+    proxies every Redis command to the pooled client. Commands fail fast
+    with ConnectionError while the store is backing off, and a connection
+    error starts the backoff.
+    """
+
+    def __init__(self, store=DEFAULT_STORE):
+        self.store = store
+
+    def __bool__(self):
+        return get_redis_client(self.store) is not None
+
+    def __repr__(self):
+        return f"<RedisStore {self.store}>"
+
+    def __getattr__(self, name):
+        client = get_redis_client(self.store)
+        if client is None:
+            raise redis.ConnectionError(f"Redis store '{self.store}' is unavailable")
+
+        attr = getattr(client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                _mark_down(_pool_key(get_store_config(self.store)), e)
+                raise
+        return call